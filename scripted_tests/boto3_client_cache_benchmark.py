@@ -0,0 +1,65 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+import argparse
+import os
+import time
+
+import boto3
+
+from deadline.client import api
+from deadline.client.api._session import _share_data_loader, invalidate_boto3_session_cache
+
+NUM_CALLS = 200
+NUM_SESSIONS = 20
+
+"""
+A benchmark of creating boto3 clients, like the CLI and submitters do many times over while
+listing resources and submitting jobs. It compares:
+
+- "uncached": calling session.client("deadline") on every use.
+- "cached": calling api.get_boto3_client("deadline"), which reuses the client of the session.
+- "fresh loader": creating an s3 client in each new session, like the queue role sessions do,
+  where every session loads the service model from disk again.
+- "shared loader": the same, but with the loaded service models shared between the sessions.
+
+No AWS requests are made; creating a client only loads the service model and endpoint data.
+
+Example usage:
+
+  python3 boto3_client_cache_benchmark.py
+  python3 boto3_client_cache_benchmark.py --calls 1000 --sessions 50
+"""
+
+
+def timed(label: str, count: int, fn) -> None:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>14}: {count} clients in {elapsed:.2f}s ({elapsed / count * 1e3:.2f} ms each)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=NUM_CALLS)
+    parser.add_argument("--sessions", type=int, default=NUM_SESSIONS)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-2")
+
+    invalidate_boto3_session_cache()
+    session = api.get_boto3_session()
+    timed("uncached", args.calls, lambda: session.client("deadline"))
+    timed("cached", args.calls, lambda: api.get_boto3_client("deadline"))
+
+    def fresh_loader_client() -> None:
+        boto3.Session(region_name=os.environ["AWS_DEFAULT_REGION"]).client("s3")
+
+    def shared_loader_client() -> None:
+        new_session = boto3.Session(region_name=os.environ["AWS_DEFAULT_REGION"])
+        _share_data_loader(new_session._session)
+        new_session.client("s3")
+
+    timed("fresh loader", args.sessions, fresh_loader_client)
+    timed("shared loader", args.sessions, shared_loader_client)
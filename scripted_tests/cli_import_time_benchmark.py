@@ -0,0 +1,109 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+import argparse
+import statistics
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List, Tuple
+
+# The import time budget, in milliseconds, of each CLI command. Commands that only touch the
+# local configuration should not pay for importing the service and job attachments code.
+# "{root}" and "{destination}" are replaced by a directory with a few files to snapshot and
+# a directory to write manifests to.
+COMMAND_BUDGETS_MS = {
+    "--version": 200,
+    "config get settings.log_level": 250,
+    "config show": 250,
+    "job --help": 650,
+    "bundle --help": 500,
+    "manifest snapshot --root {root} --destination {destination}": 650,
+}
+# Commands that only work with local files, which must not import boto3 or botocore.
+# "manifest snapshot" is not one of them, because it records hashing telemetry.
+LOCAL_ONLY_COMMANDS = {
+    "--version",
+    "config get settings.log_level",
+    "config show",
+}
+NUM_RUNS = 5
+
+"""
+An import time regression benchmark for the deadline CLI. It runs each command in a new
+interpreter with "python -X importtime", adds up the time spent importing modules, and fails
+if the median over several runs is over the budget of the command, or if a command that only
+works with local files imported boto3 or botocore.
+
+No AWS requests are made; every command only reads the local configuration or prints help.
+
+Example usage:
+
+  python3 cli_import_time_benchmark.py
+  python3 cli_import_time_benchmark.py --runs 10 --show-slowest 20
+"""
+
+
+def measure_import_time(command: str) -> Tuple[float, List[Tuple[int, str]]]:
+    """
+    Runs the deadline CLI command with -X importtime, and returns the total import time
+    in milliseconds along with the (self time in microseconds, module name) of each import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "deadline", *command.split()],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        imports.append((int(self_us), name.strip()))
+    return sum(self_us for self_us, _ in imports) / 1000, imports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=NUM_RUNS)
+    parser.add_argument("--show-slowest", type=int, default=0)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    root = os.path.join(tmpdir.name, "root")
+    destination = os.path.join(tmpdir.name, "manifests")
+    os.makedirs(os.path.join(root, "subdir"))
+    os.makedirs(destination)
+    for i in range(10):
+        with open(os.path.join(root, "subdir", f"file{i}.txt"), "w") as f:
+            f.write(f"contents {i}")
+
+    over_budget = []
+    loaded_boto3 = []
+    for command_template, budget_ms in COMMAND_BUDGETS_MS.items():
+        command = command_template.format(root=root, destination=destination)
+        runs = [measure_import_time(command) for _ in range(args.runs)]
+        median_ms = statistics.median(total_ms for total_ms, _ in runs)
+        module_count = len(runs[0][1])
+        status = "ok" if median_ms <= budget_ms else "OVER BUDGET"
+        imported_modules = {name for _, name in runs[0][1]}
+        if command_template in LOCAL_ONLY_COMMANDS and imported_modules & {"boto3", "botocore"}:
+            status += ", IMPORTED BOTO3"
+            loaded_boto3.append(command_template)
+        print(
+            f"deadline {command_template.split(' --root')[0]:<32} {median_ms:7.1f} ms /"
+            f" {budget_ms} ms budget, {module_count} modules  {status}"
+        )
+        for self_us, name in sorted(runs[-1][1], reverse=True)[: args.show_slowest]:
+            print(f"    {self_us / 1000:7.1f} ms  {name}")
+        if median_ms > budget_ms:
+            over_budget.append(command_template)
+
+    tmpdir.cleanup()
+    if over_budget:
+        sys.exit(f"Import time over budget for: {', '.join(over_budget)}")
+    if loaded_boto3:
+        sys.exit(f"boto3 imported by local-only commands: {', '.join(loaded_boto3)}")
@@ -0,0 +1,103 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+import argparse
+import grp
+import os
+import pathlib
+import tempfile
+import time
+
+from deadline.job_attachments.os_file_permission import (
+    PosixFileSystemPermissionSettings,
+    _PosixPermissionsAtCreation,
+    _set_fs_group_for_posix,
+)
+
+NUM_FILES = 100_000
+FILES_PER_DIR = 100
+
+"""
+A benchmark comparing the two ways of applying file system permissions to downloaded input files
+on POSIX systems, without any S3 traffic:
+
+- "post-pass": create all files, then make a second pass with `_set_fs_group_for_posix`, which
+  chowns/chmods every file and parent directory by path, followed by a stat of every file to
+  record its modification time (as `AssetSync._record_attachment_mtimes` used to do).
+- "at-creation": apply the group and mode through the file descriptor while creating each file
+  with `_PosixPermissionsAtCreation`, and take the modification time from that same descriptor.
+
+The target group is the current user's primary group, so no special privileges are needed.
+
+Example usage:
+
+  python3 download_permissions_benchmark.py
+  python3 download_permissions_benchmark.py --num-files 300000 --dir /path/on/target/filesystem
+"""
+
+
+def _relative_paths(num_files: int) -> list[str]:
+    return [f"dir{i // FILES_PER_DIR}/sub/file{i}.txt" for i in range(num_files)]
+
+
+def _write_file(path: pathlib.Path, mtime_ns: int) -> int:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        os.write(fd, b"small file contents")
+        os.utime(fd, ns=(mtime_ns, mtime_ns))
+        return os.fstat(fd).st_mtime_ns
+    finally:
+        os.close(fd)
+
+
+def run_post_pass(root: pathlib.Path, relative_paths: list[str], settings) -> float:
+    start = time.perf_counter()
+    file_paths = []
+    for rel_path in relative_paths:
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_file(path, 1_000_000_000)
+        file_paths.append(str(path))
+    _set_fs_group_for_posix(file_paths, str(root), settings)
+    mtimes = {path: pathlib.Path(path).stat().st_mtime_ns for path in file_paths}
+    assert len(mtimes) == len(relative_paths)
+    return time.perf_counter() - start
+
+
+def run_at_creation(root: pathlib.Path, relative_paths: list[str], settings) -> float:
+    start = time.perf_counter()
+    fs_permissions = _PosixPermissionsAtCreation(str(root), settings)
+    mtimes = {}
+    for rel_path in relative_paths:
+        path = root / rel_path
+        fs_permissions.make_dirs(path.parent)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            fs_permissions.apply_to_file(fd)
+            os.write(fd, b"small file contents")
+            os.utime(fd, ns=(1_000_000_000, 1_000_000_000))
+            mtimes[str(path)] = os.fstat(fd).st_mtime_ns
+        finally:
+            os.close(fd)
+    assert len(mtimes) == len(relative_paths)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-files", type=int, default=NUM_FILES)
+    parser.add_argument("--dir", type=str, default=None, help="Directory to create files under.")
+    args = parser.parse_args()
+
+    settings = PosixFileSystemPermissionSettings(
+        os_user="",
+        os_group=grp.getgrgid(os.getgid()).gr_name,
+        dir_mode=0o20,
+        file_mode=0o20,
+    )
+    relative_paths = _relative_paths(args.num_files)
+
+    for name, run in (("post-pass", run_post_pass), ("at-creation", run_at_creation)):
+        with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+            elapsed = run(pathlib.Path(temp_dir), relative_paths, settings)
+        print(f"{name:>12}: {args.num_files} files in {elapsed:.2f}s")
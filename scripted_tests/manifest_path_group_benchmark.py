@@ -0,0 +1,97 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+import argparse
+import statistics
+import sys
+import time
+from typing import List
+
+from deadline.job_attachments.asset_manifests.base_manifest import BaseManifestPath
+from deadline.job_attachments.asset_manifests.hash_algorithms import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import ManifestPath
+from deadline.job_attachments.models import ManifestPathGroup
+
+# The time budget, in seconds, of each operation on a group of NUM_PATHS paths.
+OPERATION_BUDGETS_SECONDS = {
+    "build": 2.0,
+    "contains_path": 1.0,
+    "get_all_paths": 1.0,
+}
+NUM_PATHS = 1_000_000
+NUM_RUNS = 3
+
+"""
+A performance regression benchmark for ManifestPathGroup, the paths of the output manifests
+of a job under one root. It builds a group of one million paths, and fails if the median time
+of either operation below is over its budget:
+
+- build: indexing the paths by their relative path.
+- contains_path: looking up every 10th path.
+- get_all_paths: building the sorted list of paths.
+
+Example usage:
+
+  python3 manifest_path_group_benchmark.py
+  python3 manifest_path_group_benchmark.py --runs 5 --num-paths 2000000
+"""
+
+
+def make_paths(num_paths: int) -> List[BaseManifestPath]:
+    return [
+        ManifestPath(path=f"frames/{i % 1000}/frame_{i}.exr", hash="h", size=1, mtime=1)
+        for i in range(num_paths)
+    ]
+
+
+def make_group(paths: List[BaseManifestPath]) -> ManifestPathGroup:
+    return ManifestPathGroup(files_by_hash_alg={HashAlgorithm.XXH128: paths})
+
+
+def time_build(paths: List[BaseManifestPath]) -> float:
+    start = time.perf_counter()
+    make_group(paths)
+    return time.perf_counter() - start
+
+
+def time_contains_path(paths: List[BaseManifestPath]) -> float:
+    group = make_group(paths)
+    start = time.perf_counter()
+    for manifest_path in paths[::10]:
+        assert group.contains_path(manifest_path.path)
+    return time.perf_counter() - start
+
+
+def time_get_all_paths(paths: List[BaseManifestPath]) -> float:
+    group = make_group(paths)
+    start = time.perf_counter()
+    assert len(group.get_all_paths()) == len(paths)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=NUM_RUNS)
+    parser.add_argument("--num-paths", type=int, default=NUM_PATHS)
+    args = parser.parse_args()
+
+    paths = make_paths(args.num_paths)
+
+    over_budget = []
+    for operation, time_operation in [
+        ("build", time_build),
+        ("contains_path", time_contains_path),
+        ("get_all_paths", time_get_all_paths),
+    ]:
+        budget_seconds = OPERATION_BUDGETS_SECONDS[operation]
+        median_seconds = statistics.median(time_operation(paths) for _ in range(args.runs))
+        status = "ok" if median_seconds <= budget_seconds else "OVER BUDGET"
+        print(
+            f"{operation:<16} {median_seconds:6.3f} s / {budget_seconds} s budget"
+            f" for {len(paths)} paths  {status}"
+        )
+        if median_seconds > budget_seconds:
+            over_budget.append(operation)
+
+    if over_budget:
+        sys.exit(f"Over budget: {', '.join(over_budget)}")
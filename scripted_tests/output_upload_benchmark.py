@@ -0,0 +1,143 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+import argparse
+import os
+import pathlib
+import tempfile
+import time
+import uuid
+from typing import List, Optional
+
+import boto3
+
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
+from deadline.job_attachments.asset_sync import AssetSync
+from deadline.job_attachments.models import JobAttachmentS3Settings, OutputFile
+
+NUM_FILES = 2000
+FILE_SIZE = 64 * 1024
+# Every Nth file has the same content as the file before it, like repeated layers of a render.
+DUPLICATE_EVERY = 10
+BUCKET_NAME = "output-upload-benchmark"
+
+"""
+A benchmark comparing uploading task output files one at a time (as AssetSync._upload_output_files_to_s3
+used to do) against the concurrent small/large file scheduling shared with input uploads, which also
+uploads files with identical content only once.
+
+By default, S3 is stood in for by moto in the same process, with an artificial delay added to every
+request to stand in for the round trip to S3. To use another S3 compatible server instead, such as
+`moto_server` (pip install "moto[server]") or MinIO, pass its endpoint URL; the bucket is created if
+it does not exist.
+
+Example usage:
+
+  python3 output_upload_benchmark.py
+  python3 output_upload_benchmark.py --num-files 5000 --latency-ms 20
+  moto_server -p 5000 &
+  python3 output_upload_benchmark.py --endpoint-url http://localhost:5000 --latency-ms 0
+"""
+
+
+def _create_output_files(root: pathlib.Path, num_files: int, file_size: int) -> List[OutputFile]:
+    output_files = []
+    data = b""
+    for i in range(num_files):
+        if i % DUPLICATE_EVERY != DUPLICATE_EVERY - 1:
+            data = os.urandom(file_size)
+        path = root / f"layer{i}.exr"
+        path.write_bytes(data)
+        file_hash = hash_data(data, HashAlgorithm.XXH128)
+        output_files.append(
+            OutputFile(
+                file_size=file_size,
+                file_hash=file_hash,
+                rel_path=path.name,
+                full_path=str(path),
+                s3_key=f"{{prefix}}/Data/{file_hash}.xxh128",
+                in_s3=False,
+                base_dir=str(root),
+            )
+        )
+    return output_files
+
+
+def _with_prefix(output_files: List[OutputFile], prefix: str) -> List[OutputFile]:
+    return [
+        OutputFile(**{**vars(output_file), "s3_key": output_file.s3_key.format(prefix=prefix)})
+        for output_file in output_files
+    ]
+
+
+def run_serial(
+    asset_sync: AssetSync, s3_settings: JobAttachmentS3Settings, output_files: List[OutputFile]
+) -> float:
+    start = time.perf_counter()
+    for file in output_files:
+        asset_sync.s3_uploader.upload_file_to_s3(
+            local_path=pathlib.Path(file.full_path),
+            s3_bucket=s3_settings.s3BucketName,
+            s3_upload_key=file.s3_key,
+            base_dir_path=pathlib.Path(file.base_dir) if file.base_dir else None,
+        )
+    return time.perf_counter() - start
+
+
+def run_concurrent(
+    asset_sync: AssetSync, s3_settings: JobAttachmentS3Settings, output_files: List[OutputFile]
+) -> float:
+    start = time.perf_counter()
+    asset_sync._upload_output_files_to_s3(s3_settings, output_files, None)
+    return time.perf_counter() - start
+
+
+def run_benchmark(args: argparse.Namespace, endpoint_url: Optional[str]) -> None:
+    asset_sync = AssetSync("farm-benchmark")
+    s3_client = boto3.client("s3", region_name="us-west-2", endpoint_url=endpoint_url)
+
+    def add_latency(**kwargs):
+        time.sleep(args.latency_ms / 1000)
+
+    s3_client.meta.events.register("before-sign.s3", add_latency)
+    asset_sync.s3_uploader._s3 = s3_client
+    try:
+        s3_client.create_bucket(
+            Bucket=BUCKET_NAME,
+            CreateBucketConfiguration={"LocationConstraint": "us-west-2"},
+        )
+    except s3_client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    s3_settings = JobAttachmentS3Settings(s3BucketName=BUCKET_NAME, rootPrefix="benchmark")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_files = _create_output_files(pathlib.Path(temp_dir), args.num_files, args.file_size)
+        for name, run in (("serial", run_serial), ("concurrent", run_concurrent)):
+            # Upload under a new prefix each time, so no output is already in the CAS.
+            files = _with_prefix(output_files, f"benchmark/{uuid.uuid4().hex}")
+            elapsed = run(asset_sync, s3_settings, files)
+            print(f"{name:>10}: {len(files)} files of {args.file_size} bytes in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-files", type=int, default=NUM_FILES)
+    parser.add_argument("--file-size", type=int, default=FILE_SIZE)
+    parser.add_argument(
+        "--latency-ms", type=float, default=10.0, help="Delay added to every S3 request."
+    )
+    parser.add_argument(
+        "--endpoint-url", type=str, default=None, help="An S3 compatible server to upload to."
+    )
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        run_benchmark(args, args.endpoint_url)
+    else:
+        from moto import mock_aws
+
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-2")
+        with mock_aws():
+            run_benchmark(args, None)
@@ -0,0 +1,111 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+#! /usr/bin/env python3
+import argparse
+import concurrent.futures
+import threading
+import time
+from typing import Callable
+
+from deadline.job_attachments.progress_tracker import (
+    ProgressReportMetadata,
+    ProgressStatus,
+    ProgressTracker,
+)
+
+NUM_THREADS = 64
+CHUNKS_PER_THREAD = 2000
+CHUNK_SIZE = 8 * 1024
+CALLBACK_MS = 50
+CALLBACK_INTERVAL = 0.1
+
+"""
+A benchmark of the progress tracking overhead seen by the transfer threads, with many threads
+reporting byte-chunk progress at once and a slow progress callback (like a GUI or a remote
+progress reporter.) It compares:
+
+- "locked": the previous design, where every byte-chunk callback took one lock shared by all the
+  threads, and the progress callback was invoked by whichever transfer thread found a report due,
+  while still holding that lock.
+- "tracker": the current ProgressTracker, where each thread updates its own counters and the
+  progress callback is invoked from a separate reporter thread.
+
+No files or S3 requests are involved; the transfer threads do nothing but report progress.
+
+Example usage:
+
+  python3 progress_tracker_contention_benchmark.py
+  python3 progress_tracker_contention_benchmark.py --threads 128 --callback-ms 200
+"""
+
+
+class _LockedProgressTracker:
+    """A stand-in for the previous ProgressTracker's byte-chunk callback."""
+
+    def __init__(self, on_progress_callback: Callable[[ProgressReportMetadata], bool]) -> None:
+        self.on_progress_callback = on_progress_callback
+        self.processed_bytes = 0
+        self.last_report_time = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def track_progress_callback(self, bytes_amount: int) -> bool:
+        with self._lock:
+            self.processed_bytes += bytes_amount
+            current_time = time.perf_counter()
+            if current_time - self.last_report_time >= CALLBACK_INTERVAL:
+                self.on_progress_callback(
+                    ProgressReportMetadata(ProgressStatus.UPLOAD_IN_PROGRESS, 0.0, 0.0, "")
+                )
+                self.last_report_time = current_time
+            return True
+
+
+def run(tracker, num_threads: int, chunks_per_thread: int) -> float:
+    def transfer() -> None:
+        for _ in range(chunks_per_thread):
+            tracker.track_progress_callback(CHUNK_SIZE)
+            # Give up the GIL like a real transfer thread does while waiting on the network.
+            time.sleep(0)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+        futures = [executor.submit(transfer) for _ in range(num_threads)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    assert tracker.processed_bytes == num_threads * chunks_per_thread * CHUNK_SIZE
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=NUM_THREADS)
+    parser.add_argument("--chunks-per-thread", type=int, default=CHUNKS_PER_THREAD)
+    parser.add_argument("--callback-ms", type=float, default=CALLBACK_MS)
+    args = parser.parse_args()
+
+    def slow_callback(_: ProgressReportMetadata) -> bool:
+        time.sleep(args.callback_ms / 1000)
+        return True
+
+    total_bytes = args.threads * args.chunks_per_thread * CHUNK_SIZE
+    trackers = (
+        ("locked", _LockedProgressTracker(slow_callback)),
+        (
+            "tracker",
+            ProgressTracker(
+                status=ProgressStatus.UPLOAD_IN_PROGRESS,
+                total_files=args.threads,
+                total_bytes=total_bytes,
+                on_progress_callback=slow_callback,
+                callback_interval=CALLBACK_INTERVAL,
+            ),
+        ),
+    )
+    for name, tracker in trackers:
+        elapsed = run(tracker, args.threads, args.chunks_per_thread)
+        calls = args.threads * args.chunks_per_thread
+        print(
+            f"{name:>8}: {calls} callbacks from {args.threads} threads in {elapsed:.2f}s"
+            f" ({elapsed / calls * 1e6:.1f} us per callback)"
+        )
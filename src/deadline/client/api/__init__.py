@@ -18,12 +18,14 @@ __all__ = [
     "list_jobs",
     "list_fleets",
     "list_storage_profiles_for_queue",
+    "get_queue",
     "get_queue_user_boto3_session",
     "get_queue_parameter_definitions",
     "get_telemetry_client",
     "get_deadline_cloud_library_telemetry_client",
     "get_storage_profile_for_queue",
     "record_success_fail_telemetry_event",
+    "clear_metadata_cache",
 ]
 
 # The following import is needed to prevent the following sporadic failure:
@@ -52,6 +54,7 @@ from ._list_apis import (
     list_fleets,
     list_storage_profiles_for_queue,
 )
+from ._metadata_cache import clear_metadata_cache, get_queue
 from ._queue_parameters import get_queue_parameter_definitions
 
 # Telemetry must be imported before Submit Job Bundle to avoid circular dependencies.
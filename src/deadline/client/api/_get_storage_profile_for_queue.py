@@ -7,6 +7,7 @@ from configparser import ConfigParser
 from typing import Optional
 from botocore.client import BaseClient  # type: ignore[import]
 
+from ._metadata_cache import open_metadata_cache
 from ._session import get_boto3_client
 from ...job_attachments.models import (
     FileSystemLocation,
@@ -26,9 +27,13 @@ def get_storage_profile_for_queue(
     if deadline is None:
         deadline = get_boto3_client("deadline", config=config)
 
-    storage_profile_response = deadline.get_storage_profile_for_queue(
-        farmId=farm_id, queueId=queue_id, storageProfileId=storage_profile_id
-    )
+    with open_metadata_cache(deadline, config) as cache:
+        storage_profile_response = cache.get(
+            f"storage-profile-for-queue/{farm_id}/{queue_id}/{storage_profile_id}",
+            lambda: deadline.get_storage_profile_for_queue(  # type: ignore[union-attr]
+                farmId=farm_id, queueId=queue_id, storageProfileId=storage_profile_id
+            ),
+        )
     return StorageProfile(
         storageProfileId=storage_profile_response["storageProfileId"],
         displayName=storage_profile_response["displayName"],
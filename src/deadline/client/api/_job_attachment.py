@@ -2,8 +2,9 @@
 
 from deadline.client import api
 from deadline.client.config import config_file
+from deadline.job_attachments._local_asset_manager import LocalAssetManager
 from deadline.job_attachments.models import AssetRootGroup, AssetRootManifest
-from deadline.job_attachments.upload import S3AssetManager, SummaryStatistics
+from deadline.job_attachments.progress_tracker import SummaryStatistics
 
 
 import textwrap
@@ -12,7 +13,7 @@ from typing import Callable, Dict, List, Optional, Tuple
 
 
 def _hash_attachments(
-    asset_manager: S3AssetManager,
+    asset_manager: LocalAssetManager,
     asset_groups: List[AssetRootGroup],
     total_input_files: int,
     total_input_bytes: int,
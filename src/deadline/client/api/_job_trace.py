@@ -0,0 +1,294 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Collects the sessions, session actions, steps and tasks of an AWS Deadline Cloud job for
+`deadline job trace-schedule`, and writes the trace in the Chrome tracing format.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "ChromeTraceWriter",
+    "JobTraceCollector",
+    "clear_job_trace_cache",
+    "load_cached_job_trace_data",
+    "save_job_trace_data",
+]
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from botocore.client import BaseClient  # type: ignore[import]
+
+from ..config import config_file
+from ..exceptions import DeadlineOperationError
+from ._job_waiter import TERMINAL_TASK_RUN_STATUSES
+from ._list_apis import _call_paginated_deadline_list_api
+from ._metadata_cache import _decode_value, _encode_value
+
+logger = logging.getLogger(__name__)
+
+JOB_TRACE_CACHE_DIR_NAME = "job_traces"
+
+# The defaults for how many requests are made at the same time, and how many per second,
+# chosen to stay well within the AWS Deadline Cloud API throttling limits.
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_REQUESTS_PER_SECOND = 20.0
+
+
+class _RateLimiter:
+    """
+    A token bucket that allows up to requests_per_second calls to acquire() per second,
+    in bursts of at most one second's worth of calls. It is safe to use from several threads.
+    """
+
+    def __init__(self, requests_per_second: float) -> None:
+        self._requests_per_second = requests_per_second
+        self._tokens = requests_per_second
+        self._last_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._requests_per_second,
+                    self._tokens + (now - self._last_time) * self._requests_per_second,
+                )
+                self._last_time = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self._requests_per_second
+            time.sleep(wait_seconds)
+
+
+class JobTraceCollector:
+    """
+    Gets all the data of a job that the trace is made from, using the deadline:List* APIs
+    on a thread pool with a limited request rate. The steps and tasks are listed in the
+    background as soon as the collector is entered, while the sessions are listed.
+
+    This class is intended to always be used with a context manager, which waits for
+    the background requests when it exits.
+
+    Example:
+        with JobTraceCollector(deadline, farm_id, queue_id, job_id) as collector:
+            sessions = collector.list_sessions()
+            collector.list_session_actions(sessions)
+            collector.add_steps_and_tasks(sessions)
+    """
+
+    def __init__(
+        self,
+        deadline_client: BaseClient,
+        farm_id: str,
+        queue_id: str,
+        job_id: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_requests_per_second: float = DEFAULT_MAX_REQUESTS_PER_SECOND,
+    ) -> None:
+        self._deadline = deadline_client
+        self._job_kwargs = {"farmId": farm_id, "queueId": queue_id, "jobId": job_id}
+        self._rate_limiter = _RateLimiter(max_requests_per_second)
+        # Listing the tasks waits on other workers, so there need to be at least two.
+        self._executor = ThreadPoolExecutor(max_workers=max(max_workers, 2))
+        self._futures: List[Future] = []
+        self._steps_and_tasks: Optional[Future] = None
+
+    def __enter__(self) -> JobTraceCollector:
+        self._steps_and_tasks = self._submit(self._list_steps_and_tasks)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        if exc_type is not None:
+            for future in self._futures:
+                future.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        future = self._executor.submit(func, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def _call(self, api: Callable[..., Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        self._rate_limiter.acquire()
+        response = api(**self._job_kwargs, **kwargs)
+        response.pop("ResponseMetadata", None)
+        return response
+
+    def _list(self, api: Callable[..., Dict[str, Any]], list_property_name: str, **kwargs) -> list:
+        return _call_paginated_deadline_list_api(
+            lambda **page_kwargs: self._call(api, **page_kwargs), list_property_name, **kwargs
+        )[list_property_name]
+
+    def _list_steps_and_tasks(self) -> tuple[Dict[str, Any], Dict[str, Any]]:
+        steps = {step["stepId"]: step for step in self._list(self._deadline.list_steps, "steps")}
+        task_lists = [
+            self._submit(self._list, self._deadline.list_tasks, "tasks", stepId=step_id)
+            for step_id in steps
+        ]
+        tasks = {task["taskId"]: task for task_list in task_lists for task in task_list.result()}
+        return steps, tasks
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """Returns all the sessions of the job, sorted by when they started."""
+        sessions = self._list(self._deadline.list_sessions, "sessions")
+        return sorted(sessions, key=lambda session: session["startedAt"])
+
+    def list_session_actions(
+        self,
+        sessions: List[Dict[str, Any]],
+        progress_callback: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Sets the "actions" of each session to its session actions. Calls progress_callback
+        on the calling thread each time the actions of a session were listed.
+        """
+        futures = {
+            self._submit(
+                self._list,
+                self._deadline.list_session_actions,
+                "sessionActions",
+                sessionId=session["sessionId"],
+            ): session
+            for session in sessions
+        }
+        for future in as_completed(futures):
+            futures[future]["actions"] = future.result()
+            if progress_callback:
+                progress_callback()
+
+    def add_steps_and_tasks(self, sessions: List[Dict[str, Any]]) -> None:
+        """
+        Sets the "index" and "step" of each session, and the "task" of each task run
+        session action. Steps and tasks that weren't listed are fetched one by one.
+        """
+        if self._steps_and_tasks is None:
+            raise RuntimeError("JobTraceCollector must be used as a context manager.")
+        steps, tasks = self._steps_and_tasks.result()
+
+        for index, session in enumerate(sessions):
+            session["index"] = index
+            for action in session["actions"]:
+                step_id = action["definition"].get("taskRun", {}).get("stepId")
+                task_id = action["definition"].get("taskRun", {}).get("taskId")
+                if step_id and task_id:
+                    if "step" not in session:
+                        if step_id not in steps:
+                            steps[step_id] = self._call(self._deadline.get_step, stepId=step_id)
+                        session["step"] = steps[step_id]
+                    elif session["step"]["stepId"] != step_id:
+                        # The session itself doesn't have a step id, but for now the scheduler always creates new
+                        # sessions for new steps.
+                        raise DeadlineOperationError(
+                            f"Session {session['sessionId']} ran more than one step! When this code was"
+                            " written that wasn't possible."
+                        )
+
+                    if task_id not in tasks:
+                        tasks[task_id] = self._call(
+                            self._deadline.get_task, stepId=step_id, taskId=task_id
+                        )
+                    action["task"] = tasks[task_id]
+
+
+def get_job_trace_cache_file(farm_id: str, queue_id: str, job_id: str) -> str:
+    return os.path.join(
+        config_file.get_cache_directory(),
+        JOB_TRACE_CACHE_DIR_NAME,
+        farm_id,
+        queue_id,
+        f"{job_id}.json",
+    )
+
+
+def load_cached_job_trace_data(
+    farm_id: str, queue_id: str, job: Dict[str, Any]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Returns the sessions cached by save_job_trace_data, if the job hasn't changed
+    since they were collected, otherwise None.
+    """
+    cache_file = get_job_trace_cache_file(farm_id, queue_id, job["jobId"])
+    try:
+        with open(cache_file, "r", encoding="utf-8") as fh:
+            cached_data = _decode_value(fh.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring the cached job trace data {cache_file}: {e}")
+        return None
+    # Compare the encoded values, so that a change to any field of the job is noticed
+    if _encode_value(cached_data.get("job")) != _encode_value(job):
+        return None
+    return cached_data.get("sessions")
+
+
+def save_job_trace_data(
+    farm_id: str, queue_id: str, job: Dict[str, Any], sessions: List[Dict[str, Any]]
+) -> Optional[str]:
+    """
+    Caches the collected sessions of the job on disk, if all its tasks are done running so the
+    sessions won't change anymore. Returns the cache file, or None if it wasn't cached.
+    """
+    if job.get("taskRunStatus") not in TERMINAL_TASK_RUN_STATUSES:
+        return None
+    cache_file = get_job_trace_cache_file(farm_id, queue_id, job["jobId"])
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as fh:
+            fh.write(_encode_value({"job": job, "sessions": sessions}))
+        os.replace(temp_file, cache_file)
+    except Exception as e:
+        logger.debug(f"Could not cache the job trace data: {e}")
+        return None
+    return cache_file
+
+
+def clear_job_trace_cache() -> None:
+    """
+    Removes all the cached job trace data.
+    """
+    shutil.rmtree(
+        os.path.join(config_file.get_cache_directory(), JOB_TRACE_CACHE_DIR_NAME),
+        ignore_errors=True,
+    )
+
+
+class ChromeTraceWriter:
+    """
+    Writes a trace in the Chrome tracing JSON object format one event at a time, so that
+    the events of a large job don't all need to be kept in memory. The "otherData"
+    metadata is written last, when the writer is closed.
+
+    Example:
+        with open(trace_file, "w", encoding="utf8") as fh:
+            writer = ChromeTraceWriter(fh)
+            writer.write_event({"name": "Task", "ph": "X", "ts": 0, "dur": 10, "pid": 0, "tid": 0})
+            writer.close(other_data={"jobId": job_id})
+    """
+
+    def __init__(self, fh: IO[str]) -> None:
+        self._fh = fh
+        self._event_count = 0
+        self._fh.write('{"traceEvents": [')
+
+    def write_event(self, event: Dict[str, Any]) -> None:
+        self._fh.write(",\n" if self._event_count else "\n")
+        self._fh.write(json.dumps(event))
+        self._event_count += 1
+
+    def close(self, other_data: Optional[Dict[str, Any]] = None) -> None:
+        self._fh.write("\n]")
+        if other_data is not None:
+            self._fh.write(',\n"otherData": ')
+            self._fh.write(json.dumps(other_data, indent=1))
+        self._fh.write("}\n")
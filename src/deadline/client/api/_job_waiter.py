@@ -0,0 +1,200 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Waits for AWS Deadline Cloud jobs to reach a status. The first check is made right away, and the
+checks after it back off exponentially, so that fast transitions return quickly while long waits
+don't flood the service with requests.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "JobWaiterBackoff",
+    "TERMINAL_TASK_RUN_STATUSES",
+    "get_job_lifecycle_status",
+    "wait_for_jobs",
+]
+
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from botocore.client import BaseClient  # type: ignore[import]
+from botocore.exceptions import ClientError  # type: ignore[import]
+
+from ..exceptions import JobWaiterCanceled
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_TASK_RUN_STATUSES = frozenset({"SUCCEEDED", "FAILED", "CANCELED", "NOT_COMPATIBLE"})
+"""The task run statuses that a job stays in until someone changes it."""
+
+# The longest time to sleep between checks of the continue callback.
+_MAX_SLEEP_SLICE_SECONDS = 1.0
+
+# The most values that a deadline:SearchJobs string list filter accepts.
+_SEARCH_JOBS_MAX_JOB_IDS = 16
+
+
+@dataclass(frozen=True)
+class JobWaiterBackoff:
+    """
+    The delays between the checks of a waiter. The first delay is initial_delay, and each
+    delay after it is multiplier times longer, up to max_delay. Every delay is randomly
+    adjusted by up to the jitter fraction of itself, so that many waiters started at the
+    same time don't all call the service at the same time.
+    """
+
+    initial_delay: float = 0.5
+    max_delay: float = 10.0
+    multiplier: float = 2.0
+    jitter: float = 0.2
+
+    def delays(self) -> Iterator[float]:
+        delay = self.initial_delay
+        while True:
+            yield delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay = min(delay * self.multiplier, self.max_delay)
+
+
+def get_job_lifecycle_status(job: Dict[str, Any]) -> str:
+    """
+    Returns the lifecycle status of a job from a deadline:GetJob, deadline:ListJobs or
+    deadline:SearchJobs response.
+    """
+    return job["lifecycleStatus"] if "lifecycleStatus" in job else job["state"]
+
+
+def _job_status(job: Dict[str, Any]) -> tuple:
+    return (job.get("lifecycleStatus", job.get("state")), job.get("taskRunStatus"))
+
+
+class _JobFetcher:
+    """
+    Gets the details of jobs in a queue. A single job is fetched with deadline:GetJob, and
+    several jobs with deadline:SearchJobs filtered on their job IDs, which needs one request
+    for up to _SEARCH_JOBS_MAX_JOB_IDS jobs instead of one request for each job.
+    """
+
+    def __init__(self, deadline_client: BaseClient, farm_id: str, queue_id: str) -> None:
+        self._deadline = deadline_client
+        self._farm_id = farm_id
+        self._queue_id = queue_id
+        self._use_search_jobs = True
+
+    def _search_jobs(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        response = self._deadline.search_jobs(
+            farmId=self._farm_id,
+            queueIds=[self._queue_id],
+            filterExpressions={
+                "filters": [
+                    {
+                        "stringListFilter": {
+                            "name": "JOB_ID",
+                            "operator": "ANY_EQUALS",
+                            "values": job_ids,
+                        }
+                    }
+                ],
+                "operator": "AND",
+            },
+            itemOffset=0,
+            pageSize=len(job_ids),
+        )
+        return response["jobs"]
+
+    def fetch(self, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        jobs: Dict[str, Dict[str, Any]] = {}
+        if self._use_search_jobs and len(job_ids) > 1:
+            try:
+                for i in range(0, len(job_ids), _SEARCH_JOBS_MAX_JOB_IDS):
+                    for job in self._search_jobs(job_ids[i : i + _SEARCH_JOBS_MAX_JOB_IDS]):
+                        jobs[job["jobId"]] = job
+            except ClientError as e:
+                # For example, if the credentials don't allow deadline:SearchJobs
+                logger.debug(f"Falling back to deadline:GetJob, SearchJobs failed: {e}")
+                self._use_search_jobs = False
+        # Jobs can be missing from the search results, for example if they're still being created.
+        for job_id in job_ids:
+            if job_id not in jobs:
+                jobs[job_id] = self._deadline.get_job(
+                    farmId=self._farm_id, queueId=self._queue_id, jobId=job_id
+                )
+        return jobs
+
+
+def wait_for_jobs(
+    deadline_client: BaseClient,
+    farm_id: str,
+    queue_id: str,
+    job_ids: Iterable[str],
+    is_done: Callable[[Dict[str, Any]], bool],
+    continue_callback: Callable[[], bool] = lambda: True,
+    on_status_change: Optional[Callable[[Dict[str, Any]], None]] = None,
+    backoff: Optional[JobWaiterBackoff] = None,
+    max_wait_seconds: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Waits until is_done returns True for all the jobs, and returns the latest details of each job.
+
+    Args:
+        deadline_client (BaseClient): A Deadline client.
+        farm_id (str): The farm of the jobs.
+        queue_id (str): The queue of the jobs.
+        job_ids (Iterable[str]): The jobs to wait for.
+        is_done (Callable dict -> bool): Called with the details of a job from deadline:GetJob or
+                deadline:SearchJobs, returns True when the job doesn't need to be waited for anymore.
+        continue_callback (Callable -> bool, optional): Called before every check and while waiting
+                between checks. If it returns False, raises JobWaiterCanceled.
+        on_status_change (Callable dict -> None, optional): Called with the details of a job the
+                first time it is checked, and whenever its lifecycle or task run status changes.
+        backoff (JobWaiterBackoff, optional): The delays between checks.
+        max_wait_seconds (float, optional): If provided, raises TimeoutError when the jobs aren't
+                done after this long.
+    """
+    pending_job_ids = list(dict.fromkeys(job_ids))
+    jobs: Dict[str, Dict[str, Any]] = {}
+    fetcher = _JobFetcher(deadline_client, farm_id, queue_id)
+    delays = (backoff or JobWaiterBackoff()).delays()
+    start_time = time.monotonic()
+    # The time spent sleeping is tracked too, in case the clock doesn't advance while sleeping.
+    slept_seconds = 0.0
+
+    attempt = 0
+    while True:
+        attempt += 1
+        if not continue_callback():
+            raise JobWaiterCanceled()
+
+        logger.debug(f"Checking the status of {len(pending_job_ids)} job(s), attempt {attempt}")
+        for job_id, job in fetcher.fetch(pending_job_ids).items():
+            previous_job = jobs.get(job_id)
+            jobs[job_id] = job
+            if on_status_change and (
+                previous_job is None or _job_status(previous_job) != _job_status(job)
+            ):
+                on_status_change(job)
+
+        pending_job_ids = [job_id for job_id in pending_job_ids if not is_done(jobs[job_id])]
+        if not pending_job_ids:
+            return jobs
+
+        elapsed_seconds = max(time.monotonic() - start_time, slept_seconds)
+        if max_wait_seconds is not None and elapsed_seconds >= max_wait_seconds:
+            raise TimeoutError(
+                f"Timed out after {max_wait_seconds} seconds while waiting for jobs: "
+                + ", ".join(pending_job_ids)
+            )
+
+        delay = next(delays)
+        if max_wait_seconds is not None:
+            delay = min(delay, max_wait_seconds - elapsed_seconds)
+        # Sleep in slices so that a cancelation doesn't have to wait for a long delay.
+        while delay > 0:
+            if not continue_callback():
+                raise JobWaiterCanceled()
+            sleep_seconds = min(delay, _MAX_SLEEP_SLICE_SECONDS)
+            time.sleep(sleep_seconds)
+            slept_seconds += sleep_seconds
+            delay -= sleep_seconds
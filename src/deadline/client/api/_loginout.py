@@ -19,6 +19,7 @@ from ._session import (
     AwsAuthenticationStatus,
 )
 from . import _session
+from ._queue_credential_cache import clear_queue_credential_cache
 from ..config import get_setting
 from ..exceptions import DeadlineOperationError
 import time
@@ -66,6 +67,8 @@ def _login_deadline_cloud_monitor(
         # Deadline Cloud monitor is a GUI app that will keep on running
         # So we sit here and test that profile for validity until it works
         if check_authentication_status(config) == AwsAuthenticationStatus.AUTHENTICATED:
+            # Queue role credentials cached for the profile may belong to a different user.
+            clear_queue_credential_cache()
             return f"Deadline Cloud monitor profile: {profile_name}"
         if on_cancellation_check:
             # Check if the UI has signaled a cancel
@@ -144,6 +147,7 @@ def logout(config: Optional[ConfigParser] = None) -> str:
 
         # Force a refresh of the cached boto3 Session
         _session.invalidate_boto3_session_cache()
+        clear_queue_credential_cache()
         return output.decode("utf8")
     raise UnsupportedProfileTypeForLoginLogout(
         "Logging out is only supported for AWS Profiles created by Deadline Cloud monitor."
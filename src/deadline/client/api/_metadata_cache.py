@@ -0,0 +1,241 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+A local cache of AWS Deadline Cloud resource metadata that every job submission reads, but
+that rarely changes, like queues, queue environments and storage profiles.
+"""
+from __future__ import annotations
+
+__all__ = ["DeadlineMetadataCache", "clear_metadata_cache", "get_queue"]
+
+import json
+import logging
+import os
+import time
+from configparser import ConfigParser
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from botocore.client import BaseClient  # type: ignore[import]
+
+from ...job_attachments.caches.cache_db import CacheDB
+from ..config import config_file
+
+logger = logging.getLogger(__name__)
+
+_DATETIME_KEY = "__datetime__"
+
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, dict):
+        # The request metadata of an API response is not worth caching.
+        value = {key: val for key, val in value.items() if key != "ResponseMetadata"}
+
+    def encode_datetime(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return {_DATETIME_KEY: obj.isoformat()}
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    return json.dumps(value, default=encode_datetime)
+
+
+def _decode_value(value: str) -> Any:
+    def decode_datetime(obj: dict) -> Any:
+        if len(obj) == 1 and _DATETIME_KEY in obj:
+            return datetime.fromisoformat(obj[_DATETIME_KEY])
+        return obj
+
+    return json.loads(value, object_hook=decode_datetime)
+
+
+def _get_resource_version(response: dict) -> Optional[str]:
+    """
+    Returns a value that changes whenever the resource of an API response changes: its "updatedAt",
+    or its "createdAt" if it was never updated. Returns None if the response has neither.
+    """
+    for timestamp_key in ("updatedAt", "createdAt"):
+        if timestamp_key in response:
+            return str(response[timestamp_key])
+    return None
+
+
+class DeadlineMetadataCache(CacheDB):
+    """
+    Maintains a cache of AWS Deadline Cloud API responses, or values derived from them, in a
+    local database under the Deadline cache directory. Entries are keyed by the service endpoint
+    and resource, e.g. "queue/{farmId}/{queueId}", and are used without calling the service
+    until they are older than the TTL.
+
+    This class is intended to always be used with a context manager to properly
+    close the connection to the cache database. If the TTL is 0 or less, or SQLite or the
+    cache directory is not available, every value is fetched from the service.
+    """
+
+    CACHE_NAME = "deadline_metadata_cache"
+    CACHE_DB_VERSION = 1
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        cache_dir: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+    ) -> None:
+        table_name: str = f"metadataV{self.CACHE_DB_VERSION}"
+        create_query: str = (
+            # Several threads or processes can create the table at the same time.
+            f"CREATE TABLE IF NOT EXISTS metadataV{self.CACHE_DB_VERSION}(cache_key text primary key, updated_at text, cached_at real, value text)"
+        )
+        try:
+            super().__init__(
+                cache_name=self.CACHE_NAME,
+                table_name=table_name,
+                create_query=create_query,
+                cache_dir=cache_dir or config_file.get_cache_directory(),
+            )
+        except OSError as e:
+            # For example, if the cache directory can't be created.
+            logger.debug(f"Not using the metadata cache: {e}")
+            self.enabled = False
+        self.ttl_seconds = ttl_seconds
+        # The same resource IDs can exist behind different endpoints, e.g. in different regions.
+        self.endpoint_url = endpoint_url
+        if self.ttl_seconds <= 0:
+            self.enabled = False
+
+    def __enter__(self) -> DeadlineMetadataCache:
+        try:
+            super().__enter__()
+        except Exception as e:
+            # The values can always be fetched from the service instead.
+            logger.debug(f"Not using the metadata cache: {e}")
+            self.enabled = False
+        return self
+
+    def _get_entry(self, cache_key: str) -> Optional[tuple[Optional[str], float, Any]]:
+        """Returns the (updated_at, cached_at, value) of the entry, or None if there isn't one."""
+        try:
+            with self.db_lock, self.db_connection:
+                entry_vals = self.db_connection.execute(
+                    f"SELECT updated_at, cached_at, value FROM {self.table_name} WHERE cache_key=?",
+                    [cache_key],
+                ).fetchone()
+            if entry_vals:
+                return entry_vals[0], float(entry_vals[1]), _decode_value(entry_vals[2])
+        except Exception as e:
+            logger.debug(f"Ignoring the cached metadata for {cache_key}: {e}")
+        return None
+
+    def _put_entry(self, cache_key: str, value: Any, updated_at: Optional[str] = None) -> None:
+        try:
+            with self.db_lock, self.db_connection:
+                self.db_connection.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} VALUES(?, ?, ?, ?)",
+                    [cache_key, updated_at, time.time(), _encode_value(value)],
+                )
+        except Exception as e:
+            logger.debug(f"Could not cache the metadata for {cache_key}: {e}")
+
+    def _endpoint_cache_key(self, cache_key: str) -> str:
+        return f"{self.endpoint_url}/{cache_key}" if self.endpoint_url else cache_key
+
+    def _is_fresh(self, cached_at: float) -> bool:
+        return 0 <= time.time() - cached_at < self.ttl_seconds
+
+    def get(self, cache_key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for the key if it's younger than the TTL, otherwise
+        calls fetch to get the value and caches it.
+        """
+        if not self.enabled:
+            return fetch()
+
+        cache_key = self._endpoint_cache_key(cache_key)
+        entry = self._get_entry(cache_key)
+        if entry is not None and self._is_fresh(entry[1]):
+            return entry[2]
+
+        value = fetch()
+        self._put_entry(cache_key, value)
+        return value
+
+    def get_derived(
+        self,
+        cache_key: str,
+        fetch: Callable[[], dict],
+        derive: Callable[[dict], Any],
+    ) -> Any:
+        """
+        Returns the cached value for the key if it's younger than the TTL. Otherwise calls
+        fetch to get the API response, and if its "updatedAt" (or "createdAt", if it was never
+        updated) is the same as when the value was cached, keeps the cached value instead of
+        calling derive to compute it from the response.
+        """
+        if not self.enabled:
+            return derive(fetch())
+
+        cache_key = self._endpoint_cache_key(cache_key)
+        entry = self._get_entry(cache_key)
+        if entry is not None and self._is_fresh(entry[1]):
+            return entry[2]
+
+        response = fetch()
+        updated_at = _get_resource_version(response)
+        if entry is not None and updated_at is not None and entry[0] == updated_at:
+            value = entry[2]
+        else:
+            value = derive(response)
+        self._put_entry(cache_key, value, updated_at)
+        return value
+
+    def clear(self) -> None:
+        """Removes all the entries from the cache."""
+        if self.enabled:
+            with self.db_lock, self.db_connection:
+                self.db_connection.execute(f"DELETE FROM {self.table_name}")
+
+
+def open_metadata_cache(
+    deadline: BaseClient, config: Optional[ConfigParser] = None
+) -> DeadlineMetadataCache:
+    """
+    Creates a metadata cache for the endpoint of the deadline client, with the TTL from the
+    settings. Use it as a context manager.
+    """
+    try:
+        ttl_seconds = int(
+            config_file.get_setting("settings.metadata_cache_ttl_seconds", config=config)
+        )
+    except ValueError:
+        logger.warning(
+            "The setting 'settings.metadata_cache_ttl_seconds' is not an integer, so the metadata cache is not used."
+        )
+        ttl_seconds = 0
+    return DeadlineMetadataCache(ttl_seconds=ttl_seconds, endpoint_url=deadline.meta.endpoint_url)
+
+
+def clear_metadata_cache() -> None:
+    """
+    Removes all the cached AWS Deadline Cloud metadata, so that it is fetched again on next use.
+    """
+    cache_file = os.path.join(
+        config_file.get_cache_directory(), f"{DeadlineMetadataCache.CACHE_NAME}.db"
+    )
+    if os.path.exists(cache_file):
+        with DeadlineMetadataCache(ttl_seconds=1) as cache:
+            cache.clear()
+
+
+def get_queue(
+    farm_id: str,
+    queue_id: str,
+    deadline: BaseClient,
+    config: Optional[ConfigParser] = None,
+) -> dict[str, Any]:
+    """
+    Calls the deadline:GetQueue API, or returns its cached response.
+    """
+    with open_metadata_cache(deadline, config) as cache:
+        return cache.get(
+            f"queue/{farm_id}/{queue_id}",
+            lambda: deadline.get_queue(farmId=farm_id, queueId=queue_id),
+        )
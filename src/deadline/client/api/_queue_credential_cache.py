@@ -0,0 +1,199 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+A cache of the credentials from deadline:AssumeQueueRoleForUser that is shared between processes,
+so that running the CLI repeatedly doesn't assume the queue role every time.
+"""
+from __future__ import annotations
+
+__all__ = ["QueueCredentialCache", "clear_queue_credential_cache"]
+
+import getpass
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from botocore.credentials import RefreshableCredentials  # type: ignore[import]
+
+from ..config import config_file
+
+logger = logging.getLogger(__name__)
+
+QUEUE_CREDENTIAL_CACHE_DIR_NAME = "queue_credentials"
+
+# Cached credentials are only used if botocore wouldn't refresh them yet.
+_ADVISORY_REFRESH_SECONDS: int = getattr(
+    RefreshableCredentials, "_advisory_refresh_timeout", 15 * 60
+)
+
+
+# The cache directories whose permissions were already restricted by this process on Windows.
+_restricted_cache_dirs: Set[str] = set()
+_restricted_cache_dirs_lock = threading.Lock()
+
+
+def get_queue_credential_cache_dir() -> str:
+    return os.path.join(config_file.get_cache_directory(), QUEUE_CREDENTIAL_CACHE_DIR_NAME)
+
+
+def _restrict_cache_dir_permissions_windows(cache_dir: str) -> None:
+    """
+    On Windows, file modes don't restrict access, so the ACL of the cache directory is reset to
+    only allow the current user, Administrators and SYSTEM, the same way as the config file
+    directory. The files in the directory inherit it.
+    """
+    with _restricted_cache_dirs_lock:
+        if cache_dir in _restricted_cache_dirs:
+            return
+        # OI - Contained objects will inherit
+        # CI - Sub-directories will inherit
+        # F  - Full control
+        config_file._reset_directory_permissions_windows(
+            Path(cache_dir).absolute(), getpass.getuser(), "(OI)(CI)(F)"
+        )
+        _restricted_cache_dirs.add(cache_dir)
+
+
+class QueueCredentialCache:
+    """
+    Caches the queue role credentials for an AWS profile and its current credentials, a Deadline
+    Cloud endpoint, farm and queue in a file that only the current user can access, along with
+    the AWS account ID of the credentials. Cached credentials
+    are used until they are within botocore's advisory refresh window of expiring.
+
+    Errors reading or writing the cache are logged and otherwise ignored, so the credentials are
+    fetched from the service instead.
+    """
+
+    def __init__(
+        self,
+        profile_name: Optional[str],
+        farm_id: str,
+        queue_id: str,
+        *,
+        base_access_key_id: str,
+        endpoint_url: Optional[str],
+        region_name: Optional[str],
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        self.cache_dir = cache_dir or get_queue_credential_cache_dir()
+        # The credentials the queue role was assumed with are part of the key, so that a profile
+        # that is signed in as someone else, or credentials from environment variables that
+        # change, never reuse the queue role credentials of the previous identity.
+        cache_key = json.dumps(
+            {
+                "profile": profile_name or "",
+                "baseAccessKeyId": hashlib.sha256(base_access_key_id.encode("utf-8")).hexdigest(),
+                "endpointUrl": endpoint_url or "",
+                "region": region_name or "",
+                "farmId": farm_id,
+                "queueId": queue_id,
+            },
+            sort_keys=True,
+        )
+        self.cache_file = os.path.join(
+            self.cache_dir, hashlib.sha256(cache_key.encode("utf-8")).hexdigest() + ".json"
+        )
+        self._lock = threading.Lock()
+        self._entry: Optional[Dict[str, Any]] = None
+
+    def _read_entry(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as fh:
+                # On Windows, the ACL of the cache directory is restricted when writing instead.
+                if sys.platform != "win32":
+                    # Don't trust a file that someone else could have written or read.
+                    file_stat = os.fstat(fh.fileno())
+                    if file_stat.st_uid != os.getuid() or file_stat.st_mode & 0o077:
+                        logger.warning(
+                            f"Ignoring the queue credential cache file {self.cache_file} because other users can access it."
+                        )
+                        return {}
+                entry = json.load(fh)
+            return entry if isinstance(entry, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.debug(f"Could not read the queue credential cache: {e}")
+            return {}
+
+    def _write_entry(self, entry: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            if sys.platform == "win32":
+                # If the permissions can't be restricted, the credentials aren't written.
+                _restrict_cache_dir_permissions_windows(self.cache_dir)
+            # Write a new file that only the current user can access, and then replace the cache
+            # file with it, so that other processes never read a partially written file.
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(entry, fh)
+                os.replace(temp_path, self.cache_file)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except Exception as e:
+            logger.debug(f"Could not write the queue credential cache: {e}")
+
+    def _get_entry(self) -> Dict[str, Any]:
+        if self._entry is None:
+            self._entry = self._read_entry()
+        return self._entry
+
+    def load_credentials(self) -> Optional[Dict[str, str]]:
+        """
+        Returns the cached credentials in botocore's metadata format, or None if there
+        are none that are far enough from expiring.
+        """
+        with self._lock:
+            # Another process may have refreshed the credentials since they were last read.
+            self._entry = self._read_entry()
+            credentials = self._entry.get("credentials")
+        if not credentials:
+            return None
+        try:
+            expiry_time = datetime.fromisoformat(credentials["expiry_time"])
+            if expiry_time.tzinfo is None:
+                expiry_time = expiry_time.replace(tzinfo=timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            return None
+        if expiry_time - datetime.now(timezone.utc) <= timedelta(seconds=_ADVISORY_REFRESH_SECONDS):
+            return None
+        return credentials
+
+    def save_credentials(self, credentials: Dict[str, str]) -> None:
+        """Caches credentials in botocore's metadata format."""
+        with self._lock:
+            entry = dict(self._get_entry())
+            entry["credentials"] = credentials
+            self._entry = entry
+            self._write_entry(entry)
+
+    def get_account_id(self) -> Optional[str]:
+        with self._lock:
+            return self._get_entry().get("accountId")
+
+    def set_account_id(self, account_id: str) -> None:
+        with self._lock:
+            entry = dict(self._get_entry())
+            if entry.get("accountId") == account_id:
+                return
+            entry["accountId"] = account_id
+            self._entry = entry
+            self._write_entry(entry)
+
+
+def clear_queue_credential_cache() -> None:
+    """
+    Removes all the cached queue role credentials, for example when logging out.
+    """
+    shutil.rmtree(get_queue_credential_cache_dir(), ignore_errors=True)
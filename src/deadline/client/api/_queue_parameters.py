@@ -3,9 +3,16 @@ from __future__ import annotations
 
 __all__ = ["get_queue_parameter_definitions"]
 
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
 import yaml
 
 from ._list_apis import _call_paginated_deadline_list_api
+from ._metadata_cache import _get_resource_version, open_metadata_cache
 from ._session import get_boto3_client
 from ..exceptions import DeadlineOperationError
 from ..job_bundle.parameters import (
@@ -15,6 +22,64 @@ from ..job_bundle.parameters import (
     validate_job_parameter,
 )
 
+# The libyaml based loader is much faster than the pure Python one, but is only
+# available when PyYAML was built with libyaml.
+_YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# The most queue environments to get from the service at the same time.
+_MAX_QUEUE_ENVIRONMENT_WORKERS = 8
+
+# The parsed queue environments of this process by (queueEnvironmentId, updatedAt or createdAt),
+# so that the same version of a queue environment is only parsed and validated once, even when
+# the metadata cache is disabled.
+_MAX_PARSED_QUEUE_ENVIRONMENTS = 256
+_parsed_queue_environments: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+_parsed_queue_environments_lock = threading.Lock()
+
+
+def _load_queue_environment_template(template: str) -> Any:
+    return yaml.load(template, Loader=_YAML_SAFE_LOADER)
+
+
+def _parse_queue_environment(queue_env_response: dict[str, Any]) -> dict[str, Any]:
+    """
+    Returns the priority and the validated parameter definitions of a queue environment
+    from its deadline:GetQueueEnvironment response.
+    """
+    memo_key: Optional[tuple[str, str]] = None
+    version = _get_resource_version(queue_env_response)
+    if version is not None:
+        memo_key = (queue_env_response["queueEnvironmentId"], version)
+        with _parsed_queue_environments_lock:
+            parsed_queue_env = _parsed_queue_environments.get(memo_key)
+            if parsed_queue_env is not None:
+                _parsed_queue_environments.move_to_end(memo_key)
+                return copy.deepcopy(parsed_queue_env)
+
+    template = _load_queue_environment_template(queue_env_response["template"])
+    parameters: list[JobParameter] = []
+    for parameter in template.get("parameterDefinitions", []):
+        parameter = validate_job_parameter(parameter, type_required=True, default_required=True)
+
+        # If there is no group label, set it to the name of the Queue Environment
+        if not parameter.get("userInterface", {}).get("groupLabel"):
+            if "userInterface" not in parameter:
+                parameter["userInterface"] = {
+                    "control": get_ui_control_for_parameter_definition(parameter)
+                }
+            parameter["userInterface"][
+                "groupLabel"
+            ] = f"Queue Environment: {template['environment']['name']}"
+        parameters.append(parameter)
+    parsed_queue_env = {"priority": queue_env_response["priority"], "parameters": parameters}
+
+    if memo_key is not None:
+        with _parsed_queue_environments_lock:
+            _parsed_queue_environments[memo_key] = copy.deepcopy(parsed_queue_env)
+            while len(_parsed_queue_environments) > _MAX_PARSED_QUEUE_ENVIRONMENTS:
+                _parsed_queue_environments.popitem(last=False)
+    return parsed_queue_env
+
 
 def get_queue_parameter_definitions(
     *, farmId: str, queueId: str, config=None
@@ -22,44 +87,50 @@ def get_queue_parameter_definitions(
     """
     This gets all the queue parameters definitions from the specified Queue. It does so
     by getting all the full templates for queue environments, and then combining
-    them equivalently to the Deadline Cloud service logic.
+    them equivalently to the Deadline Cloud service logic. The queue environments are
+    fetched concurrently, and cached locally for the time in the
+    "settings.metadata_cache_ttl_seconds" setting.
     """
     deadline = get_boto3_client("deadline", config=config)
-    response = _call_paginated_deadline_list_api(
-        deadline.list_queue_environments,
-        "environments",
-        farmId=farmId,
-        queueId=queueId,
-    )
-    queue_environments = sorted(
-        (
-            deadline.get_queue_environment(
+    with open_metadata_cache(deadline, config) as cache:
+        response = cache.get(
+            f"queue-environments/{farmId}/{queueId}",
+            lambda: _call_paginated_deadline_list_api(
+                deadline.list_queue_environments,
+                "environments",
                 farmId=farmId,
                 queueId=queueId,
-                queueEnvironmentId=queue_env["queueEnvironmentId"],
+            ),
+        )
+
+        # Cache the parameter definitions of each queue environment, which only need parsing
+        # again when the queue environment was updated.
+        def get_queue_environment(queue_env_id: str) -> dict[str, Any]:
+            return cache.get_derived(
+                f"queue-environment-parameters/{farmId}/{queueId}/{queue_env_id}",
+                lambda: deadline.get_queue_environment(
+                    farmId=farmId, queueId=queueId, queueEnvironmentId=queue_env_id
+                ),
+                _parse_queue_environment,
             )
-            for queue_env in response["environments"]
-        ),
-        key=lambda queue_env: queue_env["priority"],
-    )
-    queue_environment_templates = [
-        yaml.safe_load(queue_env["template"]) for queue_env in queue_environments
-    ]
+
+        queue_env_ids = [queue_env["queueEnvironmentId"] for queue_env in response["environments"]]
+        if len(queue_env_ids) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(len(queue_env_ids), _MAX_QUEUE_ENVIRONMENT_WORKERS)
+            ) as executor:
+                # The results are in the order of the ids, so the first error raised is
+                # the same as when getting them one after the other.
+                queue_environments = list(executor.map(get_queue_environment, queue_env_ids))
+        else:
+            queue_environments = [
+                get_queue_environment(queue_env_id) for queue_env_id in queue_env_ids
+            ]
+    queue_environments.sort(key=lambda queue_env: queue_env["priority"])
 
     queue_parameters_definitions: dict[str, JobParameter] = {}
-    for template in queue_environment_templates:
-        for parameter in template.get("parameterDefinitions", []):
-            parameter = validate_job_parameter(parameter, type_required=True, default_required=True)
-
-            # If there is no group label, set it to the name of the Queue Environment
-            if not parameter.get("userInterface", {}).get("groupLabel"):
-                if "userInterface" not in parameter:
-                    parameter["userInterface"] = {
-                        "control": get_ui_control_for_parameter_definition(parameter)
-                    }
-                parameter["userInterface"][
-                    "groupLabel"
-                ] = f"Queue Environment: {template['environment']['name']}"
+    for queue_env in queue_environments:
+        for parameter in queue_env["parameters"]:
             existing_parameter = queue_parameters_definitions.get(parameter["name"])
             if existing_parameter:
                 differences = parameter_definition_difference(existing_parameter, parameter)
@@ -7,11 +7,14 @@ of the Deadline-configured IAM credentials.
 from __future__ import annotations
 
 import logging
+import os
+import threading
+import weakref
 from configparser import ConfigParser
 from contextlib import contextmanager
 from enum import Enum
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Optional
 
 import boto3  # type: ignore[import]
 import botocore
@@ -21,11 +24,16 @@ from botocore.exceptions import (  # type: ignore[import]
     ClientError,
     ProfileNotFound,
 )
+from botocore.loaders import Loader
 from botocore.session import get_session as get_botocore_session
 
 from .. import version
 from ..config import get_setting
 from ..exceptions import DeadlineOperationError
+from ...job_attachments._aws.aws_clients import set_account_id_cache
+from ._queue_credential_cache import QueueCredentialCache
+
+logger = logging.getLogger(__name__)
 
 
 class AwsCredentialsSource(Enum):
@@ -43,6 +51,32 @@ class AwsAuthenticationStatus(Enum):
 # Place for stashing context to be attached to boto clients.
 session_context: dict[str, Optional[str]] = {"submitter-name": None}
 
+# Creating a client loads and parses the service model, which takes tens of milliseconds, so the
+# clients returned by get_boto3_client are cached for each session. The cache is keyed weakly by
+# the session, so that it doesn't keep sessions alive.
+_boto3_client_cache: weakref.WeakKeyDictionary[boto3.Session, dict[tuple, BaseClient]] = (
+    weakref.WeakKeyDictionary()
+)
+# The loader of service models and endpoints data, shared by the botocore sessions created here, so
+# that the data is loaded and parsed once for all of them instead of once per session.
+_shared_data_loader: Optional[Loader] = None
+_cache_lock = threading.Lock()
+
+
+def _share_data_loader(botocore_session: Any) -> None:
+    """
+    Makes the given botocore session use the shared loader of service models, or makes its loader
+    the shared one if there isn't one yet.
+    """
+    global _shared_data_loader
+    with _cache_lock:
+        if _shared_data_loader is None:
+            loader = botocore_session.get_component("data_loader")
+            if isinstance(loader, Loader):
+                _shared_data_loader = loader
+        else:
+            botocore_session.register_component("data_loader", _shared_data_loader)
+
 
 def get_boto3_session(
     force_refresh: bool = False, config: Optional[ConfigParser] = None
@@ -76,6 +110,7 @@ def get_boto3_session(
 @lru_cache
 def _get_boto3_session_for_profile(profile_name: str):
     session = boto3.Session(profile_name=profile_name)
+    _share_data_loader(session._session)
 
     # By default, DCM returns creds that expire after 15 minutes, and boto3's RefreshableCredentials
     # class refreshes creds that are within 15 minutes of expiring, so credentials would never be reused.
@@ -100,8 +135,12 @@ def _get_boto3_session_for_profile(profile_name: str):
 
 
 def invalidate_boto3_session_cache() -> None:
+    global _shared_data_loader
     _get_boto3_session_for_profile.cache_clear()
     _get_queue_user_boto3_session.cache_clear()
+    with _cache_lock:
+        _boto3_client_cache.clear()
+        _shared_data_loader = None
 
 
 def get_default_client_config() -> botocore.config.Config:
@@ -122,13 +161,32 @@ def get_boto3_client(service_name: str, config: Optional[ConfigParser] = None) -
     If the client requested is `deadline`, it uses the AWS_ENDPOINT_URL_DEADLINE
     deadline endpoint url.
 
+    Clients are cached for each session, endpoint URL and client config, and are dropped
+    together with the session cache by `invalidate_boto3_session_cache`.
+
     Args:
         service_name (str): The AWS service to get the client for, e.g. "deadline".
         config (ConfigParser, optional): If provided, the AWS Deadline Cloud config to use.
     """
 
     session = get_boto3_session(config=config)
-    return session.client(service_name, config=get_default_client_config())
+    client_config = get_default_client_config()
+    env_service_name = service_name.upper().replace("-", "_")
+    cache_key = (
+        service_name,
+        os.environ.get(f"AWS_ENDPOINT_URL_{env_service_name}"),
+        os.environ.get("AWS_ENDPOINT_URL"),
+        # The default client config only varies by its user agent.
+        client_config.user_agent_extra,
+    )
+
+    with _cache_lock:
+        session_clients = _boto3_client_cache.setdefault(session, {})
+        client = session_clients.get(cache_key)
+        if client is None:
+            client = session.client(service_name, config=client_config)
+            session_clients[cache_key] = client
+    return client
 
 
 def get_credentials_source(config: Optional[ConfigParser] = None) -> AwsCredentialsSource:
@@ -220,25 +278,43 @@ def _get_queue_user_boto3_session(
     queue_id: str,
     queue_display_name: Optional[str] = None,
 ):
+    # Share the queue role credentials and account ID with other processes using the same
+    # AWS credentials and queue, like repeated CLI commands.
+    credential_cache: Optional[QueueCredentialCache] = None
+    base_credentials = base_session.get_credentials()
+    if base_credentials is not None:
+        credential_cache = QueueCredentialCache(
+            base_session.profile_name,
+            farm_id,
+            queue_id,
+            base_access_key_id=base_credentials.access_key,
+            endpoint_url=deadline.meta.endpoint_url,
+            region_name=deadline.meta.region_name,
+        )
     queue_credential_provider = QueueUserCredentialProvider(
         deadline,
         farm_id,
         queue_id,
         queue_display_name,
+        credential_cache=credential_cache,
     )
 
     botocore_session = get_botocore_session()
+    _share_data_loader(botocore_session)
     credential_provider = botocore_session.get_component("credential_provider")
     credential_provider.insert_before("env", queue_credential_provider)
     aws_profile_name: Optional[str] = None
     if base_session.profile_name != "default":
         aws_profile_name = base_session.profile_name
 
-    return boto3.Session(
+    queue_session = boto3.Session(
         botocore_session=botocore_session,
         profile_name=aws_profile_name,
         region_name=base_session.region_name,
     )
+    if credential_cache is not None:
+        set_account_id_cache(queue_session, credential_cache)
+    return queue_session
 
 
 @contextmanager
@@ -297,6 +373,7 @@ class QueueUserCredentialProvider(CredentialProvider):
     farm_id: str
     queue_id: str
     queue_display_name_or_id: Optional[str]
+    credential_cache: Optional[QueueCredentialCache]
 
     def __init__(
         self,
@@ -304,20 +381,40 @@ class QueueUserCredentialProvider(CredentialProvider):
         farm_id: str,
         queue_id: str,
         queue_display_name: Optional[str] = None,
+        credential_cache: Optional[QueueCredentialCache] = None,
     ):
         self.deadline = deadline
         self.farm_id = farm_id
         self.queue_id = queue_id
         self.queue_display_name_or_id = queue_display_name or queue_id
+        self.credential_cache = credential_cache
 
     def load(self):
-        credentials = self._get_queue_credentials()
+        credentials = self._load_queue_credentials()
         return RefreshableCredentials.create_from_metadata(
             metadata=credentials,
-            refresh_using=self._get_queue_credentials,
+            refresh_using=self._load_queue_credentials,
             method=self.METHOD,
         )
 
+    def _load_queue_credentials(self):
+        """
+        Returns the cached credentials if there are any that aren't about to expire,
+        otherwise fetches new credentials and caches them.
+        """
+        if self.credential_cache is not None:
+            credentials = self.credential_cache.load_credentials()
+            if credentials is not None:
+                logger.debug(
+                    f"Using cached credentials for Queue '{self.queue_display_name_or_id}'"
+                )
+                return credentials
+
+        credentials = self._get_queue_credentials()
+        if self.credential_cache is not None:
+            self.credential_cache.save_credentials(credentials)
+        return credentials
+
     def _get_queue_credentials(self):
         """
         Fetches or refreshes the credentials using the AssumeQueueRoleForUser API
@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Runs the independent steps of an operation, like the preparation of a job submission,
+concurrently while keeping track of how long each one took.
+"""
+from __future__ import annotations
+
+__all__ = ["StageGraph"]
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class StageGraph:
+    """
+    A graph of named stages that run on a thread pool. Each stage starts as soon as the
+    stages it depends on are done, and receives their results as positional arguments.
+    Call result() to get the result of a stage, which raises the exception the stage raised,
+    so that the caller sees the same errors as if it had run the stages one after the other.
+
+    Stages must be added after the stages they depend on. This class is intended to always
+    be used with a context manager, which waits for all the stages when it exits. If it
+    exits with an exception, the stages that haven't started yet are canceled.
+
+    Example:
+        with StageGraph() as stages:
+            stages.add_stage("get_queue", lambda: deadline.get_queue(...))
+            stages.add_stage("get_fleets", get_fleets, depends_on=["get_queue"])
+            queue = stages.result("get_queue")
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures: Dict[str, Future] = {}
+        self.timings: Dict[str, float] = {}
+        """The time in seconds that each finished stage took, not including waiting on its dependencies."""
+
+    def __enter__(self) -> StageGraph:
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        if exc_type is not None:
+            for future in self._futures.values():
+                future.cancel()
+        self._executor.shutdown(wait=True)
+        if self.timings:
+            logger.debug(
+                "Stage timings: "
+                + ", ".join(f"{name}={seconds:.3f}s" for name, seconds in self.timings.items())
+            )
+
+    def add_stage(
+        self, name: str, func: Callable[..., Any], depends_on: Sequence[str] = ()
+    ) -> None:
+        """
+        Adds a stage that calls func with the results of the depends_on stages, and starts it.
+        """
+        if name in self._futures:
+            raise ValueError(f"A stage named {name!r} was already added.")
+        missing_stages = [
+            dependency for dependency in depends_on if dependency not in self._futures
+        ]
+        if missing_stages:
+            raise ValueError(
+                f"The stage {name!r} depends on stages that weren't added: {', '.join(missing_stages)}"
+            )
+        # Because every dependency was submitted to the executor earlier, it has already been picked
+        # up by a worker by the time this stage runs and waits on it.
+        dependencies = [self._futures[dependency] for dependency in depends_on]
+
+        def run_stage() -> Any:
+            args = [dependency.result() for dependency in dependencies]
+            start_time = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.timings[name] = time.perf_counter() - start_time
+
+        self._futures[name] = self._executor.submit(run_stage)
+
+    def result(self, name: str) -> Any:
+        """
+        Waits for the stage to finish and returns its result, or raises its exception.
+        """
+        return self._futures[name].result()
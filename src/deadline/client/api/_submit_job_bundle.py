@@ -7,19 +7,19 @@ from __future__ import annotations
 
 import json
 import logging
-import time
 import os
 import textwrap
 from configparser import ConfigParser
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import boto3
 from botocore.client import BaseClient
 
 from deadline.client.api._job_attachment import _hash_attachments  # type: ignore[import]
 
 from .. import api
-from ..exceptions import DeadlineOperationError, CreateJobWaiterCanceled
-from ..config import get_setting, set_setting, config_file
+from ..exceptions import DeadlineOperationError, CreateJobWaiterCanceled, JobWaiterCanceled
+from ..config import set_setting, config_file
 from ..job_bundle import deadline_yaml_dump
 from ..job_bundle.loader import (
     read_yaml_or_json,
@@ -34,6 +34,7 @@ from ..job_bundle.parameters import (
     JobParameter,
 )
 from ..job_bundle.submission import AssetReferences, split_parameter_args
+from ...job_attachments._aws.aws_clients import get_account_id
 from ...job_attachments.exceptions import MisconfiguredInputsError
 from ...job_attachments.models import (
     JobAttachmentsFileSystem,
@@ -43,10 +44,16 @@ from ...job_attachments.models import (
 )
 from ...job_attachments.progress_tracker import ProgressReportMetadata
 from ...job_attachments.upload import S3AssetManager
+from ._job_waiter import JobWaiterBackoff, get_job_lifecycle_status, wait_for_jobs
 from ._session import session_context
+from ._stage_graph import StageGraph
 
 logger = logging.getLogger(__name__)
 
+# Jobs are usually created in under a second, so the first checks are frequent.
+CREATE_JOB_WAITER_BACKOFF = JobWaiterBackoff(initial_delay=0.25, max_delay=5.0)
+CREATE_JOB_WAITER_TIMEOUT_SECONDS = 300
+
 
 def create_job_from_job_bundle(
     job_bundle_dir: str,
@@ -158,118 +165,192 @@ def create_job_from_job_bundle(
         else:
             file_contents = json.dumps(template_obj)
 
+    # Resolve the settings once for the whole submission, including the job attachments transfer.
+    config_snapshot = (
+        config_file.get_config_snapshot()
+        if config is None
+        else config_file.ConfigSnapshot.from_config(config)
+    )
+
     deadline = api.get_boto3_client("deadline", config=config)
-    queue_id = get_setting("defaults.queue_id", config=config)
-    farm_id = get_setting("defaults.farm_id", config=config)
+    queue_id = config_snapshot.get_setting("defaults.queue_id")
+    farm_id = config_snapshot.get_setting("defaults.farm_id")
 
     if job_attachments_file_system is None:
-        job_attachments_file_system = get_setting(
-            "defaults.job_attachments_file_system", config=config
+        job_attachments_file_system = config_snapshot.get_setting(
+            "defaults.job_attachments_file_system"
         )
 
-    queue = deadline.get_queue(
-        farmId=farm_id,
-        queueId=queue_id,
-    )
-    print_function_callback(f"Submitting to Queue: {queue['displayName']}")
-
-    create_job_args: Dict[str, Any] = {
-        "farmId": farm_id,
-        "queueId": queue_id,
-        "template": file_contents,
-        "templateType": file_type,
-        "priority": 50,
-    }
+    storage_profile_id = config_snapshot.get_setting("settings.storage_profile_id")
 
-    storage_profile_id = get_setting("settings.storage_profile_id", config=config)
-    storage_profile = None
-    if storage_profile_id:
-        create_job_args["storageProfileId"] = storage_profile_id
-        storage_profile = api.get_storage_profile_for_queue(
-            farm_id, queue_id, storage_profile_id, deadline
+    # Most of the preparation steps don't depend on each other, so they run concurrently.
+    # Their results are taken in the order the steps used to run, so that errors are the same.
+    with StageGraph() as stages:
+        stages.add_stage(
+            "get_queue", lambda: api.get_queue(farm_id, queue_id, deadline, config=config)
+        )
+        if storage_profile_id:
+            stages.add_stage(
+                "get_storage_profile_for_queue",
+                lambda: api.get_storage_profile_for_queue(
+                    farm_id, queue_id, storage_profile_id, deadline
+                ),
+            )
+        stages.add_stage(
+            "read_job_bundle_parameters", lambda: read_job_bundle_parameters(job_bundle_dir)
         )
+        stages.add_stage(
+            "read_asset_references",
+            lambda: read_yaml_or_json_object(job_bundle_dir, "asset_references", required=False),
+        )
+        if queue_parameter_definitions is None:
+            stages.add_stage(
+                "get_queue_parameter_definitions",
+                lambda: api.get_queue_parameter_definitions(farmId=farm_id, queueId=queue_id),
+            )
 
-    # The job parameters
-    job_bundle_parameters = read_job_bundle_parameters(job_bundle_dir)
+        def list_input_directories(
+            queue: dict[str, Any], asset_references_obj: Optional[dict[str, Any]]
+        ) -> dict[str, Optional[list[str]]]:
+            if "jobAttachmentSettings" not in queue:
+                return {}
+            return {
+                directory: _list_input_directory(directory)
+                for directory in AssetReferences.from_dict(asset_references_obj).input_directories
+            }
 
-    asset_references_obj = read_yaml_or_json_object(
-        job_bundle_dir, "asset_references", required=False
-    )
-    asset_references = AssetReferences.from_dict(asset_references_obj)
+        stages.add_stage(
+            "list_input_directories",
+            list_input_directories,
+            depends_on=["get_queue", "read_asset_references"],
+        )
 
-    if queue_parameter_definitions is None:
-        queue_parameter_definitions = api.get_queue_parameter_definitions(
-            farmId=farm_id, queueId=queue_id
+        def get_queue_role_session(
+            queue: dict[str, Any], asset_references_obj: Optional[dict[str, Any]]
+        ) -> Optional[boto3.Session]:
+            if "jobAttachmentSettings" not in queue or not AssetReferences.from_dict(
+                asset_references_obj
+            ):
+                return None
+            queue_role_session = api.get_queue_user_boto3_session(
+                deadline=deadline,
+                config=config,
+                farm_id=farm_id,
+                queue_id=queue_id,
+                queue_display_name=queue["displayName"],
+            )
+            # Assuming the queue role and getting its account ID are otherwise done when the
+            # upload starts. If they fail here, they fail again with the same error at that point.
+            try:
+                get_account_id(session=queue_role_session)
+            except Exception as e:
+                logger.debug(f"Could not get the account ID of the queue role ahead of time: {e}")
+            return queue_role_session
+
+        stages.add_stage(
+            "get_queue_user_boto3_session",
+            get_queue_role_session,
+            depends_on=["get_queue", "read_asset_references"],
         )
 
-    parameters = merge_queue_job_parameters(
-        queue_id=queue_id,
-        job_parameters=job_bundle_parameters,
-        queue_parameters=queue_parameter_definitions,
-    )
+        queue = stages.result("get_queue")
+        print_function_callback(f"Submitting to Queue: {queue['displayName']}")
 
-    apply_job_parameters(
-        job_parameters,
-        job_bundle_dir,
-        parameters,
-        asset_references,
-    )
-    app_parameters_formatted, job_parameters_formatted = split_parameter_args(
-        parameters, job_bundle_dir
-    )
+        create_job_args: Dict[str, Any] = {
+            "farmId": farm_id,
+            "queueId": queue_id,
+            "template": file_contents,
+            "templateType": file_type,
+            "priority": 50,
+        }
 
-    # Hash and upload job attachments if there are any
-    if asset_references and "jobAttachmentSettings" in queue:
-        # Extend input_filenames with all the files in the input_directories
-        missing_directories: set[str] = set()
-        for directory in asset_references.input_directories:
-            if not os.path.isdir(directory):
-                if require_paths_exist:
-                    missing_directories.add(directory)
+        storage_profile = None
+        if storage_profile_id:
+            create_job_args["storageProfileId"] = storage_profile_id
+            storage_profile = stages.result("get_storage_profile_for_queue")
+
+        # The job parameters
+        job_bundle_parameters = stages.result("read_job_bundle_parameters")
+
+        asset_references = AssetReferences.from_dict(stages.result("read_asset_references"))
+
+        if queue_parameter_definitions is None:
+            queue_parameter_definitions = stages.result("get_queue_parameter_definitions")
+
+        parameters = merge_queue_job_parameters(
+            queue_id=queue_id,
+            job_parameters=job_bundle_parameters,
+            queue_parameters=queue_parameter_definitions,
+        )
+
+        apply_job_parameters(
+            job_parameters,
+            job_bundle_dir,
+            parameters,
+            asset_references,
+        )
+        app_parameters_formatted, job_parameters_formatted = split_parameter_args(
+            parameters, job_bundle_dir
+        )
+
+        uses_job_attachments = bool(asset_references) and "jobAttachmentSettings" in queue
+        if uses_job_attachments:
+            # Extend input_filenames with all the files in the input_directories. The job
+            # parameters can add input directories that weren't listed ahead of time.
+            listed_input_directories = stages.result("list_input_directories")
+            missing_directories: set[str] = set()
+            for directory in asset_references.input_directories:
+                if directory in listed_input_directories:
+                    directory_files = listed_input_directories[directory]
                 else:
-                    logger.warning(
-                        f"Input path '{directory}' does not exist. Adding to referenced paths."
+                    directory_files = _list_input_directory(directory)
+                if directory_files is None:
+                    if require_paths_exist:
+                        missing_directories.add(directory)
+                    else:
+                        logger.warning(
+                            f"Input path '{directory}' does not exist. Adding to referenced paths."
+                        )
+                        asset_references.referenced_paths.add(directory)
+                    continue
+
+                # Empty directories just become references since there's nothing to upload
+                if not directory_files:
+                    logger.info(
+                        f"Input directory '{directory}' is empty. Adding to referenced paths."
                     )
                     asset_references.referenced_paths.add(directory)
-                continue
-
-            is_dir_empty = True
-            for root, _, files in os.walk(directory):
-                if not files:
-                    continue
-                is_dir_empty = False
-                asset_references.input_filenames.update(
-                    os.path.normpath(os.path.join(root, file)) for file in files
+                asset_references.input_filenames.update(directory_files)
+            asset_references.input_directories.clear()
+
+            if missing_directories:
+                all_missing_directories = "\n\t".join(sorted(list(missing_directories)))
+                misconfigured_directories_msg = (
+                    "Job submission contains misconfigured input directories and cannot be submitted."
+                    " All input directories must exist."
+                    f"\nNon-existent directories:\n\t{all_missing_directories}"
                 )
-            # Empty directories just become references since there's nothing to upload
-            if is_dir_empty:
-                logger.info(f"Input directory '{directory}' is empty. Adding to referenced paths.")
-                asset_references.referenced_paths.add(directory)
-        asset_references.input_directories.clear()
-
-        if missing_directories:
-            all_missing_directories = "\n\t".join(sorted(list(missing_directories)))
-            misconfigured_directories_msg = (
-                "Job submission contains misconfigured input directories and cannot be submitted."
-                " All input directories must exist."
-                f"\nNon-existent directories:\n\t{all_missing_directories}"
-            )
 
-            raise MisconfiguredInputsError(misconfigured_directories_msg)
+                raise MisconfiguredInputsError(misconfigured_directories_msg)
 
-        queue_role_session = api.get_queue_user_boto3_session(
-            deadline=deadline,
-            config=config,
-            farm_id=farm_id,
-            queue_id=queue_id,
-            queue_display_name=queue["displayName"],
-        )
+            queue_role_session = stages.result("get_queue_user_boto3_session")
+            if queue_role_session is None:
+                queue_role_session = api.get_queue_user_boto3_session(
+                    deadline=deadline,
+                    config=config,
+                    farm_id=farm_id,
+                    queue_id=queue_id,
+                    queue_display_name=queue["displayName"],
+                )
 
+    # Hash and upload job attachments if there are any
+    if uses_job_attachments:
         asset_manager = S3AssetManager(
             farm_id=farm_id,
             queue_id=queue_id,
             job_attachment_settings=JobAttachmentS3Settings(**queue["jobAttachmentSettings"]),
             session=queue_role_session,
+            config=config_snapshot,
         )
 
         upload_group = asset_manager.prepare_paths_for_upload(
@@ -363,6 +444,20 @@ def create_job_from_job_bundle(
         raise DeadlineOperationError("CreateJob response was empty, or did not contain a Job ID.")
 
 
+def _list_input_directory(directory: str) -> Optional[List[str]]:
+    """
+    Returns the paths of all the files in the directory and its subdirectories,
+    or None if the directory doesn't exist.
+    """
+    if not os.path.isdir(directory):
+        return None
+    return [
+        os.path.normpath(os.path.join(root, file))
+        for root, _, files in os.walk(directory)
+        for file in files
+    ]
+
+
 def wait_for_create_job_to_complete(
     farm_id: str,
     queue_id: str,
@@ -371,37 +466,35 @@ def wait_for_create_job_to_complete(
     continue_callback: Callable,
 ) -> Tuple[bool, str]:
     """
-    Wait until a job exits the CREATE_IN_PROGRESS state.
+    Wait until a job exits the CREATE_IN_PROGRESS state. The job is checked right away,
+    and then with exponentially increasing delays.
     """
 
-    delay_sec = 5  # Time to wait between checks in seconds.
-    max_attempts = 60
     creating_statuses = {
         "CREATE_IN_PROGRESS",
     }
     failure_statuses = {"CREATE_FAILED"}
 
-    for attempt in range(max_attempts):
-        logger.debug(
-            f"Waiting for creation of {job_id} to complete...attempt {attempt} of {max_attempts}"
+    try:
+        jobs = wait_for_jobs(
+            deadline_client,
+            farm_id,
+            queue_id,
+            [job_id],
+            is_done=lambda job: get_job_lifecycle_status(job) not in creating_statuses,
+            continue_callback=continue_callback,
+            backoff=CREATE_JOB_WAITER_BACKOFF,
+            max_wait_seconds=CREATE_JOB_WAITER_TIMEOUT_SECONDS,
         )
-
-        if not continue_callback():
-            raise CreateJobWaiterCanceled
-
-        job = deadline_client.get_job(jobId=job_id, queueId=queue_id, farmId=farm_id)
-
-        current_status = job["lifecycleStatus"] if "lifecycleStatus" in job else job["state"]
-        if current_status in creating_statuses:
-            time.sleep(delay_sec)
-        elif current_status in failure_statuses:
-            return False, job["lifecycleStatusMessage"]
-        else:
-            return True, job["lifecycleStatusMessage"]
-
-    raise TimeoutError(
-        f"Timed out after {delay_sec * max_attempts} seconds while waiting for Job to be created: {job_id}"
-    )
+    except JobWaiterCanceled as e:
+        raise CreateJobWaiterCanceled from e
+    except TimeoutError as e:
+        raise TimeoutError(
+            f"Timed out after {CREATE_JOB_WAITER_TIMEOUT_SECONDS} seconds while waiting for Job to be created: {job_id}"
+        ) from e
+
+    job = jobs[job_id]
+    return get_job_lifecycle_status(job) not in failure_statuses, job["lifecycleStatusMessage"]
 
 
 @api.record_success_fail_telemetry_event(metric_name="cli_asset_upload")  # type: ignore
@@ -4,28 +4,35 @@
 The AWS Deadline Cloud CLI interface.
 """
 
+import importlib
 import logging
 from logging import getLogger
+from typing import Dict, List, Optional, Tuple
 
 import click
 
 from .. import version
 from ..config import get_setting, get_setting_default
-from ._common import _PROMPT_WHEN_COMPLETE
-from ._groups.bundle_group import cli_bundle
-from ._groups.config_group import cli_config
-from ._groups.auth_group import cli_auth
-from ._groups.farm_group import cli_farm
-from ._groups.fleet_group import cli_fleet
-from ._groups.handle_web_url_command import cli_handle_web_url
-from ._groups.job_group import cli_job
-from ._groups.queue_group import cli_queue
-from ._groups.worker_group import cli_worker
-from ._groups.attachment_group import cli_attachment
-from ._groups.manifest_group import cli_manifest
 
 logger = getLogger(__name__)
 
+# The CLI command groups, as (module, attribute) pairs relative to this package. A group's module is
+# only imported when the group is used, so that running one command doesn't pay for importing the
+# dependencies of all the others.
+_LAZY_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "bundle": ("._groups.bundle_group", "cli_bundle"),
+    "config": ("._groups.config_group", "cli_config"),
+    "auth": ("._groups.auth_group", "cli_auth"),
+    "farm": ("._groups.farm_group", "cli_farm"),
+    "fleet": ("._groups.fleet_group", "cli_fleet"),
+    "handle-web-url": ("._groups.handle_web_url_command", "cli_handle_web_url"),
+    "job": ("._groups.job_group", "cli_job"),
+    "queue": ("._groups.queue_group", "cli_queue"),
+    "worker": ("._groups.worker_group", "cli_worker"),
+    "attachment": ("._groups.attachment_group", "cli_attachment"),
+    "manifest": ("._groups.manifest_group", "cli_manifest"),
+}
+
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
 _DEADLINE_LOG_LEVELS = [
     "ERROR",
@@ -46,7 +53,27 @@ else:
     _CLI_DEFAULT_LOG_LEVEL = _SETTING_LOG_LEVEL
 
 
-@click.group(context_settings=CONTEXT_SETTINGS)
+class _LazyGroup(click.Group):
+    """
+    A click group that imports the modules of its lazy subcommands on first use.
+    """
+
+    def __init__(self, *args, lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attr_name = self.lazy_commands[cmd_name]
+            module = importlib.import_module(module_name, package=__package__)
+            self.add_command(getattr(module, attr_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=_LazyGroup, lazy_commands=_LAZY_COMMANDS, context_settings=CONTEXT_SETTINGS)
 @click.version_option(version=version, prog_name="deadline")
 @click.option(
     "--log-level",
@@ -60,6 +87,8 @@ def main(ctx: click.Context, log_level: str):
     The AWS Deadline Cloud CLI provides functionality to interact with the AWS Deadline Cloud
     service.
     """
+    from ._common import _PROMPT_WHEN_COMPLETE
+
     logging.basicConfig(level=log_level)
     if log_level == "DEBUG":
         logger.debug("Debug logging is on")
@@ -67,17 +96,3 @@ def main(ctx: click.Context, log_level: str):
     ctx.ensure_object(dict)
     # By default don't prompt when the operation is complete
     ctx.obj[_PROMPT_WHEN_COMPLETE] = False
-
-
-main.add_command(cli_bundle)
-main.add_command(cli_config)
-main.add_command(cli_auth)
-main.add_command(cli_farm)
-main.add_command(cli_fleet)
-main.add_command(cli_handle_web_url)
-main.add_command(cli_job)
-main.add_command(cli_queue)
-main.add_command(cli_worker)
-
-main.add_command(cli_attachment)
-main.add_command(cli_manifest)
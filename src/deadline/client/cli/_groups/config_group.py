@@ -89,3 +89,24 @@ def config_get(setting_name):
     Run `deadline config --help` to show available settings.
     """
     click.echo(config_file.get_setting(setting_name))
+
+
+@cli_config.command(name="clear-cache")
+@_handle_error
+def config_clear_cache():
+    """
+    Clears the locally cached AWS Deadline Cloud queue, queue environment and
+    storage profile details, queue role credentials, and job trace data, so that
+    they are fetched again on next use.
+
+    The time the details are cached for is the setting
+    `settings.metadata_cache_ttl_seconds`.
+    """
+    from ...api._job_trace import clear_job_trace_cache
+    from ...api._metadata_cache import clear_metadata_cache
+    from ...api._queue_credential_cache import clear_queue_credential_cache
+
+    clear_metadata_cache()
+    clear_queue_credential_cache()
+    clear_job_trace_cache()
+    click.echo("Cleared the AWS Deadline Cloud cache.")
@@ -5,6 +5,7 @@ All the `deadline job` commands.
 """
 
 from __future__ import annotations
+import contextlib
 import json
 import logging
 from configparser import ConfigParser
@@ -18,6 +19,17 @@ from typing import Any
 import click
 from botocore.exceptions import ClientError
 
+from deadline.client.api._job_trace import (
+    ChromeTraceWriter,
+    JobTraceCollector,
+    load_cached_job_trace_data,
+    save_job_trace_data,
+)
+from deadline.client.api._job_waiter import (
+    TERMINAL_TASK_RUN_STATUSES,
+    get_job_lifecycle_status,
+    wait_for_jobs,
+)
 from deadline.client.api._session import _modified_logging_level
 from deadline.job_attachments.download import OutputDownloader
 from deadline.job_attachments.models import (
@@ -224,6 +236,101 @@ def job_cancel(mark_as: str, yes: bool, **args):
     deadline.update_job(farmId=farm_id, queueId=queue_id, jobId=job_id, targetTaskRunStatus=mark_as)
 
 
+JOB_TASK_RUN_STATUSES = [
+    "PENDING",
+    "READY",
+    "ASSIGNED",
+    "STARTING",
+    "SCHEDULED",
+    "INTERRUPTING",
+    "RUNNING",
+    "SUSPENDED",
+    "CANCELED",
+    "FAILED",
+    "SUCCEEDED",
+    "NOT_COMPATIBLE",
+]
+
+
+@cli_job.command(name="wait")
+@click.option("--profile", help="The AWS profile to use.")
+@click.option("--farm-id", help="The farm to use.")
+@click.option("--queue-id", help="The queue to use.")
+@click.option(
+    "--job-id",
+    "job_ids",
+    multiple=True,
+    help="The job to wait for. Provide the option several times to wait for several jobs.",
+)
+@click.option(
+    "--until",
+    type=click.Choice(JOB_TASK_RUN_STATUSES, case_sensitive=False),
+    default="SUCCEEDED",
+    help="The task run status to wait for the jobs to reach.",
+)
+@click.option("--timeout", type=int, help="The maximum number of seconds to wait.")
+@_handle_error
+def job_wait(job_ids, until, timeout, **args):
+    """
+    Wait for jobs to reach a task run status, printing their status as it changes.
+
+    Waiting for a job stops early if the job reaches a status that it stays in,
+    like FAILED or CANCELED, or if its creation failed. If any job doesn't reach
+    the status, the command exits with an error.
+    """
+    # Get a temporary config object with the standard options handled
+    config = _apply_cli_options_to_config(
+        required_options={"farm_id", "queue_id", "job_id"},
+        job_id=job_ids[0] if job_ids else None,
+        **args,
+    )
+
+    farm_id = config_file.get_setting("defaults.farm_id", config=config)
+    queue_id = config_file.get_setting("defaults.queue_id", config=config)
+    if not job_ids:
+        job_ids = (config_file.get_setting("defaults.job_id", config=config),)
+
+    until = until.upper()
+
+    def is_done(job: dict[str, Any]) -> bool:
+        return (
+            job.get("taskRunStatus") == until
+            or job.get("taskRunStatus") in TERMINAL_TASK_RUN_STATUSES
+            or get_job_lifecycle_status(job) == "CREATE_FAILED"
+        )
+
+    def echo_job_status(job: dict[str, Any]) -> None:
+        timestamp = datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+        click.echo(
+            f"{timestamp}  {job['jobId']}  {get_job_lifecycle_status(job)}  {job.get('taskRunStatus', '')}"
+        )
+
+    deadline = api.get_boto3_client("deadline", config=config)
+    try:
+        jobs = wait_for_jobs(
+            deadline,
+            farm_id,
+            queue_id,
+            job_ids,
+            is_done=is_done,
+            on_status_change=echo_job_status,
+            max_wait_seconds=timeout,
+        )
+    except TimeoutError as e:
+        raise DeadlineOperationError(str(e)) from e
+
+    other_status_jobs = [job for job in jobs.values() if job.get("taskRunStatus") != until]
+    if other_status_jobs:
+        raise DeadlineOperationError(
+            f"{len(other_status_jobs)} of {len(jobs)} job(s) did not reach {until}:\n"
+            + "\n".join(
+                f"  {job['jobId']}: {get_job_lifecycle_status(job)} {job.get('taskRunStatus', '')}"
+                for job in other_status_jobs
+            )
+        )
+    click.echo(f"All {len(jobs)} job(s) reached {until}.")
+
+
 def _download_job_output(
     config: Optional[ConfigParser],
     farm_id: str,
@@ -275,15 +382,36 @@ def _download_job_output(
         for manifest in job_attachments_manifests:
             root_path_format_mapping[manifest["rootPath"]] = manifest["rootPathFormat"]
 
-    job_output_downloader = OutputDownloader(
-        s3_settings=JobAttachmentS3Settings(**queue["jobAttachmentSettings"]),
-        farm_id=farm_id,
-        queue_id=queue_id,
-        job_id=job_id,
-        step_id=step_id,
-        task_id=task_id,
-        session=queue_role_session,
-    )
+    def _create_output_downloader(
+        on_discovering_outputs: Optional[Callable[[ProgressReportMetadata], bool]] = None,
+    ) -> OutputDownloader:
+        return OutputDownloader(
+            s3_settings=JobAttachmentS3Settings(**queue["jobAttachmentSettings"]),
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_id=job_id,
+            step_id=step_id,
+            task_id=task_id,
+            session=queue_role_session,
+            on_discovering_outputs=on_discovering_outputs,
+        )
+
+    if not is_json_format:
+        # Note: click doesn't export the return type of progressbar(), so we suppress mypy warnings for
+        # not annotating the type of discovery_progress.
+        with click.progressbar(length=100, label="Discovering Outputs") as discovery_progress:  # type: ignore[var-annotated]
+
+            def _update_discovery_progress(discovery_metadata: ProgressReportMetadata) -> bool:
+                new_progress = int(discovery_metadata.progress) - discovery_progress.pos
+                if new_progress > 0:
+                    discovery_progress.update(new_progress)
+                return sigint_handler.continue_operation
+
+            job_output_downloader = _create_output_downloader(
+                on_discovering_outputs=_update_discovery_progress
+            )
+    else:
+        job_output_downloader = _create_output_downloader()
 
     output_paths_by_root = job_output_downloader.get_output_paths_by_root()
 
@@ -549,12 +677,18 @@ def _get_download_summary_message(
 
 def _get_conflicting_filenames(filenames_by_root: dict[str, list[str]]) -> list[str]:
     conflicting_filenames: list[str] = []
+    # Whether each parent directory exists, so that files under directories that don't exist
+    # yet (the common case for a fresh download) are skipped without a stat call per file.
+    existing_dirs: dict[str, bool] = {}
 
     for root, filenames in filenames_by_root.items():
         for filename in filenames:
-            abs_path = Path(root).joinpath(filename).resolve()
-            if abs_path.is_file():
-                conflicting_filenames.append(str(abs_path))
+            path = os.path.join(root, filename)
+            parent_dir = os.path.dirname(path)
+            if parent_dir not in existing_dirs:
+                existing_dirs[parent_dir] = os.path.isdir(parent_dir)
+            if existing_dirs[parent_dir] and os.path.isfile(path):
+                conflicting_filenames.append(str(Path(path).resolve()))
 
     return conflicting_filenames
 
@@ -677,6 +811,10 @@ def job_trace_schedule(verbose, trace_format, trace_file, **args):
     """
     EXPERIMENTAL - Generate statistics from a completed job.
 
+    The sessions, steps and tasks of a job whose tasks are all done are cached
+    locally, so running this command again, for example to write a trace file,
+    doesn't need to get them again.
+
     To visualize the trace output file when providing the options
     "--trace-format chrome --trace-file <output>.json", use
     the https://ui.perfetto.dev Tracing UI and choose "Open trace file".
@@ -699,89 +837,28 @@ def job_trace_schedule(verbose, trace_format, trace_file, **args):
     job = deadline.get_job(farmId=farm_id, queueId=queue_id, jobId=job_id)
     job.pop("ResponseMetadata", None)
 
-    click.echo("Getting all the sessions for the job...")
-    response = deadline.list_sessions(farmId=farm_id, queueId=queue_id, jobId=job_id)
-    while "nextToken" in response:
-        old_list = response["sessions"]
-        response = deadline.list_sessions(
-            farmId=farm_id, queueId=queue_id, jobId=job_id, nextToken=response["nextToken"]
-        )
-        response["sessions"] = old_list + response["sessions"]
-    response.pop("ResponseMetadata", None)
-
-    sessions = sorted(response["sessions"], key=lambda session: session["startedAt"])
-
-    click.echo("Getting all the session actions for the job...")
-    for session in sessions:
-        response = deadline.list_session_actions(
-            farmId=farm_id, queueId=queue_id, jobId=job_id, sessionId=session["sessionId"]
-        )
-        while "nextToken" in response:
-            old_list = response["sessionActions"]
-            response = deadline.list_session_actions(
-                farmId=farm_id,
-                queueId=queue_id,
-                jobId=job_id,
-                sessionId=session["sessionId"],
-                nextToken=response["nextToken"],
-            )
-            response["sessionActions"] = old_list + response["sessionActions"]
-        response.pop("ResponseMetadata", None)
+    sessions = load_cached_job_trace_data(farm_id, queue_id, job)
+    if sessions is not None:
+        click.echo("Using the cached sessions, steps and tasks for the job...")
+    else:
+        with JobTraceCollector(deadline, farm_id, queue_id, job_id) as collector:
+            click.echo("Getting all the sessions for the job...")
+            sessions = collector.list_sessions()
 
-        session["actions"] = response["sessionActions"]
+            with click.progressbar(  # type: ignore[var-annotated]
+                length=len(sessions), label="Getting all the session actions for the job..."
+            ) as progressbar:
+                collector.list_session_actions(sessions, lambda: progressbar.update(1))
 
-    # Cache steps and tasks by their id, to only get each once
-    steps: dict[str, Any] = {}
-    tasks: dict[str, Any] = {}
-
-    with click.progressbar(  # type: ignore[var-annotated]
-        length=len(sessions), label="Getting all the steps and tasks for the job..."
-    ) as progressbar:
-        for index, session in enumerate(sessions):
-            session["index"] = index
-            for action in session["actions"]:
-                step_id = action["definition"].get("taskRun", {}).get("stepId")
-                task_id = action["definition"].get("taskRun", {}).get("taskId")
-                if step_id and task_id:
-                    if "step" not in session:
-                        if step_id in steps:
-                            step = steps[step_id]
-                        else:
-                            step = deadline.get_step(
-                                farmId=farm_id, queueId=queue_id, jobId=job_id, stepId=step_id
-                            )
-                            step.pop("ResponseMetadata", None)
-                            steps[step_id] = step
-                        session["step"] = step
-                    elif session["step"]["stepId"] != step_id:
-                        # The session itself doesn't have a step id, but for now the scheduler always creates new
-                        # sessions for new steps.
-                        raise DeadlineOperationError(
-                            f"Session {session['sessionId']} ran more than one step! When this code was"
-                            " written that wasn't possible."
-                        )
-
-                    if task_id in tasks:
-                        task = tasks[task_id]
-                    else:
-                        task = deadline.get_task(
-                            farmId=farm_id,
-                            queueId=queue_id,
-                            jobId=job_id,
-                            stepId=step_id,
-                            taskId=task_id,
-                        )
-                        task.pop("ResponseMetadata", None)
-                        tasks[task_id] = task
-                    action["task"] = task
-            progressbar.update(1)
+            click.echo("Getting all the steps and tasks for the job...")
+            collector.add_steps_and_tasks(sessions)
+        save_job_trace_data(farm_id, queue_id, job, sessions)
 
     # Collect the worker IDs that ran the sessions, and give them indexes to act as PIDs in the tracing file
     worker_ids = {session["workerId"] for session in sessions}
     workers = {worker_id: index for index, worker_id in enumerate(worker_ids)}
 
     click.echo("Processing the trace data...")
-    trace_events = []
 
     started_at = job["startedAt"]
 
@@ -807,86 +884,111 @@ def job_trace_schedule(verbose, trace_format, trace_file, **args):
         "syncJobAttachmentsDuration": 0,
     }
 
-    for session in sessions:
-        accumulators["sessionCount"] += 1
-        accumulators["sessionDuration"] += duration_of(session)
-
-        pid = workers[session["workerId"]]
-        session_event_name = f"{session['step']['name']} - {session['index']}"
-        trace_events.append(
-            {
-                "name": session_event_name,
-                "cat": "SESSION",
-                "ph": "B",  # Begin Event
-                "ts": time_int(session["startedAt"]),
-                "pid": pid,
-                "tid": 0,
-                "args": {
-                    "sessionId": session["sessionId"],
-                    "workerId": session["workerId"],
-                    "fleetId": session["fleetId"],
-                    "lifecycleStatus": session["lifecycleStatus"],
-                },
-            }
-        )
+    with contextlib.ExitStack() as stack:
+        # Write the trace events as they are generated, instead of keeping them all in memory
+        trace_writer: Optional[ChromeTraceWriter] = None
+        if trace_file:
+            trace_writer = ChromeTraceWriter(
+                stack.enter_context(open(trace_file, "w", encoding="utf8"))
+            )
 
-        for action in session["actions"]:
-            accumulators["sessionActionCount"] += 1
-            accumulators["sessionActionDuration"] += duration_of(action)
+        def write_trace_event(event: dict[str, Any]) -> None:
+            if trace_writer:
+                trace_writer.write_event(event)
+
+        for session in sessions:
+            accumulators["sessionCount"] += 1
+            accumulators["sessionDuration"] += duration_of(session)
+
+            pid = workers[session["workerId"]]
+            session_event_name = f"{session['step']['name']} - {session['index']}"
+            write_trace_event(
+                {
+                    "name": session_event_name,
+                    "cat": "SESSION",
+                    "ph": "B",  # Begin Event
+                    "ts": time_int(session["startedAt"]),
+                    "pid": pid,
+                    "tid": 0,
+                    "args": {
+                        "sessionId": session["sessionId"],
+                        "workerId": session["workerId"],
+                        "fleetId": session["fleetId"],
+                        "lifecycleStatus": session["lifecycleStatus"],
+                    },
+                }
+            )
 
-            name = action["sessionActionId"]
-            action_type = list(action["definition"].keys())[0]
-            if action_type == "taskRun":
-                accumulators["taskRunCount"] += 1
-                accumulators["taskRunDuration"] += duration_of(action)
+            for action in session["actions"]:
+                accumulators["sessionActionCount"] += 1
+                accumulators["sessionActionDuration"] += duration_of(action)
+
+                name = action["sessionActionId"]
+                action_type = list(action["definition"].keys())[0]
+                if action_type == "taskRun":
+                    accumulators["taskRunCount"] += 1
+                    accumulators["taskRunDuration"] += duration_of(action)
+
+                    task = action["task"]
+                    parameters = task.get("parameters", {})
+                    name = ",".join(
+                        f"{param}={list(parameters[param].values())[0]}" for param in parameters
+                    )
+                    if not name:
+                        name = "<No Task Params>"
+                elif action_type in ("envEnter", "envExit"):
+                    accumulators["envActionCount"] += 1
+                    accumulators["envActionDuration"] += duration_of(action)
+
+                    name = action["definition"][action_type]["environmentId"].split(":")[-1]
+                elif action_type == "syncInputJobAttachments":
+                    accumulators["syncJobAttachmentsCount"] += 1
+                    accumulators["syncJobAttachmentsDuration"] += duration_of(action)
+
+                    if "stepId" in action["definition"][action_type]:
+                        name = "Sync Job Attchmnt (Dependencies)"
+                    else:
+                        name = "Sync Job Attchmnt (Submitted)"
+                if "startedAt" in action:
+                    write_trace_event(
+                        {
+                            "name": name,
+                            "cat": action_type,
+                            "ph": "X",  # Complete Event
+                            "ts": time_int(action["startedAt"]),
+                            "dur": duration_of(action),
+                            "pid": pid,
+                            "tid": 0,
+                            "args": {
+                                "sessionActionId": action["sessionActionId"],
+                                "status": action["status"],
+                                "stepName": session["step"]["name"],
+                            },
+                        }
+                    )
+            write_trace_event(
+                {
+                    "name": session_event_name,
+                    "cat": "SESSION",
+                    "ph": "E",  # End Event
+                    "ts": time_int(session["endedAt"]),
+                    "pid": pid,
+                    "tid": 0,
+                }
+            )
 
-                task = action["task"]
-                parameters = task.get("parameters", {})
-                name = ",".join(
-                    f"{param}={list(parameters[param].values())[0]}" for param in parameters
-                )
-                if not name:
-                    name = "<No Task Params>"
-            elif action_type in ("envEnter", "envExit"):
-                accumulators["envActionCount"] += 1
-                accumulators["envActionDuration"] += duration_of(action)
-
-                name = action["definition"][action_type]["environmentId"].split(":")[-1]
-            elif action_type == "syncInputJobAttachments":
-                accumulators["syncJobAttachmentsCount"] += 1
-                accumulators["syncJobAttachmentsDuration"] += duration_of(action)
-
-                if "stepId" in action["definition"][action_type]:
-                    name = "Sync Job Attchmnt (Dependencies)"
-                else:
-                    name = "Sync Job Attchmnt (Submitted)"
-            if "startedAt" in action:
-                trace_events.append(
-                    {
-                        "name": name,
-                        "cat": action_type,
-                        "ph": "X",  # Complete Event
-                        "ts": time_int(action["startedAt"]),
-                        "dur": duration_of(action),
-                        "pid": pid,
-                        "tid": 0,
-                        "args": {
-                            "sessionActionId": action["sessionActionId"],
-                            "status": action["status"],
-                            "stepName": session["step"]["name"],
-                        },
-                    }
-                )
-        trace_events.append(
-            {
-                "name": session_event_name,
-                "cat": "SESSION",
-                "ph": "E",  # End Event
-                "ts": time_int(session["endedAt"]),
-                "pid": pid,
-                "tid": 0,
+        if trace_writer:
+            other_data: dict[str, Any] = {
+                "farmId": farm_id,
+                "queueId": queue_id,
+                "jobId": job_id,
+                "jobName": job["name"],
+                "startedAt": job["startedAt"].isoformat(sep="T"),
             }
-        )
+            if "endedAt" in job:
+                other_data["endedAt"] = job["endedAt"].isoformat(sep="T")
+            other_data.update(accumulators)
+            trace_writer.close(other_data)
 
     if verbose:
         click.echo(" ==== TRACE DATA ====")
@@ -938,23 +1040,3 @@ def job_trace_schedule(verbose, trace_format, trace_file, **args):
     click.echo(
         f"Within-session Overhead Duration Per Action: {datetime.timedelta(microseconds=(accumulators['sessionDuration'] - accumulators['sessionActionDuration']) / accumulators['sessionActionCount'])}"
     )
-
-    tracing_data: dict[str, Any] = {
-        "traceEvents": trace_events,
-        # "displayTimeUnits": "s",
-        "otherData": {
-            "farmId": farm_id,
-            "queueId": queue_id,
-            "jobId": job_id,
-            "jobName": job["name"],
-            "startedAt": job["startedAt"].isoformat(sep="T"),
-        },
-    }
-    if "endedAt" in job:
-        tracing_data["otherData"]["endedAt"] = job["endedAt"].isoformat(sep="T")
-
-    tracing_data["otherData"].update(accumulators)
-
-    if trace_file:
-        with open(trace_file, "w", encoding="utf8") as f:
-            json.dump(tracing_data, f, indent=1)
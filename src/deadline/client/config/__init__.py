@@ -13,14 +13,27 @@ __all__ = [
     "set_setting",
     "get_best_profile_for_farm",
     "str2bool",
+    "ConfigSnapshot",
+    "get_config_snapshot",
     "DEFAULT_DEADLINE_ENDPOINT_URL",
 ]
 
+from typing import Any
+
+from . import config_file
 from .config_file import (
-    DEFAULT_DEADLINE_ENDPOINT_URL,
+    ConfigSnapshot,
     get_best_profile_for_farm,
+    get_config_snapshot,
     get_setting,
     get_setting_default,
     set_setting,
     str2bool,
 )
+
+
+def __getattr__(name: str) -> Any:
+    # DEFAULT_DEADLINE_ENDPOINT_URL is computed on first access, see config_file.
+    if name == "DEFAULT_DEADLINE_ENDPOINT_URL":
+        return config_file.DEFAULT_DEADLINE_ENDPOINT_URL
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,6 +10,8 @@ __all__ = [
     "set_setting",
     "get_best_profile_for_farm",
     "str2bool",
+    "ConfigSnapshot",
+    "get_config_snapshot",
 ]
 
 import getpass
@@ -17,11 +19,12 @@ import os
 import platform
 import subprocess
 from configparser import ConfigParser
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import tempfile
 
-import boto3
 from deadline.job_attachments.models import FileConflictResolution
 
 from ..exceptions import DeadlineOperationError
@@ -31,16 +34,28 @@ import re
 CONFIG_FILE_PATH = os.path.join("~", ".deadline", "config")
 # Environment variable that, if set, overrides the value of CONFIG_FILE_PATH
 CONFIG_FILE_PATH_ENV_VAR = "DEADLINE_CONFIG_FILE_PATH"
-# The default AWS Deadline Cloud endpoint URL
+# The default AWS Deadline Cloud endpoint URL, DEFAULT_DEADLINE_ENDPOINT_URL, is computed on first
+# access by __getattr__ below, so that reading the configuration doesn't import boto3.
 # Environment variable that, if set, overrides the value of DEFAULT_DEADLINE_ENDPOINT_URL
-DEFAULT_DEADLINE_ENDPOINT_URL = os.getenv(
-    "AWS_ENDPOINT_URL_DEADLINE", f"https://deadline.{boto3.Session().region_name}.amazonaws.com"
-)
+DEADLINE_ENDPOINT_URL_ENV_VAR = "AWS_ENDPOINT_URL_DEADLINE"
 
 # The default directory within which to save the history of created jobs.
 DEFAULT_JOB_HISTORY_DIR = os.path.join("~", ".deadline", "job_history", "{aws_profile_name}")
 DEFAULT_CACHE_DIR = os.path.join("~", ".deadline", "cache")
 
+
+def __getattr__(name: str) -> Any:
+    if name == "DEFAULT_DEADLINE_ENDPOINT_URL":
+        endpoint_url = os.getenv(DEADLINE_ENDPOINT_URL_ENV_VAR)
+        if endpoint_url is None:
+            import boto3
+
+            endpoint_url = f"https://deadline.{boto3.Session().region_name}.amazonaws.com"
+        globals()[name] = endpoint_url
+        return endpoint_url
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 _TRUE_VALUES = {"yes", "on", "true", "1"}
 _FALSE_VALUES = {"no", "off", "false", "0"}
 _BOOL_VALUES = _TRUE_VALUES | _FALSE_VALUES
@@ -48,6 +63,7 @@ _BOOL_VALUES = _TRUE_VALUES | _FALSE_VALUES
 __config = ConfigParser()
 __config_file_path = None
 __config_mtime = None
+__config_snapshot: Optional["ConfigSnapshot"] = None
 
 # This value defines the AWS Deadline Cloud settings structure. For each named setting,
 # it stores:
@@ -56,6 +72,7 @@ __config_mtime = None
 #             setting to embed the dependency value, e.g. default.farm_id goes in
 #             section [profile-{profileName} default]
 # "section_format" - How its value gets formatted into config file sections.
+# "type"    - The type of the value, if it's not a string. ConfigSnapshot converts the value to it.
 SETTINGS: Dict[str, Dict[str, Any]] = {
     "deadline-cloud-monitor.path": {
         "default": "",
@@ -97,6 +114,7 @@ SETTINGS: Dict[str, Dict[str, Any]] = {
     },
     "settings.auto_accept": {
         "default": "false",
+        "type": bool,
     },
     "settings.conflict_resolution": {
         "default": FileConflictResolution.NOT_SELECTED.name,
@@ -106,11 +124,12 @@ SETTINGS: Dict[str, Dict[str, Any]] = {
         "default": "WARNING",
         "description": "The logging level to use in the CLI and GUIs.",
     },
-    "telemetry.opt_out": {"default": "false"},
+    "telemetry.opt_out": {"default": "false", "type": bool},
     "telemetry.identifier": {"default": ""},
     "defaults.job_attachments_file_system": {"default": "COPIED", "depend": "defaults.farm_id"},
     "settings.s3_max_pool_connections": {
         "default": "50",
+        "type": int,
         "description": (
             "The maximum number of connections to keep in the connection pool used by the S3's upload/download operations. "
             "If this value is not set, the default value of 50 is used. "
@@ -119,11 +138,20 @@ SETTINGS: Dict[str, Dict[str, Any]] = {
     },
     "settings.small_file_threshold_multiplier": {
         "default": "20",  # By default, the small file threshold is 160 MB (since the default S3 multipart-upload chunk size is 8 MB.)
+        "type": int,
         "description": (
             "When uploading job attachments, the file size threshold is set to separate 'large' files from 'small' files so that 'large' files can be processed serially. "
             "This multiplier is used to calculate the size threshold. (Small files are defined as those smaller than or equal to the chunk size multiplied by this factor.)"
         ),
     },
+    "settings.metadata_cache_ttl_seconds": {
+        "default": "300",
+        "type": int,
+        "description": (
+            "How many seconds the queue, queue environment and storage profile details used for job submission are cached locally before they are fetched again. "
+            "Set to 0 to always fetch them. Run `deadline config clear-cache` to clear the cache."
+        ),
+    },
 }
 
 
@@ -181,6 +209,15 @@ def read_config() -> ConfigParser:
     return __config
 
 
+def _read_config_with_mtime() -> Tuple[ConfigParser, Optional[Path], Optional[float]]:
+    """
+    Reads the config like `read_config`, also returning the config file path and the
+    modification time it was read with.
+    """
+    config = read_config()
+    return config, __config_file_path, __config_mtime
+
+
 def _get_grant_args(principal: str, permissions: str) -> List[str]:
     return [
         "/grant",
@@ -287,6 +324,10 @@ def write_config(config: ConfigParser) -> None:
 
     os.replace(tmp_file_name, config_file_path)
 
+    # The settings changed, so the next snapshot has to be created from the new file.
+    global __config_snapshot
+    __config_snapshot = None
+
 
 def _get_setting_config(setting_name: str) -> dict:
     """
@@ -420,6 +461,116 @@ def set_setting(setting_name: str, value: str, config: Optional[ConfigParser] =
         write_config(config)
 
 
+def _parse_typed_setting(setting_name: str, value: str) -> Any:
+    """
+    Converts the value of a setting to the "type" of its setting config, if it has one.
+    Raises ValueError if the value is not valid for the type.
+    """
+    setting_type = SETTINGS[setting_name].get("type", str)
+    if setting_type is bool:
+        return str2bool(value)
+    return setting_type(value)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    An immutable view of all the AWS Deadline Cloud settings, resolved once from the
+    configuration. Create one per command or job submission with `get_config_snapshot()`
+    or `ConfigSnapshot.from_config()`, and pass it to the code that reads settings in a
+    loop or in frequently created objects, instead of calling `get_setting` each time.
+    """
+
+    settings: Mapping[str, str]
+    """The value of every setting in SETTINGS, as returned by `get_setting`."""
+    typed_settings: Mapping[str, Any]
+    """The values of the settings with a "type", converted to it. Values that aren't valid
+    for their type are left out, and raise an error when requested with `get_typed_setting`."""
+    config_file_path: Optional[Path] = None
+    """The config file the snapshot was read from, if it wasn't created from a ConfigParser."""
+    config_mtime: Optional[float] = None
+    """The modification time of the config file when the snapshot was read."""
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigParser] = None) -> "ConfigSnapshot":
+        """
+        Resolves all the settings from the provided config, or from the config file if it is None.
+        """
+        config_file_path: Optional[Path] = None
+        config_mtime: Optional[float] = None
+        if config is None:
+            config, config_file_path, config_mtime = _read_config_with_mtime()
+
+        settings: Dict[str, str] = {}
+        typed_settings: Dict[str, Any] = {}
+        for setting_name, setting_config in SETTINGS.items():
+            value = get_setting(setting_name, config=config)
+            settings[setting_name] = value
+            if "type" in setting_config:
+                try:
+                    typed_settings[setting_name] = _parse_typed_setting(setting_name, value)
+                except ValueError:
+                    pass
+
+        return cls(
+            settings=MappingProxyType(settings),
+            typed_settings=MappingProxyType(typed_settings),
+            config_file_path=config_file_path,
+            config_mtime=config_mtime,
+        )
+
+    def get_setting(self, setting_name: str) -> str:
+        """
+        Gets the value of the specified setting, like `get_setting` does.
+        """
+        try:
+            return self.settings[setting_name]
+        except KeyError:
+            # Raises the same error as get_setting for a setting that doesn't exist
+            _get_setting_config(setting_name)
+            raise
+
+    def get_typed_setting(self, setting_name: str) -> Any:
+        """
+        Gets the value of the specified setting converted to its type, e.g. an int for
+        `settings.s3_max_pool_connections`. Raises ValueError if the configured value
+        is not valid for the type.
+        """
+        if setting_name in self.typed_settings:
+            return self.typed_settings[setting_name]
+        return _parse_typed_setting(setting_name, self.get_setting(setting_name))
+
+    def is_stale(self) -> bool:
+        """
+        Returns True if the snapshot was read from a config file that was modified or replaced
+        since then. This only needs to stat the config file.
+        """
+        if self.config_file_path is None:
+            return False
+        config_file_path = get_config_file_path()
+        if config_file_path != self.config_file_path:
+            return True
+        try:
+            config_mtime: Optional[float] = config_file_path.stat().st_mtime
+        except FileNotFoundError:
+            config_mtime = None
+        return config_mtime != self.config_mtime
+
+
+def get_config_snapshot(refresh: bool = False) -> ConfigSnapshot:
+    """
+    Gets a snapshot of the settings in the config file. The snapshot is reused until
+    the config file changes, it is written with `write_config`, or refresh is True.
+    """
+    global __config_snapshot
+
+    snapshot = __config_snapshot
+    if refresh or snapshot is None or snapshot.is_stale():
+        snapshot = ConfigSnapshot.from_config()
+        __config_snapshot = snapshot
+    return snapshot
+
+
 def get_best_profile_for_farm(farm_id: str, queue_id: Optional[str] = None) -> str:
     """
     Finds the best AWS profile for the specified farm and queue IDs. Chooses
@@ -429,6 +580,8 @@ def get_best_profile_for_farm(farm_id: str, queue_id: Optional[str] = None) -> s
     3. AWS profiles whose default farm matches.
     4. If there were no matches, returns the default AWS profile.
     """
+    import boto3
+
     # Get the full list of AWS profiles
     session = boto3.Session()
     aws_profile_names = session._session.full_config["profiles"].keys()
@@ -13,6 +13,10 @@ class CreateJobWaiterCanceled(Exception):
     """Error for when the waiter on CreateJob is interrupted"""
 
 
+class JobWaiterCanceled(Exception):
+    """Error for when a waiter on the status of jobs is interrupted"""
+
+
 class UserInitiatedCancel(Exception):
     """Error for when the user requests cancelation"""
 
@@ -445,7 +445,7 @@ class SubmitJobToDeadlineDialog(QDialog):
                     farm_id, queue_id, storage_profile_id, deadline
                 )
 
-            queue = deadline.get_queue(farmId=farm_id, queueId=queue_id)
+            queue = api.get_queue(farm_id, queue_id, deadline)
 
             queue_role_session = api.get_queue_user_boto3_session(
                 deadline=deadline,
@@ -527,7 +527,7 @@ class DeadlineQueueDisplay(_DeadlineNamedResourceDisplay):
         queue_id = get_setting(self.setting_name)
         if farm_id and queue_id:
             deadline = api.get_boto3_client("deadline")
-            response = deadline.get_queue(farmId=farm_id, queueId=queue_id)
+            response = api.get_queue(farm_id, queue_id, deadline)
             return (response["queueId"], response["displayName"], response["description"])
         else:
             return ("", "", "")
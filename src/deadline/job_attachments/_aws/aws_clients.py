@@ -3,8 +3,9 @@
 """Functions for handling and retrieving AWS clients."""
 from __future__ import annotations
 
+import weakref
 from functools import lru_cache
-from typing import Optional
+from typing import Optional, Protocol
 
 import boto3
 import botocore
@@ -25,6 +26,19 @@ from .aws_config import (
 MAX_SIZE_CACHE = 128
 
 
+class AccountIdCache(Protocol):
+    """A store of the AWS account ID of a session's credentials, like an on-disk cache."""
+
+    def get_account_id(self) -> Optional[str]: ...
+
+    def set_account_id(self, account_id: str) -> None: ...
+
+
+_account_id_caches: "weakref.WeakKeyDictionary[boto3.session.Session, AccountIdCache]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 # Should create a new botocore session since botocore session may be modified by boto3 session/client using it
 # https://github.com/boto/boto3/blob/61de529b5f9a7bdcc8c76debb472a7f934d048e6/boto3/session.py#L79
 def get_botocore_session() -> botocore.session.Session:
@@ -86,9 +100,11 @@ def get_s3_client(session: Optional[boto3.Session] = None) -> BaseClient:
     return client
 
 
-def get_s3_max_pool_connections() -> int:
+def get_s3_max_pool_connections(config: Optional[config_file.ConfigSnapshot] = None) -> int:
+    if config is None:
+        config = config_file.get_config_snapshot()
     try:
-        s3_max_pool_connections = int(config_file.get_setting("settings.s3_max_pool_connections"))
+        s3_max_pool_connections = config.get_typed_setting("settings.s3_max_pool_connections")
     except ValueError as ve:
         raise AssetSyncError(
             "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers: "
@@ -128,8 +144,25 @@ def get_caller_identity(session: Optional[boto3.session.Session] = None) -> dict
     return get_sts_client(session).get_caller_identity()
 
 
+def set_account_id_cache(session: boto3.session.Session, cache: AccountIdCache) -> None:
+    """
+    Sets where get_account_id looks up and stores the account ID of the session before calling
+    STS, for sessions whose credentials are cached outside of this process.
+    """
+    _account_id_caches[session] = cache
+
+
 def get_account_id(session: Optional[boto3.session.Session] = None) -> str:
     """
     Get the account id for the current session.
     """
-    return get_caller_identity(session)["Account"]
+    cache = _account_id_caches.get(session) if session is not None else None
+    if cache is not None:
+        account_id = cache.get_account_id()
+        if account_id:
+            return account_id
+
+    account_id = get_caller_identity(session)["Account"]
+    if cache is not None:
+        cache.set_account_id(account_id)
+    return account_id
@@ -1,6 +1,4 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
-import concurrent.futures
-
 import logging
 import os
 from pathlib import Path, PurePosixPath
@@ -8,17 +6,18 @@ from typing import Dict, List, Tuple
 from deadline.client.cli._groups.click_logger import ClickLogger
 from deadline.client.config import config_file
 from deadline.client.exceptions import NonValidInputError
+from deadline.job_attachments._local_asset_manager import LocalAssetManager
+from deadline.job_attachments._utils import _bounded_imap_unordered
 from deadline.job_attachments.asset_manifests.base_manifest import (
     BaseAssetManifest,
     BaseManifestPath,
 )
 from deadline.job_attachments.caches.hash_cache import HashCache
 from deadline.job_attachments.models import AssetRootManifest, FileStatus, ManifestDiff
-from deadline.job_attachments.upload import S3AssetManager
 
 
 def diff_manifest(
-    asset_manager: S3AssetManager,
+    asset_manager: LocalAssetManager,
     asset_root_manifest: AssetRootManifest,
     manifest: str,
     update: bool,
@@ -51,7 +50,7 @@ def diff_manifest(
 
 
 def find_file_with_status(
-    asset_manager: S3AssetManager,
+    asset_manager: LocalAssetManager,
     input_paths: List[Path],
     root_path: str,
     update: bool,
@@ -64,24 +63,23 @@ def find_file_with_status(
     cache_config: str = config_file.get_cache_directory()
 
     with HashCache(cache_config) as hash_cache:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(
-                    asset_manager._process_input_path,
-                    path=path,
-                    root_path=root_path,
-                    hash_cache=hash_cache,
-                    update=update,
-                ): path
-                for path in input_paths
-            }
-            status_paths: List[tuple] = []
-            for future in concurrent.futures.as_completed(futures):
-                (file_status, _, manifestPath) = future.result()
-                if file_status in statuses:
-                    status_paths.append((file_status, manifestPath))
-
-            return status_paths
+
+        def process_input_path(path: Path) -> Tuple[FileStatus, int, BaseManifestPath]:
+            return asset_manager._process_input_path(
+                path=path,
+                root_path=root_path,
+                hash_cache=hash_cache,
+                update=update,
+            )
+
+        status_paths: List[tuple] = []
+        for _, (file_status, _, manifestPath) in _bounded_imap_unordered(
+            process_input_path, input_paths
+        ):
+            if file_status in statuses:
+                status_paths.append((file_status, manifestPath))
+
+        return status_paths
 
 
 def compare_manifest(
@@ -1,8 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 import json
+import re
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Pattern
 from deadline.client.exceptions import NonValidInputError
 from deadline.job_attachments.models import GlobConfig
 
@@ -70,3 +71,81 @@ def _glob_paths(
         exclude_files = list(filter(None, exclude_files))
         include_files = list(set(include_files) - set(exclude_files))
     return include_files  # type: ignore[return-value]
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translates a glob pattern for a POSIX-style relative path into a regular expression.
+    "*" and "?" never match across a "/", while "**" matches any number of directories.
+    """
+    pattern = pattern.replace("\\", "/")
+    while pattern.startswith("./"):
+        pattern = pattern[2:]
+
+    i, n = 0, len(pattern)
+    regex_parts: List[str] = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if i < n and pattern[i] == "/":
+                    # "**/" matches zero or more whole directories.
+                    i += 1
+                    regex_parts.append("(?:.*/)?")
+                else:
+                    regex_parts.append(".*")
+                continue
+            regex_parts.append("[^/]*")
+        elif c == "?":
+            regex_parts.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                regex_parts.append(re.escape(c))
+            else:
+                char_class = pattern[i + 1 : end]
+                if char_class.startswith("!"):
+                    char_class = "^" + char_class[1:]
+                regex_parts.append(f"[{char_class}]")
+                i = end + 1
+                continue
+        else:
+            regex_parts.append(re.escape(c))
+        i += 1
+    return "".join(regex_parts)
+
+
+def _compile_globs(patterns: List[str]) -> Optional[Pattern[str]]:
+    """
+    Compiles the given glob patterns into a single regular expression that fully matches
+    any POSIX-style relative path matched by at least one of the patterns.
+    Returns None if no patterns are given.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{_glob_to_regex(pattern)})" for pattern in patterns))
+
+
+def _filter_relative_paths(
+    paths: List[str], include: List[str] = ["**/*"], exclude: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Filters POSIX-style relative paths, such as the paths in an asset manifest, without touching
+    the file system. Keeps the paths that match any include pattern and no exclude pattern.
+    paths: Relative paths to filter.
+    include: Optional, pattern syntax for paths to include.
+    exclude: Optional, pattern syntax for paths to exclude.
+    return: The matching paths, in their original order.
+    """
+    include_regex = _compile_globs(include)
+    exclude_regex = _compile_globs(exclude or [])
+    if include_regex is None:
+        return []
+
+    return [
+        path
+        for path in paths
+        if include_regex.fullmatch(path)
+        and (exclude_regex is None or not exclude_regex.fullmatch(path))
+    ]
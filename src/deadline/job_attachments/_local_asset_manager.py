@@ -0,0 +1,511 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+The local part of handling assets: grouping input and output paths by asset root, and hashing
+input files into asset manifests. Nothing here talks to AWS, so it can be used without
+importing boto3, e.g. to snapshot or diff a directory.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from datetime import datetime
+from math import trunc
+from pathlib import Path, PurePath
+from typing import Any, Callable, Optional, Tuple, Type
+
+from .asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestModel,
+    HashAlgorithm,
+    hash_file,
+    ManifestModelRegistry,
+    ManifestVersion,
+    base_manifest,
+)
+from .caches import HashCache, HashCacheEntry
+from .exceptions import AssetSyncCancelledError, MisconfiguredInputsError
+from .models import (
+    AssetRootGroup,
+    AssetRootManifest,
+    AssetUploadGroup,
+    FileStatus,
+    FileSystemLocationType,
+    StorageProfile,
+)
+from .progress_tracker import ProgressStatus, ProgressTracker, SummaryStatistics
+from ._utils import _bounded_imap_unordered, _is_relative_to
+
+logger = logging.getLogger("deadline.job_attachments.upload")
+
+
+class LocalAssetManager:
+    """
+    Asset handler that groups local paths by asset root and creates asset manifests for them.
+    """
+
+    def __init__(
+        self,
+        asset_manifest_version: ManifestVersion = ManifestVersion.v2023_03_03,
+    ) -> None:
+        self.manifest_version: ManifestVersion = asset_manifest_version
+
+    def _hash_file(self, full_path: str, hash_alg: HashAlgorithm) -> str:
+        return hash_file(full_path, hash_alg)
+
+    def _process_input_path(
+        self,
+        path: Path,
+        root_path: str,
+        hash_cache: HashCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+        update: bool = True,
+    ) -> Tuple[FileStatus, int, base_manifest.BaseManifestPath]:
+        # If it's cancelled, raise an AssetSyncCancelledError exception
+        if progress_tracker and not progress_tracker.continue_reporting:
+            raise AssetSyncCancelledError(
+                "File hashing cancelled.", progress_tracker.get_summary_statistics()
+            )
+
+        manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
+            version=self.manifest_version
+        )
+        hash_alg: HashAlgorithm = manifest_model.AssetManifest.get_default_hash_alg()
+
+        full_path = str(path.resolve())
+        file_status: FileStatus = FileStatus.UNCHANGED
+        actual_modified_time = str(datetime.fromtimestamp(path.stat().st_mtime))
+
+        entry: Optional[HashCacheEntry] = hash_cache.get_entry(full_path, hash_alg)
+        if entry is not None:
+            # If the file was modified, we need to rehash it
+            if actual_modified_time != entry.last_modified_time:
+                entry.last_modified_time = actual_modified_time
+                entry.file_hash = self._hash_file(full_path, hash_alg)
+                entry.hash_algorithm = hash_alg
+                file_status = FileStatus.MODIFIED
+        else:
+            entry = HashCacheEntry(
+                file_path=full_path,
+                hash_algorithm=hash_alg,
+                file_hash=self._hash_file(full_path, hash_alg),
+                last_modified_time=actual_modified_time,
+            )
+            file_status = FileStatus.NEW
+
+        if file_status != FileStatus.UNCHANGED and update:
+            hash_cache.put_entry(entry)
+
+        file_size = path.resolve().stat().st_size
+        path_args: dict[str, Any] = {
+            "path": path.relative_to(root_path).as_posix(),
+            "hash": entry.file_hash,
+        }
+
+        # stat().st_mtime_ns returns an int that represents the time in nanoseconds since the epoch.
+        # The asset manifest spec requires the mtime to be represented as an integer in microseconds.
+        path_args["mtime"] = trunc(path.stat().st_mtime_ns // 1000)
+        path_args["size"] = file_size
+
+        return (file_status, file_size, manifest_model.Path(**path_args))
+
+    def _create_manifest_file(
+        self,
+        input_paths: list[Path],
+        root_path: str,
+        hash_cache: HashCache,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> BaseAssetManifest:
+        manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
+            version=self.manifest_version
+        )
+        if manifest_model.manifest_version in {
+            ManifestVersion.v2023_03_03,
+        }:
+            paths: list[base_manifest.BaseManifestPath] = []
+
+            def process_input_path(
+                path: Path,
+            ) -> Tuple[FileStatus, int, base_manifest.BaseManifestPath]:
+                return self._process_input_path(path, root_path, hash_cache, progress_tracker)
+
+            for _, (file_status, file_size, path_to_put_in_manifest) in _bounded_imap_unordered(
+                process_input_path,
+                input_paths,
+                cancel_event=progress_tracker.cancel_event if progress_tracker else None,
+            ):
+                paths.append(path_to_put_in_manifest)
+                if progress_tracker:
+                    if file_status == FileStatus.NEW or file_status == FileStatus.MODIFIED:
+                        progress_tracker.increase_processed(1, file_size)
+                    else:
+                        progress_tracker.increase_skipped(1, file_size)
+                    progress_tracker.report_progress()
+
+            if progress_tracker and not progress_tracker.continue_reporting:
+                raise AssetSyncCancelledError(
+                    "File hashing cancelled.", progress_tracker.get_summary_statistics()
+                )
+
+            # Need to sort the list to keep it canonical
+            paths.sort(key=lambda x: x.path, reverse=True)
+
+            manifest_args: dict[str, Any] = {
+                "hash_alg": manifest_model.AssetManifest.get_default_hash_alg(),
+                "paths": paths,
+            }
+
+            manifest_args["total_size"] = sum([path.size for path in paths])
+
+            return manifest_model.AssetManifest(**manifest_args)
+        else:
+            raise NotImplementedError(
+                f"Creation of manifest version {manifest_model.manifest_version} is not supported."
+            )
+
+    def _get_asset_groups(
+        self,
+        input_paths: set[str],
+        output_paths: set[str],
+        referenced_paths: set[str],
+        local_type_locations: dict[str, str] = {},
+        shared_type_locations: dict[str, str] = {},
+        require_paths_exist: bool = False,
+    ) -> list[AssetRootGroup]:
+        """
+        For the given input paths and output paths, a list of groups is returned, where paths sharing
+        the same root path are grouped together. Note that paths can be files or directories.
+
+        The returned list satisfies the following conditions:
+        - If a path is relative to any of the paths in the given `shared_type_locations` paths, it is
+          excluded from the list.
+        - The given `local_type_locations` paths can each form a group based on its root path. In other
+          words, if there are paths relative to any of the `local_type_locations` paths, they are grouped
+          together as one.
+        - The referenced paths may have no files or directories associated, but they always live
+          relative to one of the AssetRootGroup objects returned.
+        """
+        groupings: dict[str, AssetRootGroup] = {}
+        missing_input_paths = set()
+        misconfigured_directories = set()
+
+        # Resolve full path, then cast to pure path to get top-level directory
+        for _path in input_paths:
+            # Need to use absolute to not resolve symlinks, but need normpath to get rid of relative paths, i.e. '..'
+            abs_path = Path(os.path.normpath(Path(_path).absolute()))
+            if not abs_path.exists():
+                if require_paths_exist:
+                    missing_input_paths.add(abs_path)
+                else:
+                    logger.warning(
+                        f"Input path '{_path}' resolving to '{abs_path}' does not exist. Adding to referenced paths."
+                    )
+                    referenced_paths.add(_path)
+                continue
+            if abs_path.is_dir():
+                misconfigured_directories.add(abs_path)
+                continue
+
+            # Skips the upload if the path is relative to any of the File System Location
+            # of SHARED type that was set in the Job.
+            if any(_is_relative_to(abs_path, shared) for shared in shared_type_locations):
+                continue
+
+            # If the path is relative to any of the File System Location of LOCAL type,
+            # groups the files into a single group using the path of that location.
+            matched_root = self._find_matched_root_from_local_type_locations(
+                groupings=groupings,
+                abs_path=abs_path,
+                local_type_locations=local_type_locations,
+            )
+            matched_group = self._get_matched_group(matched_root, groupings)
+            matched_group.inputs.add(abs_path)
+
+        if missing_input_paths or misconfigured_directories:
+            all_misconfigured_inputs = ""
+            misconfigured_inputs_msg = (
+                "Job submission contains missing input files or directories specified as files."
+                " All inputs must exist and be classified properly."
+            )
+            if missing_input_paths:
+                missing_inputs_list: list[str] = sorted([str(i) for i in missing_input_paths])
+                all_missing_inputs = "\n\t".join(missing_inputs_list)
+                all_misconfigured_inputs += f"\nMissing input files:\n\t{all_missing_inputs}"
+            if misconfigured_directories:
+                misconfigured_directories_list: list[str] = sorted(
+                    [str(d) for d in misconfigured_directories]
+                )
+                all_misconfigured_directories = "\n\t".join(misconfigured_directories_list)
+                all_misconfigured_inputs += (
+                    f"\nDirectories classified as files:\n\t{all_misconfigured_directories}"
+                )
+            raise MisconfiguredInputsError(misconfigured_inputs_msg + all_misconfigured_inputs)
+
+        for _path in output_paths:
+            abs_path = Path(os.path.normpath(Path(_path).absolute()))
+
+            # Skips the upload if the path is relative to any of the File System Location
+            # of SHARED type that was set in the Job.
+            if any(_is_relative_to(abs_path, shared) for shared in shared_type_locations):
+                continue
+
+            # If the path is relative to any of the File System Location of LOCAL type,
+            # groups the files into a single group using the path of that location.
+            matched_root = self._find_matched_root_from_local_type_locations(
+                groupings=groupings,
+                abs_path=abs_path,
+                local_type_locations=local_type_locations,
+            )
+            matched_group = self._get_matched_group(matched_root, groupings)
+            matched_group.outputs.add(abs_path)
+
+        for _path in referenced_paths:
+            abs_path = Path(os.path.normpath(Path(_path).absolute()))
+
+            # Skips the reference if the path is relative to any of the File System Location
+            # of SHARED type that was set in the Job.
+            if any(_is_relative_to(abs_path, shared) for shared in shared_type_locations):
+                continue
+            # If the path is relative to any of the File System Location of LOCAL type,
+            # groups the references into a single group using the path of that location.
+            matched_root = self._find_matched_root_from_local_type_locations(
+                groupings=groupings,
+                abs_path=abs_path,
+                local_type_locations=local_type_locations,
+            )
+            matched_group = self._get_matched_group(matched_root, groupings)
+            matched_group.references.add(abs_path)
+
+        # Finally, build the list of asset root groups
+        for asset_group in groupings.values():
+            common_path: Path = Path(
+                os.path.commonpath(
+                    list(asset_group.inputs | asset_group.outputs | asset_group.references)
+                )
+            )
+            if common_path.is_file():
+                common_path = common_path.parent
+            asset_group.root_path = str(common_path)
+
+        return list(groupings.values())
+
+    def _get_matched_group(
+        self, root_path: str, groupings: dict[str, AssetRootGroup]
+    ) -> AssetRootGroup:
+        root_normcase = os.path.normcase(root_path)
+        matched_group = next(
+            (group for key, group in groupings.items() if os.path.normcase(key) == root_normcase),
+            None,
+        )
+        if matched_group is None:
+            raise ValueError(
+                f"No group found for the root path '{root_path}' in the groupings dictionary: {groupings}"
+            )
+        return matched_group
+
+    def _find_matched_root_from_local_type_locations(
+        self,
+        groupings: dict[str, AssetRootGroup],
+        abs_path: Path,
+        local_type_locations: dict[str, str] = {},
+    ) -> str:
+        """
+        Checks if the given `abs_path` is relative to any of the File System Locations of LOCAL type.
+        If it is, select the most specific File System Location, and add a new grouping keyed by that
+        matched root path (if the key does not exist.) Then, returns the matched root path.
+        If no match is found, returns the top directory of `abs_path` as the key used for grouping.
+        """
+        matched_root = None
+        for root_path in local_type_locations.keys():
+            if _is_relative_to(abs_path, root_path) and (
+                matched_root is None or len(root_path) > len(matched_root)
+            ):
+                matched_root = root_path
+
+        if matched_root is not None:
+            if matched_root not in groupings:
+                groupings[matched_root] = AssetRootGroup(
+                    file_system_location_name=local_type_locations[matched_root],
+                )
+            return matched_root
+        else:
+            keys_normcase = [os.path.normcase(key) for key in groupings.keys()]
+            top_directory = PurePath(abs_path).parts[0]
+            top_directory_normcase = os.path.normcase(top_directory)
+            if top_directory_normcase not in keys_normcase:
+                groupings[top_directory] = AssetRootGroup()
+            else:
+                return top_directory_normcase
+            return top_directory
+
+    def _get_total_size_of_files(self, paths: list[str]) -> int:
+        total_bytes = 0
+        try:
+            for path in paths:
+                total_bytes += Path(path).resolve().stat().st_size
+        except FileNotFoundError:
+            logger.warning(
+                f"Skipping the input from total size calculation as it doesn't exist: {path}"
+            )
+        return total_bytes
+
+    def _get_total_input_size_from_manifests(
+        self, manifests: list[AssetRootManifest]
+    ) -> tuple[int, int]:
+        total_files = 0
+        total_bytes = 0
+        for asset_root_manifest in manifests:
+            if asset_root_manifest.asset_manifest:
+                input_paths = asset_root_manifest.asset_manifest.paths
+                input_paths_str = [
+                    str(Path(asset_root_manifest.root_path).joinpath(path.path))
+                    for path in input_paths
+                ]
+                total_files += len(input_paths)
+                total_bytes += self._get_total_size_of_files(input_paths_str)
+
+        return (total_files, total_bytes)
+
+    def _get_total_input_size_from_asset_group(
+        self, groups: list[AssetRootGroup]
+    ) -> tuple[int, int]:
+        total_files = 0
+        total_bytes = 0
+        for group in groups:
+            input_paths = [str(input) for input in group.inputs]
+            total_bytes += self._get_total_size_of_files(input_paths)
+            total_files += len(input_paths)
+        return (total_files, total_bytes)
+
+    def _get_file_system_locations_by_type(
+        self,
+        storage_profile_for_queue: StorageProfile,
+    ) -> Tuple[dict, dict]:
+        """
+        Given the Storage Profile for Queue object, extracts and groups
+        path and name pairs from the File System Locations into two dicts,
+        LOCAL and SHARED type, respectively. Returns a tuple of two dicts.
+        """
+        local_type_locations: dict[str, str] = {}
+        shared_type_locations: dict[str, str] = {}
+        for fs_loc in storage_profile_for_queue.fileSystemLocations:
+            if fs_loc.type == FileSystemLocationType.LOCAL:
+                local_type_locations[fs_loc.path] = fs_loc.name
+            elif fs_loc.type == FileSystemLocationType.SHARED:
+                shared_type_locations[fs_loc.path] = fs_loc.name
+        return local_type_locations, shared_type_locations
+
+    def _group_asset_paths(
+        self,
+        input_paths: list[str],
+        output_paths: list[str],
+        referenced_paths: list[str],
+        storage_profile: Optional[StorageProfile] = None,
+        require_paths_exist: bool = False,
+    ) -> list[AssetRootGroup]:
+        """
+        Resolves all of the paths that will be uploaded, sorting by storage profile location.
+        """
+        local_type_locations: dict[str, str] = {}
+        shared_type_locations: dict[str, str] = {}
+        if storage_profile:
+            (
+                local_type_locations,
+                shared_type_locations,
+            ) = self._get_file_system_locations_by_type(storage_profile)
+
+        # Group the paths by asset root, removing duplicates and empty strings
+        asset_groups: list[AssetRootGroup] = self._get_asset_groups(
+            {ip_path for ip_path in input_paths if ip_path},
+            {op_path for op_path in output_paths if op_path},
+            {rf_path for rf_path in referenced_paths if rf_path},
+            local_type_locations,
+            shared_type_locations,
+            require_paths_exist,
+        )
+
+        return asset_groups
+
+    def prepare_paths_for_upload(
+        self,
+        input_paths: list[str],
+        output_paths: list[str],
+        referenced_paths: list[str],
+        storage_profile: Optional[StorageProfile] = None,
+        require_paths_exist: bool = False,
+    ) -> AssetUploadGroup:
+        """
+        Processes all of the paths required for upload, grouping them by asset root and local storage profile locations.
+        Returns an object containing the grouped paths, which also includes a dictionary of input directories and file counts
+        for files that were not under the root path or any local storage profile locations.
+        """
+        asset_groups = self._group_asset_paths(
+            input_paths,
+            output_paths,
+            referenced_paths,
+            storage_profile,
+            require_paths_exist,
+        )
+        (input_file_count, input_bytes) = self._get_total_input_size_from_asset_group(asset_groups)
+        return AssetUploadGroup(
+            asset_groups=asset_groups,
+            total_input_files=input_file_count,
+            total_input_bytes=input_bytes,
+        )
+
+    def hash_assets_and_create_manifest(
+        self,
+        asset_groups: list[AssetRootGroup],
+        total_input_files: int,
+        total_input_bytes: int,
+        hash_cache_dir: Optional[str] = None,
+        on_preparing_to_submit: Optional[Callable[[Any], bool]] = None,
+    ) -> tuple[SummaryStatistics, list[AssetRootManifest]]:
+        """
+        Computes the hashes for input files, and creates manifests using the local hash cache.
+
+        Args:
+            input_paths: a list of input paths.
+            output_paths: a list of output paths.
+            hash_cache_dir: a path to local hash cache directory. If it's None, use default path.
+            on_preparing_to_submit: a callback to be called to periodically report progress to the caller.
+            The callback returns True if the operation should continue as normal, or False to cancel.
+
+        Returns:
+            a tuple with (1) the summary statistics of the hash operation, and
+            (2) a list of AssetRootManifest (a manifest and output paths for each asset root).
+        """
+        start_time = time.perf_counter()
+
+        # Sets up progress tracker to report upload progress back to the caller.
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.PREPARING_IN_PROGRESS,
+            total_files=total_input_files,
+            total_bytes=total_input_bytes,
+            on_progress_callback=on_preparing_to_submit,
+        )
+
+        asset_root_manifests: list[AssetRootManifest] = []
+        for group in asset_groups:
+            # Might have output directories, but no inputs for this group
+            asset_manifest: Optional[BaseAssetManifest] = None
+            if group.inputs:
+                # Create manifest, using local hash cache
+                with HashCache(hash_cache_dir) as hash_cache:
+                    asset_manifest = self._create_manifest_file(
+                        sorted(list(group.inputs)), group.root_path, hash_cache, progress_tracker
+                    )
+
+            asset_root_manifests.append(
+                AssetRootManifest(
+                    file_system_location_name=group.file_system_location_name,
+                    root_path=group.root_path,
+                    asset_manifest=asset_manifest,
+                    outputs=sorted(list(group.outputs)),
+                )
+            )
+
+        progress_tracker.total_time = time.perf_counter() - start_time
+
+        return (progress_tracker.get_summary_statistics(), asset_root_manifests)
@@ -0,0 +1,105 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Watches output directories while a task is running, and hands each output file over for upload
+once it has stopped changing, so that the output sync at the end of the task has less left to do.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from logging import Logger, LoggerAdapter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ._utils import _walk_files
+
+# How long a file's modification time and size must stay the same before it is uploaded.
+DEFAULT_QUIESCENCE_SECONDS: float = 10.0
+# How often the output directories are walked.
+DEFAULT_POLL_INTERVAL_SECONDS: float = 2.0
+
+
+class _OutputStreamer:
+    """
+    Polls a set of output directories from a background thread. A file is considered closed
+    once its modification time and size have not changed for `quiescence_seconds`; it is then
+    passed to `on_quiescent_file` along with the session directory that the file's resolved path must
+    be contained in. A file that changes again after it was handed over is handed over again once it
+    is quiescent.
+
+    Errors raised by `on_quiescent_file` are logged and the file is retried on a later poll,
+    since any file that was not streamed is still synced at the end of the task.
+    """
+
+    def __init__(
+        self,
+        output_dirs: List[Tuple[Path, Path]],
+        on_quiescent_file: Callable[[Path, Path], None],
+        logger: Union[Logger, LoggerAdapter],
+        quiescence_seconds: float = DEFAULT_QUIESCENCE_SECONDS,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Args:
+            output_dirs: (output directory, session directory) pairs to watch.
+            on_quiescent_file: Called with (file path, session directory) for each quiescent file.
+        """
+        self.output_dirs = output_dirs
+        self.on_quiescent_file = on_quiescent_file
+        self.logger = logger
+        self.quiescence_seconds = quiescence_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+
+        # Maps each file path to its last seen (modification time, size), and the monotonic time at
+        # which that state was first seen.
+        self._observed: Dict[str, Tuple[Tuple[int, int], float]] = {}
+        # Maps each file path to the (modification time, size) it had when it was handed over.
+        self._streamed: Dict[str, Tuple[int, int]] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="JobAttachmentsOutputStreamer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops polling, and waits for a file that is being handed over to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.poll_interval_seconds)
+
+    def poll(self, now: Optional[float] = None) -> None:
+        """Walks the output directories once, and hands over the files that have become quiescent."""
+        if now is None:
+            now = time.monotonic()
+        for output_dir, session_dir in self.output_dirs:
+            if not output_dir.is_dir():
+                continue
+            for file_path, file_stat in _walk_files(output_dir):
+                if self._stop_event.is_set():
+                    return
+                path_key = str(file_path)
+                state = (file_stat.st_mtime_ns, file_stat.st_size)
+                observed = self._observed.get(path_key)
+                if observed is None or observed[0] != state:
+                    self._observed[path_key] = (state, now)
+                    continue
+                if self._streamed.get(path_key) == state:
+                    continue
+                if now - observed[1] < self.quiescence_seconds:
+                    continue
+                try:
+                    self.on_quiescent_file(file_path, session_dir)
+                except Exception as e:
+                    self.logger.warning(f"Failed to stream output file '{file_path}': {e}")
+                    continue
+                self._streamed[path_key] = state
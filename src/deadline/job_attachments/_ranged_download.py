@@ -0,0 +1,288 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Downloads a single large object from S3 with parallel ranged GETs.
+
+The destination file is preallocated and written with positional writes from multiple
+connections. The content hash is computed in order while the ranges stream in, so corruption
+is detected without reading the file back.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from botocore.client import BaseClient
+
+from .asset_manifests.hash_algorithms import HashAlgorithm
+from .exceptions import AssetSyncError, UnsupportedHashingAlgorithmError
+from .progress_tracker import ProgressTracker
+
+# Objects at least this large are downloaded with parallel ranged GETs.
+RANGED_GET_THRESHOLD_BYTES: int = 128 * 1024 * 1024  # 128 MiB
+RANGED_GET_MIN_PART_SIZE: int = 8 * 1024 * 1024  # 8 MiB
+RANGED_GET_MAX_PART_SIZE: int = 256 * 1024 * 1024  # 256 MiB
+# The fraction of each ranged GET that we accept to spend waiting for the first byte.
+RANGED_GET_MAX_LATENCY_OVERHEAD: float = 0.1
+# Size of the reads from each response body, and therefore of the progress callbacks.
+RANGED_GET_READ_CHUNK_SIZE: int = 1024 * 1024  # 1 MiB
+# Number of parts that may be held in memory, per connection, while waiting to be hashed in order.
+RANGED_GET_HASH_WINDOW_PER_CONNECTION: int = 2
+# The most bytes of parts that may be held in memory at once, downloading or waiting to be hashed.
+# The next part to hash is always allowed, so one large part can go over it.
+RANGED_GET_HASH_MEMORY_LIMIT_BYTES: int = 512 * 1024 * 1024  # 512 MiB
+
+
+class _TransferEstimate:
+    """
+    A running estimate of the per-connection throughput and the request latency (time to first
+    byte) observed on ranged GETs, used to size the ranges of the next download. Parts are made
+    large enough that the request latency stays a small fraction of each part's transfer time.
+    """
+
+    # Exponential moving average weight given to each new observation.
+    SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        bytes_per_second: float = 64 * 1000 * 1000,
+        latency_seconds: float = 0.05,
+    ) -> None:
+        self.bytes_per_second = bytes_per_second
+        self.latency_seconds = latency_seconds
+        self._lock = threading.Lock()
+
+    def record(self, num_bytes: int, latency_seconds: float, total_seconds: float) -> None:
+        """Adds the observation of one completed ranged GET to the estimate."""
+        transfer_seconds = total_seconds - latency_seconds
+        if num_bytes <= 0 or transfer_seconds <= 0:
+            return
+        with self._lock:
+            self.bytes_per_second += self.SMOOTHING * (
+                num_bytes / transfer_seconds - self.bytes_per_second
+            )
+            self.latency_seconds += self.SMOOTHING * (latency_seconds - self.latency_seconds)
+
+    def part_size(self) -> int:
+        """Returns the range size to use, rounded to whole MiB and clamped to the allowed range."""
+        with self._lock:
+            bandwidth_delay_product = self.bytes_per_second * self.latency_seconds
+        part_size = int(bandwidth_delay_product / RANGED_GET_MAX_LATENCY_OVERHEAD)
+        part_size = max(RANGED_GET_MIN_PART_SIZE, min(RANGED_GET_MAX_PART_SIZE, part_size))
+        return part_size - part_size % (1024 * 1024)
+
+
+# Shared by all downloads in the process, so that later downloads start with a tuned part size.
+_transfer_estimate = _TransferEstimate()
+
+
+def _split_into_ranges(file_size: int, part_size: int) -> List[Tuple[int, int]]:
+    """Returns the (offset, length) of each range covering a file of the given size."""
+    return [
+        (offset, min(part_size, file_size - offset)) for offset in range(0, file_size, part_size)
+    ]
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserves the disk space for the whole file up front, so the ranged writes cannot fragment it."""
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            # Not every file system supports fallocate; fall back to extending the file.
+            pass
+    os.ftruncate(fd, size)
+
+
+class _OrderedHasher:
+    """
+    Hashes the parts of a file in order while they complete out of order. Completed parts wait
+    in memory until all of the parts before them have been hashed; `wait_for_turn` bounds how
+    far ahead of the hashing the downloads are allowed to get, both in parts and in bytes.
+    """
+
+    def __init__(
+        self,
+        hash_alg: HashAlgorithm,
+        window: int,
+        memory_limit_bytes: int = RANGED_GET_HASH_MEMORY_LIMIT_BYTES,
+    ) -> None:
+        if hash_alg == HashAlgorithm.XXH128:
+            from xxhash import xxh3_128
+
+            self._hasher = xxh3_128()
+        else:
+            raise UnsupportedHashingAlgorithmError(
+                f"Unsupported hashing algorithm provided: {hash_alg}"
+            )
+        self._window = window
+        self._memory_limit_bytes = memory_limit_bytes
+        # The bytes of the parts that were allowed to start and haven't been hashed yet.
+        self._reserved_bytes = 0
+        self._next_index = 0
+        self._pending: Dict[int, List[bytes]] = {}
+        self._condition = threading.Condition()
+        self._aborted = False
+
+    def wait_for_turn(self, index: int, length: int) -> bool:
+        """
+        Blocks until part `index`, of `length` bytes, is within the window and fits in the memory
+        limit, then reserves its memory. Returns False if aborted.
+        """
+        with self._condition:
+            while not self._aborted and (
+                index >= self._next_index + self._window
+                or (
+                    index != self._next_index
+                    and self._reserved_bytes + length > self._memory_limit_bytes
+                )
+            ):
+                self._condition.wait()
+            if self._aborted:
+                return False
+            self._reserved_bytes += length
+            return True
+
+    def add(self, index: int, chunks: List[bytes]) -> None:
+        """Hands over the data of a completed part, and hashes every part that is now in order."""
+        with self._condition:
+            self._pending[index] = chunks
+            while self._next_index in self._pending:
+                for chunk in self._pending.pop(self._next_index):
+                    self._hasher.update(chunk)
+                    self._reserved_bytes -= len(chunk)
+                self._next_index += 1
+            self._condition.notify_all()
+
+    def abort(self) -> None:
+        with self._condition:
+            self._aborted = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+
+def _pwrite(fd: int, data: bytes, offset: int, lock: threading.Lock) -> None:
+    if sys.platform != "win32":
+        # Loop since a positional write is allowed to be partial.
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+    else:
+        # Windows has no positional write, so serialize seeking and writing on the shared descriptor.
+        with lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+
+
+def download_file_with_ranged_gets(
+    s3_client: BaseClient,
+    s3_bucket: str,
+    s3_key: str,
+    fd: int,
+    file_size: int,
+    expected_hash: str,
+    hash_algorithm: HashAlgorithm,
+    max_connections: int,
+    progress_tracker: Optional[ProgressTracker] = None,
+    extra_args: Optional[Dict[str, Any]] = None,
+    transfer_estimate: Optional[_TransferEstimate] = None,
+) -> None:
+    """
+    Downloads an object into the file open for writing as `fd`, with up to `max_connections`
+    concurrent ranged GETs. The caller owns the file, and should discard it if this raises.
+
+    Raises:
+        concurrent.futures.CancelledError: If the progress tracker signals cancellation.
+        AssetSyncError: If the downloaded content does not match the expected hash.
+        ClientError, BotoCoreError: On S3 request failures.
+    """
+    estimate = transfer_estimate or _transfer_estimate
+    ranges = _split_into_ranges(file_size, estimate.part_size())
+    num_connections = max(1, min(max_connections, len(ranges)))
+    hasher = _OrderedHasher(
+        hash_algorithm,
+        window=num_connections * RANGED_GET_HASH_WINDOW_PER_CONNECTION,
+        memory_limit_bytes=RANGED_GET_HASH_MEMORY_LIMIT_BYTES,
+    )
+    stop_event = threading.Event()
+    write_lock = threading.Lock()
+    next_range_lock = threading.Lock()
+    next_range = 0
+
+    def download_ranges() -> None:
+        nonlocal next_range
+        while not stop_event.is_set():
+            with next_range_lock:
+                index = next_range
+                next_range += 1
+            if index >= len(ranges):
+                return
+            offset, length = ranges[index]
+            if not hasher.wait_for_turn(index, length):
+                return
+
+            start_time = time.perf_counter()
+            response = s3_client.get_object(
+                Bucket=s3_bucket,
+                Key=s3_key,
+                Range=f"bytes={offset}-{offset + length - 1}",
+                **(extra_args or {}),
+            )
+            body = response["Body"]
+            latency = time.perf_counter() - start_time
+            chunks: List[bytes] = []
+            position = offset
+            try:
+                while position < offset + length:
+                    chunk = body.read(min(RANGED_GET_READ_CHUNK_SIZE, offset + length - position))
+                    if not chunk:
+                        raise AssetSyncError(
+                            f"Ranged download of s3://{s3_bucket}/{s3_key} ended early at byte {position}"
+                            f" (expected {offset + length})."
+                        )
+                    _pwrite(fd, chunk, position, write_lock)
+                    chunks.append(chunk)
+                    position += len(chunk)
+                    if stop_event.is_set():
+                        return
+                    if progress_tracker and not progress_tracker.track_progress_callback(
+                        len(chunk)
+                    ):
+                        raise concurrent.futures.CancelledError()
+            finally:
+                body.close()
+            estimate.record(length, latency, time.perf_counter() - start_time)
+            hasher.add(index, chunks)
+
+    _preallocate(fd, file_size)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_connections) as executor:
+        futures = [executor.submit(download_ranges) for _ in range(num_connections)]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        except BaseException:
+            # Stop the remaining workers before leaving the executor, which waits for them.
+            stop_event.set()
+            hasher.abort()
+            raise
+
+    actual_hash = hasher.hexdigest()
+    if actual_hash != expected_hash:
+        raise AssetSyncError(
+            f"Hash mismatch for s3://{s3_bucket}/{s3_key}: the downloaded data hashes to"
+            f" {actual_hash}, but {expected_hash} was expected. The download has been discarded."
+        )
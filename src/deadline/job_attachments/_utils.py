@@ -1,12 +1,16 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
+import concurrent.futures
 import datetime
 from functools import wraps
+import itertools
 from hashlib import shake_256
+import os
 from pathlib import Path
 import random
+import threading
 import time
-from typing import Any, Callable, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Type, TypeVar, Union
 import uuid
 import sys
 
@@ -19,8 +23,12 @@ __all__ = [
     "_get_unique_dest_dir_name",
     "_get_bucket_and_object_key",
     "_is_relative_to",
+    "_bounded_imap_unordered",
 ]
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 
 def _join_s3_paths(root: str, *args: str):
     return "/".join([root, *args])
@@ -92,6 +100,91 @@ def _is_relative_to(path1: Union[Path, str], path2: Union[Path, str]) -> bool:
         return False
 
 
+def _walk_files(root: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+    """
+    Yields every non-directory entry under the given directory, recursively, along with its
+    stat result. Symbolic links are reported with the stat result of their target; symbolic links to
+    directories are neither followed nor reported, and entries that disappear or are dangling while
+    walking are skipped.
+
+    This uses `os.scandir` so that each directory is listed with a single system call, and the
+    file type comes from the directory listing instead of a separate `stat` per entry.
+    """
+    dirs_to_walk = [root]
+    while dirs_to_walk:
+        try:
+            with os.scandir(dirs_to_walk.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                dirs_to_walk.append(Path(entry.path))
+                            continue
+                        entry_stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield Path(entry.path), entry_stat
+        except FileNotFoundError:
+            continue
+
+
+def _bounded_imap_unordered(
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[Tuple[_T, _R]]:
+    """
+    Calls `fn` on every item in a thread pool and yields `(item, result)` pairs as they finish.
+
+    Unlike submitting one future per item up front, the items are consumed lazily and at most
+    `max_in_flight` calls (twice `max_workers` by default) are submitted or waiting to be
+    yielded at any time, so memory use doesn't grow with the number of items. If a call raises,
+    or the generator is closed early, the calls that haven't started yet are cancelled and the
+    pool waits for the running ones before the exception propagates.
+
+    Once `cancel_event` is set, no more items are taken, the calls that haven't started yet are
+    dropped, and the generator stops after yielding the results of the calls that were running.
+    It's up to the caller to check the event and report the cancellation.
+    """
+    if max_workers is None:
+        # Same default as concurrent.futures.ThreadPoolExecutor
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    if max_in_flight is None:
+        max_in_flight = 2 * max_workers
+    if max_workers < 1 or max_in_flight < 1:
+        raise ValueError("max_workers and max_in_flight must be greater than 0.")
+
+    def is_cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    items_iter = iter(items)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight: Dict[concurrent.futures.Future, _T] = {}
+        try:
+            if not is_cancelled():
+                for item in itertools.islice(items_iter, max_in_flight):
+                    in_flight[executor.submit(fn, item)] = item
+            while in_flight:
+                done, _ = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield in_flight.pop(future), future.result()
+                    # Take the next item as soon as a slot frees up, rather than after the whole
+                    # batch, so the workers stay busy while the caller handles the results.
+                    if not is_cancelled():
+                        for item in itertools.islice(items_iter, 1):
+                            in_flight[executor.submit(fn, item)] = item
+                if is_cancelled():
+                    for future in [future for future in in_flight if future.cancel()]:
+                        del in_flight[future]
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
 def _is_windows_file_path_limit() -> bool:
     if sys.platform != "win32":
         return True
@@ -2,4 +2,14 @@
 
 __all__ = ["attachment_download", "attachment_upload"]
 
-from .attachment import attachment_download, attachment_upload
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # The attachment functions need boto3, so they're only imported when used. This keeps
+    # local-only modules like deadline.job_attachments.api.manifest free of boto3.
+    if name in __all__:
+        from . import attachment
+
+        return getattr(attachment, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,6 +7,7 @@ from typing import List, Optional, Tuple
 
 from deadline.client.cli._groups.click_logger import ClickLogger
 from deadline.job_attachments._diff import _fast_file_list_to_manifest_diff, compare_manifest
+from deadline.job_attachments._local_asset_manager import LocalAssetManager
 from deadline.job_attachments._glob import _process_glob_inputs, _glob_paths
 from deadline.job_attachments.asset_manifests._create_manifest import (
     _create_manifest_for_single_root,
@@ -26,7 +27,6 @@ from deadline.job_attachments.models import (
     ManifestSnapshot,
     default_glob_all,
 )
-from deadline.job_attachments.upload import S3AssetManager
 
 """
 APIs here should be business logic only. It should perform one thing, and one thing well. 
@@ -202,8 +202,8 @@ def _manifest_diff(
     )
     input_paths = [Path(p) for p in input_files]
 
-    # Placeholder Asset Manager
-    asset_manager = S3AssetManager()
+    # Only hashes local files, so it doesn't need an S3 asset manager (or boto3).
+    asset_manager = LocalAssetManager()
 
     # parse the given manifest to compare against.
     local_manifest_object: BaseAssetManifest
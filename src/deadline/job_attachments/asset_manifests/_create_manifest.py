@@ -2,12 +2,11 @@
 
 from typing import List, Optional
 
-from deadline.client.api._job_attachment import _hash_attachments
 from deadline.client.cli._common import _ProgressBarCallbackManager
 from deadline.client.cli._groups.click_logger import ClickLogger
+from deadline.job_attachments._local_asset_manager import LocalAssetManager
 from deadline.job_attachments.asset_manifests.base_manifest import BaseAssetManifest
 from deadline.job_attachments.exceptions import ManifestCreationException
-from deadline.job_attachments.upload import S3AssetManager
 
 
 def _create_manifest_for_single_root(
@@ -22,8 +21,8 @@ def _create_manifest_for_single_root(
     :param logger: Click logger for stdout.
     :return
     """
-    # Placeholder Asset Manager
-    asset_manager = S3AssetManager()
+    # Only hashes local files, so it doesn't need an S3 asset manager (or boto3).
+    asset_manager = LocalAssetManager()
 
     hash_callback_manager = _ProgressBarCallbackManager(length=100, label="Hashing Attachments")
 
@@ -34,6 +33,10 @@ def _create_manifest_for_single_root(
     assert len(upload_group.asset_groups) == 1
 
     if upload_group.asset_groups:
+        # Imported here because it loads the Deadline Cloud API and boto3 to record hashing
+        # telemetry, which isn't needed until the files are hashed.
+        from deadline.client.api._job_attachment import _hash_attachments
+
         _, manifests = _hash_attachments(
             asset_manager=asset_manager,
             asset_groups=upload_group.asset_groups,
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 from pathlib import Path
 from typing import Any, Optional, Tuple
 
@@ -17,6 +18,10 @@ from .versions import ManifestVersion
 
 alphanum_regex = re.compile("[a-zA-Z0-9]+")
 
+# Checking a schema resolves references in the JSON Schema meta-schemas, which isn't thread-safe
+# in jsonschema. Manifests are decoded from multiple threads, so the check is serialized.
+_check_schema_lock = threading.Lock()
+
 
 def _get_schema(version) -> dict[str, Any]:
     schema_filename = Path(__file__).parent.joinpath("schemas", version + ".json").resolve()
@@ -33,7 +38,13 @@ def validate_manifest(
     is valid for the given version. Returns False and a string explaining the error if the manifest is not valid.
     """
     try:
-        jsonschema.validate(manifest, _get_schema(version))
+        schema = _get_schema(version)
+        validator_cls = jsonschema.validators.validator_for(schema)
+        with _check_schema_lock:
+            validator_cls.check_schema(schema)
+        error = jsonschema.exceptions.best_match(validator_cls(schema).iter_errors(manifest))
+        if error is not None:
+            raise error
 
     except (jsonschema.ValidationError, jsonschema.SchemaError) as e:
         return False, str(e)
@@ -5,6 +5,7 @@
 import io
 
 from enum import Enum
+from typing import Optional
 
 from ..exceptions import UnsupportedHashingAlgorithmError
 
@@ -21,8 +22,14 @@ class HashAlgorithm(str, Enum):
     XXH128 = "xxh128"
 
 
-def hash_file(file_path: str, hash_alg: HashAlgorithm) -> str:
-    """Hashes the given file using the given hashing algorithm."""
+def hash_file(
+    file_path: str, hash_alg: HashAlgorithm, *, file_contents: Optional[bytearray] = None
+) -> str:
+    """
+    Hashes the given file using the given hashing algorithm.
+    If `file_contents` is given, the bytes read from the file are also appended to it, so that
+    the caller can use them without reading the file again.
+    """
     if hash_alg == HashAlgorithm.XXH128:
         from xxhash import xxh3_128
 
@@ -38,6 +45,8 @@ def hash_file(file_path: str, hash_alg: HashAlgorithm) -> str:
             if not chunk:
                 break
             hasher.update(chunk)
+            if file_contents is not None:
+                file_contents += chunk
         return hasher.hexdigest()
 
 
@@ -2,16 +2,20 @@
 
 """ Module for File Attachment synching """
 from __future__ import annotations
+import concurrent.futures
 from dataclasses import asdict
 import os
+import re
 import shutil
+import stat
 import sys
+import tempfile
 import time
 from io import BytesIO
 from logging import Logger, LoggerAdapter, getLogger
 from math import trunc
 from pathlib import Path, PurePosixPath
-from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple, Type, Union
 
 import boto3
 
@@ -35,6 +39,7 @@ from .asset_manifests import BaseManifestPath as RelativeFilePath
 from ._aws.aws_clients import get_boto3_session
 from ._aws.deadline import get_job, get_queue
 from .download import (
+    filter_asset_manifest,
     merge_asset_manifests,
     download_files_from_manifests,
     get_manifest_from_s3,
@@ -43,6 +48,7 @@ from .download import (
 )
 
 from .exceptions import (
+    AssetSyncCancelledError,
     AssetSyncError,
     VFSExecutableMissingError,
     JobAttachmentsS3ClientError,
@@ -51,6 +57,7 @@ from .exceptions import (
 from .vfs import VFSProcessManager
 from .models import (
     Attachments,
+    GlobConfig,
     JobAttachmentsFileSystem,
     JobAttachmentS3Settings,
     ManifestProperties,
@@ -59,16 +66,27 @@ from .models import (
     PathMappingRule,
 )
 from .upload import S3AssetUploader
+from ._output_streamer import (
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    DEFAULT_QUIESCENCE_SECONDS,
+    _OutputStreamer,
+)
 from .os_file_permission import FileSystemPermissionSettings, PosixFileSystemPermissionSettings
 from ._utils import (
     _float_to_iso_datetime_string,
     _get_unique_dest_dir_name,
     _human_readable_file_size,
     _join_s3_paths,
+    _walk_files,
 )
 
 logger = getLogger("deadline.job_attachments")
 
+# Matches a task parameter reference, e.g. "{{Task.Param.Frame}}", in an input filter pattern.
+_TASK_PARAMETER_REFERENCE_REGEX = re.compile(
+    r"\{\{\s*Task\.(?:Param|RawParam)\.([A-Za-z_][A-Za-z0-9_]*)\s*\}\}"
+)
+
 
 class AssetSync:
     """Class for managing AWS Deadline Cloud job-level attachments."""
@@ -105,6 +123,15 @@ class AssetSync:
         # This is used to determine if an asset has been modified since it was last synced.
         self.synced_assets_mtime: dict[str, int] = dict()
 
+        # Hashes of output files keyed by their resolved paths, along with the modification time (in
+        # nanoseconds) and size that each file had when it was hashed. A file that is found again by a
+        # later session action without having changed since then is not hashed again.
+        self._output_hash_cache: dict[str, Tuple[int, int, str]] = dict()
+        # S3 keys (prefixed with the bucket name) of output files that are known to exist in the CAS.
+        self._output_s3_keys_in_cas: Set[str] = set()
+        # Uploads output files in the background while a task is running, if started.
+        self._output_streamer: Optional[_OutputStreamer] = None
+
         self.hash_alg: HashAlgorithm = self.manifest_model.AssetManifest.get_default_hash_alg()
 
     @staticmethod
@@ -166,6 +193,49 @@ class AssetSync:
                 f"No path mapping rule found for the source path {manifest_properties.rootPath}"
             )
 
+    @staticmethod
+    def expand_input_filter(
+        input_filter: GlobConfig,
+        task_parameters: Optional[Dict[str, Any]] = None,
+    ) -> GlobConfig:
+        """
+        Expands the task parameter references in the given input filter patterns.
+
+        Args:
+            input_filter: include/exclude glob patterns that may reference task parameters
+                as "{{Task.Param.<Name>}}" or "{{Task.RawParam.<Name>}}".
+            task_parameters: the values of the task's parameters, keyed by parameter name. Values
+                may be plain values, or typed values as returned by the Deadline GetTask API,
+                e.g. {"int": "101"}.
+
+        Returns: a new GlobConfig with every task parameter reference replaced by its value.
+        Raises: AssetSyncError If a pattern references a parameter that the task does not define.
+        """
+        parameter_values: dict[str, str] = {}
+        for name, value in (task_parameters or {}).items():
+            if isinstance(value, dict) and len(value) == 1:
+                # Typed parameter value, such as {"int": "101"} or {"path": "/mnt/scene"}
+                value = next(iter(value.values()))
+            parameter_values[name] = str(value)
+
+        def expand(pattern: str) -> str:
+            def replace(match: re.Match) -> str:
+                name = match.group(1)
+                if name not in parameter_values:
+                    raise AssetSyncError(
+                        "Error occurred while attempting to sync input files: "
+                        f"The input filter pattern '{pattern}' references the task parameter "
+                        f"'{name}', but the task has no such parameter."
+                    )
+                return parameter_values[name]
+
+            return _TASK_PARAMETER_REFERENCE_REGEX.sub(replace, pattern)
+
+        return GlobConfig(
+            include_glob=[expand(pattern) for pattern in input_filter.include_glob],
+            exclude_glob=[expand(pattern) for pattern in input_filter.exclude_glob],
+        )
+
     def aggregate_asset_root_manifests(
         self,
         session_dir: Path,
@@ -271,6 +341,7 @@ class AssetSync:
         fs_permission_settings: Optional[FileSystemPermissionSettings] = None,
         merged_manifests_by_root: dict[str, BaseAssetManifest] = dict(),
         on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
+        downloaded_file_mtimes: Optional[dict[str, int]] = None,
     ) -> SummaryStatistics:
         """
         Args:
@@ -280,6 +351,8 @@ class AssetSync:
                                     to be set on the downloaded (synchronized) input files and directories.
             merged_manifests_by_root: Merged manifests produced by aggregate_asset_root_manifests()
             on_downloading_files: Callback when download files from S3.
+            downloaded_file_mtimes: If given, filled with the modification time (in nanoseconds)
+                                    of each downloaded file, keyed by its local path.
 
         Returns:
             The download summary statistics.
@@ -296,6 +369,7 @@ class AssetSync:
                 session=self.session,
                 on_downloading_files=on_downloading_files,
                 logger=self.logger,
+                downloaded_file_mtimes=downloaded_file_mtimes,
             ).convert_to_summary_statistics()
         except JobAttachmentsS3ClientError as exc:
             if exc.status_code == 404:
@@ -325,6 +399,8 @@ class AssetSync:
         step_dependencies: Optional[list[str]] = None,
         on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
         os_env_vars: Dict[str, str] | None = None,
+        input_filter: Optional[GlobConfig] = None,
+        task_parameters: Optional[Dict[str, Any]] = None,
     ) -> Tuple[SummaryStatistics, List[Dict[str, str]]]:
         """
         Depending on the fileSystem in the Attachments this will perform two
@@ -350,6 +426,11 @@ class AssetSync:
                 for each file being downloaded. If the function returns False, the download will be
                 cancelled. If it returns True, the download will continue.
             os_env_vars: environment variables to set for launched subprocesses
+            input_filter: include/exclude glob patterns, relative to each asset root, that narrow
+                the input files down to the ones the task needs. Patterns may reference task
+                parameters, e.g. "sim/frame_{{Task.Param.Frame}}.vdb", which are expanded using
+                `task_parameters`. If not given, all input files are synchronized.
+            task_parameters: the values of the task's parameters, keyed by parameter name.
 
         Returns:
             COPIED / None : a tuple of (1) final summary statistics for file downloads,
@@ -389,18 +470,28 @@ class AssetSync:
             )
         )
 
+        expanded_input_filter: Optional[GlobConfig] = None
+        if input_filter is not None:
+            expanded_input_filter = AssetSync.expand_input_filter(input_filter, task_parameters)
+
         # Merge the manifests in each root into a single manifest
         merged_manifests_by_root: dict[str, BaseAssetManifest] = dict()
         total_input_size: int = 0
         for root, manifests in grouped_manifests_by_root.items():
             merged_manifest = merge_asset_manifests(manifests)
 
+            if merged_manifest and expanded_input_filter is not None:
+                merged_manifest = self._filter_merged_manifest(
+                    root, merged_manifest, expanded_input_filter
+                )
+
             if merged_manifest:
                 merged_manifests_by_root[root] = merged_manifest
                 total_input_size += merged_manifest.totalSize  # type: ignore[attr-defined]
 
         # Download
         summary_statistics: SummaryStatistics = SummaryStatistics()
+        downloaded_file_mtimes: dict[str, int] = {}
         if (
             attachments.fileSystem == JobAttachmentsFileSystem.VIRTUAL.value
             and sys.platform != "win32"
@@ -426,14 +517,37 @@ class AssetSync:
                 fs_permission_settings=fs_permission_settings,
                 merged_manifests_by_root=merged_manifests_by_root,
                 on_downloading_files=on_downloading_files,
+                downloaded_file_mtimes=downloaded_file_mtimes,
             )
 
-        self._record_attachment_mtimes(merged_manifests_by_root)
+        self._record_attachment_mtimes(merged_manifests_by_root, downloaded_file_mtimes)
         return (
             summary_statistics,
             list(asdict(r) for r in dynamic_mapping_rules.values()),
         )
 
+    def _filter_merged_manifest(
+        self,
+        local_root: str,
+        merged_manifest: BaseAssetManifest,
+        input_filter: GlobConfig,
+    ) -> Optional[BaseAssetManifest]:
+        """
+        Narrows the merged manifest of an asset root down to the paths matching the input filter.
+        Returns None if no path in the asset root matches.
+        """
+        filtered_manifest = filter_asset_manifest(
+            merged_manifest,
+            include=input_filter.include_glob,
+            exclude=input_filter.exclude_glob,
+        )
+        self.logger.info(
+            f"Input filter selected {len(filtered_manifest.paths)} of {len(merged_manifest.paths)} input files"
+            f" totaling {_human_readable_file_size(filtered_manifest.totalSize)}"  # type: ignore[attr-defined]
+            f" for local root: {local_root}"
+        )
+        return filtered_manifest if filtered_manifest.paths else None
+
     def _upload_output_files_to_s3(
         self,
         s3_settings: JobAttachmentS3Settings,
@@ -456,11 +570,28 @@ class AssetSync:
 
         start_time = time.perf_counter()
 
+        # Each distinct output is uploaded once. Files that are already in the CAS, or that have the
+        # same content as another output file, are skipped.
+        files_to_upload: Dict[str, OutputFile] = {}
         for file in output_files:
-            if file.in_s3:
+            if file.in_s3 or file.s3_key in files_to_upload:
                 progress_tracker.increase_skipped(1, file.file_size)
-                continue
+            else:
+                files_to_upload[file.s3_key] = file
+
+        small_file_queue: List[OutputFile] = []
+        large_file_queue: List[OutputFile] = []
+        for file in files_to_upload.values():
+            if file.file_size <= self.s3_uploader.small_file_threshold:
+                small_file_queue.append(file)
+            else:
+                large_file_queue.append(file)
 
+        def upload_output_file(file: OutputFile) -> None:
+            if not progress_tracker.continue_reporting:
+                raise AssetSyncCancelledError(
+                    "File upload cancelled.", progress_tracker.get_summary_statistics()
+                )
             self.s3_uploader.upload_file_to_s3(
                 local_path=Path(file.full_path),
                 s3_bucket=s3_settings.s3BucketName,
@@ -469,6 +600,21 @@ class AssetSync:
                 base_dir_path=Path(file.base_dir) if file.base_dir else None,
             )
 
+        self.s3_uploader._upload_small_files_then_large_files(
+            small_file_queue,
+            large_file_queue,
+            upload_output_file,
+            cancel_event=progress_tracker.cancel_event,
+        )
+
+        # to report progress 100% at the end, and
+        # to check if the upload was canceled in the middle of processing the last batch of files.
+        progress_tracker.report_progress()
+        if not progress_tracker.continue_reporting:
+            raise AssetSyncCancelledError(
+                "File upload cancelled.", progress_tracker.get_summary_statistics()
+            )
+
         progress_tracker.total_time = time.perf_counter() - start_time
         return progress_tracker.get_summary_statistics()
 
@@ -534,70 +680,47 @@ class AssetSync:
         """
         Walks the output directories for this asset root for any output files that have been created or modified
         since the start time provided. Hashes and checks if the output files already exist in the CAS.
+
+        The output directories are walked on the calling thread, while the files that need to be
+        synced are resolved and hashed in a thread pool. The CAS is then checked once for each
+        distinct hash.
         """
         output_files: List[OutputFile] = []
 
-        source_path_format = manifest_properties.rootPathFormat
-        current_path_format = PathFormat.get_host_path_format()
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            for output_root in self._get_output_dirs(manifest_properties, local_root):
+                total_file_count = 0
+                total_file_size = 0
 
-        for output_dir in manifest_properties.outputRelativeDirectories or []:
-            if source_path_format != current_path_format:
-                if source_path_format == PathFormat.WINDOWS:
-                    output_dir = output_dir.replace("\\", "/")
-                elif source_path_format == PathFormat.POSIX:
-                    output_dir = output_dir.replace("/", "\\")
-            output_root: Path = local_root / output_dir
-
-            total_file_count = 0
-            total_file_size = 0
-
-            # Don't fail if output dir hasn't been created yet; another task might be working on it
-            if not output_root.is_dir():
-                self.logger.info(f"Found 0 files (Output directory {output_root} does not exist.)")
-                continue
-
-            # Get all files in this directory (includes sub-directories)
-            for file_path in output_root.glob("**/*"):
-                # Files that are new or have been modified since the last sync will be added to the output list.
-                mtime_when_synced = self.synced_assets_mtime.get(str(file_path), None)
-                file_mtime = file_path.stat().st_mtime_ns
-                is_modified = False
-                if mtime_when_synced:
-                    if file_mtime > int(mtime_when_synced):
-                        # This file has been modified during this session action.
-                        is_modified = True
-                else:
-                    # This is a new file created during this session action.
-                    self.synced_assets_mtime[str(file_path)] = int(file_mtime)
-                    is_modified = True
-
-                # Resolve the real path to prevent time-of-check/time-of-use vulnerability
-                file_real_path = file_path.resolve()
-
-                # validate that the file resolves inside of the session working directory.
-                is_file_path_under_session_dir = self._is_file_within_directory(
-                    file_real_path, session_dir
-                )
-                if is_file_path_under_session_dir is False:
+                # Don't fail if output dir hasn't been created yet; another task might be working on it
+                if not output_root.is_dir():
                     self.logger.info(
-                        f"Skipping file '{file_path}' as its resolved path '{file_real_path}' is"
-                        f" outside the session directory '{session_dir}'"
+                        f"Found 0 files (Output directory {output_root} does not exist.)"
                     )
                     continue
 
-                if (
-                    not file_real_path.is_dir()
-                    and file_real_path.exists()
-                    and is_modified
-                    and is_file_path_under_session_dir
+                # Get all files in this directory (includes sub-directories) that are new or have been
+                # modified since the last sync.
+                modified_file_paths = [
+                    file_path
+                    for file_path, file_stat in _walk_files(output_root)
+                    if self._is_modified_since_synced(file_path, file_stat.st_mtime_ns)
+                ]
+
+                # Results are returned in the order of the walk, so the output list is deterministic.
+                for file_path, hashed_file in zip(
+                    modified_file_paths,
+                    executor.map(
+                        lambda file_path: self._hash_output_file(file_path, session_dir),
+                        modified_file_paths,
+                    ),
                 ):
-                    file_size = file_real_path.resolve().lstat().st_size
-                    file_hash = hash_file(str(file_real_path), self.hash_alg)
+                    if hashed_file is None:
+                        continue
+                    file_real_path, file_size, file_hash = hashed_file
                     s3_key = f"{file_hash}.{self.hash_alg.value}"
-
                     if s3_settings.full_cas_prefix():
                         s3_key = _join_s3_paths(s3_settings.full_cas_prefix(), s3_key)
-                    in_s3 = self.s3_uploader.file_already_uploaded(s3_settings.s3BucketName, s3_key)
 
                     total_file_count += 1
                     total_file_size += file_size
@@ -609,18 +732,153 @@ class AssetSync:
                             rel_path=str(PurePosixPath(*file_path.relative_to(local_root).parts)),
                             full_path=str(file_real_path),
                             s3_key=s3_key,
-                            in_s3=in_s3,
+                            in_s3=False,
                             base_dir=str(session_dir),
                         )
                     )
 
+                self.logger.info(
+                    f"Found {total_file_count} file{'' if total_file_count == 1 else 's'}"
+                    f" totaling {_human_readable_file_size(total_file_size)}"
+                    f" in output directory: {str(output_root)}"
+                )
+
+        keys_in_s3 = self._get_output_s3_keys_in_cas(
+            s3_settings.s3BucketName, {output_file.s3_key for output_file in output_files}
+        )
+        for output_file in output_files:
+            output_file.in_s3 = output_file.s3_key in keys_in_s3
+
+        return output_files
+
+    def _get_output_roots(
+        self,
+        attachments: Attachments,
+        session_dir: Path,
+        storage_profiles_path_mapping_rules: dict[str, str],
+    ) -> List[Tuple[ManifestProperties, Path, Path]]:
+        """
+        Returns the (manifest properties, local root, session root) of each asset root in the
+        attachments. Output files are only synced if they resolve to a location inside the session root.
+        """
+        output_roots: List[Tuple[ManifestProperties, Path, Path]] = []
+        storage_profiles_source_paths = list(storage_profiles_path_mapping_rules.keys())
+
+        for manifest_properties in attachments.manifests:
+            session_root = session_dir
+            local_root: Path = Path()
+            if (
+                len(storage_profiles_path_mapping_rules) > 0
+                and manifest_properties.fileSystemLocationName
+            ):
+                if manifest_properties.rootPath in storage_profiles_source_paths:
+                    local_root = Path(
+                        storage_profiles_path_mapping_rules[manifest_properties.rootPath]
+                    )
+                    # We use session_root to filter out any files resolved to a location outside
+                    # of that directory. If storage profile's path mapping rules are available,
+                    # we can consider the session_root to be the mapped-storage profile path.
+                    session_root = local_root
+                else:
+                    raise AssetSyncError(
+                        "Error occurred while attempting to sync output files: "
+                        f"No path mapping rule found for the source path {manifest_properties.rootPath}"
+                    )
+            else:
+                dir_name: str = _get_unique_dest_dir_name(manifest_properties.rootPath)
+                local_root = session_dir.joinpath(dir_name)
+            output_roots.append((manifest_properties, local_root, session_root))
+        return output_roots
+
+    def _get_output_dirs(
+        self, manifest_properties: ManifestProperties, local_root: Path
+    ) -> List[Path]:
+        """Returns the output directories of an asset root, converted to the host's path format."""
+        output_dirs: List[Path] = []
+        source_path_format = manifest_properties.rootPathFormat
+        current_path_format = PathFormat.get_host_path_format()
+        for output_dir in manifest_properties.outputRelativeDirectories or []:
+            if source_path_format != current_path_format:
+                if source_path_format == PathFormat.WINDOWS:
+                    output_dir = output_dir.replace("\\", "/")
+                elif source_path_format == PathFormat.POSIX:
+                    output_dir = output_dir.replace("/", "\\")
+            output_dirs.append(local_root / output_dir)
+        return output_dirs
+
+    def _is_modified_since_synced(self, file_path: Path, file_mtime: int) -> bool:
+        """
+        Returns whether the file is new, or has been modified since it was last synced. New files
+        are recorded with their current modification time.
+        """
+        mtime_when_synced = self.synced_assets_mtime.get(str(file_path), None)
+        if mtime_when_synced:
+            # Whether this file has been modified during this session action.
+            return file_mtime > int(mtime_when_synced)
+        # This is a new file created during this session action.
+        self.synced_assets_mtime[str(file_path)] = int(file_mtime)
+        return True
+
+    def _hash_output_file(
+        self, file_path: Path, session_dir: Path
+    ) -> Optional[Tuple[Path, int, str]]:
+        """
+        Resolves and hashes an output file. Returns its real path, size and hash, or None if the file
+        should not be synced because it resolves outside the session directory or is not a file.
+        """
+        # Resolve the real path to prevent time-of-check/time-of-use vulnerability
+        file_real_path = file_path.resolve()
+
+        # validate that the file resolves inside of the session working directory.
+        if not self._is_file_within_directory(file_real_path, session_dir):
             self.logger.info(
-                f"Found {total_file_count} file{'' if total_file_count == 1 else 's'}"
-                f" totaling {_human_readable_file_size(total_file_size)}"
-                f" in output directory: {str(output_root)}"
+                f"Skipping file '{file_path}' as its resolved path '{file_real_path}' is"
+                f" outside the session directory '{session_dir}'"
             )
+            return None
 
-        return output_files
+        try:
+            file_stat = file_real_path.stat()
+        except FileNotFoundError:
+            return None
+        if stat.S_ISDIR(file_stat.st_mode):
+            return None
+
+        cache_key = str(file_real_path)
+        cached = self._output_hash_cache.get(cache_key)
+        if cached is not None and cached[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+            file_hash = cached[2]
+        else:
+            file_hash = hash_file(cache_key, self.hash_alg)
+            self._output_hash_cache[cache_key] = (
+                file_stat.st_mtime_ns,
+                file_stat.st_size,
+                file_hash,
+            )
+        return file_real_path, file_stat.st_size, file_hash
+
+    def _get_output_s3_keys_in_cas(self, s3_bucket: str, s3_keys: Set[str]) -> Set[str]:
+        """
+        Returns which of the given keys exist in the S3 bucket. Keys that were already found by an
+        earlier sync are not checked again, and the rest are checked concurrently.
+        """
+        keys_to_check = [
+            key for key in s3_keys if f"{s3_bucket}/{key}" not in self._output_s3_keys_in_cas
+        ]
+        if keys_to_check:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.s3_uploader.num_upload_workers
+            ) as executor:
+                for key, in_s3 in zip(
+                    keys_to_check,
+                    executor.map(
+                        lambda key: self.s3_uploader.file_already_uploaded(s3_bucket, key),
+                        keys_to_check,
+                    ),
+                ):
+                    if in_s3:
+                        self._output_s3_keys_in_cas.add(f"{s3_bucket}/{key}")
+        return {key for key in s3_keys if f"{s3_bucket}/{key}" in self._output_s3_keys_in_cas}
 
     def _is_file_within_directory(self, file_path: Path, directory_path: Path) -> bool:
         """
@@ -657,15 +915,23 @@ class AssetSync:
         return job.attachments if job and job.attachments else None
 
     def _record_attachment_mtimes(
-        self, merged_manifests_by_root: dict[str, BaseAssetManifest]
+        self,
+        merged_manifests_by_root: dict[str, BaseAssetManifest],
+        downloaded_file_mtimes: Optional[dict[str, int]] = None,
     ) -> None:
         # Record the mapping of downloaded files' absolute paths to their last modification time
-        # (in microseconds). This is used to later determine which files have been modified or
+        # (in nanoseconds). This is used to later determine which files have been modified or
         # newly created during the session and need to be uploaded as output.
+        # The modification times reported by the download are used as is; only the files that
+        # were not downloaded (e.g. mounted through the VFS) are stat'ed.
+        downloaded_file_mtimes = downloaded_file_mtimes or {}
         for local_root, merged_manifest in merged_manifests_by_root.items():
             for manifest_path in merged_manifest.paths:
                 abs_path = str(Path(local_root) / manifest_path.path)
-                self.synced_assets_mtime[abs_path] = Path(abs_path).stat().st_mtime_ns
+                mtime_ns = downloaded_file_mtimes.get(abs_path)
+                if mtime_ns is None:
+                    mtime_ns = Path(abs_path).stat().st_mtime_ns
+                self.synced_assets_mtime[abs_path] = mtime_ns
 
     def _ensure_disk_capacity(self, session_dir: Path, total_input_bytes: int) -> None:
         """
@@ -830,6 +1096,7 @@ class AssetSync:
 
         # Copied Download flow
         self._ensure_disk_capacity(session_dir, total_input_size)
+        downloaded_file_mtimes: dict[str, int] = {}
         try:
             download_summary_statistics = download_files_from_manifests(
                 s3_bucket=s3_settings.s3BucketName,
@@ -839,6 +1106,7 @@ class AssetSync:
                 session=self.session,
                 on_downloading_files=on_downloading_files,
                 logger=self.logger,
+                downloaded_file_mtimes=downloaded_file_mtimes,
             )
         except JobAttachmentsS3ClientError as exc:
             if exc.status_code == 404:
@@ -856,13 +1124,124 @@ class AssetSync:
             else:
                 raise
 
-        self._record_attachment_mtimes(merged_manifests_by_root)
+        self._record_attachment_mtimes(merged_manifests_by_root, downloaded_file_mtimes)
 
         return (
             download_summary_statistics.convert_to_summary_statistics(),
             list(pathmapping_rules.values()),
         )
 
+    def start_output_streaming(
+        self,
+        s3_settings: Optional[JobAttachmentS3Settings],
+        attachments: Optional[Attachments],
+        session_dir: Path,
+        storage_profiles_path_mapping_rules: dict[str, str] = {},
+        quiescence_seconds: float = DEFAULT_QUIESCENCE_SECONDS,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Starts uploading output files to the CAS in the background while the task is running. Output
+        files are uploaded once their modification time and size have not changed for
+        `quiescence_seconds`, and uploaded again if they are rewritten afterwards.
+
+        The output manifest is still written by `sync_outputs`, which stops the streaming first, and
+        then only needs to upload the output files that were not streamed, or that changed since.
+        """
+        self.stop_output_streaming()
+        if not s3_settings or not attachments:
+            return
+
+        output_dirs: List[Tuple[Path, Path]] = []
+        for manifest_properties, local_root, session_root in self._get_output_roots(
+            attachments, session_dir, storage_profiles_path_mapping_rules
+        ):
+            for output_dir in self._get_output_dirs(manifest_properties, local_root):
+                output_dirs.append((output_dir, session_root))
+
+        self._output_streamer = _OutputStreamer(
+            output_dirs,
+            lambda file_path, session_root: self._stream_output_file(
+                file_path, session_root, s3_settings
+            ),
+            logger=self.logger,
+            quiescence_seconds=quiescence_seconds,
+            poll_interval_seconds=poll_interval_seconds,
+        )
+        self._output_streamer.start()
+
+    def stop_output_streaming(self) -> None:
+        """Stops uploading output files in the background, if it was started."""
+        if self._output_streamer is not None:
+            self._output_streamer.stop()
+            self._output_streamer = None
+
+    def _stream_output_file(
+        self, file_path: Path, session_dir: Path, s3_settings: JobAttachmentS3Settings
+    ) -> None:
+        """
+        Uploads an output file to the CAS ahead of `sync_outputs`. The hash and the upload are
+        recorded in the same caches that `sync_outputs` consults, so that it does neither again
+        for a file that has not changed since.
+
+        The task may still be writing to the file, so it is first copied to a private temporary
+        file, and that copy is hashed and uploaded. This way the object in the CAS always has the
+        content of its hash. If the file changed while it was being copied, this raises, and the
+        file is streamed again once it is quiescent.
+        """
+        # Only stream the files that `sync_outputs` would sync, without recording them as synced.
+        mtime_when_synced = self.synced_assets_mtime.get(str(file_path), None)
+        if mtime_when_synced and file_path.stat().st_mtime_ns <= int(mtime_when_synced):
+            return
+
+        # Resolve the real path to prevent time-of-check/time-of-use vulnerability
+        file_real_path = file_path.resolve()
+        if not self._is_file_within_directory(file_real_path, session_dir):
+            return
+        try:
+            file_stat = file_real_path.stat()
+        except FileNotFoundError:
+            return
+        if not stat.S_ISREG(file_stat.st_mode):
+            return
+        file_state = (file_stat.st_mtime_ns, file_stat.st_size)
+
+        with tempfile.TemporaryDirectory(prefix="deadline-output-") as temp_dir:
+            temp_path = Path(temp_dir) / file_real_path.name
+            with self.s3_uploader._open_non_symlink_file_binary(str(file_real_path)) as src:
+                if src is None:
+                    return
+                with open(temp_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            file_stat = file_real_path.stat()
+            if (file_stat.st_mtime_ns, file_stat.st_size) != file_state or (
+                temp_path.stat().st_size != file_stat.st_size
+            ):
+                raise AssetSyncError(f"Output file '{file_path}' changed while it was being read")
+
+            file_hash = hash_file(str(temp_path), self.hash_alg)
+            self._output_hash_cache[str(file_real_path)] = (*file_state, file_hash)
+            s3_key = f"{file_hash}.{self.hash_alg.value}"
+            if s3_settings.full_cas_prefix():
+                s3_key = _join_s3_paths(s3_settings.full_cas_prefix(), s3_key)
+
+            if self._get_output_s3_keys_in_cas(s3_settings.s3BucketName, {s3_key}):
+                return
+            self.s3_uploader.upload_file_to_s3(
+                local_path=temp_path,
+                s3_bucket=s3_settings.s3BucketName,
+                s3_upload_key=s3_key,
+            )
+        # Check that the upload happened before `sync_outputs` relies on it.
+        if not self._get_output_s3_keys_in_cas(s3_settings.s3BucketName, {s3_key}):
+            raise AssetSyncError(f"Output file '{file_path}' was not uploaded to {s3_key}")
+        # The upload was of the copy, so it is still consistent, but a file that changed in the
+        # meantime is reported so that it is streamed again.
+        file_stat = file_real_path.stat()
+        if (file_stat.st_mtime_ns, file_stat.st_size) != file_state:
+            raise AssetSyncError(f"Output file '{file_path}' changed while it was being uploaded")
+        self.logger.debug(f"Streamed output file '{file_path}' to {s3_key}")
+
     def sync_outputs(
         self,
         s3_settings: Optional[JobAttachmentS3Settings],
@@ -887,41 +1266,27 @@ class AssetSync:
             self.logger.info(f"No attachments configured for Job {job_id}, no outputs to sync.")
             return SummaryStatistics()
 
-        all_output_files: List[OutputFile] = []
+        # Finish streaming outputs first, so that every file streamed so far is known to be in the CAS.
+        self.stop_output_streaming()
 
-        storage_profiles_source_paths = list(storage_profiles_path_mapping_rules.keys())
-
-        for manifest_properties in attachments.manifests:
-            session_root = session_dir
-            local_root: Path = Path()
-            if (
-                len(storage_profiles_path_mapping_rules) > 0
-                and manifest_properties.fileSystemLocationName
-            ):
-                if manifest_properties.rootPath in storage_profiles_source_paths:
-                    local_root = Path(
-                        storage_profiles_path_mapping_rules[manifest_properties.rootPath]
-                    )
-                    # We use session_root to filter out any files resolved to a location outside
-                    # of that directory. If storage profile's path mapping rules are available,
-                    # we can consider the session_root to be the mapped-storage profile path.
-                    session_root = local_root
-                else:
-                    raise AssetSyncError(
-                        "Error occurred while attempting to sync output files: "
-                        f"No path mapping rule found for the source path {manifest_properties.rootPath}"
-                    )
-            else:
-                dir_name: str = _get_unique_dest_dir_name(manifest_properties.rootPath)
-                local_root = session_dir.joinpath(dir_name)
+        all_output_files: List[OutputFile] = []
+        # Time spent in each phase of the sync, in seconds, for the log.
+        discovery_seconds = 0.0
+        manifest_upload_seconds = 0.0
 
+        for manifest_properties, local_root, session_root in self._get_output_roots(
+            attachments, session_dir, storage_profiles_path_mapping_rules
+        ):
+            phase_start_time = time.perf_counter()
             output_files: List[OutputFile] = self._get_output_files(
                 manifest_properties,
                 s3_settings,
                 local_root,
                 session_root,
             )
+            discovery_seconds += time.perf_counter() - phase_start_time
             if output_files:
+                phase_start_time = time.perf_counter()
                 output_manifest = self._generate_output_manifest(output_files)
                 session_action_id_with_time_stamp = (
                     f"{_float_to_iso_datetime_string(start_time)}_{session_action_id}"
@@ -941,6 +1306,7 @@ class AssetSync:
                     root_path=manifest_properties.rootPath,
                     file_system_location_name=manifest_properties.fileSystemLocationName,
                 )
+                manifest_upload_seconds += time.perf_counter() - phase_start_time
                 all_output_files.extend(output_files)
 
         if all_output_files:
@@ -954,6 +1320,12 @@ class AssetSync:
             )
         else:
             summary_stats = SummaryStatistics()
+
+        self.logger.info(
+            f"Output sync timing: {discovery_seconds:.2f}s finding and hashing files,"
+            f" {manifest_upload_seconds:.2f}s uploading manifests,"
+            f" {summary_stats.total_time:.2f}s uploading files"
+        )
         return summary_stats
 
     def cleanup_session(
@@ -962,6 +1334,7 @@ class AssetSync:
         file_system: JobAttachmentsFileSystem,
         os_user: Optional[str] = None,
     ):
+        self.stop_output_streaming()
         if file_system == JobAttachmentsFileSystem.COPIED.value:
             return
         if not os_user:
@@ -9,13 +9,14 @@ import os
 import re
 import sys
 import time
+import uuid
 from collections import defaultdict
 from datetime import datetime
 from itertools import chain
 from logging import Logger, LoggerAdapter, getLogger
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Any, Callable, DefaultDict, List, Optional, Tuple, Union
+from typing import Any, Callable, DefaultDict, List, NamedTuple, Optional, Tuple, Union
 
 import boto3
 from boto3.s3.transfer import ProgressCallbackInvoker
@@ -65,10 +66,18 @@ from .os_file_permission import (
     FileSystemPermissionSettings,
     PosixFileSystemPermissionSettings,
     WindowsFileSystemPermissionSettings,
+    _PosixPermissionsAtCreation,
     _set_fs_group_for_posix,
     _set_fs_permission_for_windows,
 )
-from ._utils import _is_relative_to, _join_s3_paths, _is_windows_file_path_limit
+from ._glob import _filter_relative_paths
+from ._ranged_download import RANGED_GET_THRESHOLD_BYTES, download_file_with_ranged_gets
+from ._utils import (
+    _bounded_imap_unordered,
+    _is_relative_to,
+    _join_s3_paths,
+    _is_windows_file_path_limit,
+)
 
 download_logger = getLogger("deadline.job_attachments.download")
 
@@ -94,7 +103,39 @@ def get_manifest_from_s3(
         asset_manifest = decode_manifest(string_value)
         file_buffer.close()
         return asset_manifest
-    except ClientError as exc:
+    except Exception as exc:
+        raise _get_manifest_download_error(exc, manifest_key, s3_bucket) from exc
+
+
+def _get_output_manifest_and_asset_root_from_s3(
+    manifest_key: str, s3_bucket: str, session: Optional[boto3.Session] = None
+) -> Tuple[BaseAssetManifest, Optional[str]]:
+    """
+    Downloads an output manifest with a single GET request, returning the decoded manifest
+    together with the asset root stored in the object's metadata (or None if it is missing.)
+    """
+    s3_client = get_s3_client(session=session)
+    try:
+        response = s3_client.get_object(
+            Bucket=s3_bucket,
+            Key=manifest_key,
+            ExpectedBucketOwner=get_account_id(session=session),
+        )
+        asset_manifest = decode_manifest(response["Body"].read().decode("utf-8"))
+    except Exception as exc:
+        raise _get_manifest_download_error(exc, manifest_key, s3_bucket) from exc
+
+    return asset_manifest, _get_asset_root_from_metadata(response.get("Metadata", {}))
+
+
+def _get_manifest_download_error(
+    exc: Exception, manifest_key: str, s3_bucket: str
+) -> AssetSyncError:
+    """
+    Converts an exception raised while downloading a manifest into the corresponding
+    Job Attachments error.
+    """
+    if isinstance(exc, ClientError):
         status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
         status_code_guidance = {
             **COMMON_ERROR_GUIDANCE_FOR_S3,
@@ -112,20 +153,20 @@ def get_manifest_from_s3(
             ),
             404: "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account.",
         }
-        raise JobAttachmentsS3ClientError(
+        return JobAttachmentsS3ClientError(
             action="downloading binary file",
             status_code=status_code,
             bucket_name=s3_bucket,
             key_or_prefix=manifest_key,
             message=f"{status_code_guidance.get(status_code, '')} {str(exc)}",
-        ) from exc
-    except BotoCoreError as bce:
-        raise JobAttachmentS3BotoCoreError(
+        )
+    elif isinstance(exc, BotoCoreError):
+        return JobAttachmentS3BotoCoreError(
             action="downloading binary file",
-            error_details=str(bce),
-        ) from bce
-    except Exception as e:
-        raise AssetSyncError(e) from e
+            error_details=str(exc),
+        )
+    else:
+        return AssetSyncError(exc)
 
 
 def _get_output_manifest_prefix(
@@ -166,37 +207,84 @@ def _get_output_manifest_prefix(
     return f"{manifest_prefix}/"
 
 
+def _list_s3_objects(
+    s3_client: BaseClient, s3_bucket: str, prefix: str, delimiter: Optional[str] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Lists the given S3 prefix, returning a tuple of the object keys and the common prefixes.
+    Common prefixes are only returned when a delimiter is given.
+    """
+    keys: List[str] = []
+    common_prefixes: List[str] = []
+    paginate_args = {"Bucket": s3_bucket, "Prefix": prefix}
+    if delimiter:
+        paginate_args["Delimiter"] = delimiter
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(**paginate_args):
+        keys.extend(content["Key"] for content in page.get("Contents", []))
+        common_prefixes.extend(
+            common_prefix["Prefix"] for common_prefix in page.get("CommonPrefixes", [])
+        )
+    return keys, common_prefixes
+
+
+def _is_step_prefix(prefix: str) -> bool:
+    """Returns whether the last folder of the S3 prefix is a step, e.g. ".../step-123/"."""
+    return prefix.rstrip("/").rsplit("/", 1)[-1].startswith("step-")
+
+
 def _get_tasks_manifests_keys_from_s3(
     manifest_prefix: str, s3_bucket: str, session: Optional[boto3.Session] = None
 ) -> List[str]:
     """
     Returns the keys of all output manifests from the given s3 prefix.
     (Only the manifests that end with the prefix pattern task-*/*_output)
+
+    The prefix is first listed with a delimiter to split it by its next level of sub-prefixes
+    (steps for a job prefix, tasks for a step prefix). Step prefixes are split the same way into
+    their task prefixes, concurrently, and then the task prefixes are listed concurrently.
     """
     manifests_keys: List[str] = []
     s3_client = get_s3_client(session=session)
     try:
-        paginator = s3_client.get_paginator("list_objects_v2")
-        page_iterator = paginator.paginate(
-            Bucket=s3_bucket,
-            Prefix=manifest_prefix,
+        all_keys, sub_prefixes = _list_s3_objects(
+            s3_client, s3_bucket, manifest_prefix, delimiter="/"
         )
+        if sub_prefixes:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=get_s3_max_pool_connections()
+            ) as executor:
+                # executor.map keeps the listing results in the (alphabetical) order of the sub-prefixes.
+                if all(_is_step_prefix(sub_prefix) for sub_prefix in sub_prefixes):
+                    step_prefixes, sub_prefixes = sub_prefixes, []
+                    for keys, step_sub_prefixes in executor.map(
+                        lambda step_prefix: _list_s3_objects(
+                            s3_client, s3_bucket, step_prefix, delimiter="/"
+                        ),
+                        step_prefixes,
+                    ):
+                        all_keys.extend(keys)
+                        sub_prefixes.extend(step_sub_prefixes)
+                for keys, _ in executor.map(
+                    lambda sub_prefix: _list_s3_objects(s3_client, s3_bucket, sub_prefix),
+                    sub_prefixes,
+                ):
+                    all_keys.extend(keys)
+
+        if not all_keys:
+            raise JobAttachmentsError(
+                f"Unable to find asset manifest in s3://{s3_bucket}/{manifest_prefix}"
+            )
 
         # 1. Find all files that match the pattern: task-{any}/{any}/{any}-output
         task_prefixes = defaultdict(list)
-        for page in page_iterator:
-            contents = page.get("Contents", None)
-            if contents is None:
-                raise JobAttachmentsError(
-                    f"Unable to find asset manifest in s3://{s3_bucket}/{manifest_prefix}"
-                )
-            for content in contents:
-                if re.search(r"task-.*/.*/.*_output", content["Key"]):
-                    parts = content["Key"].split("/")
-                    for i, part in enumerate(parts):
-                        if "task-" in part:
-                            task_folder = "/".join(parts[: i + 1])
-                            task_prefixes[task_folder].append(content["Key"])
+        for key in all_keys:
+            if re.search(r"task-.*/.*/.*_output", key):
+                parts = key.split("/")
+                for i, part in enumerate(parts):
+                    if "task-" in part:
+                        task_folder = "/".join(parts[: i + 1])
+                        task_prefixes[task_folder].append(key)
 
     except ClientError as exc:
         status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
@@ -394,13 +482,47 @@ def download_file(
     - The file size of 0 means that this file comes from a manifest version that does not provide file sizes.
     - The filename of None indicates that this file has been skipped or has not been downloaded.
     """
+    file_bytes, local_file_name, _ = _download_file(
+        file,
+        hash_algorithm,
+        local_download_dir,
+        s3_bucket,
+        cas_prefix,
+        s3_client,
+        session,
+        progress_tracker,
+        file_conflict_resolution,
+    )
+    return (file_bytes, local_file_name)
+
+
+def _download_file(
+    file: RelativeFilePath,
+    hash_algorithm: HashAlgorithm,
+    local_download_dir: str,
+    s3_bucket: str,
+    cas_prefix: Optional[str],
+    s3_client: Optional[BaseClient] = None,
+    session: Optional[boto3.Session] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+    file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    fs_permissions: Optional[_PosixPermissionsAtCreation] = None,
+) -> Tuple[int, Optional[Path], Optional[int]]:
+    """
+    Downloads a file as `download_file` does, and additionally returns the modification time (in nanoseconds)
+    of the downloaded file, or None if it was skipped.
+
+    The data is written to a temporary file next to the destination, which is renamed into place once complete.
+    If `fs_permissions` is given, the group ownership and permissions are applied to the temporary file and the
+    directories as they are created, so that no separate pass over the downloaded files is needed.
+    """
     if not s3_client:
         s3_client = get_s3_client(session=session)
 
     transfer_manager = get_s3_transfer_manager(s3_client=s3_client)
 
-    # The modified time in the manifest is in microseconds, but utime requires the time be expressed in seconds.
-    modified_time_override = file.mtime / 1000000  # type: ignore[attr-defined]
+    # The modified time in the manifest is in microseconds.
+    modified_time_ns: int = file.mtime * 1000  # type: ignore[attr-defined]
 
     file_bytes = file.size
 
@@ -416,7 +538,7 @@ def download_file(
     # If the file name already exists, resolve the conflict based on the file_conflict_resolution
     if local_file_name.is_file():
         if file_conflict_resolution == FileConflictResolution.SKIP:
-            return (file_bytes, None)
+            return (file_bytes, None, None)
         elif file_conflict_resolution == FileConflictResolution.OVERWRITE:
             pass
         elif file_conflict_resolution == FileConflictResolution.CREATE_COPY:
@@ -431,8 +553,13 @@ def download_file(
                 f"Unknown choice for file conflict resolution: {file_conflict_resolution}"
             )
 
-    local_file_name.parent.mkdir(parents=True, exist_ok=True)
+    if fs_permissions is not None:
+        fs_permissions.make_dirs(local_file_name.parent)
+    else:
+        local_file_name.parent.mkdir(parents=True, exist_ok=True)
 
+    temp_file_name = local_file_name.with_name(f"{local_file_name.name}.{uuid.uuid4().hex[:8]}")
+    fd = -1
     future: concurrent.futures.Future
 
     def handler(bytes_downloaded):
@@ -446,16 +573,69 @@ def download_file(
 
     subscribers = [ProgressCallbackInvoker(handler)]
 
-    future = transfer_manager.download(
-        bucket=s3_bucket,
-        key=s3_key,
-        fileobj=str(local_file_name),
-        extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
-        subscribers=subscribers,
+    # Large files are fetched with parallel ranged GETs that each get their own connection, and
+    # are verified against the manifest hash as they stream in.
+    use_ranged_gets = (
+        file_bytes >= RANGED_GET_THRESHOLD_BYTES and hash_algorithm == HashAlgorithm.XXH128
     )
 
+    def download_object(key: str) -> None:
+        nonlocal future
+        nonlocal fd
+
+        if not use_ranged_gets and fs_permissions is None:
+            # The transfer manager downloads to its own temporary file and renames it into place.
+            future = transfer_manager.download(
+                bucket=s3_bucket,
+                key=key,
+                fileobj=str(local_file_name),
+                extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
+                subscribers=subscribers,
+            )
+            future.result()
+            return
+
+        fd = os.open(
+            temp_file_name,
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+            0o666,
+        )
+        try:
+            if fs_permissions is not None:
+                fs_permissions.apply_to_file(fd)
+
+            if use_ranged_gets:
+                download_file_with_ranged_gets(
+                    s3_client=s3_client,  # type: ignore[arg-type]
+                    s3_bucket=s3_bucket,
+                    s3_key=key,
+                    fd=fd,
+                    file_size=file_bytes,
+                    expected_hash=file.hash,  # type: ignore[arg-type]
+                    hash_algorithm=hash_algorithm,
+                    max_connections=get_s3_max_pool_connections(),
+                    progress_tracker=progress_tracker,
+                    extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
+                )
+                return
+
+            with os.fdopen(fd, "wb", closefd=False) as fileobj:
+                future = transfer_manager.download(
+                    bucket=s3_bucket,
+                    key=key,
+                    fileobj=fileobj,
+                    extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
+                    subscribers=subscribers,
+                )
+                future.result()
+        except BaseException:
+            os.close(fd)
+            fd = -1
+            _remove_file_if_exists(temp_file_name)
+            raise
+
     try:
-        future.result()
+        download_object(s3_key)
     except concurrent.futures.CancelledError as ce:
         if progress_tracker and progress_tracker.continue_reporting is False:
             raise AssetSyncCancelledError("File download cancelled.")
@@ -494,15 +674,8 @@ def download_file(
         status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
         if status_code == 404:
             s3_key = s3_key.rsplit(".", 1)[0]
-            future = transfer_manager.download(
-                bucket=s3_bucket,
-                key=s3_key,
-                fileobj=str(local_file_name),
-                extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
-                subscribers=subscribers,
-            )
             try:
-                future.result()
+                download_object(s3_key)
             except concurrent.futures.CancelledError as ce:
                 if progress_tracker and progress_tracker.continue_reporting is False:
                     raise AssetSyncCancelledError("File download cancelled.")
@@ -518,6 +691,8 @@ def download_file(
             action="downloading file",
             error_details=str(bce),
         ) from bce
+    except AssetSyncError:
+        raise
     except Exception as e:
         # Add 9 to account for .Hex value when file in the middle of downloading in windows paths
         # For example: file test.txt when download will be test.txt.H4SD9Ddj
@@ -540,10 +715,47 @@ def download_file(
         # Path start with \\?\ and registry is enable, something else cause this error
         raise AssetSyncError(e) from e
 
+    # Set the modification time through the open file where supported, which also gives us the
+    # final modification time without having to stat the file by path afterwards.
+    try:
+        if fd >= 0 and os.utime in os.supports_fd:
+            os.utime(fd, ns=(modified_time_ns, modified_time_ns))
+            downloaded_mtime_ns = os.fstat(fd).st_mtime_ns
+            os.close(fd)
+            fd = -1
+            os.replace(temp_file_name, local_file_name)
+        else:
+            if fd >= 0:
+                os.close(fd)
+                fd = -1
+                os.replace(temp_file_name, local_file_name)
+            os.utime(local_file_name, ns=(modified_time_ns, modified_time_ns))
+            downloaded_mtime_ns = os.stat(local_file_name).st_mtime_ns
+    except OSError as e:
+        if fd >= 0:
+            os.close(fd)
+        _remove_file_if_exists(temp_file_name)
+        raise AssetSyncError(e) from e
+
     download_logger.debug(f"Downloaded {file.path} to {str(local_file_name)}")
-    os.utime(local_file_name, (modified_time_override, modified_time_override))  # type: ignore[arg-type]
 
-    return (file_bytes, local_file_name)
+    return (file_bytes, local_file_name, downloaded_mtime_ns)
+
+
+def _remove_file_if_exists(path: Path) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class _DownloadGroup(NamedTuple):
+    """Files to download under one local root, all hashed with the same hash algorithm."""
+
+    files: List[RelativeFilePath]
+    hash_algorithm: HashAlgorithm
+    local_download_dir: str
+    fs_permissions: Optional[_PosixPermissionsAtCreation] = None
 
 
 def _download_files_parallel(
@@ -558,48 +770,114 @@ def _download_files_parallel(
     file_mod_time: Optional[float] = None,
     progress_tracker: Optional[ProgressTracker] = None,
     file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    fs_permissions: Optional[_PosixPermissionsAtCreation] = None,
+    downloaded_file_mtimes: Optional[dict[str, int]] = None,
 ) -> list[str]:
     """
     Downloads files in parallel using thread pool.
+    See `_download_file_groups_parallel`, which this calls with a single group of files.
     Returns a list of local paths of downloaded files.
     """
-    downloaded_file_names: list[str] = []
+    return _download_file_groups_parallel(
+        [_DownloadGroup(files, hash_algorithm, local_download_dir, fs_permissions)],
+        num_download_workers,
+        s3_bucket,
+        cas_prefix,
+        s3_client,
+        session,
+        progress_tracker,
+        file_conflict_resolution,
+        downloaded_file_mtimes,
+    )[0]
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=num_download_workers) as executor:
-        futures = {
-            executor.submit(
-                download_file,
-                file,
-                hash_algorithm,
-                local_download_dir,
-                s3_bucket,
-                cas_prefix,
-                s3_client,
-                session,
-                file_mod_time,
-                progress_tracker,
-                file_conflict_resolution,
-            ): file
-            for file in files
-        }
-        # surfaces any exceptions in the thread
-        for future in concurrent.futures.as_completed(futures):
-            (file_bytes, local_file_name) = future.result()
-            if local_file_name:
-                downloaded_file_names.append(str(local_file_name.resolve()))
-                if progress_tracker:
-                    progress_tracker.increase_processed(1, 0)
-                    progress_tracker.report_progress()
+
+def _download_file_groups_parallel(
+    download_groups: List[_DownloadGroup],
+    num_download_workers: int,
+    s3_bucket: str,
+    cas_prefix: Optional[str],
+    s3_client: Optional[BaseClient] = None,
+    session: Optional[boto3.Session] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+    file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    downloaded_file_mtimes: Optional[dict[str, int]] = None,
+) -> list[list[str]]:
+    """
+    Downloads the files of all the given groups (e.g. one per asset root) in parallel, sharing one
+    thread pool, so a root with large files doesn't hold back the small files of the other roots.
+    Small files are downloaded concurrently, each over a few connections. Large files are then
+    downloaded one at a time, each one spreading parallel ranged GETs over the whole connection pool.
+    If `downloaded_file_mtimes` is given, it is filled with the modification time (in nanoseconds)
+    of each downloaded file, keyed by its local path.
+    Returns a list of local paths of downloaded files for each group, in the order of the groups.
+    """
+    downloaded_file_names_by_group: list[list[str]] = [[] for _ in download_groups]
+
+    def _track_downloaded_file(
+        group_index: int,
+        file_bytes: int,
+        local_file_name: Optional[Path],
+        mtime_ns: Optional[int],
+    ) -> None:
+        if local_file_name:
+            downloaded_file_names_by_group[group_index].append(str(local_file_name.resolve()))
+            if downloaded_file_mtimes is not None and mtime_ns is not None:
+                downloaded_file_mtimes[str(local_file_name)] = mtime_ns
+            if progress_tracker:
+                progress_tracker.increase_processed(1, 0)
+                progress_tracker.report_progress()
+        else:
+            if progress_tracker:
+                progress_tracker.increase_skipped(1, file_bytes)
+                progress_tracker.report_progress()
+
+    def _download_group_file(group_index: int, file: RelativeFilePath):
+        group = download_groups[group_index]
+        return _download_file(
+            file,
+            group.hash_algorithm,
+            group.local_download_dir,
+            s3_bucket,
+            cas_prefix,
+            s3_client,
+            session,
+            progress_tracker,
+            file_conflict_resolution,
+            group.fs_permissions,
+        )
+
+    small_files: List[Tuple[int, RelativeFilePath]] = []
+    large_files: List[Tuple[int, RelativeFilePath]] = []
+    for group_index, group in enumerate(download_groups):
+        for file in group.files:
+            if (file.size or 0) >= RANGED_GET_THRESHOLD_BYTES:
+                large_files.append((group_index, file))
             else:
-                if progress_tracker:
-                    progress_tracker.increase_skipped(1, file_bytes)
-                    progress_tracker.report_progress()
+                small_files.append((group_index, file))
+
+    def _check_cancelled() -> None:
+        if progress_tracker and not progress_tracker.continue_reporting:
+            raise AssetSyncCancelledError("File download cancelled.")
+
+    # surfaces any exceptions in the thread
+    for (group_index, _), result in _bounded_imap_unordered(
+        lambda group_file: _download_group_file(*group_file),
+        small_files,
+        max_workers=num_download_workers,
+        cancel_event=progress_tracker.cancel_event if progress_tracker else None,
+    ):
+        _track_downloaded_file(group_index, *result)
+    _check_cancelled()
+
+    for group_index, file in large_files:
+        _track_downloaded_file(group_index, *_download_group_file(group_index, file))
+        _check_cancelled()
 
     # to report progress 100% at the end
     if progress_tracker:
         progress_tracker.report_progress()
 
-    return downloaded_file_names
+    return downloaded_file_names_by_group
 
 
 def download_files(
@@ -670,7 +948,15 @@ def _get_asset_root_from_s3(
     except Exception as e:
         raise AssetSyncError(e) from e
 
-    return head["Metadata"].get("asset-root", None)
+    return _get_asset_root_from_metadata(head["Metadata"])
+
+
+def _get_asset_root_from_metadata(metadata: dict[str, str]) -> Optional[str]:
+    """
+    Gets asset root from the S3 object metadata of an output manifest.
+    If the key "asset-root" does not exist in the metadata, returns None.
+    """
+    return metadata.get("asset-root", None)
 
 
 def get_job_output_paths_by_asset_root(
@@ -682,6 +968,7 @@ def get_job_output_paths_by_asset_root(
     task_id: Optional[str] = None,
     session_action_id: Optional[str] = None,
     session: Optional[boto3.Session] = None,
+    on_discovering_outputs: Optional[Callable[[ProgressReportMetadata], bool]] = None,
 ) -> dict[str, ManifestPathGroup]:
     """
     Gets dict of grouped paths of all output files of a given job.
@@ -689,7 +976,15 @@ def get_job_output_paths_by_asset_root(
     Returns a dict of ManifestPathGroups, with the root path as the key.
     """
     output_manifests_by_root = get_output_manifests_by_asset_root(
-        s3_settings, farm_id, queue_id, job_id, step_id, task_id, session_action_id, session=session
+        s3_settings,
+        farm_id,
+        queue_id,
+        job_id,
+        step_id,
+        task_id,
+        session_action_id,
+        session=session,
+        on_discovering_outputs=on_discovering_outputs,
     )
 
     outputs: dict[str, ManifestPathGroup] = {}
@@ -711,10 +1006,16 @@ def get_output_manifests_by_asset_root(
     task_id: Optional[str] = None,
     session_action_id: Optional[str] = None,
     session: Optional[boto3.Session] = None,
+    on_discovering_outputs: Optional[Callable[[ProgressReportMetadata], bool]] = None,
 ) -> dict[str, list[BaseAssetManifest]]:
     """
     For a given job/step/task, gets a map from each root path to a corresponding list of
-    output manifests.
+    output manifests. The manifests are fetched concurrently.
+
+    Args:
+        on_discovering_outputs: a callback to be called as output manifests are fetched, to report
+            progress to the caller. The callback returns True if the operation should continue as
+            normal, or False to cancel.
     """
     outputs: DefaultDict[str, list[BaseAssetManifest]] = DefaultDict(list)
     manifest_prefix: str = _get_output_manifest_prefix(
@@ -726,14 +1027,43 @@ def get_output_manifests_by_asset_root(
         )
     except JobAttachmentsError:
         return outputs
+    if not manifests_keys:
+        return outputs
 
-    for key in manifests_keys:
-        asset_manifest = get_manifest_from_s3(
-            manifest_key=key,
-            s3_bucket=s3_settings.s3BucketName,
-            session=session,
-        )
-        asset_root = _get_asset_root_from_s3(key, s3_settings.s3BucketName, session)
+    total_manifests = len(manifests_keys)
+    max_workers = min(total_manifests, get_s3_max_pool_connections())
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _get_output_manifest_and_asset_root_from_s3,
+                key,
+                s3_settings.s3BucketName,
+                session,
+            )
+            for key in manifests_keys
+        ]
+        try:
+            for fetched_manifests, future in enumerate(
+                concurrent.futures.as_completed(futures), start=1
+            ):
+                future.result()
+                if on_discovering_outputs is not None and not on_discovering_outputs(
+                    ProgressReportMetadata(
+                        status=ProgressStatus.PREPARING_IN_PROGRESS,
+                        progress=round(fetched_manifests / total_manifests * 100, 1),
+                        transferRate=0,
+                        progressMessage=f"Fetched {fetched_manifests} / {total_manifests} output manifest{'' if total_manifests == 1 else 's'}",
+                    )
+                ):
+                    raise AssetSyncCancelledError("Output discovery cancelled.")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    # Group the manifests in the order of their keys, rather than the order they were fetched in.
+    for key, future in zip(manifests_keys, futures):
+        asset_manifest, asset_root = future.result()
         if not asset_root:
             raise MissingAssetRootError(
                 f"Failed to get asset root from metadata of output manifest: {key}"
@@ -751,6 +1081,7 @@ def download_files_from_manifests(
     session: Optional[boto3.Session] = None,
     on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
     logger: Optional[Union[Logger, LoggerAdapter]] = None,
+    downloaded_file_mtimes: Optional[dict[str, int]] = None,
 ) -> DownloadSummaryStatistics:
     """
     Given manifests, downloads all files from a CAS in each manifest.
@@ -759,16 +1090,19 @@ def download_files_from_manifests(
         s3_bucket: The name of the S3 bucket.
         manifests_by_root: a map from each local root path to a corresponding list of tuples of manifest contents and their path.
         cas_prefix: The CAS prefix of the files.
+        fs_permission_settings: An instance defining group ownership and permission modes to be set on
+            the downloaded files and directories. On POSIX systems these are applied as the files are created.
         session: The boto3 session to use.
         on_downloading_files: a callback to be called to periodically report progress to the caller.
             The callback returns True if the operation should continue as normal, or False to cancel.
+        downloaded_file_mtimes: If given, filled with the modification time (in nanoseconds) of each
+            downloaded file, keyed by its local path.
 
     Returns:
         The download summary statistics.
     """
     s3_client = get_s3_client(session=session)
     num_download_workers = _get_num_download_workers()
-    file_mod_time = datetime.now().timestamp()
 
     # Sets up progress tracker to report download progress back to the caller.
     total_size = 0
@@ -787,28 +1121,40 @@ def download_files_from_manifests(
 
     downloaded_files_paths_by_root: DefaultDict[str, list[str]] = DefaultDict(list)
 
-    for local_download_dir, manifest in manifests_by_root.items():
-        downloaded_files_paths = _download_files_parallel(
+    # The files of all the roots are downloaded together, sharing one pool of workers.
+    download_groups = [
+        _DownloadGroup(
             manifest.paths,
             manifest.hashAlg,
-            num_download_workers,
             local_download_dir,
-            s3_bucket,
-            cas_prefix,
-            s3_client,
-            session,
-            file_mod_time,
-            progress_tracker=progress_tracker,
+            _get_fs_permissions_at_creation(local_download_dir, fs_permission_settings),
         )
+        for local_download_dir, manifest in manifests_by_root.items()
+    ]
+    downloaded_files_paths_by_group = _download_file_groups_parallel(
+        download_groups,
+        num_download_workers,
+        s3_bucket,
+        cas_prefix,
+        s3_client,
+        session,
+        progress_tracker=progress_tracker,
+        downloaded_file_mtimes=downloaded_file_mtimes,
+    )
 
-        if fs_permission_settings is not None:
+    for download_group, downloaded_files_paths in zip(
+        download_groups, downloaded_files_paths_by_group
+    ):
+        if fs_permission_settings is not None and download_group.fs_permissions is None:
             _set_fs_group(
                 file_paths=downloaded_files_paths,
-                local_root=local_download_dir,
+                local_root=download_group.local_download_dir,
                 fs_permission_settings=fs_permission_settings,
             )
 
-        downloaded_files_paths_by_root[local_download_dir].extend(downloaded_files_paths)
+        downloaded_files_paths_by_root[download_group.local_download_dir].extend(
+            downloaded_files_paths
+        )
 
     progress_tracker.total_time = time.perf_counter() - start_time
     return progress_tracker.get_download_summary_statistics(downloaded_files_paths_by_root)
@@ -827,6 +1173,27 @@ def _get_num_download_workers() -> int:
     return num_download_workers
 
 
+def _get_fs_permissions_at_creation(
+    local_root: str,
+    fs_permission_settings: Optional[FileSystemPermissionSettings],
+) -> Optional[_PosixPermissionsAtCreation]:
+    """
+    Returns the helper that applies the POSIX permission settings to files as they are downloaded
+    under the given root, or None if the settings must instead be applied with `_set_fs_group`
+    after the download.
+
+    Raises:
+        TypeError: If the `fs_permission_settings` are not specific to the underlying OS.
+    """
+    if fs_permission_settings is None or os.name != "posix":
+        return None
+    if not isinstance(fs_permission_settings, PosixFileSystemPermissionSettings):
+        raise TypeError(
+            "The file system permission settings must be specific to Posix-based system."
+        )
+    return _PosixPermissionsAtCreation(local_root, fs_permission_settings)
+
+
 def _set_fs_group(
     file_paths: list[str],
     local_root: str,
@@ -908,6 +1275,37 @@ def merge_asset_manifests(manifests: list[BaseAssetManifest]) -> BaseAssetManife
     return output_manifest
 
 
+def filter_asset_manifest(
+    manifest: BaseAssetManifest,
+    include: List[str],
+    exclude: Optional[List[str]] = None,
+) -> BaseAssetManifest:
+    """Narrow a manifest down to the paths matching the given glob patterns, so that only
+    those files are downloaded or mounted. Patterns are matched against the manifest's relative
+    paths, where "*" stays within a directory and "**" spans directories.
+
+    Args:
+        manifest (AssetManifest): The manifest to filter.
+        include (list[str]): Glob patterns of the paths to keep.
+        exclude (list[str], optional): Glob patterns of the paths to drop, even if included.
+
+    Returns:
+        AssetManifest: A new manifest containing only the matching paths, with its total size updated.
+    """
+    kept_paths = set(
+        _filter_relative_paths([path.path for path in manifest.paths], include, exclude)
+    )
+    filtered_paths = [path for path in manifest.paths if path.path in kept_paths]
+
+    manifest_args: dict[str, Any] = {
+        "hash_alg": manifest.hashAlg,
+        "paths": filtered_paths,
+        "total_size": sum([path.size for path in filtered_paths]),
+    }
+
+    return manifest.__class__(**manifest_args)
+
+
 def _write_manifest_to_temp_file(manifest: BaseAssetManifest, dir: Path) -> str:
     with NamedTemporaryFile(
         suffix=".json", prefix="deadline-merged-manifest-", delete=False, mode="w", dir=dir
@@ -1017,6 +1415,8 @@ def mount_vfs_from_manifests(
 
     _set_fs_group([str(vfs_logs_dir)], str(vfs_logs_dir), fs_permission_settings)
 
+    # Write out the manifests for all of the roots first, then start all of the VFS processes together.
+    vfs_managers: List[VFSProcessManager] = []
     for mount_point, manifest in manifests_by_root.items():
         # Validate the file paths to see if they are under the given download directory.
         _ensure_paths_within_directory(
@@ -1032,18 +1432,21 @@ def mount_vfs_from_manifests(
         # Write out a temporary file with the contents of the newly merged manifest
         manifest_path: str = _write_manifest_to_temp_file(final_manifest, dir=manifest_dir)
 
-        vfs_manager: VFSProcessManager = VFSProcessManager(
-            s3_bucket,
-            boto3_session.region_name,
-            manifest_path,
-            mount_point,
-            fs_permission_settings.os_user,
-            os_env_vars,
-            getattr(fs_permission_settings, "os_group", ""),
-            cas_prefix,
-            str(vfs_cache_dir),
+        vfs_managers.append(
+            VFSProcessManager(
+                s3_bucket,
+                boto3_session.region_name,
+                manifest_path,
+                mount_point,
+                fs_permission_settings.os_user,
+                os_env_vars,
+                getattr(fs_permission_settings, "os_group", ""),
+                cas_prefix,
+                str(vfs_cache_dir),
+            )
         )
-        vfs_manager.start(session_dir=session_dir)
+
+    VFSProcessManager.start_all(vfs_managers, session_dir=session_dir)
 
 
 def _ensure_paths_within_directory(root_path: str, paths_relative_to_root: list[str]) -> None:
@@ -1086,6 +1489,7 @@ class OutputDownloader:
         task_id: Optional[str] = None,
         session_action_id: Optional[str] = None,
         session: Optional[boto3.Session] = None,
+        on_discovering_outputs: Optional[Callable[[ProgressReportMetadata], bool]] = None,
     ) -> None:
         self.s3_settings = s3_settings
         self.session = session
@@ -1098,6 +1502,7 @@ class OutputDownloader:
             task_id=task_id,
             session_action_id=session_action_id,
             session=session,
+            on_discovering_outputs=on_discovering_outputs,
         )
 
     def get_output_paths_by_root(self) -> dict[str, list[str]]:
@@ -1120,7 +1525,8 @@ class OutputDownloader:
 
         if original_root not in self.outputs_by_root:
             raise ValueError(
-                f"The root path {original_root} was not found in output manifests {self.outputs_by_root}."
+                f"The root path {original_root} was not found in output manifests. "
+                f"Available root paths: {list(self.outputs_by_root.keys())}"
             )
 
         if new_root == original_root:
@@ -1128,21 +1534,19 @@ class OutputDownloader:
 
         if new_root in self.outputs_by_root:
             # If the new_root already exists, and the file path in the original_root already exists
-            # among the file paths of the new_root, then prefix the file path with the original_root path.
+            # among the file paths of the new_root, then prefix the file name with the original_root path.
             # This is to avoid duplicate file paths in the new_root.
-            paths_in_new_root = self.outputs_by_root[new_root].get_all_paths()
-            for manifest_paths in self.outputs_by_root[original_root].files_by_hash_alg.values():
+            new_root_group = self.outputs_by_root[new_root]
+            original_root_group = self.outputs_by_root[original_root]
+            new_name_prefix = original_root.replace("/", "_").replace("\\", "_").replace(":", "_")
+            for manifest_paths in original_root_group.files_by_hash_alg.values():
                 for manifest_path in manifest_paths:
-                    if manifest_path.path in paths_in_new_root:
-                        new_name_prefix = (
-                            original_root.replace("/", "_").replace("\\", "_").replace(":", "_")
-                        )
-                        manifest_path.path = str(
-                            Path(manifest_path.path).with_name(
-                                f"{new_name_prefix}_{manifest_path.path}"
-                            )
-                        )
-            self.outputs_by_root[new_root].combine_with_group(self.outputs_by_root[original_root])
+                    if new_root_group.contains_path(manifest_path.path):
+                        original_path = Path(manifest_path.path)
+                        manifest_path.path = original_path.with_name(
+                            f"{new_name_prefix}_{original_path.name}"
+                        ).as_posix()
+            new_root_group.combine_with_group(original_root_group)
             del self.outputs_by_root[original_root]
         else:
             self.outputs_by_root = {
@@ -1173,7 +1577,7 @@ class OutputDownloader:
         total_files: int = 0
         for path_group in self.outputs_by_root.values():
             total_bytes += path_group.total_bytes
-            total_files += len(path_group.get_all_paths())
+            total_files += path_group.total_files
 
         progress_tracker = ProgressTracker(
             status=ProgressStatus.DOWNLOAD_IN_PROGRESS,
@@ -1185,22 +1589,25 @@ class OutputDownloader:
         start_time = time.perf_counter()
         downloaded_files_paths_by_root: DefaultDict[str, list[str]] = DefaultDict(list)
 
+        download_groups: list[_DownloadGroup] = []
+        for root, output_path_group in self.outputs_by_root.items():
+            for hash_alg, path_list in output_path_group.files_by_hash_alg.items():
+                # Validate the file paths to see if they are under the given download directory.
+                _ensure_paths_within_directory(root, [file.path for file in path_list])
+                download_groups.append(_DownloadGroup(path_list, hash_alg, root))
+
         try:
-            for root, output_path_group in self.outputs_by_root.items():
-                for hash_alg, path_list in output_path_group.files_by_hash_alg.items():
-                    # Validate the file paths to see if they are under the given download directory.
-                    _ensure_paths_within_directory(root, [file.path for file in path_list])
-
-                    downloaded_files_paths = download_files(
-                        files=path_list,
-                        hash_algorithm=hash_alg,
-                        local_download_dir=root,
-                        s3_settings=self.s3_settings,
-                        session=self.session,
-                        progress_tracker=progress_tracker,
-                        file_conflict_resolution=file_conflict_resolution,
-                    )
-                    downloaded_files_paths_by_root[root].extend(downloaded_files_paths)
+            # The files of all the roots are downloaded together, sharing one pool of workers.
+            downloaded_files_paths_by_group = _download_file_groups_parallel(
+                download_groups,
+                _get_num_download_workers(),
+                self.s3_settings.s3BucketName,
+                self.s3_settings.full_cas_prefix(),
+                get_s3_client(session=self.session),
+                self.session,
+                progress_tracker=progress_tracker,
+                file_conflict_resolution=file_conflict_resolution,
+            )
         except AssetSyncCancelledError:
             downloaded_files = progress_tracker.processed_files
             raise AssetSyncCancelledError(
@@ -1208,6 +1615,13 @@ class OutputDownloader:
                 f"(Downloaded {downloaded_files} file{'' if downloaded_files == 1 else 's'} before cancellation.)"
             )
 
+        for download_group, downloaded_files_paths in zip(
+            download_groups, downloaded_files_paths_by_group
+        ):
+            downloaded_files_paths_by_root[download_group.local_download_dir].extend(
+                downloaded_files_paths
+            )
+
         progress_tracker.total_time = time.perf_counter() - start_time
 
         return progress_tracker.get_download_summary_statistics(downloaded_files_paths_by_root)
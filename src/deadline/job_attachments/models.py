@@ -63,30 +63,75 @@ class AssetUploadGroup:
     total_input_bytes: int = 0
 
 
-@dataclass
 class ManifestPathGroup:
     """
     Represents paths combined from multiple manifests under the same root path, organized by hash algorithm.
+
+    Paths are indexed by their relative path within each hash algorithm, so a path that appears in
+    several manifests is only kept once (the most recently added entry wins.) The total size and
+    file count are derived from the index, and the sorted list of paths is cached until paths are added.
     """
 
-    total_bytes: int = 0
-    files_by_hash_alg: dict[HashAlgorithm, List[BaseManifestPath]] = field(default_factory=dict)
+    def __init__(
+        self, files_by_hash_alg: Optional[dict[HashAlgorithm, List[BaseManifestPath]]] = None
+    ) -> None:
+        self._paths_by_hash_alg: dict[HashAlgorithm, dict[str, BaseManifestPath]] = {}
+        self._sorted_paths: Optional[List[str]] = None
+        for hash_alg, paths in (files_by_hash_alg or {}).items():
+            self.add_paths(hash_alg, paths)
+
+    def __repr__(self) -> str:
+        return f"ManifestPathGroup(files_by_hash_alg={self.files_by_hash_alg!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ManifestPathGroup):
+            return NotImplemented
+        return self._paths_by_hash_alg == other._paths_by_hash_alg
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of the files in this group."""
+        return sum(
+            manifest_path.size
+            for paths in self._paths_by_hash_alg.values()
+            for manifest_path in paths.values()
+        )
+
+    @property
+    def total_files(self) -> int:
+        """
+        The number of files in this group, counting a path once for each hash algorithm it appears under.
+        """
+        return sum(len(paths) for paths in self._paths_by_hash_alg.values())
+
+    @property
+    def files_by_hash_alg(self) -> dict[HashAlgorithm, List[BaseManifestPath]]:
+        """
+        A copy of the files in this group, organized by hash algorithm, in the order they were first
+        added. Use add_paths to add files to the group.
+        """
+        return {
+            hash_alg: list(paths.values()) for hash_alg, paths in self._paths_by_hash_alg.items()
+        }
+
+    def add_paths(self, hash_alg: HashAlgorithm, paths: List[BaseManifestPath]) -> None:
+        """Adds the given paths, hashed with the given algorithm, to this group."""
+        paths_by_path = self._paths_by_hash_alg.setdefault(hash_alg, {})
+        for manifest_path in paths:
+            paths_by_path[manifest_path.path] = manifest_path
+        self._sorted_paths = None
 
     def add_manifest_to_group(self, manifest: BaseAssetManifest) -> None:
-        if manifest.hashAlg not in self.files_by_hash_alg:
-            self.files_by_hash_alg[manifest.hashAlg] = manifest.paths
-        else:
-            self.files_by_hash_alg[manifest.hashAlg].extend(manifest.paths)
-        self.total_bytes += manifest.totalSize  # type: ignore[attr-defined]
+        self.add_paths(manifest.hashAlg, manifest.paths)
 
     def combine_with_group(self, group: ManifestPathGroup) -> None:
         """Adds the content of the given ManifestPathGroup to this ManifestPathGroup"""
         for hash_alg, paths in group.files_by_hash_alg.items():
-            if hash_alg not in self.files_by_hash_alg:
-                self.files_by_hash_alg[hash_alg] = paths
-            else:
-                self.files_by_hash_alg[hash_alg].extend(paths)
-            self.total_bytes += group.total_bytes
+            self.add_paths(hash_alg, paths)
+
+    def contains_path(self, path: str) -> bool:
+        """Returns True if the given relative path is in this group, under any hash algorithm."""
+        return any(path in paths for paths in self._paths_by_hash_alg.values())
 
     def get_all_paths(self) -> list[str]:
         """
@@ -95,10 +140,11 @@ class ManifestPathGroup:
 
         Returns a sorted list of paths represented as strings.
         """
-        path_list: List[str] = []
-        for paths in self.files_by_hash_alg.values():
-            path_list.extend([path.path for path in paths])
-        return sorted(path_list)
+        if self._sorted_paths is None:
+            self._sorted_paths = sorted(
+                path for paths in self._paths_by_hash_alg.values() for path in paths
+            )
+        return list(self._sorted_paths)
 
 
 @dataclass
@@ -6,6 +6,7 @@ import shutil
 import sys
 from dataclasses import dataclass
 from enum import Enum
+from threading import Lock
 from typing import List, Set, Union
 
 from .exceptions import AssetSyncError, PathOutsideDirectoryError
@@ -103,6 +104,79 @@ def _set_fs_group_for_posix(
         _change_permission_for_posix(str(dir_path), os_group, dir_mode)
 
 
+class _PosixPermissionsAtCreation:
+    """
+    Applies group ownership and permission modes to downloaded files and their directories
+    while they are being created, so that no second pass over the downloaded paths is needed.
+    Files are changed through their open file descriptors, and each directory under the root
+    (including the root itself) is changed once, the first time a file is placed under it.
+    """
+
+    def __init__(
+        self,
+        local_root: str,
+        fs_permission_settings: PosixFileSystemPermissionSettings,
+    ) -> None:
+        if sys.platform == "win32":
+            raise EnvironmentError("This class can only be used on POSIX systems.")
+        self.local_root = Path(local_root)
+        self.gid = _get_posix_group_id(fs_permission_settings.os_group)
+        self.dir_mode = fs_permission_settings.dir_mode
+        self.file_mode = fs_permission_settings.file_mode
+        self._handled_dirs: Set[Path] = set()
+        self._lock = Lock()
+
+    def make_dirs(self, dir_path: Path) -> None:
+        """
+        Creates the directory and any missing parents, and applies the group ownership and
+        permissions to every directory from the root down to it that has not been handled yet.
+        """
+        if not _is_relative_to(dir_path, self.local_root):
+            raise PathOutsideDirectoryError(
+                f"The provided path '{dir_path}' is not under the root directory: {self.local_root}"
+            )
+        if dir_path in self._handled_dirs:
+            return
+
+        relative_parts = dir_path.relative_to(self.local_root).parts
+        dirs_from_root = [
+            self.local_root.joinpath(*relative_parts[:i]) for i in range(len(relative_parts) + 1)
+        ]
+        with self._lock:
+            for current_dir in dirs_from_root:
+                if current_dir in self._handled_dirs:
+                    continue
+                current_dir.mkdir(parents=True, exist_ok=True)
+                fd = os.open(current_dir, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+                try:
+                    self._apply(fd, self.dir_mode)
+                finally:
+                    os.close(fd)
+                self._handled_dirs.add(current_dir)
+
+    def apply_to_file(self, fd: int) -> None:
+        """Applies the group ownership and file permissions to a newly created, open file."""
+        self._apply(fd, self.file_mode)
+
+    def _apply(self, fd: int, mode: int) -> None:
+        if sys.platform == "win32":
+            raise EnvironmentError("This function can only be executed on POSIX systems.")
+        os.fchown(fd, -1, self.gid)
+        os.fchmod(fd, os.fstat(fd).st_mode | mode)
+
+
+def _get_posix_group_id(os_group: str) -> int:
+    if sys.platform == "win32":
+        raise EnvironmentError("This function can only be executed on POSIX systems.")
+
+    import grp
+
+    try:
+        return grp.getgrnam(os_group).gr_gid
+    except KeyError:
+        raise LookupError(f"no such group: {os_group!r}")
+
+
 def _set_fs_permission_for_windows(
     file_paths: List[str],
     local_root: str,
@@ -7,8 +7,8 @@ from logging import Logger, LoggerAdapter
 import time
 from dataclasses import asdict, dataclass, field
 from enum import Enum
-from threading import Lock
-from typing import Callable, Dict, Optional, Union
+from threading import Event, Lock, Thread, local
+from typing import Callable, Dict, List, Optional, Union
 
 from deadline.job_attachments._utils import _human_readable_file_size
 
@@ -16,6 +16,7 @@ CALLBACK_INTERVAL = 1  # in seconds
 MAX_FILES_IN_CHUNK = 50
 LOG_INTERVAL = 300  # in seconds
 LOG_PERCENTAGE_THRESHOLD = 10  # in percentage
+REPORTER_IDLE_TIMEOUT = 5  # in seconds
 
 
 @dataclass
@@ -112,7 +113,7 @@ class ProgressStatus(Enum):
     """The asset manager is not assigned any work."""
 
     PREPARING_IN_PROGRESS = ("PREPARING_IN_PROGRESS", "Processed")
-    """The asset manager is hashing files."""
+    """The asset manager is hashing files, or discovering the output files to download."""
 
     UPLOAD_IN_PROGRESS = ("UPLOAD_IN_PROGRESS", "Uploaded")
     """The asset manager is uploading files."""
@@ -139,12 +140,35 @@ class ProgressReportMetadata:
     progressMessage: str  # pylint: disable=invalid-name
 
 
+class _ProgressCounters:
+    """
+    The progress counters updated by one thread. Each thread only ever writes to its own
+    counters, so they can be updated without a lock; readers add up the counters of all threads.
+    """
+
+    __slots__ = ("processed_files", "processed_bytes", "skipped_files", "skipped_bytes")
+
+    def __init__(self) -> None:
+        self.processed_files = 0
+        self.processed_bytes = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+
+
 @dataclass
 class ProgressTracker:
     """
     A class that records the progress of file processing, and reports the
     progress data back to the client using callbacks passed from the client.
     The process is one of the following - hashing, uploading, or downloading.
+
+    The transfer threads only update their own counters when they make progress. The callback is
+    invoked from a separate reporter thread, at most once per `callback_interval` (or once
+    every `max_files_in_chunk` files), so a slow callback never holds up the transfers. The
+    reporter thread is started on demand and exits after being idle for a while. If the callback
+    returns False, the `continue_reporting` flag is cleared, which the transfer threads check to
+    cancel their work, and the `cancel_event` is set, which stops the thread pools from starting
+    the files that are still queued.
     """
 
     def __init__(
@@ -153,7 +177,7 @@ class ProgressTracker:
         total_files: int,
         total_bytes: int,
         on_progress_callback: Optional[Callable[[ProgressReportMetadata], bool]] = None,
-        callback_interval: int = CALLBACK_INTERVAL,
+        callback_interval: float = CALLBACK_INTERVAL,
         max_files_in_chunk: int = MAX_FILES_IN_CHUNK,
         logger: Optional[Union[Logger, LoggerAdapter]] = None,
         log_interval: int = LOG_INTERVAL,
@@ -166,14 +190,16 @@ class ProgressTracker:
             on_progress_callback = do_nothing
 
         self.on_progress_callback = on_progress_callback
-        self.continue_reporting = True
+        # Set when the operation is cancelled. It's shared with the thread pools doing the work, so
+        # that they stop starting new files, and with the transfers in flight, which abort.
+        self.cancel_event = Event()
 
         self.reporting_interval = callback_interval
         self.reporting_files_per_chunk = 1
         self.max_files_in_chunk = max_files_in_chunk
-        self.completed_files_in_chunk = 0
         self.last_report_time: Optional[float] = None
         self.last_report_processed_bytes: int = 0
+        self.last_report_completed_files: int = 0
 
         self.logger = logger
         self.log_interval = log_interval
@@ -186,32 +212,82 @@ class ProgressTracker:
         self.total_bytes = total_bytes
         if self.total_files >= self.max_files_in_chunk:
             self.reporting_files_per_chunk = self.max_files_in_chunk
-        self.processed_files = 0
-        self.processed_bytes = 0
-        self.skipped_files = 0
-        self.skipped_bytes = 0
         self.total_time = 0.0  # total time (in fractional seconds) taken for the process
 
-        self._lock = Lock()
+        self._thread_counters = local()
+        self._all_counters: List[_ProgressCounters] = []
+        self._counters_lock = Lock()
+        # Held while reporting, so that the callback is never invoked from two threads at once.
+        self._report_lock = Lock()
+        self._reporter_lock = Lock()
+        self._report_requested = Event()
+        self._reporter_thread: Optional[Thread] = None
 
         def track_progress(bytes_amount: int, current_file_done: Optional[bool] = False) -> bool:
             """
             When uploading or downloading files using boto3, pass this to the `Callback` argument
             so that the progress can be updated with the amount of bytes processed.
+            Returns False if the operation has been cancelled.
             """
-            with self._lock:
-                self._initialize_timestamps_if_none()
-                self.processed_bytes += bytes_amount
-                if current_file_done:
-                    self.processed_files += 1
-                    self.completed_files_in_chunk += 1
-                # Logs progress message to the logger (if exists)
-                self._log_progress_message()
-                # Invokes the callback with current progress data
-                return self._report_progress()
+            self._initialize_timestamps_if_none()
+            counters = self._get_thread_counters()
+            counters.processed_bytes += bytes_amount
+            if current_file_done:
+                counters.processed_files += 1
+            # Only the cheap time check on every callback; counting the completed files means
+            # adding up the counters of every thread.
+            if not self._report_requested.is_set() and (
+                time.perf_counter() - (self.last_report_time or 0) >= self.reporting_interval
+                or (current_file_done and self._is_report_due())
+            ):
+                self._request_report()
+            return self.continue_reporting
 
         self.track_progress_callback = track_progress
 
+    @property
+    def continue_reporting(self) -> bool:
+        """
+        False once the operation has been cancelled, i.e. the callback returned False.
+        """
+        return not self.cancel_event.is_set()
+
+    @continue_reporting.setter
+    def continue_reporting(self, value: bool) -> None:
+        if value:
+            self.cancel_event.clear()
+        else:
+            self.cancel_event.set()
+
+    def _get_thread_counters(self) -> _ProgressCounters:
+        counters: Optional[_ProgressCounters] = getattr(self._thread_counters, "counters", None)
+        if counters is None:
+            counters = _ProgressCounters()
+            self._thread_counters.counters = counters
+            with self._counters_lock:
+                self._all_counters.append(counters)
+        return counters
+
+    def _sum_counters(self, name: str) -> int:
+        # Copying a list is atomic, so this doesn't need the lock taken when a thread is added.
+        return sum(getattr(counters, name) for counters in tuple(self._all_counters))
+
+    @property
+    def processed_files(self) -> int:
+        return self._sum_counters("processed_files")
+
+    @property
+    def processed_bytes(self) -> int:
+        return self._sum_counters("processed_bytes")
+
+    @property
+    def skipped_files(self) -> int:
+        return self._sum_counters("skipped_files")
+
+    @property
+    def skipped_bytes(self) -> int:
+        return self._sum_counters("skipped_bytes")
+
     def set_total_files(self, total_files, total_bytes) -> None:
         """
         Stores the number and size of files to be processed.
@@ -229,6 +305,8 @@ class ProgressTracker:
         rate for the first progress report, which is the first callback invocation or
         the first logging.
         """
+        if self.last_report_time is not None and self.last_logged_time is not None:
+            return
         current_time = time.perf_counter()
         if self.last_report_time is None:
             self.last_report_time = current_time
@@ -239,28 +317,39 @@ class ProgressTracker:
         """
         Adds the number and size of processed files.
         """
-        with self._lock:
-            self._initialize_timestamps_if_none()
-            self.processed_files += num_files
-            self.completed_files_in_chunk += num_files
-            self.processed_bytes += file_bytes
+        self._initialize_timestamps_if_none()
+        counters = self._get_thread_counters()
+        counters.processed_files += num_files
+        counters.processed_bytes += file_bytes
 
     def increase_skipped(self, num_files: int = 1, file_bytes: int = 0) -> None:
         """
         Adds the number and size of skipped files.
         """
-        with self._lock:
-            self.skipped_files += num_files
-            self.completed_files_in_chunk += num_files
-            self.skipped_bytes += file_bytes
+        counters = self._get_thread_counters()
+        counters.skipped_files += num_files
+        counters.skipped_bytes += file_bytes
 
-    def _report_progress(self) -> bool:
+    def _is_report_due(self) -> bool:
         """
-        Invokes the callback with current progress metadata in one of the following cases:
-        1. when a specific time interval has passed since the last call, (or since the
+        Returns True in one of the following cases:
+        1. when a specific time interval has passed since the last report, (or since the
            process started,) or
-        2. when a specific number of files (a chunk) has been processed, or
+        2. when a specific number of files (a chunk) has been completed, or
         3. when the progress is 100%, (including when all files were skipped during the process.)
+        """
+        completed_files = self.processed_files + self.skipped_files
+        return (
+            self.last_report_time is None
+            or time.perf_counter() - self.last_report_time >= self.reporting_interval
+            or completed_files - self.last_report_completed_files >= self.reporting_files_per_chunk
+            or completed_files == self.total_files
+        )
+
+    def _report_progress(self) -> bool:
+        """
+        Invokes the callback with current progress metadata if a report is due.
+        Must be called while holding `_report_lock`.
 
         Sets the flag `continue_reporting` True if the operation should continue as normal,
         or False to cancel, and returns the flag.
@@ -268,25 +357,49 @@ class ProgressTracker:
         if not self.continue_reporting:
             return False
 
-        current_time = time.perf_counter()
-        if (
-            self.last_report_time is None
-            or current_time - self.last_report_time >= self.reporting_interval
-            or self.completed_files_in_chunk >= self.reporting_files_per_chunk
-            or self.processed_files + self.skipped_files == self.total_files
-        ):
-            self.continue_reporting = self.on_progress_callback(
-                self._get_progress_report_metadata()
-            )
+        if self._is_report_due():
+            metadata = self._get_progress_report_metadata()
+            self.continue_reporting = self.on_progress_callback(metadata)
             self.last_report_processed_bytes = self.processed_bytes
-            self.last_report_time = current_time
-            self.completed_files_in_chunk = 0
+            self.last_report_completed_files = self.processed_files + self.skipped_files
+            self.last_report_time = time.perf_counter()
         return self.continue_reporting
 
     def report_progress(self) -> bool:
-        with self._lock:
+        with self._report_lock:
+            self._log_progress_message()
             return self._report_progress()
 
+    def _request_report(self) -> None:
+        """
+        Asks the reporter thread to invoke the callback, starting the thread if it isn't running.
+        """
+        with self._reporter_lock:
+            self._report_requested.set()
+            if self._reporter_thread is None:
+                self._reporter_thread = Thread(
+                    target=self._run_reporter, name="ProgressTrackerReporter", daemon=True
+                )
+                self._reporter_thread.start()
+
+    def _run_reporter(self) -> None:
+        while True:
+            if not self._report_requested.wait(timeout=REPORTER_IDLE_TIMEOUT):
+                with self._reporter_lock:
+                    if not self._report_requested.is_set():
+                        self._reporter_thread = None
+                        return
+            self._report_requested.clear()
+            with self._report_lock:
+                # Skip the report if nothing changed since the last one, e.g. when the caller
+                # already reported the final progress itself.
+                if (
+                    self.processed_bytes != self.last_report_processed_bytes
+                    or self.processed_files + self.skipped_files != self.last_report_completed_files
+                ):
+                    self._log_progress_message()
+                    self._report_progress()
+
     def _get_progress_report_metadata(self) -> ProgressReportMetadata:
         completed_bytes = self.processed_bytes + self.skipped_bytes
         percentage = round(
@@ -364,6 +477,8 @@ class ProgressTracker:
         current_completed_bytes = self.processed_bytes + self.skipped_bytes
         progress_difference = (
             (current_completed_bytes - self.last_logged_completed_bytes) / self.total_bytes * 100
+            if self.total_bytes > 0
+            else 0
         )
 
         if (
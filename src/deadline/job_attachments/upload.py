@@ -6,17 +6,18 @@ Classes for handling uploading of assets.
 from __future__ import annotations
 
 import concurrent.futures
+import threading
 from contextlib import contextmanager
 import errno
 import logging
 import os
+import stat
 import sys
 import time
 from datetime import datetime
 from io import BufferedReader, BytesIO
-from math import trunc
-from pathlib import Path, PurePath
-from typing import Any, Callable, Generator, Optional, Tuple, Type, Union
+from pathlib import Path
+from typing import Any, Callable, Generator, Optional, Sequence, Tuple, TypeVar, Union
 
 import boto3
 from boto3.s3.transfer import ProgressCallbackInvoker
@@ -26,11 +27,9 @@ from deadline.client.config import config_file
 
 from .asset_manifests import (
     BaseAssetManifest,
-    BaseManifestModel,
     HashAlgorithm,
     hash_data,
     hash_file,
-    ManifestModelRegistry,
     ManifestVersion,
     base_manifest,
 )
@@ -47,22 +46,17 @@ from .exceptions import (
     JobAttachmentS3BotoCoreError,
     JobAttachmentsError,
     JobAttachmentsS3ClientError,
-    MisconfiguredInputsError,
     MissingS3BucketError,
     MissingS3RootPrefixError,
 )
-from .caches import HashCache, HashCacheEntry, S3CheckCache, S3CheckCacheEntry
+from ._local_asset_manager import LocalAssetManager
+from .caches import S3CheckCache, S3CheckCacheEntry
 from .models import (
-    AssetRootGroup,
     AssetRootManifest,
-    AssetUploadGroup,
     Attachments,
-    FileStatus,
-    FileSystemLocationType,
     JobAttachmentS3Settings,
     ManifestProperties,
     PathFormat,
-    StorageProfile,
 )
 from .progress_tracker import (
     ProgressStatus,
@@ -70,7 +64,7 @@ from .progress_tracker import (
     SummaryStatistics,
 )
 from ._utils import (
-    _is_relative_to,
+    _bounded_imap_unordered,
     _join_s3_paths,
 )
 
@@ -83,6 +77,89 @@ S3_MULTIPART_UPLOAD_CHUNK_SIZE: int = 8388608  # 8 MB
 # of thread workers for uploading multiple small files in parallel.
 S3_UPLOAD_MAX_CONCURRENCY: int = 10
 
+# New input files up to this size are read into memory once while hashing, and uploaded from that
+# memory with a single PutObject, instead of being read from disk again to upload them.
+SMALL_FILE_BUFFER_THRESHOLD_BYTES: int = 1024 * 1024  # 1 MB
+# The most memory that is used to hold the contents of small files between hashing and uploading.
+# Files that don't fit are read again from disk when they are uploaded.
+SMALL_FILE_BUFFER_MEMORY_LIMIT_BYTES: int = 256 * 1024 * 1024  # 256 MB
+
+# A file to upload, e.g. a manifest path or an output file.
+_FileT = TypeVar("_FileT")
+
+# A manifest path, with the hash algorithm of its manifest and the local root it is relative to.
+_RootFile = Tuple[base_manifest.BaseManifestPath, HashAlgorithm, Path]
+
+
+class _SmallFileBuffers:
+    """
+    The contents of small input files read while hashing them, kept in memory up to a limit, so that
+    they can be uploaded without reading the files again. Keyed by resolved local path and hash.
+
+    The contents are only given back if the file is still a regular file, not a symlink, with the
+    size and modification time it had when it was hashed. Otherwise it has to be read again.
+    """
+
+    def __init__(self, memory_limit_bytes: int = SMALL_FILE_BUFFER_MEMORY_LIMIT_BYTES) -> None:
+        self.memory_limit_bytes = memory_limit_bytes
+        self._buffered_bytes = 0
+        # The contents and modification time (in nanoseconds) of each file
+        self._contents: dict[Tuple[str, str], Tuple[bytes, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(local_path: Union[str, Path], file_hash: str) -> Tuple[str, str]:
+        # Hashing and uploading refer to the same file by different paths, so both are resolved.
+        return (str(Path(local_path).resolve()), file_hash)
+
+    def has_room(self, size: int) -> bool:
+        return self._buffered_bytes + size <= self.memory_limit_bytes
+
+    def put(
+        self, local_path: Union[str, Path], file_hash: str, contents: bytes, mtime_ns: int
+    ) -> bool:
+        """
+        Keeps the contents of the file if they fit in the memory limit. Returns whether they were kept.
+        """
+        key = self._key(local_path, file_hash)
+        with self._lock:
+            if key in self._contents or not self.has_room(len(contents)):
+                return False
+            self._contents[key] = (contents, mtime_ns)
+            self._buffered_bytes += len(contents)
+            return True
+
+    def pop(self, local_path: Union[str, Path], file_hash: str) -> Optional[bytes]:
+        """
+        Takes out the contents of the file, and returns them if the file hasn't changed since it
+        was hashed, otherwise None.
+        """
+        key = self._key(local_path, file_hash)
+        with self._lock:
+            entry = self._contents.pop(key, None)
+            if entry is None:
+                return None
+            contents, mtime_ns = entry
+            self._buffered_bytes -= len(contents)
+
+        try:
+            file_stat = os.lstat(key[0])
+        except OSError:
+            return None
+        if (
+            not stat.S_ISREG(file_stat.st_mode)
+            or file_stat.st_size != len(contents)
+            or file_stat.st_mtime_ns != mtime_ns
+        ):
+            logger.debug(f"Not uploading {key[0]} from memory, it changed after it was hashed.")
+            return None
+        return contents
+
+    def clear(self) -> None:
+        with self._lock:
+            self._contents.clear()
+            self._buffered_bytes = 0
+
 
 class S3AssetUploader:
     """
@@ -94,23 +171,27 @@ class S3AssetUploader:
     def __init__(
         self,
         session: Optional[boto3.Session] = None,
+        config: Optional[config_file.ConfigSnapshot] = None,
     ) -> None:
         if session is None:
             self._session = get_boto3_session()
         else:
             self._session = session
 
+        if config is None:
+            config = config_file.get_config_snapshot()
+
         try:
             # The small file threshold is the chunk size multiplied by the small file threshold multiplier.
-            small_file_threshold_multiplier = int(
-                config_file.get_setting("settings.small_file_threshold_multiplier")
+            small_file_threshold_multiplier: int = config.get_typed_setting(
+                "settings.small_file_threshold_multiplier"
             )
             self.small_file_threshold = (
                 S3_MULTIPART_UPLOAD_CHUNK_SIZE * small_file_threshold_multiplier
             )
 
-            s3_max_pool_connections = int(
-                config_file.get_setting("settings.s3_max_pool_connections")
+            s3_max_pool_connections: int = config.get_typed_setting(
+                "settings.s3_max_pool_connections"
             )
             self.num_upload_workers = int(
                 s3_max_pool_connections
@@ -168,8 +249,45 @@ class S3AssetUploader:
         Returns:
             A tuple of (the partial key for the manifest on S3, the hash of input manifest).
         """
+        (partial_manifest_key, manifest_hash) = self.upload_manifest(
+            job_attachment_settings=job_attachment_settings,
+            manifest=manifest,
+            source_root=source_root,
+            partial_manifest_prefix=partial_manifest_prefix,
+            file_system_location_name=file_system_location_name,
+            manifest_write_dir=manifest_write_dir,
+            manifest_name_suffix=manifest_name_suffix,
+        )
+
+        # Upload assets
+        self.upload_input_files(
+            manifest=manifest,
+            s3_bucket=job_attachment_settings.s3BucketName,
+            source_root=asset_root if asset_root else source_root,
+            s3_cas_prefix=job_attachment_settings.full_cas_prefix(),
+            progress_tracker=progress_tracker,
+            s3_check_cache_dir=s3_check_cache_dir,
+        )
+
+        return (partial_manifest_key, manifest_hash)
+
+    def upload_manifest(
+        self,
+        job_attachment_settings: JobAttachmentS3Settings,
+        manifest: BaseAssetManifest,
+        source_root: Path,
+        partial_manifest_prefix: Optional[str] = None,
+        file_system_location_name: Optional[str] = None,
+        manifest_write_dir: Optional[str] = None,
+        manifest_name_suffix: str = "input",
+    ) -> tuple[str, str]:
+        """
+        Uploads an asset manifest (and optionally writes it locally), without uploading the
+        files it lists. See `upload_assets` for the arguments.
 
-        # Upload asset manifest
+        Returns:
+            A tuple of (the partial key for the manifest on S3, the hash of input manifest).
+        """
         (hash_alg, manifest_bytes, manifest_name) = S3AssetUploader._gather_upload_metadata(
             manifest=manifest,
             source_root=source_root,
@@ -201,16 +319,6 @@ class S3AssetUploader:
                 key=full_manifest_key,
             )
 
-        # Upload assets
-        self.upload_input_files(
-            manifest=manifest,
-            s3_bucket=job_attachment_settings.s3BucketName,
-            source_root=asset_root if asset_root else source_root,
-            s3_cas_prefix=job_attachment_settings.full_cas_prefix(),
-            progress_tracker=progress_tracker,
-            s3_check_cache_dir=s3_check_cache_dir,
-        )
-
         return (partial_manifest_key, hash_data(manifest_bytes, hash_alg))
 
     @staticmethod
@@ -302,53 +410,68 @@ class S3AssetUploader:
         The local 'S3 check cache' is used to note if we've seen an object in S3 before so we
         can save the S3 API calls.
         """
-
-        # Split into a separate 'large file' and 'small file' queues.
-        # Separate 'large' files from 'small' files so that we can process 'large' files serially.
-        # This wastes less bandwidth if uploads are cancelled, as it's better to use the multi-threaded
-        # multi-part upload for a single large file than multiple large files at the same time.
-        (small_file_queue, large_file_queue) = self._separate_files_by_size(
-            manifest.paths, self.small_file_threshold
+        self.upload_input_files_from_roots(
+            manifests_by_source_root=[(manifest, source_root)],
+            s3_bucket=s3_bucket,
+            s3_cas_prefix=s3_cas_prefix,
+            progress_tracker=progress_tracker,
+            s3_check_cache_dir=s3_check_cache_dir,
         )
 
+    def upload_input_files_from_roots(
+        self,
+        manifests_by_source_root: Sequence[Tuple[BaseAssetManifest, Path]],
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        progress_tracker: Optional[ProgressTracker] = None,
+        s3_check_cache_dir: Optional[str] = None,
+        small_file_buffers: Optional[_SmallFileBuffers] = None,
+    ) -> None:
+        """
+        Uploads all of the files listed in the given manifests, each paired with the local root its
+        paths are relative to, to S3 if they don't exist in the given S3 prefix already.
+
+        The files of all the roots are scheduled together, so the uploads share one pool of workers
+        and a root with large files doesn't hold back the small files of the other roots. Files whose
+        contents are in `small_file_buffers` are uploaded from memory.
+        """
+        small_file_queue: list[_RootFile] = []
+        large_file_queue: list[_RootFile] = []
+        for manifest, source_root in manifests_by_source_root:
+            # Split into a separate 'large file' and 'small file' queues.
+            # Separate 'large' files from 'small' files so that we can process 'large' files serially.
+            # This wastes less bandwidth if uploads are cancelled, as it's better to use the multi-threaded
+            # multi-part upload for a single large file than multiple large files at the same time.
+            (small_files, large_files) = self._separate_files_by_size(
+                manifest.paths, self.small_file_threshold
+            )
+            small_file_queue.extend((file, manifest.hashAlg, source_root) for file in small_files)
+            large_file_queue.extend((file, manifest.hashAlg, source_root) for file in large_files)
+
         with S3CheckCache(s3_check_cache_dir) as s3_cache:
-            # First, process the whole 'small file' queue with parallel object uploads.
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=self.num_upload_workers
-            ) as executor:
-                futures = {
-                    executor.submit(
-                        self.upload_object_to_cas,
-                        file,
-                        manifest.hashAlg,
-                        s3_bucket,
-                        source_root,
-                        s3_cas_prefix,
-                        s3_cache,
-                        progress_tracker,
-                    ): file
-                    for file in small_file_queue
-                }
-                # surfaces any exceptions in the thread
-                for future in concurrent.futures.as_completed(futures):
-                    (is_uploaded, file_size) = future.result()
-                    if progress_tracker and not is_uploaded:
-                        progress_tracker.increase_skipped(1, file_size)
-
-            # Now process the whole 'large file' queue with serial object uploads (but still parallel multi-part upload.)
-            for file in large_file_queue:
+
+            def upload_object(root_file: _RootFile) -> None:
+                (file, hash_alg, source_root) = root_file
                 (is_uploaded, file_size) = self.upload_object_to_cas(
                     file,
-                    manifest.hashAlg,
+                    hash_alg,
                     s3_bucket,
                     source_root,
                     s3_cas_prefix,
                     s3_cache,
                     progress_tracker,
+                    small_file_buffers,
                 )
                 if progress_tracker and not is_uploaded:
                     progress_tracker.increase_skipped(1, file_size)
 
+            self._upload_small_files_then_large_files(
+                small_file_queue,
+                large_file_queue,
+                upload_object,
+                cancel_event=progress_tracker.cancel_event if progress_tracker else None,
+            )
+
         # to report progress 100% at the end, and
         # to check if the job submission was canceled in the middle of processing the last batch of files.
         if progress_tracker:
@@ -358,6 +481,36 @@ class S3AssetUploader:
                     "File upload cancelled.", progress_tracker.get_summary_statistics()
                 )
 
+    def _upload_small_files_then_large_files(
+        self,
+        small_file_queue: Sequence[_FileT],
+        large_file_queue: Sequence[_FileT],
+        upload_file: Callable[[_FileT], None],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> None:
+        """
+        Calls `upload_file` for every file: first for the whole 'small file' queue in parallel, then for
+        the 'large file' queue one file at a time (each of which is still a parallel multi-part upload.)
+        Processing large files serially wastes less bandwidth if uploads are cancelled, as it's better
+        to use the multi-threaded multi-part upload for a single large file than multiple large files at
+        the same time. If an upload fails, the small file uploads that have not started yet are cancelled.
+        Once `cancel_event` is set, the files that haven't started uploading are dropped; it's up to
+        the caller to check the event afterwards.
+        """
+        # surfaces any exceptions in the thread
+        for _ in _bounded_imap_unordered(
+            upload_file,
+            small_file_queue,
+            max_workers=self.num_upload_workers,
+            cancel_event=cancel_event,
+        ):
+            pass
+
+        for file in large_file_queue:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            upload_file(file)
+
     def _separate_files_by_size(
         self,
         files_to_upload: list[base_manifest.BaseManifestPath],
@@ -387,10 +540,13 @@ class S3AssetUploader:
         s3_cas_prefix: str,
         s3_check_cache: S3CheckCache,
         progress_tracker: Optional[ProgressTracker] = None,
+        small_file_buffers: Optional[_SmallFileBuffers] = None,
     ) -> Tuple[bool, int]:
         """
         Uploads an object to the S3 content-addressable storage (CAS) prefix. Optionally,
         does a head-object check and only uploads the file if it doesn't exist in S3 already.
+        If the contents of the file were kept in `small_file_buffers` when it was hashed, they
+        are uploaded from memory instead of reading the file again.
         Returns a tuple (whether it has been uploaded, the file size).
         """
         local_path = source_root.joinpath(file.path)
@@ -398,7 +554,10 @@ class S3AssetUploader:
         if s3_cas_prefix:
             s3_upload_key = _join_s3_paths(s3_cas_prefix, s3_upload_key)
         is_uploaded = False
-        file_size = local_path.resolve().stat().st_size
+        real_path = local_path.resolve()
+        file_size = real_path.stat().st_size
+        # Taken out even if the file is skipped, to free the memory.
+        file_contents = small_file_buffers.pop(real_path, file.hash) if small_file_buffers else None
 
         if s3_check_cache.get_entry(s3_key=f"{s3_bucket}/{s3_upload_key}"):
             logger.debug(
@@ -410,6 +569,11 @@ class S3AssetUploader:
             logger.debug(
                 f"skipping {local_path} because it has already been uploaded to s3://{s3_bucket}/{s3_upload_key}"
             )
+        elif file_contents is not None:
+            self._put_small_file_to_s3(
+                file_contents, local_path, s3_bucket, s3_upload_key, progress_tracker
+            )
+            is_uploaded = True
         else:
             self.upload_file_to_s3(
                 local_path=local_path,
@@ -493,29 +657,8 @@ class S3AssetUploader:
                 else:
                     raise AssetSyncError("File upload failed.", ce) from ce
             except ClientError as exc:
-                status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
-                status_code_guidance = {
-                    **COMMON_ERROR_GUIDANCE_FOR_S3,
-                    403: (
-                        (
-                            "Forbidden or Access denied. Please check your AWS credentials, and ensure that "
-                            "your AWS IAM Role or User has the 's3:PutObject' permission for this bucket. "
-                        )
-                        if "kms:" not in str(exc)
-                        else (
-                            "Forbidden or Access denied. Please check your AWS credentials and Job Attachments S3 bucket "
-                            "encryption settings. If a customer-managed KMS key is set, confirm that your AWS IAM Role or "
-                            "User has the 'kms:GenerateDataKey' and 'kms:DescribeKey' permissions for the key used to encrypt the bucket."
-                        )
-                    ),
-                    404: "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account.",
-                }
-                raise JobAttachmentsS3ClientError(
-                    action="uploading file",
-                    status_code=status_code,
-                    bucket_name=s3_bucket,
-                    key_or_prefix=s3_upload_key,
-                    message=f"{status_code_guidance.get(status_code, '')} {str(exc)} (Failed to upload {str(local_path)})",
+                raise self._get_upload_file_error(
+                    exc, s3_bucket, s3_upload_key, local_path
                 ) from exc
             except BotoCoreError as bce:
                 raise JobAttachmentS3BotoCoreError(
@@ -525,6 +668,65 @@ class S3AssetUploader:
             except Exception as e:
                 raise AssetSyncError(e) from e
 
+    def _put_small_file_to_s3(
+        self,
+        file_contents: bytes,
+        local_path: Path,
+        s3_bucket: str,
+        s3_upload_key: str,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> None:
+        """
+        Uploads the contents of a small file, already in memory, to S3 with a single PutObject
+        instead of going through TransferManager.
+        """
+        if progress_tracker and not progress_tracker.continue_reporting:
+            raise AssetSyncCancelledError(
+                "File upload cancelled.", progress_tracker.get_summary_statistics()
+            )
+        try:
+            self._s3.put_object(Bucket=s3_bucket, Key=s3_upload_key, Body=file_contents)
+        except ClientError as exc:
+            raise self._get_upload_file_error(exc, s3_bucket, s3_upload_key, local_path) from exc
+        except BotoCoreError as bce:
+            raise JobAttachmentS3BotoCoreError(
+                action="uploading file",
+                error_details=str(bce),
+            ) from bce
+        except Exception as e:
+            raise AssetSyncError(e) from e
+        if progress_tracker:
+            progress_tracker.track_progress_callback(len(file_contents))
+            progress_tracker.increase_processed(1, 0)
+
+    def _get_upload_file_error(
+        self, exc: ClientError, s3_bucket: str, s3_upload_key: str, local_path: Path
+    ) -> JobAttachmentsS3ClientError:
+        status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+        status_code_guidance = {
+            **COMMON_ERROR_GUIDANCE_FOR_S3,
+            403: (
+                (
+                    "Forbidden or Access denied. Please check your AWS credentials, and ensure that "
+                    "your AWS IAM Role or User has the 's3:PutObject' permission for this bucket. "
+                )
+                if "kms:" not in str(exc)
+                else (
+                    "Forbidden or Access denied. Please check your AWS credentials and Job Attachments S3 bucket "
+                    "encryption settings. If a customer-managed KMS key is set, confirm that your AWS IAM Role or "
+                    "User has the 'kms:GenerateDataKey' and 'kms:DescribeKey' permissions for the key used to encrypt the bucket."
+                )
+            ),
+            404: "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account.",
+        }
+        return JobAttachmentsS3ClientError(
+            action="uploading file",
+            status_code=status_code,
+            bucket_name=s3_bucket,
+            key_or_prefix=s3_upload_key,
+            message=f"{status_code_guidance.get(status_code, '')} {str(exc)} (Failed to upload {str(local_path)})",
+        )
+
     @contextmanager
     def _open_non_symlink_file_binary(
         self, path: str
@@ -738,7 +940,7 @@ class S3AssetUploader:
             raise AssetSyncError(e) from e
 
 
-class S3AssetManager:
+class S3AssetManager(LocalAssetManager):
     """
     Asset handler that creates an asset manifest and uploads assets. Based on an S3 file system.
     """
@@ -751,7 +953,9 @@ class S3AssetManager:
         asset_uploader: Optional[S3AssetUploader] = None,
         session: Optional[boto3.Session] = None,
         asset_manifest_version: ManifestVersion = ManifestVersion.v2023_03_03,
+        config: Optional[config_file.ConfigSnapshot] = None,
     ) -> None:
+        super().__init__(asset_manifest_version=asset_manifest_version)
         self.farm_id = farm_id
         self.queue_id = queue_id
         self.job_attachment_settings: Optional[JobAttachmentS3Settings] = job_attachment_settings
@@ -767,462 +971,38 @@ class S3AssetManager:
                 )
 
         if asset_uploader is None:
-            asset_uploader = S3AssetUploader(session=session)
+            asset_uploader = S3AssetUploader(session=session, config=config)
 
         self.asset_uploader = asset_uploader
         self.session = session
 
-        self.manifest_version: ManifestVersion = asset_manifest_version
-
-    def _process_input_path(
-        self,
-        path: Path,
-        root_path: str,
-        hash_cache: HashCache,
-        progress_tracker: Optional[ProgressTracker] = None,
-        update: bool = True,
-    ) -> Tuple[FileStatus, int, base_manifest.BaseManifestPath]:
-        # If it's cancelled, raise an AssetSyncCancelledError exception
-        if progress_tracker and not progress_tracker.continue_reporting:
-            raise AssetSyncCancelledError(
-                "File hashing cancelled.", progress_tracker.get_summary_statistics()
-            )
-
-        manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
-            version=self.manifest_version
+        # If this manager can upload, the small files it hashes are kept in memory (up to a limit)
+        # for the upload that follows, so that they're only read from disk once.
+        self._small_file_buffers: Optional[_SmallFileBuffers] = (
+            _SmallFileBuffers() if self.job_attachment_settings else None
         )
-        hash_alg: HashAlgorithm = manifest_model.AssetManifest.get_default_hash_alg()
-
-        full_path = str(path.resolve())
-        file_status: FileStatus = FileStatus.UNCHANGED
-        actual_modified_time = str(datetime.fromtimestamp(path.stat().st_mtime))
-
-        entry: Optional[HashCacheEntry] = hash_cache.get_entry(full_path, hash_alg)
-        if entry is not None:
-            # If the file was modified, we need to rehash it
-            if actual_modified_time != entry.last_modified_time:
-                entry.last_modified_time = actual_modified_time
-                entry.file_hash = hash_file(full_path, hash_alg)
-                entry.hash_algorithm = hash_alg
-                file_status = FileStatus.MODIFIED
-        else:
-            entry = HashCacheEntry(
-                file_path=full_path,
-                hash_algorithm=hash_alg,
-                file_hash=hash_file(full_path, hash_alg),
-                last_modified_time=actual_modified_time,
-            )
-            file_status = FileStatus.NEW
 
-        if file_status != FileStatus.UNCHANGED and update:
-            hash_cache.put_entry(entry)
-
-        file_size = path.resolve().stat().st_size
-        path_args: dict[str, Any] = {
-            "path": path.relative_to(root_path).as_posix(),
-            "hash": entry.file_hash,
-        }
-
-        # stat().st_mtime_ns returns an int that represents the time in nanoseconds since the epoch.
-        # The asset manifest spec requires the mtime to be represented as an integer in microseconds.
-        path_args["mtime"] = trunc(path.stat().st_mtime_ns // 1000)
-        path_args["size"] = file_size
-
-        return (file_status, file_size, manifest_model.Path(**path_args))
-
-    def _create_manifest_file(
-        self,
-        input_paths: list[Path],
-        root_path: str,
-        hash_cache: HashCache,
-        progress_tracker: Optional[ProgressTracker] = None,
-    ) -> BaseAssetManifest:
-        manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
-            version=self.manifest_version
-        )
-        if manifest_model.manifest_version in {
-            ManifestVersion.v2023_03_03,
-        }:
-            paths: list[base_manifest.BaseManifestPath] = []
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = {
-                    executor.submit(
-                        self._process_input_path, path, root_path, hash_cache, progress_tracker
-                    ): path
-                    for path in input_paths
-                }
-                for future in concurrent.futures.as_completed(futures):
-                    (file_status, file_size, path_to_put_in_manifest) = future.result()
-                    paths.append(path_to_put_in_manifest)
-                    if progress_tracker:
-                        if file_status == FileStatus.NEW or file_status == FileStatus.MODIFIED:
-                            progress_tracker.increase_processed(1, file_size)
-                        else:
-                            progress_tracker.increase_skipped(1, file_size)
-                        progress_tracker.report_progress()
-
-            # Need to sort the list to keep it canonical
-            paths.sort(key=lambda x: x.path, reverse=True)
-
-            manifest_args: dict[str, Any] = {
-                "hash_alg": manifest_model.AssetManifest.get_default_hash_alg(),
-                "paths": paths,
-            }
-
-            manifest_args["total_size"] = sum([path.size for path in paths])
-
-            return manifest_model.AssetManifest(**manifest_args)
-        else:
-            raise NotImplementedError(
-                f"Creation of manifest version {manifest_model.manifest_version} is not supported."
-            )
-
-    def _get_asset_groups(
-        self,
-        input_paths: set[str],
-        output_paths: set[str],
-        referenced_paths: set[str],
-        local_type_locations: dict[str, str] = {},
-        shared_type_locations: dict[str, str] = {},
-        require_paths_exist: bool = False,
-    ) -> list[AssetRootGroup]:
+    def _hash_file(self, full_path: str, hash_alg: HashAlgorithm) -> str:
         """
-        For the given input paths and output paths, a list of groups is returned, where paths sharing
-        the same root path are grouped together. Note that paths can be files or directories.
-
-        The returned list satisfies the following conditions:
-        - If a path is relative to any of the paths in the given `shared_type_locations` paths, it is
-          excluded from the list.
-        - The given `local_type_locations` paths can each form a group based on its root path. In other
-          words, if there are paths relative to any of the `local_type_locations` paths, they are grouped
-          together as one.
-        - The referenced paths may have no files or directories associated, but they always live
-          relative to one of the AssetRootGroup objects returned.
+        Hashes the given file. A small file is kept in memory, if there's room, for uploading later.
         """
-        groupings: dict[str, AssetRootGroup] = {}
-        missing_input_paths = set()
-        misconfigured_directories = set()
-
-        # Resolve full path, then cast to pure path to get top-level directory
-        for _path in input_paths:
-            # Need to use absolute to not resolve symlinks, but need normpath to get rid of relative paths, i.e. '..'
-            abs_path = Path(os.path.normpath(Path(_path).absolute()))
-            if not abs_path.exists():
-                if require_paths_exist:
-                    missing_input_paths.add(abs_path)
-                else:
-                    logger.warning(
-                        f"Input path '{_path}' resolving to '{abs_path}' does not exist. Adding to referenced paths."
-                    )
-                    referenced_paths.add(_path)
-                continue
-            if abs_path.is_dir():
-                misconfigured_directories.add(abs_path)
-                continue
-
-            # Skips the upload if the path is relative to any of the File System Location
-            # of SHARED type that was set in the Job.
-            if any(_is_relative_to(abs_path, shared) for shared in shared_type_locations):
-                continue
-
-            # If the path is relative to any of the File System Location of LOCAL type,
-            # groups the files into a single group using the path of that location.
-            matched_root = self._find_matched_root_from_local_type_locations(
-                groupings=groupings,
-                abs_path=abs_path,
-                local_type_locations=local_type_locations,
-            )
-            matched_group = self._get_matched_group(matched_root, groupings)
-            matched_group.inputs.add(abs_path)
-
-        if missing_input_paths or misconfigured_directories:
-            all_misconfigured_inputs = ""
-            misconfigured_inputs_msg = (
-                "Job submission contains missing input files or directories specified as files."
-                " All inputs must exist and be classified properly."
-            )
-            if missing_input_paths:
-                missing_inputs_list: list[str] = sorted([str(i) for i in missing_input_paths])
-                all_missing_inputs = "\n\t".join(missing_inputs_list)
-                all_misconfigured_inputs += f"\nMissing input files:\n\t{all_missing_inputs}"
-            if misconfigured_directories:
-                misconfigured_directories_list: list[str] = sorted(
-                    [str(d) for d in misconfigured_directories]
-                )
-                all_misconfigured_directories = "\n\t".join(misconfigured_directories_list)
-                all_misconfigured_inputs += (
-                    f"\nDirectories classified as files:\n\t{all_misconfigured_directories}"
-                )
-            raise MisconfiguredInputsError(misconfigured_inputs_msg + all_misconfigured_inputs)
-
-        for _path in output_paths:
-            abs_path = Path(os.path.normpath(Path(_path).absolute()))
-
-            # Skips the upload if the path is relative to any of the File System Location
-            # of SHARED type that was set in the Job.
-            if any(_is_relative_to(abs_path, shared) for shared in shared_type_locations):
-                continue
-
-            # If the path is relative to any of the File System Location of LOCAL type,
-            # groups the files into a single group using the path of that location.
-            matched_root = self._find_matched_root_from_local_type_locations(
-                groupings=groupings,
-                abs_path=abs_path,
-                local_type_locations=local_type_locations,
-            )
-            matched_group = self._get_matched_group(matched_root, groupings)
-            matched_group.outputs.add(abs_path)
-
-        for _path in referenced_paths:
-            abs_path = Path(os.path.normpath(Path(_path).absolute()))
-
-            # Skips the reference if the path is relative to any of the File System Location
-            # of SHARED type that was set in the Job.
-            if any(_is_relative_to(abs_path, shared) for shared in shared_type_locations):
-                continue
-            # If the path is relative to any of the File System Location of LOCAL type,
-            # groups the references into a single group using the path of that location.
-            matched_root = self._find_matched_root_from_local_type_locations(
-                groupings=groupings,
-                abs_path=abs_path,
-                local_type_locations=local_type_locations,
-            )
-            matched_group = self._get_matched_group(matched_root, groupings)
-            matched_group.references.add(abs_path)
-
-        # Finally, build the list of asset root groups
-        for asset_group in groupings.values():
-            common_path: Path = Path(
-                os.path.commonpath(
-                    list(asset_group.inputs | asset_group.outputs | asset_group.references)
-                )
-            )
-            if common_path.is_file():
-                common_path = common_path.parent
-            asset_group.root_path = str(common_path)
-
-        return list(groupings.values())
-
-    def _get_matched_group(
-        self, root_path: str, groupings: dict[str, AssetRootGroup]
-    ) -> AssetRootGroup:
-        root_normcase = os.path.normcase(root_path)
-        matched_group = next(
-            (group for key, group in groupings.items() if os.path.normcase(key) == root_normcase),
-            None,
-        )
-        if matched_group is None:
-            raise ValueError(
-                f"No group found for the root path '{root_path}' in the groupings dictionary: {groupings}"
+        if self._small_file_buffers is None:
+            return hash_file(full_path, hash_alg)
+
+        file_stat = os.stat(full_path)
+        file_size = file_stat.st_size
+        if file_size > SMALL_FILE_BUFFER_THRESHOLD_BYTES or not self._small_file_buffers.has_room(
+            file_size
+        ):
+            return hash_file(full_path, hash_alg)
+
+        file_contents = bytearray()
+        file_hash = hash_file(full_path, hash_alg, file_contents=file_contents)
+        if len(file_contents) == file_size:
+            self._small_file_buffers.put(
+                full_path, file_hash, bytes(file_contents), file_stat.st_mtime_ns
             )
-        return matched_group
-
-    def _find_matched_root_from_local_type_locations(
-        self,
-        groupings: dict[str, AssetRootGroup],
-        abs_path: Path,
-        local_type_locations: dict[str, str] = {},
-    ) -> str:
-        """
-        Checks if the given `abs_path` is relative to any of the File System Locations of LOCAL type.
-        If it is, select the most specific File System Location, and add a new grouping keyed by that
-        matched root path (if the key does not exist.) Then, returns the matched root path.
-        If no match is found, returns the top directory of `abs_path` as the key used for grouping.
-        """
-        matched_root = None
-        for root_path in local_type_locations.keys():
-            if _is_relative_to(abs_path, root_path) and (
-                matched_root is None or len(root_path) > len(matched_root)
-            ):
-                matched_root = root_path
-
-        if matched_root is not None:
-            if matched_root not in groupings:
-                groupings[matched_root] = AssetRootGroup(
-                    file_system_location_name=local_type_locations[matched_root],
-                )
-            return matched_root
-        else:
-            keys_normcase = [os.path.normcase(key) for key in groupings.keys()]
-            top_directory = PurePath(abs_path).parts[0]
-            top_directory_normcase = os.path.normcase(top_directory)
-            if top_directory_normcase not in keys_normcase:
-                groupings[top_directory] = AssetRootGroup()
-            else:
-                return top_directory_normcase
-            return top_directory
-
-    def _get_total_size_of_files(self, paths: list[str]) -> int:
-        total_bytes = 0
-        try:
-            for path in paths:
-                total_bytes += Path(path).resolve().stat().st_size
-        except FileNotFoundError:
-            logger.warning(
-                f"Skipping the input from total size calculation as it doesn't exist: {path}"
-            )
-        return total_bytes
-
-    def _get_total_input_size_from_manifests(
-        self, manifests: list[AssetRootManifest]
-    ) -> tuple[int, int]:
-        total_files = 0
-        total_bytes = 0
-        for asset_root_manifest in manifests:
-            if asset_root_manifest.asset_manifest:
-                input_paths = asset_root_manifest.asset_manifest.paths
-                input_paths_str = [
-                    str(Path(asset_root_manifest.root_path).joinpath(path.path))
-                    for path in input_paths
-                ]
-                total_files += len(input_paths)
-                total_bytes += self._get_total_size_of_files(input_paths_str)
-
-        return (total_files, total_bytes)
-
-    def _get_total_input_size_from_asset_group(
-        self, groups: list[AssetRootGroup]
-    ) -> tuple[int, int]:
-        total_files = 0
-        total_bytes = 0
-        for group in groups:
-            input_paths = [str(input) for input in group.inputs]
-            total_bytes += self._get_total_size_of_files(input_paths)
-            total_files += len(input_paths)
-        return (total_files, total_bytes)
-
-    def _get_file_system_locations_by_type(
-        self,
-        storage_profile_for_queue: StorageProfile,
-    ) -> Tuple[dict, dict]:
-        """
-        Given the Storage Profile for Queue object, extracts and groups
-        path and name pairs from the File System Locations into two dicts,
-        LOCAL and SHARED type, respectively. Returns a tuple of two dicts.
-        """
-        local_type_locations: dict[str, str] = {}
-        shared_type_locations: dict[str, str] = {}
-        for fs_loc in storage_profile_for_queue.fileSystemLocations:
-            if fs_loc.type == FileSystemLocationType.LOCAL:
-                local_type_locations[fs_loc.path] = fs_loc.name
-            elif fs_loc.type == FileSystemLocationType.SHARED:
-                shared_type_locations[fs_loc.path] = fs_loc.name
-        return local_type_locations, shared_type_locations
-
-    def _group_asset_paths(
-        self,
-        input_paths: list[str],
-        output_paths: list[str],
-        referenced_paths: list[str],
-        storage_profile: Optional[StorageProfile] = None,
-        require_paths_exist: bool = False,
-    ) -> list[AssetRootGroup]:
-        """
-        Resolves all of the paths that will be uploaded, sorting by storage profile location.
-        """
-        local_type_locations: dict[str, str] = {}
-        shared_type_locations: dict[str, str] = {}
-        if storage_profile:
-            (
-                local_type_locations,
-                shared_type_locations,
-            ) = self._get_file_system_locations_by_type(storage_profile)
-
-        # Group the paths by asset root, removing duplicates and empty strings
-        asset_groups: list[AssetRootGroup] = self._get_asset_groups(
-            {ip_path for ip_path in input_paths if ip_path},
-            {op_path for op_path in output_paths if op_path},
-            {rf_path for rf_path in referenced_paths if rf_path},
-            local_type_locations,
-            shared_type_locations,
-            require_paths_exist,
-        )
-
-        return asset_groups
-
-    def prepare_paths_for_upload(
-        self,
-        input_paths: list[str],
-        output_paths: list[str],
-        referenced_paths: list[str],
-        storage_profile: Optional[StorageProfile] = None,
-        require_paths_exist: bool = False,
-    ) -> AssetUploadGroup:
-        """
-        Processes all of the paths required for upload, grouping them by asset root and local storage profile locations.
-        Returns an object containing the grouped paths, which also includes a dictionary of input directories and file counts
-        for files that were not under the root path or any local storage profile locations.
-        """
-        asset_groups = self._group_asset_paths(
-            input_paths,
-            output_paths,
-            referenced_paths,
-            storage_profile,
-            require_paths_exist,
-        )
-        (input_file_count, input_bytes) = self._get_total_input_size_from_asset_group(asset_groups)
-        return AssetUploadGroup(
-            asset_groups=asset_groups,
-            total_input_files=input_file_count,
-            total_input_bytes=input_bytes,
-        )
-
-    def hash_assets_and_create_manifest(
-        self,
-        asset_groups: list[AssetRootGroup],
-        total_input_files: int,
-        total_input_bytes: int,
-        hash_cache_dir: Optional[str] = None,
-        on_preparing_to_submit: Optional[Callable[[Any], bool]] = None,
-    ) -> tuple[SummaryStatistics, list[AssetRootManifest]]:
-        """
-        Computes the hashes for input files, and creates manifests using the local hash cache.
-
-        Args:
-            input_paths: a list of input paths.
-            output_paths: a list of output paths.
-            hash_cache_dir: a path to local hash cache directory. If it's None, use default path.
-            on_preparing_to_submit: a callback to be called to periodically report progress to the caller.
-            The callback returns True if the operation should continue as normal, or False to cancel.
-
-        Returns:
-            a tuple with (1) the summary statistics of the hash operation, and
-            (2) a list of AssetRootManifest (a manifest and output paths for each asset root).
-        """
-        start_time = time.perf_counter()
-
-        # Sets up progress tracker to report upload progress back to the caller.
-        progress_tracker = ProgressTracker(
-            status=ProgressStatus.PREPARING_IN_PROGRESS,
-            total_files=total_input_files,
-            total_bytes=total_input_bytes,
-            on_progress_callback=on_preparing_to_submit,
-        )
-
-        asset_root_manifests: list[AssetRootManifest] = []
-        for group in asset_groups:
-            # Might have output directories, but no inputs for this group
-            asset_manifest: Optional[BaseAssetManifest] = None
-            if group.inputs:
-                # Create manifest, using local hash cache
-                with HashCache(hash_cache_dir) as hash_cache:
-                    asset_manifest = self._create_manifest_file(
-                        sorted(list(group.inputs)), group.root_path, hash_cache, progress_tracker
-                    )
-
-            asset_root_manifests.append(
-                AssetRootManifest(
-                    file_system_location_name=group.file_system_location_name,
-                    root_path=group.root_path,
-                    asset_manifest=asset_manifest,
-                    outputs=sorted(list(group.outputs)),
-                )
-            )
-
-        progress_tracker.total_time = time.perf_counter() - start_time
-
-        return (progress_tracker.get_summary_statistics(), asset_root_manifests)
+        return file_hash
 
     def upload_assets(
         self,
@@ -1260,6 +1040,7 @@ class S3AssetManager:
         start_time = time.perf_counter()
 
         manifest_properties_list: list[ManifestProperties] = []
+        manifests_by_source_root: list[tuple[BaseAssetManifest, Path]] = []
 
         for asset_root_manifest in manifests:
             output_rel_paths: list[str] = [
@@ -1275,7 +1056,7 @@ class S3AssetManager:
             )
 
             if asset_root_manifest.asset_manifest:
-                (partial_manifest_key, asset_manifest_hash) = self.asset_uploader.upload_assets(
+                (partial_manifest_key, asset_manifest_hash) = self.asset_uploader.upload_manifest(
                     job_attachment_settings=self.job_attachment_settings,  # type: ignore[arg-type]
                     manifest=asset_root_manifest.asset_manifest,
                     partial_manifest_prefix=self.job_attachment_settings.partial_manifest_prefix(  # type: ignore[union-attr]
@@ -1283,12 +1064,13 @@ class S3AssetManager:
                     ),
                     source_root=Path(asset_root_manifest.root_path),
                     file_system_location_name=asset_root_manifest.file_system_location_name,
-                    progress_tracker=progress_tracker,
-                    s3_check_cache_dir=s3_check_cache_dir,
                     manifest_write_dir=manifest_write_dir,
                 )
                 manifest_properties.inputManifestPath = partial_manifest_key
                 manifest_properties.inputManifestHash = asset_manifest_hash
+                manifests_by_source_root.append(
+                    (asset_root_manifest.asset_manifest, Path(asset_root_manifest.root_path))
+                )
 
             manifest_properties_list.append(manifest_properties)
 
@@ -1305,6 +1087,21 @@ class S3AssetManager:
                 )
             )
 
+        # Upload the input files of all the asset roots together.
+        try:
+            if manifests_by_source_root:
+                self.asset_uploader.upload_input_files_from_roots(
+                    manifests_by_source_root=manifests_by_source_root,
+                    s3_bucket=self.job_attachment_settings.s3BucketName,  # type: ignore[union-attr]
+                    s3_cas_prefix=self.job_attachment_settings.full_cas_prefix(),  # type: ignore[union-attr]
+                    progress_tracker=progress_tracker,
+                    s3_check_cache_dir=s3_check_cache_dir,
+                    small_file_buffers=self._small_file_buffers,
+                )
+        finally:
+            if self._small_file_buffers is not None:
+                self._small_file_buffers.clear()
+
         progress_tracker.total_time = time.perf_counter() - start_time
 
         return (
@@ -2,12 +2,14 @@
 
 import logging
 import os
+import re
+import select
 import shutil
 import subprocess
 import time
 from pathlib import Path
 import threading
-from typing import Dict, Union, Optional
+from typing import Dict, Iterable, List, Union, Optional, Set
 
 from .exceptions import (
     VFSExecutableMissingError,
@@ -33,6 +35,15 @@ VFS_CACHE_REL_PATH_IN_SESSION = ".vfs_object_cache"
 VFS_MANIFEST_FOLDER_IN_SESSION = ".vfs_manifests"
 VFS_LOGS_FOLDER_IN_SESSION = ".vfs_logs"
 
+# The mount table of the current process on Linux; findmnt reads the same file.
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+# Intervals between checks while waiting for a mount to appear or disappear. The mount table is
+# re-read right away when the kernel reports a change to it, so these only bound the wait otherwise.
+MOUNT_CHECK_MIN_INTERVAL_SECONDS = 0.01
+MOUNT_CHECK_MAX_INTERVAL_SECONDS = 0.1
+# Interval between checks when the mount table cannot be read, and findmnt is run instead.
+FINDMNT_CHECK_INTERVAL_SECONDS = 1.0
+
 VFS_MANIFEST_FOLDER_PERMISSIONS = PosixFileSystemPermissionSettings(
     os_user="",
     os_group="",
@@ -207,9 +218,12 @@ class VFSProcessManager(object):
     def is_mount(cls, path) -> bool:
         """
         os.path.ismount returns false for libfuse mounts owned by "other users",
-        use findmnt instead
+        so check the mount table instead, or use findmnt if it can't be read
         """
-        return subprocess.run(["findmnt", path]).returncode == 0
+        mount_points = _read_mount_points()
+        if mount_points is None:
+            return subprocess.run(["findmnt", path]).returncode == 0
+        return _is_in_mount_points(path, mount_points)
 
     @classmethod
     def wait_for_mount(cls, mount_path, session_dir, mount_wait_seconds=60, expected=True) -> bool:
@@ -221,17 +235,59 @@ class VFSProcessManager(object):
         :param mount_wait_seconds: Duration to wait for mount state
         :param expected: Wait for the mount to exist or no longer exist
         """
-        log.info(f"Waiting for is_mount at {mount_path} to return {expected}..")
-        wait_seconds = mount_wait_seconds
-        while wait_seconds >= 0:
-            if cls.is_mount(mount_path) == expected:
-                log.info(f"is_mount on {mount_path} returns {expected}, returning")
+        return cls.wait_for_mounts([mount_path], session_dir, mount_wait_seconds, expected)
+
+    @classmethod
+    def wait_for_mounts(
+        cls,
+        mount_paths: Iterable[Union[os.PathLike, str]],
+        session_dir: Path,
+        mount_wait_seconds: float = 60,
+        expected: bool = True,
+    ) -> bool:
+        """
+        Waits for all of the given mounts at once. Each check reads the mount table a single time for
+        all of the mounts, and the checks start a few milliseconds apart, backing off to
+        MOUNT_CHECK_MAX_INTERVAL_SECONDS. On Linux, a change to the mount table ends the wait for the
+        next check early.
+        :param mount_paths: Paths to mounts to watch for
+        :param session_dir: Session folder associated with the mounts
+        :param mount_wait_seconds: Duration to wait for mount state
+        :param expected: Wait for the mounts to exist or no longer exist
+        :returns: Whether all of the mounts reached the expected state in time
+        """
+        pending: List[str] = [str(mount_path) for mount_path in mount_paths]
+        log.info(f"Waiting for is_mount at {', '.join(pending)} to return {expected}..")
+        deadline = time.monotonic() + mount_wait_seconds
+        interval = MOUNT_CHECK_MIN_INTERVAL_SECONDS
+        while True:
+            mount_points = _read_mount_points()
+            still_pending: List[str] = []
+            for mount_path in pending:
+                if mount_points is None:
+                    is_mount = subprocess.run(["findmnt", mount_path]).returncode == 0
+                else:
+                    is_mount = _is_in_mount_points(mount_path, mount_points)
+                if is_mount == expected:
+                    log.info(f"is_mount on {mount_path} returns {expected}, returning")
+                else:
+                    still_pending.append(mount_path)
+            pending = still_pending
+            if not pending:
                 return True
-            wait_seconds -= 1
-            if wait_seconds >= 0:
-                log.info(f"is_mount on {mount_path} not {expected}, sleeping...")
-                time.sleep(1)
-        log.info(f"Failed to find is_mount {expected} at {mount_path} after {mount_wait_seconds}")
+
+            remaining_seconds = deadline - time.monotonic()
+            if remaining_seconds <= 0:
+                break
+            if mount_points is None:
+                time.sleep(min(FINDMNT_CHECK_INTERVAL_SECONDS, remaining_seconds))
+            else:
+                _wait_for_mount_table_change(min(interval, remaining_seconds))
+                interval = min(interval * 2, MOUNT_CHECK_MAX_INTERVAL_SECONDS)
+
+        log.info(
+            f"Failed to find is_mount {expected} at {', '.join(pending)} after {mount_wait_seconds}"
+        )
         cls.print_log_end(session_dir)
         return False
 
@@ -457,6 +513,56 @@ class VFSProcessManager(object):
         Start our VFS process
         :return: VFS process id
         """
+        self.launch(session_dir)
+        if not VFSProcessManager.wait_for_mount(self.get_mount_point(), session_dir):
+            log.error("Failed to mount, shutting down")
+            raise VFSFailedToMountError
+        self.record_pid(session_dir)
+
+    @classmethod
+    def start_all(cls, vfs_managers: List["VFSProcessManager"], session_dir: Path) -> None:
+        """
+        Start several VFS processes for one session together. All of the processes are launched
+        before waiting for any mount, and the mounts are then awaited jointly. If any process fails to
+        launch or mount, all of the processes that were launched are shut down.
+        """
+        launched: List[VFSProcessManager] = []
+        try:
+            for vfs_manager in vfs_managers:
+                vfs_manager.launch(session_dir)
+                launched.append(vfs_manager)
+            if not cls.wait_for_mounts(
+                [vfs_manager.get_mount_point() for vfs_manager in vfs_managers], session_dir
+            ):
+                log.error("Failed to mount, shutting down")
+                raise VFSFailedToMountError
+        except BaseException:
+            for vfs_manager in launched:
+                vfs_manager.shut_down(session_dir)
+            raise
+
+        for vfs_manager in vfs_managers:
+            vfs_manager.record_pid(session_dir)
+
+    def shut_down(self, session_dir: Path) -> None:
+        """
+        Unmount and stop a launched VFS process that has not been recorded in the pid file.
+        Errors are logged rather than raised, since this is used while handling another failure.
+        """
+        try:
+            if VFSProcessManager.is_mount(self._mount_point):
+                VFSProcessManager.shutdown_libfuse_mount(
+                    self._mount_point, self._os_user, session_dir
+                )
+            if self._vfs_proc is not None and self._vfs_proc.poll() is None:
+                self._vfs_proc.terminate()
+        except Exception as e:
+            log.error(f"Failed to shut down VFS at {self._mount_point}: {e}")
+
+    def launch(self, session_dir: Path) -> None:
+        """
+        Launch our VFS process, without waiting for its mount to be ready
+        """
         self._run_path = session_dir
         log.info(f"Using run_path {self._run_path}")
         log.info(f"Using mount_point {self._mount_point}")
@@ -497,10 +603,12 @@ class VFSProcessManager(object):
             log.exception(f"Exception during launch with command {start_command} exception {e}")
             raise e
         log.info(f"Launched VFS as pid {self._vfs_proc.pid}")
-        if not VFSProcessManager.wait_for_mount(self.get_mount_point(), session_dir):
-            log.error("Failed to mount, shutting down")
-            raise VFSFailedToMountError
 
+    def record_pid(self, session_dir: Path) -> None:
+        """
+        Record the mount point, pid and manifest of our mounted VFS process in the session's pid file
+        """
+        assert self._vfs_proc is not None
         try:
             # if the pid file exists, add the new VFS instance and remove any it replaced
             pid_file_path = (session_dir / DEADLINE_VFS_PID_FILE_NAME).resolve()
@@ -522,3 +630,53 @@ class VFSProcessManager(object):
 
     def get_mount_point(self) -> Union[os.PathLike, str]:
         return self._mount_point
+
+
+def _unescape_mountinfo_field(field: str) -> str:
+    """Mount table fields escape space, tab, newline and backslash as octal, e.g. "\\040"."""
+    if "\\" not in field:
+        return field
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), field)
+
+
+def _read_mount_points() -> Optional[Set[str]]:
+    """
+    Returns the mount points in the mount table of the current process, or None if the mount
+    table can't be read, e.g. on operating systems other than Linux.
+    """
+    try:
+        with open(MOUNTINFO_PATH, "r") as mountinfo:
+            lines = mountinfo.readlines()
+    except OSError:
+        return None
+    # Each line is "<mount id> <parent id> <major:minor> <root> <mount point> ...".
+    return {
+        _unescape_mountinfo_field(fields[4])
+        for fields in (line.split(" ") for line in lines)
+        if len(fields) > 4
+    }
+
+
+def _is_in_mount_points(path: Union[os.PathLike, str], mount_points: Set[str]) -> bool:
+    normalized_path = os.path.normpath(os.path.abspath(path))
+    return normalized_path in mount_points or os.path.realpath(normalized_path) in mount_points
+
+
+def _wait_for_mount_table_change(timeout_seconds: float) -> None:
+    """
+    Waits until the mount table changes, or the timeout passes. The kernel signals a change of
+    the mount table as an exceptional condition on an open mount table file that has been read.
+    Where that isn't available, this just waits for the timeout.
+    """
+    poll = getattr(select, "poll", None)
+    if poll is None:
+        time.sleep(timeout_seconds)
+        return
+    try:
+        with open(MOUNTINFO_PATH, "rb") as mountinfo:
+            mountinfo.read()
+            poller = poll()
+            poller.register(mountinfo, select.POLLPRI | select.POLLERR)
+            poller.poll(timeout_seconds * 1000)
+    except OSError:
+        time.sleep(timeout_seconds)
@@ -10,6 +10,16 @@ from pathlib import Path
 from deadline.client.config import config_file
 
 
+@pytest.fixture(scope="function", autouse=True)
+def isolated_deadline_cache_dir(tmp_path):
+    """
+    Fixture to keep local caches, like the AWS Deadline Cloud metadata cache, from being
+    shared between tests or with the user's cache directory.
+    """
+    with patch.object(config_file, "DEFAULT_CACHE_DIR", str(tmp_path / "deadline_cache")):
+        yield str(tmp_path / "deadline_cache")
+
+
 @pytest.fixture(scope="function")
 def fresh_deadline_config():
     """
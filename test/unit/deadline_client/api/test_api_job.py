@@ -4,11 +4,14 @@
 tests the deadline.client.api functions relating to jobs
 """
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
+from botocore.exceptions import ClientError
 
 from deadline.client import api
+from deadline.client.api import _job_waiter
+from deadline.client.exceptions import JobWaiterCanceled
 
 JOBS_LIST = [
     {
@@ -83,3 +86,134 @@ def test_list_jobs_principal_id(fresh_deadline_config, pass_principal_id_filter,
             )
         else:
             session_mock().client("deadline").list_jobs.assert_called_once_with()
+
+
+def test_wait_for_jobs_checks_immediately_then_backs_off():
+    """Confirm that the first check has no delay, and the delays after it grow up to the maximum"""
+    deadline = MagicMock()
+    deadline.get_job.side_effect = [{"jobId": "job-1", "taskRunStatus": "RUNNING"}] * 5 + [
+        {"jobId": "job-1", "taskRunStatus": "SUCCEEDED"}
+    ]
+    status_changes = []
+
+    with patch.object(_job_waiter.time, "sleep") as sleep_mock:
+        jobs = _job_waiter.wait_for_jobs(
+            deadline,
+            "farm-1",
+            "queue-1",
+            ["job-1"],
+            is_done=lambda job: job["taskRunStatus"] == "SUCCEEDED",
+            on_status_change=lambda job: status_changes.append(job["taskRunStatus"]),
+            backoff=_job_waiter.JobWaiterBackoff(initial_delay=0.25, max_delay=1.0, jitter=0),
+        )
+
+    assert jobs["job-1"]["taskRunStatus"] == "SUCCEEDED"
+    assert status_changes == ["RUNNING", "SUCCEEDED"]
+    assert [c.args[0] for c in sleep_mock.call_args_list] == [0.25, 0.5, 1.0, 1.0, 1.0]
+
+    # A job that is already done needs no delay at all
+    deadline.get_job.side_effect = [{"jobId": "job-1", "taskRunStatus": "SUCCEEDED"}]
+    with patch.object(_job_waiter.time, "sleep") as sleep_mock:
+        _job_waiter.wait_for_jobs(
+            deadline,
+            "farm-1",
+            "queue-1",
+            ["job-1"],
+            is_done=lambda job: job["taskRunStatus"] == "SUCCEEDED",
+        )
+    sleep_mock.assert_not_called()
+
+
+def test_wait_for_jobs_searches_jobs_in_batches():
+    """Confirm that several jobs are checked with SearchJobs on their job IDs, not the whole queue"""
+    deadline = MagicMock()
+    job_ids = [f"job-{i}" for i in range(20)]
+
+    def search_jobs(**kwargs):
+        filter_values = kwargs["filterExpressions"]["filters"][0]["stringListFilter"]["values"]
+        # The jobs are running for the first check, and the last jobs aren't found yet
+        task_run_status = "RUNNING" if deadline.search_jobs.call_count <= 2 else "SUCCEEDED"
+        return {
+            "jobs": [
+                {"jobId": job_id, "taskRunStatus": task_run_status}
+                for job_id in filter_values
+                if job_id not in job_ids[-2:]
+            ]
+        }
+
+    deadline.search_jobs.side_effect = search_jobs
+    deadline.get_job.side_effect = lambda farmId, queueId, jobId: {
+        "jobId": jobId,
+        "taskRunStatus": "SUCCEEDED",
+    }
+
+    with patch.object(_job_waiter.time, "sleep"):
+        jobs = _job_waiter.wait_for_jobs(
+            deadline,
+            "farm-1",
+            "queue-1",
+            job_ids,
+            is_done=lambda job: job["taskRunStatus"] == "SUCCEEDED",
+        )
+
+    assert set(jobs) == set(job_ids)
+    deadline.list_jobs.assert_not_called()
+    # Two searches for the 20 jobs on the first check, and one for the 18 still running after it
+    assert [
+        c.kwargs["filterExpressions"]["filters"][0]["stringListFilter"]["values"]
+        for c in deadline.search_jobs.call_args_list
+    ] == [job_ids[:16], job_ids[16:], job_ids[:16], job_ids[16:18]]
+    assert all(
+        c.kwargs["farmId"] == "farm-1" and c.kwargs["queueIds"] == ["queue-1"]
+        for c in deadline.search_jobs.call_args_list
+    )
+    assert [c.kwargs["jobId"] for c in deadline.get_job.call_args_list] == job_ids[-2:]
+
+
+def test_wait_for_jobs_falls_back_to_get_job():
+    """Confirm that one job uses GetJob, and that GetJob is used if SearchJobs isn't allowed"""
+    deadline = MagicMock()
+    deadline.get_job.side_effect = lambda farmId, queueId, jobId: {
+        "jobId": jobId,
+        "taskRunStatus": "SUCCEEDED",
+    }
+
+    _job_waiter.wait_for_jobs(deadline, "farm-1", "queue-1", ["job-1"], is_done=lambda job: True)
+    deadline.search_jobs.assert_not_called()
+    assert deadline.get_job.call_count == 1
+
+    deadline.get_job.reset_mock()
+    deadline.search_jobs.side_effect = ClientError(
+        {"Error": {"Code": "AccessDeniedException", "Message": "Not allowed"}}, "SearchJobs"
+    )
+    jobs = _job_waiter.wait_for_jobs(
+        deadline, "farm-1", "queue-1", ["job-1", "job-2"], is_done=lambda job: True
+    )
+    assert set(jobs) == {"job-1", "job-2"}
+    assert deadline.get_job.call_count == 2
+
+
+def test_wait_for_jobs_canceled_and_timeout():
+    deadline = MagicMock()
+    deadline.get_job.return_value = {"jobId": "job-1", "taskRunStatus": "RUNNING"}
+
+    with patch.object(_job_waiter.time, "sleep"), pytest.raises(JobWaiterCanceled):
+        _job_waiter.wait_for_jobs(
+            deadline,
+            "farm-1",
+            "queue-1",
+            ["job-1"],
+            is_done=lambda job: False,
+            continue_callback=lambda: deadline.get_job.call_count < 3,
+        )
+    assert deadline.get_job.call_count == 3
+
+    with patch.object(_job_waiter.time, "sleep"), pytest.raises(TimeoutError, match="job-1"):
+        _job_waiter.wait_for_jobs(
+            deadline,
+            "farm-1",
+            "queue-1",
+            ["job-1"],
+            is_done=lambda job: False,
+            max_wait_seconds=30,
+        )
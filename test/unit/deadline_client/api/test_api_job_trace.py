@@ -0,0 +1,51 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+tests the deadline.client.api helpers for `deadline job trace-schedule`
+"""
+
+import io
+import json
+from unittest.mock import patch
+
+from deadline.client.api import _job_trace
+from deadline.client.api._job_trace import ChromeTraceWriter
+
+
+def test_chrome_trace_writer_writes_valid_json():
+    """Confirm that the streamed trace is a Chrome tracing JSON object"""
+    events = [
+        {"name": "Session", "ph": "B", "ts": 0, "pid": 0, "tid": 0},
+        {"name": "Session", "ph": "E", "ts": 10, "pid": 0, "tid": 0},
+    ]
+    for event_count in (0, 1, 2):
+        fh = io.StringIO()
+        writer = ChromeTraceWriter(fh)
+        for event in events[:event_count]:
+            writer.write_event(event)
+        writer.close(other_data={"jobId": "job-1"})
+
+        assert json.loads(fh.getvalue()) == {
+            "traceEvents": events[:event_count],
+            "otherData": {"jobId": "job-1"},
+        }
+
+
+def test_rate_limiter_waits_after_a_burst():
+    """Confirm that the rate limiter allows a burst of one second's requests, and then waits"""
+    now = [100.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    with patch.object(_job_trace.time, "monotonic", side_effect=lambda: now[0]), patch.object(
+        _job_trace.time, "sleep", side_effect=sleep
+    ):
+        rate_limiter = _job_trace._RateLimiter(requests_per_second=4)
+        for _ in range(4):
+            rate_limiter.acquire()
+        assert now[0] == 100.0
+
+        for _ in range(4):
+            rate_limiter.acquire()
+        assert abs(now[0] - 101.0) < 1e-6
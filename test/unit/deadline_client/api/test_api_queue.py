@@ -4,11 +4,14 @@
 tests the deadline.client.api functions relating to queues
 """
 
-from unittest.mock import patch
+import datetime
+import threading
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from deadline.client import api
+from deadline.client import api, config
 
 QUEUES_LIST = [
     {
@@ -38,6 +41,27 @@ QUEUES_LIST = [
     },
 ]
 
+QUEUE_ENVIRONMENT_TEMPLATE = """
+specificationVersion: environment-2023-09
+parameterDefinitions:
+- name: Param
+  type: STRING
+  default: value
+environment:
+  name: Env
+  script:
+    actions:
+      onEnter:
+        command: echo
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_parsed_queue_environments():
+    """Keep the queue environments parsed by one test from being used by another."""
+    with patch.dict(api._queue_parameters._parsed_queue_environments, clear=True):
+        yield
+
 
 def test_list_queues_paginated(fresh_deadline_config):
     """Confirm api.list_queues concatenates multiple pages"""
@@ -88,3 +112,223 @@ def test_list_queues_principal_id(fresh_deadline_config, pass_principal_id_filte
             )
         else:
             session_mock().client("deadline").list_queues.assert_called_once_with()
+
+
+def test_get_queue_is_cached_for_the_ttl(fresh_deadline_config):
+    """Confirm that GetQueue responses are cached until the TTL expires or the cache is cleared"""
+    queue = {"queueId": "queue-123", "displayName": "Queue", "ResponseMetadata": {}}
+    with patch.object(api._session, "get_boto3_session"):
+        deadline = api.get_boto3_client("deadline")
+        deadline.get_queue.return_value = queue
+
+        assert api.get_queue("farm-123", "queue-123", deadline)["displayName"] == "Queue"
+        assert api.get_queue("farm-123", "queue-123", deadline)["displayName"] == "Queue"
+        deadline.get_queue.assert_called_once_with(farmId="farm-123", queueId="queue-123")
+
+        api.clear_metadata_cache()
+        api.get_queue("farm-123", "queue-123", deadline)
+        assert deadline.get_queue.call_count == 2
+
+        config.set_setting("settings.metadata_cache_ttl_seconds", "0")
+        api.get_queue("farm-123", "queue-123", deadline)
+        api.get_queue("farm-123", "queue-123", deadline)
+        assert deadline.get_queue.call_count == 4
+
+
+def test_get_queue_is_cached_per_endpoint(fresh_deadline_config):
+    """Confirm that the same queue behind different endpoints is cached separately"""
+    clients = []
+    for region in ("us-west-2", "eu-west-1"):
+        deadline = MagicMock()
+        deadline.meta.endpoint_url = f"https://deadline.{region}.amazonaws.com"
+        deadline.get_queue.return_value = {"queueId": "queue-123", "displayName": region}
+        clients.append(deadline)
+
+    for deadline in clients + clients:
+        assert (
+            api.get_queue("farm-123", "queue-123", deadline)["displayName"]
+            == deadline.get_queue.return_value["displayName"]
+        )
+    for deadline in clients:
+        deadline.get_queue.assert_called_once_with(farmId="farm-123", queueId="queue-123")
+
+
+def test_metadata_cache_without_cache_directory(fresh_deadline_config, tmp_path):
+    """Confirm that values are fetched from the service if the cache directory can't be created"""
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+
+    with api._metadata_cache.DeadlineMetadataCache(
+        ttl_seconds=60, cache_dir=str(not_a_directory / "cache")
+    ) as cache:
+        assert not cache.enabled
+        assert cache.get("queue/farm-1/queue-1", lambda: {"displayName": "Fetched"}) == {
+            "displayName": "Fetched"
+        }
+
+
+def test_get_queue_parameter_definitions_revalidates_with_updated_at(fresh_deadline_config):
+    """Confirm that queue environment templates are only parsed again when they were updated"""
+    deadline = MagicMock()
+    deadline.list_queue_environments.return_value = {
+        "environments": [{"queueEnvironmentId": "queueenv-1", "name": "Env", "priority": 1}]
+    }
+    template = QUEUE_ENVIRONMENT_TEMPLATE
+    deadline.get_queue_environment.return_value = {
+        "queueEnvironmentId": "queueenv-1",
+        "priority": 1,
+        "template": template,
+        "updatedAt": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    }
+
+    with patch.object(
+        api._queue_parameters, "get_boto3_client", return_value=deadline
+    ), patch.object(
+        api._queue_parameters,
+        "_load_queue_environment_template",
+        wraps=api._queue_parameters._load_queue_environment_template,
+    ) as load_template_mock:
+        assert [
+            p["name"]
+            for p in api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        ] == ["Param"]
+        assert load_template_mock.call_count == 1
+
+        # Within the TTL, no calls are made
+        api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        assert deadline.get_queue_environment.call_count == 1
+
+        # After the TTL, the queue environment is fetched again, but not parsed again
+        with patch.object(api._metadata_cache.time, "time", return_value=time.time() + 3600):
+            assert [
+                p["name"]
+                for p in api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+            ] == ["Param"]
+        assert deadline.get_queue_environment.call_count == 2
+        assert load_template_mock.call_count == 1
+
+
+def test_get_queue_parameter_definitions_fetches_concurrently(fresh_deadline_config):
+    """Confirm that the queue environments are fetched at the same time, and combined by priority"""
+    deadline = MagicMock()
+    deadline.list_queue_environments.return_value = {
+        "environments": [
+            {"queueEnvironmentId": "queueenv-2", "name": "Env2", "priority": 2},
+            {"queueEnvironmentId": "queueenv-1", "name": "Env1", "priority": 1},
+        ]
+    }
+    # Each fetch waits until the other one has started, so this only passes if they overlap.
+    barrier = threading.Barrier(2, timeout=10)
+
+    def get_queue_environment(farmId, queueId, queueEnvironmentId):
+        barrier.wait()
+        priority = int(queueEnvironmentId[-1])
+        return {
+            "queueEnvironmentId": queueEnvironmentId,
+            "priority": priority,
+            "template": QUEUE_ENVIRONMENT_TEMPLATE.replace("Param", f"Param{priority}"),
+            "updatedAt": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+        }
+
+    deadline.get_queue_environment.side_effect = get_queue_environment
+
+    with patch.object(api._queue_parameters, "get_boto3_client", return_value=deadline):
+        assert [
+            p["name"]
+            for p in api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        ] == ["Param1", "Param2"]
+
+
+def test_get_queue_parameter_definitions_memoizes_without_metadata_cache(fresh_deadline_config):
+    """Confirm that a queue environment version is parsed once per process when there is no cache"""
+    config.set_setting("settings.metadata_cache_ttl_seconds", "0")
+    deadline = MagicMock()
+    deadline.list_queue_environments.return_value = {
+        "environments": [{"queueEnvironmentId": "queueenv-1", "name": "Env", "priority": 1}]
+    }
+    deadline.get_queue_environment.return_value = {
+        "queueEnvironmentId": "queueenv-1",
+        "priority": 1,
+        "template": QUEUE_ENVIRONMENT_TEMPLATE,
+        "updatedAt": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    }
+
+    with patch.object(
+        api._queue_parameters, "get_boto3_client", return_value=deadline
+    ), patch.object(
+        api._queue_parameters,
+        "_load_queue_environment_template",
+        wraps=api._queue_parameters._load_queue_environment_template,
+    ) as load_template_mock:
+        first = api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        # Changes made by the caller don't affect the memoized definitions
+        first[0]["default"] = "changed"
+        second = api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        assert second[0]["default"] == "value"
+        assert second[0]["userInterface"]["groupLabel"] == "Queue Environment: Env"
+        assert deadline.get_queue_environment.call_count == 2
+        assert load_template_mock.call_count == 1
+
+        # A new version of the queue environment is parsed again
+        deadline.get_queue_environment.return_value = {
+            **deadline.get_queue_environment.return_value,
+            "updatedAt": datetime.datetime(2024, 2, 1, tzinfo=datetime.timezone.utc),
+        }
+        api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        assert load_template_mock.call_count == 2
+
+
+@pytest.mark.parametrize("metadata_cache_ttl_seconds", ["0", "3600"])
+def test_get_queue_parameter_definitions_uses_created_at_when_never_updated(
+    fresh_deadline_config, metadata_cache_ttl_seconds
+):
+    """Confirm that a queue environment without an updatedAt isn't parsed again until it changes"""
+    config.set_setting("settings.metadata_cache_ttl_seconds", metadata_cache_ttl_seconds)
+    deadline = MagicMock()
+    deadline.list_queue_environments.return_value = {
+        "environments": [{"queueEnvironmentId": "queueenv-1", "name": "Env", "priority": 1}]
+    }
+    deadline.get_queue_environment.return_value = {
+        "queueEnvironmentId": "queueenv-1",
+        "priority": 1,
+        "template": QUEUE_ENVIRONMENT_TEMPLATE,
+        "createdAt": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    }
+
+    with patch.object(
+        api._queue_parameters, "get_boto3_client", return_value=deadline
+    ), patch.object(
+        api._queue_parameters,
+        "_load_queue_environment_template",
+        wraps=api._queue_parameters._load_queue_environment_template,
+    ) as load_template_mock:
+        api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        # After the TTL, the queue environment is fetched again, but not parsed again
+        with patch.object(api._metadata_cache.time, "time", return_value=time.time() + 7200):
+            api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        assert deadline.get_queue_environment.call_count == 2
+        assert load_template_mock.call_count == 1
+
+        # Once it is updated, it is parsed again
+        deadline.get_queue_environment.return_value = {
+            **deadline.get_queue_environment.return_value,
+            "updatedAt": datetime.datetime(2024, 2, 1, tzinfo=datetime.timezone.utc),
+        }
+        with patch.object(api._metadata_cache.time, "time", return_value=time.time() + 14400):
+            api.get_queue_parameter_definitions(farmId="farm-1", queueId="queue-1")
+        assert load_template_mock.call_count == 2
+
+
+def test_metadata_cache_get_derived_uses_created_at(fresh_deadline_config, tmp_path):
+    """Confirm that a cached value is kept after the TTL if the resource was never updated"""
+    response = {"createdAt": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)}
+    derive = MagicMock(side_effect=lambda response: "derived")
+
+    with api._metadata_cache.DeadlineMetadataCache(
+        ttl_seconds=60, cache_dir=str(tmp_path)
+    ) as cache:
+        assert cache.get_derived("key", lambda: response, derive) == "derived"
+        with patch.object(api._metadata_cache.time, "time", return_value=time.time() + 3600):
+            assert cache.get_derived("key", lambda: response, derive) == "derived"
+
+    derive.assert_called_once()
@@ -4,11 +4,18 @@
 tests the deadline.client.api functions relating to boto3.Client
 """
 
+import datetime
+import os
+import sys
 from typing import Optional
 from unittest.mock import call, patch, MagicMock, ANY
 
 import boto3  # type: ignore[import]
+import pytest
+
 from deadline.client import api, config
+from deadline.client.api._queue_credential_cache import QueueCredentialCache
+from deadline.job_attachments._aws import aws_clients
 
 
 def test_get_boto3_session(fresh_deadline_config):
@@ -100,7 +107,10 @@ def test_get_queue_user_boto3_session_no_profile(fresh_deadline_config):
     # The value returned when no profile was selected is "default"
     session_mock.profile_name = "default"
     session_mock.region_name = "us-west-2"
+    session_mock.get_credentials.return_value.access_key = "BASE_ACCESS_KEY"
     deadline_mock = MagicMock()
+    deadline_mock.meta.endpoint_url = "https://deadline.us-west-2.amazonaws.com"
+    deadline_mock.meta.region_name = "us-west-2"
     mock_botocore_session = MagicMock()
     mock_botocore_session.get_config_variable = lambda name: (
         "default" if name == "profile" else None
@@ -139,3 +149,198 @@ def test_check_deadline_api_available_fails(fresh_deadline_config):
         assert result is False
         # It should have called list_farms with to check the API
         session_mock().client("deadline").list_farms.assert_called_once_with(maxResults=1)
+
+
+def test_get_boto3_client_caching_behavior(fresh_deadline_config, monkeypatch):
+    """
+    Confirm that api.get_boto3_client reuses the client of a session, creates a new one for
+    a different endpoint, and drops the cached clients when the session cache is invalidated.
+    """
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-west-2")
+    monkeypatch.delenv("AWS_ENDPOINT_URL_DEADLINE", raising=False)
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+
+    client0 = api.get_boto3_client("deadline")
+    assert api.get_boto3_client("deadline") is client0
+    assert api.get_boto3_client("sts") is not client0
+
+    monkeypatch.setenv("AWS_ENDPOINT_URL_DEADLINE", "https://deadline.example.com")
+    client1 = api.get_boto3_client("deadline")
+    assert client1 is not client0
+    assert client1.meta.endpoint_url == "https://deadline.example.com"
+
+    api._session.invalidate_boto3_session_cache()
+    assert api.get_boto3_client("deadline") is not client1
+
+
+def test_sessions_share_loaded_service_models(fresh_deadline_config, monkeypatch):
+    """
+    Confirm that the queue role session reuses the service models loaded by the profile session.
+    """
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-west-2")
+
+    session = api.get_boto3_session()
+    queue_session = api._session._get_queue_user_boto3_session(
+        MagicMock(), session, "farm-1234", "queue-1234"
+    )
+
+    assert queue_session._session.get_component("data_loader") is session._session.get_component(
+        "data_loader"
+    )
+
+
+def _mock_assume_queue_role_response(expires_in: datetime.timedelta) -> dict:
+    return {
+        "credentials": {
+            "accessKeyId": "ACCESS_KEY",
+            "secretAccessKey": "SECRET_KEY",
+            "sessionToken": "TOKEN",
+            "expiration": datetime.datetime.now(datetime.timezone.utc) + expires_in,
+        }
+    }
+
+
+def _queue_credential_cache(
+    base_access_key_id: str = "BASE_ACCESS_KEY",
+    endpoint_url: str = "https://deadline.us-west-2.amazonaws.com",
+) -> QueueCredentialCache:
+    return QueueCredentialCache(
+        "profile",
+        "farm-1234",
+        "queue-1234",
+        base_access_key_id=base_access_key_id,
+        endpoint_url=endpoint_url,
+        region_name="us-west-2",
+    )
+
+
+def test_queue_user_credentials_are_cached_between_processes(fresh_deadline_config):
+    """
+    Confirm that queue role credentials are reused by a new provider, like one in another
+    CLI process, until they are within the advisory refresh window of expiring.
+    """
+    deadline = MagicMock()
+    deadline.assume_queue_role_for_user.return_value = _mock_assume_queue_role_response(
+        datetime.timedelta(hours=1)
+    )
+
+    def load_credentials():
+        provider = api._session.QueueUserCredentialProvider(
+            deadline,
+            "farm-1234",
+            "queue-1234",
+            credential_cache=_queue_credential_cache(),
+        )
+        return provider.load().get_frozen_credentials()
+
+    assert load_credentials().access_key == "ACCESS_KEY"
+    assert load_credentials().access_key == "ACCESS_KEY"
+    deadline.assume_queue_role_for_user.assert_called_once_with(
+        farmId="farm-1234", queueId="queue-1234"
+    )
+
+    cache_file = _queue_credential_cache().cache_file
+    if sys.platform != "win32":
+        assert os.stat(cache_file).st_mode & 0o777 == 0o600
+
+    # Credentials close to expiring are not used from the cache
+    cache = _queue_credential_cache()
+    cache.save_credentials(
+        {
+            "access_key": "ACCESS_KEY",
+            "secret_key": "SECRET_KEY",
+            "token": "TOKEN",
+            "expiry_time": (
+                datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=12)
+            ).isoformat(),
+        }
+    )
+    assert cache.load_credentials() is None
+
+
+def test_queue_credential_cache_is_keyed_by_base_identity_and_endpoint(fresh_deadline_config):
+    """
+    Confirm that the cached queue role credentials are not used after the profile is signed in
+    with other credentials, or with another Deadline Cloud endpoint.
+    """
+    _queue_credential_cache().save_credentials(
+        {
+            "access_key": "ACCESS_KEY",
+            "secret_key": "SECRET_KEY",
+            "token": "TOKEN",
+            "expiry_time": "2999-01-01T00:00:00+00:00",
+        }
+    )
+
+    assert _queue_credential_cache().load_credentials() is not None
+    assert _queue_credential_cache(base_access_key_id="OTHER").load_credentials() is None
+    assert _queue_credential_cache(endpoint_url="https://fake-endpoint").load_credentials() is None
+    # The base access key ID is not stored in the clear
+    with open(_queue_credential_cache().cache_file, encoding="utf-8") as fh:
+        assert "BASE_ACCESS_KEY" not in fh.read()
+    assert "BASE_ACCESS_KEY" not in _queue_credential_cache().cache_file
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="File modes are only checked on POSIX")
+def test_queue_credential_cache_ignores_files_others_can_access(fresh_deadline_config):
+    cache = _queue_credential_cache()
+    cache.save_credentials(
+        {
+            "access_key": "ACCESS_KEY",
+            "secret_key": "SECRET_KEY",
+            "token": "TOKEN",
+            "expiry_time": "2999-01-01T00:00:00+00:00",
+        }
+    )
+    assert cache.load_credentials() is not None
+
+    os.chmod(cache.cache_file, 0o644)
+    assert cache.load_credentials() is None
+
+
+def test_queue_account_id_is_cached_between_processes(fresh_deadline_config):
+    """Confirm that the account ID of a queue role session is only looked up once"""
+    sts_client = MagicMock()
+    sts_client.get_caller_identity.return_value = {"Account": "123456789012"}
+
+    for _ in range(2):
+        # A new session and cache object, like in another CLI process
+        session = MagicMock()
+        session.client.return_value = sts_client
+        aws_clients.set_account_id_cache(session, _queue_credential_cache())
+        assert aws_clients.get_account_id(session=session) == "123456789012"
+
+    sts_client.get_caller_identity.assert_called_once()
+
+
+def test_queue_credential_cache_restricts_permissions_on_windows(fresh_deadline_config):
+    """
+    Confirm that on Windows the ACL of the cache directory is restricted to the current user
+    before credentials are written to it, and that nothing is written if that fails.
+    """
+    credentials = {
+        "access_key": "ACCESS_KEY",
+        "secret_key": "SECRET_KEY",
+        "token": "TOKEN",
+        "expiry_time": "2999-01-01T00:00:00+00:00",
+    }
+    with patch.object(
+        api._queue_credential_cache, "sys", MagicMock(platform="win32")
+    ), patch.object(api._queue_credential_cache, "_restricted_cache_dirs", set()), patch.object(
+        api._queue_credential_cache.getpass, "getuser", return_value="user"
+    ), patch.object(
+        config.config_file, "_reset_directory_permissions_windows"
+    ) as reset_permissions_mock:
+        reset_permissions_mock.side_effect = OSError("icacls failed")
+        cache = _queue_credential_cache()
+        cache.save_credentials(credentials)
+        assert not os.path.exists(cache.cache_file)
+
+        reset_permissions_mock.side_effect = None
+        cache.save_credentials(credentials)
+        _queue_credential_cache().save_credentials(credentials)
+        assert _queue_credential_cache().load_credentials() == credentials
+
+    assert reset_permissions_mock.call_count == 2
+    reset_permissions_mock.assert_called_with(ANY, "user", "(OI)(CI)(F)")
+    assert str(reset_permissions_mock.call_args.args[0]) == os.path.abspath(cache.cache_dir)
@@ -0,0 +1,72 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+tests the deadline.client.api StageGraph used to run preparation steps concurrently
+"""
+
+import threading
+
+import pytest
+
+from deadline.client.api._stage_graph import StageGraph
+
+
+def test_stage_graph_runs_independent_stages_concurrently():
+    """Confirm that stages without dependencies between them run at the same time"""
+    # Each stage waits until the other one has started, so this only passes if they overlap.
+    barrier = threading.Barrier(2, timeout=10)
+
+    def wait_for_other_stage(value):
+        barrier.wait()
+        return value
+
+    with StageGraph() as stages:
+        stages.add_stage("first", lambda: wait_for_other_stage("first"))
+        stages.add_stage("second", lambda: wait_for_other_stage("second"))
+
+        assert stages.result("first") == "first"
+        assert stages.result("second") == "second"
+
+    assert set(stages.timings) == {"first", "second"}
+
+
+def test_stage_graph_passes_dependency_results():
+    """Confirm that a stage runs after, and receives the results of, the stages it depends on"""
+    with StageGraph() as stages:
+        stages.add_stage("queue", lambda: {"displayName": "Queue"})
+        stages.add_stage("farm", lambda: "Farm")
+        stages.add_stage(
+            "title",
+            lambda queue, farm: f"{farm}/{queue['displayName']}",
+            depends_on=["queue", "farm"],
+        )
+
+        assert stages.result("title") == "Farm/Queue"
+
+
+def test_stage_graph_raises_stage_errors():
+    """Confirm that result() raises the error of the stage, or of a stage it depends on"""
+
+    def fail():
+        raise RuntimeError("The queue does not exist")
+
+    with StageGraph() as stages:
+        stages.add_stage("queue", fail)
+        stages.add_stage("title", lambda queue: queue["displayName"], depends_on=["queue"])
+        stages.add_stage("farm", lambda: "Farm")
+
+        with pytest.raises(RuntimeError, match="The queue does not exist"):
+            stages.result("queue")
+        with pytest.raises(RuntimeError, match="The queue does not exist"):
+            stages.result("title")
+        assert stages.result("farm") == "Farm"
+
+
+def test_stage_graph_rejects_unknown_dependencies():
+    with StageGraph() as stages:
+        stages.add_stage("queue", lambda: None)
+
+        with pytest.raises(ValueError, match="farm"):
+            stages.add_stage("title", lambda queue, farm: None, depends_on=["queue", "farm"])
+        with pytest.raises(ValueError, match="already added"):
+            stages.add_stage("queue", lambda: None)
@@ -6,6 +6,7 @@ Tests the deadline.client.api functions for submitting Open Job Description job
 
 import json
 import os
+import threading
 from logging import INFO
 from pathlib import Path
 from typing import Any, Dict, Tuple
@@ -1123,3 +1124,59 @@ def test_wait_for_create_job_to_complete_timeout():
             deadline_client=deadline_client,
             continue_callback=mock_continue_callback,
         )
+
+
+def test_create_job_from_job_bundle_prepares_concurrently(
+    fresh_deadline_config, temp_job_bundle_dir
+):
+    """
+    Test that the queue, storage profile and queue parameters are fetched at the same time.
+    """
+    # Each call waits until the others have started, so this only passes if they overlap.
+    barrier = threading.Barrier(3, timeout=10)
+
+    def get_queue(*args, **kwargs):
+        barrier.wait()
+        return MOCK_GET_QUEUE_RESPONSE
+
+    def get_storage_profile_for_queue(*args, **kwargs):
+        barrier.wait()
+        return None
+
+    def get_queue_parameter_definitions(*args, **kwargs):
+        barrier.wait()
+        return []
+
+    with patch.object(_submit_job_bundle.api, "get_boto3_client") as client_mock, patch.object(
+        _submit_job_bundle.api, "get_queue", side_effect=get_queue
+    ), patch.object(
+        _submit_job_bundle.api,
+        "get_storage_profile_for_queue",
+        side_effect=get_storage_profile_for_queue,
+    ), patch.object(
+        _submit_job_bundle.api,
+        "get_queue_parameter_definitions",
+        side_effect=get_queue_parameter_definitions,
+    ), patch.object(
+        _submit_job_bundle.api, "get_deadline_cloud_library_telemetry_client"
+    ):
+        client_mock().create_job.side_effect = [MOCK_CREATE_JOB_RESPONSE]
+        client_mock().get_job.side_effect = [MOCK_GET_JOB_RESPONSE]
+        config.set_setting("defaults.farm_id", MOCK_FARM_ID)
+        config.set_setting("defaults.queue_id", MOCK_QUEUE_ID)
+        config.set_setting("settings.storage_profile_id", MOCK_STORAGE_PROFILE_ID)
+
+        with open(os.path.join(temp_job_bundle_dir, "template.json"), "w", encoding="utf8") as f:
+            f.write(MOCK_JOB_TEMPLATE_CASES["MINIMAL_JSON"][1])
+
+        response = api.create_job_from_job_bundle(job_bundle_dir=temp_job_bundle_dir)
+
+        assert response == MOCK_JOB_ID
+        client_mock().create_job.assert_called_once_with(
+            farmId=MOCK_FARM_ID,
+            queueId=MOCK_QUEUE_ID,
+            template=MOCK_JOB_TEMPLATE_CASES["MINIMAL_JSON"][1],
+            templateType="JSON",
+            priority=50,
+            storageProfileId=MOCK_STORAGE_PROFILE_ID,
+        )
@@ -386,7 +386,7 @@ def test_create_job_from_job_bundle_with_all_asset_ref_variants(
             asset_groups=[AssetRootGroup()],
             total_input_files=0,
             total_input_bytes=0,
-            hash_cache_dir=os.path.expanduser(os.path.join("~", ".deadline", "cache")),
+            hash_cache_dir=config.config_file.get_cache_directory(),
             on_preparing_to_submit=ANY,
         )
         client_mock().create_job.assert_called_once_with(
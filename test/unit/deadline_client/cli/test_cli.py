@@ -86,3 +86,39 @@ def test_cli_object_repr(obj, expected):
     Test that the CLI object represntation is expected.
     """
     assert _cli_object_repr(obj) == expected
+
+
+def test_cli_lists_all_command_groups(fresh_deadline_config):
+    """
+    Confirm that the top-level help lists the command groups that are loaded on demand.
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ["--help"])
+
+    assert result.exit_code == 0
+    for cli_group in ["attachment", "auth", "bundle", "config", "farm", "job", "queue", "worker"]:
+        assert f"  {cli_group} " in result.output
+
+
+def test_cli_imports_only_the_invoked_group(fresh_deadline_config):
+    """
+    Confirm that running a command only imports the module of its own command group.
+    """
+    output = subprocess.check_output(
+        args=[
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from deadline.client.cli._deadline_cli import main\n"
+            "try:\n"
+            "    main(['config', 'get', 'settings.log_level'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(sorted(m for m in sys.modules if m.startswith('deadline.client.cli._groups.')))",
+        ],
+        text=True,
+    )
+
+    assert "deadline.client.cli._groups.config_group" in output
+    assert "deadline.client.cli._groups.job_group" not in output
+    assert "deadline.client.cli._groups.bundle_group" not in output
@@ -35,7 +35,7 @@ def test_cli_config_show_defaults(fresh_deadline_config):
     assert fresh_deadline_config in result.output
 
     # Assert the expected number of settings
-    assert len(settings.keys()) == 15
+    assert len(settings.keys()) == 16
 
     for setting_name in settings.keys():
         assert setting_name in result.output
@@ -104,6 +104,7 @@ def test_cli_config_show_modified_config(fresh_deadline_config):
     config.set_setting("telemetry.identifier", "user-id-123abc-456def")
     config.set_setting("settings.s3_max_pool_connections", "100")
     config.set_setting("settings.small_file_threshold_multiplier", "15")
+    config.set_setting("settings.metadata_cache_ttl_seconds", "60")
 
     runner = CliRunner()
     result = runner.invoke(main, ["config", "show"])
@@ -166,3 +167,25 @@ def test_config_set_setting_nonexistant(fresh_deadline_config):
 
     assert result.exit_code == 1
     assert "doesnt_exist" in result.output
+
+
+def test_config_clear_cache(fresh_deadline_config):
+    """Test that the metadata cache is cleared, whether or not it exists."""
+    from deadline.client.api._metadata_cache import DeadlineMetadataCache
+
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["config", "clear-cache"])
+    assert result.exit_code == 0, result.output
+
+    with DeadlineMetadataCache(ttl_seconds=60) as cache:
+        cache.get("queue/farm-1/queue-1", lambda: {"displayName": "Cached"})
+
+    result = runner.invoke(main, ["config", "clear-cache"])
+
+    assert result.exit_code == 0, result.output
+    assert "Cleared" in result.output
+    with DeadlineMetadataCache(ttl_seconds=60) as cache:
+        assert cache.get("queue/farm-1/queue-1", lambda: {"displayName": "Fetched"}) == {
+            "displayName": "Fetched"
+        }
@@ -6,7 +6,7 @@ Tests for the CLI job commands.
 import datetime
 import json
 import os
-from typing import Dict, List
+from typing import Any, Dict, List
 import pytest
 from pathlib import Path
 import sys
@@ -74,7 +74,7 @@ MOCK_SESSIONS_LIST = [
     },
 ]
 
-MOCK_SESSION_ACTIONS_LIST = [
+MOCK_SESSION_ACTIONS_LIST: List[Dict[str, Any]] = [
     {
         "sessionActionId": "sessionaction-1-0",
         "status": "SUCCEEDED",
@@ -337,6 +337,82 @@ priority: 50
         assert result.exit_code == 0
 
 
+def test_cli_job_wait(fresh_deadline_config):
+    """
+    Confirm that the CLI waits for the job and prints its status whenever it changes.
+    """
+    job = {"jobId": MOCK_JOB_ID, "lifecycleStatus": "CREATE_COMPLETE"}
+    with patch.object(api._session, "get_boto3_session") as session_mock, patch(
+        "time.sleep"
+    ) as sleep_mock:
+        session_mock().client("deadline").get_job.side_effect = [
+            {**job, "taskRunStatus": "READY"},
+            {**job, "taskRunStatus": "RUNNING"},
+            {**job, "taskRunStatus": "RUNNING"},
+            {**job, "taskRunStatus": "SUCCEEDED"},
+        ]
+
+        runner = CliRunner()
+        result = runner.invoke(
+            main,
+            [
+                "job",
+                "wait",
+                "--farm-id",
+                MOCK_FARM_ID,
+                "--queue-id",
+                MOCK_QUEUE_ID,
+                "--job-id",
+                MOCK_JOB_ID,
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        status_lines = result.output.splitlines()
+        assert [line.split()[-1] for line in status_lines[:-1]] == [
+            "READY",
+            "RUNNING",
+            "SUCCEEDED",
+        ]
+        assert status_lines[-1] == "All 1 job(s) reached SUCCEEDED."
+        assert session_mock().client("deadline").get_job.call_count == 4
+        assert sleep_mock.call_count >= 3
+
+
+def test_cli_job_wait_other_status(fresh_deadline_config):
+    """
+    Confirm that the CLI stops waiting and fails when a job ends in a different status.
+    """
+    with patch.object(api._session, "get_boto3_session") as session_mock, patch("time.sleep"):
+        session_mock().client("deadline").get_job.return_value = {
+            "jobId": MOCK_JOB_ID,
+            "lifecycleStatus": "CREATE_COMPLETE",
+            "taskRunStatus": "FAILED",
+        }
+
+        runner = CliRunner()
+        result = runner.invoke(
+            main,
+            [
+                "job",
+                "wait",
+                "--farm-id",
+                MOCK_FARM_ID,
+                "--queue-id",
+                MOCK_QUEUE_ID,
+                "--job-id",
+                MOCK_JOB_ID,
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert (
+            f"1 of 1 job(s) did not reach SUCCEEDED:\n  {MOCK_JOB_ID}: CREATE_COMPLETE FAILED"
+            in (result.output)
+        )
+        session_mock().client("deadline").get_job.assert_called_once()
+
+
 def test_cli_job_download_output_stdout_with_only_required_input(
     fresh_deadline_config, tmp_path: Path
 ):
@@ -411,12 +487,14 @@ def test_cli_job_download_output_stdout_with_only_required_input(
             step_id=None,
             task_id=None,
             session=ANY,
+            on_discovering_outputs=ANY,
         )
 
         path_separator = "/" if sys.platform != "win32" else "\\"
 
         assert (
             f"""Downloading output from Job 'Mock Job'
+Discovering Outputs
 
 Summary of files to download:
     {mock_root_path}{path_separator}outputs (3 files)
@@ -516,12 +594,14 @@ def test_cli_job_download_output_stdout_with_mismatching_path_format(
             step_id=None,
             task_id=None,
             session=ANY,
+            on_discovering_outputs=ANY,
         )
 
         path_separator = "/" if sys.platform != "win32" else "\\"
 
         assert (
             f"""Downloading output from Job 'Mock Job'
+Discovering Outputs
 This root path format does not match the operating system you're using. Where would you like to save the files?
 The location was {mock_root_path}, on {other_format[0].upper() + other_format[1:]}.
 > Please enter a new root path: {str(tmp_path)}
@@ -608,12 +688,14 @@ def test_cli_job_download_output_handles_unc_path_on_windows(fresh_deadline_conf
             step_id=None,
             task_id=None,
             session=ANY,
+            on_discovering_outputs=ANY,
         )
 
         path_separator = "/" if sys.platform != "win32" else "\\"
 
         assert (
             f"""Downloading output from Job 'Mock Job'
+Discovering Outputs
 
 Summary of files to download:
     {mock_root_path}{path_separator}outputs (3 files)
@@ -687,10 +769,12 @@ def test_cli_job_download_no_output_stdout(fresh_deadline_config, tmp_path: Path
             step_id=None,
             task_id=None,
             session=ANY,
+            on_discovering_outputs=ANY,
         )
 
         assert (
             """Downloading output from Job 'Mock Job'
+Discovering Outputs
 There are no output files available for download at this moment. Please verify that the Job/Step/Task you are trying to download output from has completed successfully.
 """
             in result.output
@@ -775,6 +859,7 @@ def test_cli_job_download_output_stdout_with_json_format(
             step_id=None,
             task_id=None,
             session=ANY,
+            on_discovering_outputs=ANY,
         )
 
         expected_json_title = json.dumps({"messageType": "title", "value": "Mock Job"})
@@ -943,6 +1028,7 @@ def test_cli_job_download_output_handle_web_url_with_optional_input(fresh_deadli
             step_id="step-1",
             task_id="task-2",
             session=ANY,
+            on_discovering_outputs=ANY,
         )
         mock_download.assert_called_once_with(
             file_conflict_resolution=FileConflictResolution.CREATE_COPY,
@@ -1012,3 +1098,66 @@ Within-session Overhead Duration Per Action: 0:00:30
 """
         )
         assert result.exit_code == 0
+
+
+def test_cli_job_trace_schedule_lists_and_caches(fresh_deadline_config, tmp_path):
+    """
+    Confirm that trace-schedule gets the steps and tasks with the list APIs, writes a Chrome
+    trace file, and uses the cached data of a completed job when it is run again.
+    """
+    job = {**MOCK_JOBS_LIST[0], "taskRunStatus": "SUCCEEDED"}
+    task = {**MOCK_TASK, "taskId": MOCK_SESSION_ACTIONS_LIST[0]["definition"]["taskRun"]["taskId"]}
+    trace_file = tmp_path / "trace.json"
+
+    with patch.object(api._session, "get_boto3_session") as session_mock:
+        deadline_mock = session_mock().client("deadline")
+        deadline_mock.get_job.return_value = job
+        deadline_mock.list_sessions.return_value = {"sessions": MOCK_SESSIONS_LIST}
+        deadline_mock.list_session_actions.return_value = {
+            "sessionActions": MOCK_SESSION_ACTIONS_LIST
+        }
+        deadline_mock.list_steps.return_value = {"steps": [MOCK_STEP]}
+        deadline_mock.list_tasks.return_value = {"tasks": [task]}
+
+        runner = CliRunner()
+        args = [
+            "job",
+            "trace-schedule",
+            "--farm-id",
+            MOCK_FARM_ID,
+            "--queue-id",
+            MOCK_QUEUE_ID,
+            "--job-id",
+            str(job["jobId"]),
+            "--trace-format",
+            "chrome",
+            "--trace-file",
+            str(trace_file),
+        ]
+        result = runner.invoke(main, args)
+
+        assert result.exit_code == 0, result.output
+        deadline_mock.list_tasks.assert_called_once_with(
+            farmId=MOCK_FARM_ID,
+            queueId=MOCK_QUEUE_ID,
+            jobId=job["jobId"],
+            stepId=MOCK_STEP["stepId"],
+        )
+        deadline_mock.get_step.assert_not_called()
+        deadline_mock.get_task.assert_not_called()
+        with open(trace_file, encoding="utf8") as fh:
+            first_trace = json.load(fh)
+        assert [event["ph"] for event in first_trace["traceEvents"]] == ["B", "X", "E"]
+        assert first_trace["otherData"]["jobId"] == job["jobId"]
+        assert first_trace["otherData"]["taskRunCount"] == 1
+
+        # Running it again only gets the job, and writes the same trace
+        trace_file.unlink()
+        result = runner.invoke(main, args)
+
+        assert result.exit_code == 0, result.output
+        assert "Using the cached sessions, steps and tasks for the job..." in result.output
+        deadline_mock.list_sessions.assert_called_once()
+        assert deadline_mock.get_job.call_count == 2
+        with open(trace_file, encoding="utf8") as fh:
+            assert json.load(fh) == first_trace
@@ -284,3 +284,82 @@ def test_posix_config_file_permissions(fresh_deadline_config) -> None:
     config_file.set_setting("defaults.aws_profile_name", "goodguyprofile")
 
     assert config_file_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_config_snapshot_values(fresh_deadline_config):
+    """
+    Test that a config snapshot resolves every setting like get_setting, with typed values.
+    """
+    config.set_setting("defaults.farm_id", "farm-for-snapshot")
+    config.set_setting("defaults.queue_id", "queue-for-snapshot")
+    config.set_setting("settings.s3_max_pool_connections", "100")
+    config.set_setting("settings.auto_accept", "true")
+
+    snapshot = config.get_config_snapshot()
+
+    for setting_name in config_file.SETTINGS:
+        assert snapshot.get_setting(setting_name) == config.get_setting(setting_name)
+    assert snapshot.get_setting("defaults.queue_id") == "queue-for-snapshot"
+    assert snapshot.get_typed_setting("settings.s3_max_pool_connections") == 100
+    assert snapshot.get_typed_setting("settings.small_file_threshold_multiplier") == 20
+    assert snapshot.get_typed_setting("settings.auto_accept") is True
+    assert snapshot.get_typed_setting("defaults.farm_id") == "farm-for-snapshot"
+
+    with pytest.raises(DeadlineOperationError) as excinfo:
+        snapshot.get_setting("settings.aws_porfile_name")
+    assert "has no setting" in str(excinfo.value)
+
+
+def test_config_snapshot_invalid_typed_value(fresh_deadline_config):
+    """
+    Test that an invalid value only raises an error when its typed value is requested.
+    """
+    config.set_setting("settings.s3_max_pool_connections", "!@#$")
+
+    snapshot = config.get_config_snapshot()
+
+    assert snapshot.get_setting("settings.s3_max_pool_connections") == "!@#$"
+    with pytest.raises(ValueError):
+        snapshot.get_typed_setting("settings.s3_max_pool_connections")
+
+
+def test_config_snapshot_refresh(fresh_deadline_config):
+    """
+    Test that the config snapshot is reused until the config file changes.
+    """
+    snapshot = config.get_config_snapshot()
+    assert config.get_config_snapshot() is snapshot
+    assert not snapshot.is_stale()
+
+    # Writing the settings invalidates the snapshot
+    config.set_setting("defaults.farm_id", "farm-after-write")
+    new_snapshot = config.get_config_snapshot()
+    assert new_snapshot is not snapshot
+    assert new_snapshot.get_setting("defaults.farm_id") == "farm-after-write"
+
+    # So does another process modifying the file
+    config_file_path = config_file.get_config_file_path()
+    config_file_path.write_text(
+        config_file_path.read_text().replace("farm-after-write", "farm-from-elsewhere")
+    )
+    os.utime(config_file_path, (0, 0))
+    assert new_snapshot.is_stale()
+    latest_snapshot = config.get_config_snapshot()
+    assert latest_snapshot.get_setting("defaults.farm_id") == "farm-from-elsewhere"
+
+    # A snapshot can always be refreshed explicitly
+    assert config.get_config_snapshot(refresh=True) is not latest_snapshot
+
+
+def test_config_snapshot_from_config(fresh_deadline_config):
+    """
+    Test that a snapshot of a provided ConfigParser resolves its values, and is never stale.
+    """
+    parser = config_file.read_config()
+    config.set_setting("defaults.farm_id", "farm-in-parser", config=parser)
+
+    snapshot = config.ConfigSnapshot.from_config(parser)
+
+    assert snapshot.get_setting("defaults.farm_id") == "farm-in-parser"
+    assert snapshot.config_file_path is None
+    assert not snapshot.is_stale()
@@ -4,6 +4,9 @@ import json
 import os
 import tempfile
 from typing import List, Optional
+from unittest.mock import patch
+
+from deadline.client import api
 from deadline.job_attachments.api.manifest import _manifest_snapshot
 from deadline.job_attachments.exceptions import ManifestCreationException
 from deadline.job_attachments.models import ManifestSnapshot
@@ -57,6 +60,21 @@ class TestSnapshotAPI:
             assert len(manifest_payload["paths"]) == 1
             assert manifest_payload["paths"][0]["path"] == test_file_name
 
+    def test_snapshot_records_hashing_telemetry(self, temp_dir):
+        """
+        Snapshot records the hashing summary with the library telemetry client.
+        """
+        root_dir = os.path.join(temp_dir, "snapshot")
+        os.makedirs(root_dir)
+        with open(os.path.join(root_dir, "test_file"), "w") as f:
+            f.write("testing123")
+
+        with patch.object(api, "get_deadline_cloud_library_telemetry_client") as telemetry_mock:
+            _manifest_snapshot(root=root_dir, destination=temp_dir, name="test")
+
+        telemetry_mock().record_hashing_summary.assert_called_once()
+        assert telemetry_mock().record_hashing_summary.call_args[0][0].processed_files == 1
+
     def test_snapshot_recursive_folder(self, temp_dir):
         """
         Snapshot with a folder a file, a nested folder and a file in the nested folder.
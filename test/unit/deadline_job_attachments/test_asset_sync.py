@@ -6,9 +6,10 @@ import json
 from logging import getLogger
 import os
 import shutil
+import time
 from math import trunc
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Set
 from unittest.mock import ANY, MagicMock, patch
 
 import boto3
@@ -16,6 +17,7 @@ import pytest
 from moto import mock_aws
 
 import deadline
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data, hash_file
 from deadline.job_attachments.asset_manifests.decode import decode_manifest
 from deadline.job_attachments.asset_sync import AssetSync
 from deadline.job_attachments.os_file_permission import PosixFileSystemPermissionSettings
@@ -28,10 +30,12 @@ from deadline.job_attachments.exceptions import (
 )
 from deadline.job_attachments.models import (
     Attachments,
+    GlobConfig,
     Job,
     JobAttachmentsFileSystem,
     JobAttachmentS3Settings,
     ManifestProperties,
+    OutputFile,
     PathFormat,
     Queue,
 )
@@ -40,7 +44,7 @@ from deadline.job_attachments.progress_tracker import (
     ProgressStatus,
     SummaryStatistics,
 )
-from deadline.job_attachments._utils import _human_readable_file_size
+from deadline.job_attachments._utils import _get_unique_dest_dir_name, _human_readable_file_size
 from ..conftest import is_windows_non_admin
 
 
@@ -628,9 +632,12 @@ class TestAssetSync:
         )
 
         # WHEN
+        # Output files are hashed concurrently, so the hashes are given by file name, not by call order.
         with patch(
             f"{deadline.__package__}.job_attachments.asset_sync.hash_file",
-            side_effect=["hash1", "hash2"],
+            side_effect=lambda file_path, _: {"test.txt": "hash1", "test2.txt": "hash2"}[
+                Path(file_path).name
+            ],
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.hash_data", side_effect=["hash3"]
         ), patch(
@@ -724,6 +731,290 @@ class TestAssetSync:
 
             assert summary_statistics == expected_summary_statistics
 
+    def test_get_output_files_reuses_hashes_and_cas_checks(
+        self, tmp_path: Path, default_job_attachment_s3_settings: JobAttachmentS3Settings
+    ):
+        """
+        Files with the same content are checked against the CAS once, and files that are found
+        again without having changed since they were hashed are not hashed or checked again.
+        """
+        # GIVEN
+        output_root = tmp_path / "outputs"
+        (output_root / "sub").mkdir(parents=True)
+        (output_root / "a.txt").write_text("same")
+        (output_root / "sub" / "b.txt").write_text("same")
+        (output_root / "c.txt").write_text("different")
+        manifest_properties = ManifestProperties(
+            rootPath=str(tmp_path),
+            rootPathFormat=PathFormat.get_host_path_format(),
+            outputRelativeDirectories=["outputs"],
+        )
+
+        def get_output_files():
+            return self.default_asset_sync._get_output_files(
+                manifest_properties, default_job_attachment_s3_settings, tmp_path, tmp_path
+            )
+
+        with patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.hash_file",
+            wraps=hash_file,
+        ) as mock_hash_file, patch.object(
+            self.default_asset_sync.s3_uploader, "file_already_uploaded", return_value=True
+        ) as mock_file_already_uploaded:
+            # WHEN
+            output_files = get_output_files()
+
+            # THEN
+            assert sorted(output_file.rel_path for output_file in output_files) == [
+                "outputs/a.txt",
+                "outputs/c.txt",
+                "outputs/sub/b.txt",
+            ]
+            assert all(output_file.in_s3 for output_file in output_files)
+            assert mock_hash_file.call_count == 3
+            assert mock_file_already_uploaded.call_count == 2
+
+            # WHEN
+            # Mark all of the files as modified since they were last synced, but only change one.
+            for path in self.default_asset_sync.synced_assets_mtime:
+                self.default_asset_sync.synced_assets_mtime[path] = 1
+            (output_root / "c.txt").write_text("changed")
+            os.utime(output_root / "c.txt", ns=(10**18, 10**18))
+            mock_hash_file.reset_mock()
+            mock_file_already_uploaded.reset_mock()
+            output_files = get_output_files()
+
+            # THEN
+            assert len(output_files) == 3
+            mock_hash_file.assert_called_once_with(
+                str((output_root / "c.txt").resolve()), self.default_asset_sync.hash_alg
+            )
+            mock_file_already_uploaded.assert_called_once()
+
+    def test_upload_output_files_to_s3_uploads_each_hash_once(
+        self, tmp_path: Path, default_job_attachment_s3_settings: JobAttachmentS3Settings
+    ):
+        """
+        Output files that are already in the CAS are skipped, and output files with the same content
+        are uploaded once.
+        """
+
+        # GIVEN
+        def output_file(name: str, s3_key: str, in_s3: bool = False) -> OutputFile:
+            return OutputFile(
+                file_size=10,
+                file_hash=s3_key,
+                rel_path=name,
+                full_path=str(tmp_path / name),
+                s3_key=s3_key,
+                in_s3=in_s3,
+                base_dir=str(tmp_path),
+            )
+
+        output_files = [
+            output_file("a.exr", "Data/hash1.xxh128"),
+            output_file("b.exr", "Data/hash1.xxh128"),
+            output_file("c.exr", "Data/hash2.xxh128", in_s3=True),
+            output_file("d.exr", "Data/hash3.xxh128"),
+        ]
+
+        # WHEN
+        with patch.object(
+            self.default_asset_sync.s3_uploader, "upload_file_to_s3"
+        ) as mock_upload_file_to_s3:
+            summary_statistics = self.default_asset_sync._upload_output_files_to_s3(
+                default_job_attachment_s3_settings, output_files, None
+            )
+
+        # THEN
+        assert sorted(
+            call.kwargs["s3_upload_key"] for call in mock_upload_file_to_s3.call_args_list
+        ) == ["Data/hash1.xxh128", "Data/hash3.xxh128"]
+        assert summary_statistics.total_files == 4
+        assert summary_statistics.skipped_files == 2
+        assert summary_statistics.skipped_bytes == 20
+
+    @pytest.mark.skipif(
+        is_windows_non_admin(),
+        reason="Windows requires Admin to create symlinks, skipping this test.",
+    )
+    def test_get_output_files_skips_files_outside_session_dir(
+        self, tmp_path: Path, default_job_attachment_s3_settings: JobAttachmentS3Settings
+    ):
+        # GIVEN
+        session_dir = tmp_path / "session"
+        output_root = session_dir / "outputs"
+        output_root.mkdir(parents=True)
+        (output_root / "inside.txt").write_text("inside")
+        outside_file = tmp_path / "outside.txt"
+        outside_file.write_text("outside")
+        (output_root / "link_to_outside.txt").symlink_to(outside_file)
+        (output_root / "link_to_dir").symlink_to(output_root, target_is_directory=True)
+        manifest_properties = ManifestProperties(
+            rootPath=str(session_dir),
+            rootPathFormat=PathFormat.get_host_path_format(),
+            outputRelativeDirectories=["outputs"],
+        )
+
+        # WHEN
+        output_files = self.default_asset_sync._get_output_files(
+            manifest_properties, default_job_attachment_s3_settings, session_dir, session_dir
+        )
+
+        # THEN
+        assert [output_file.rel_path for output_file in output_files] == ["outputs/inside.txt"]
+
+    @mock_aws
+    def test_sync_outputs_after_output_streaming(
+        self,
+        tmp_path: Path,
+        default_queue: Queue,
+        default_job: Job,
+        session_action_id: str,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+    ):
+        """
+        Output files that were streamed while the task was running are not uploaded again by
+        sync_outputs, unless they changed after they were streamed.
+        """
+        # GIVEN
+        attachments = Attachments(
+            manifests=[
+                ManifestProperties(
+                    rootPath="/tmp",
+                    rootPathFormat=PathFormat.POSIX,
+                    outputRelativeDirectories=["outputs"],
+                )
+            ],
+        )
+        output_root = tmp_path / _get_unique_dest_dir_name("/tmp") / "outputs"
+        output_root.mkdir(parents=True)
+        (output_root / "frame1.exr").write_text("frame 1")
+        (output_root / "frame2.exr").write_text("frame 2")
+
+        def uploaded_keys(mock_upload_file_to_s3: MagicMock) -> Set[str]:
+            return {
+                call.kwargs["s3_upload_key"].split("/")[-1]
+                for call in mock_upload_file_to_s3.call_args_list
+            }
+
+        with patch.object(
+            self.default_asset_sync.s3_uploader,
+            "upload_file_to_s3",
+            wraps=self.default_asset_sync.s3_uploader.upload_file_to_s3,
+        ) as mock_upload_file_to_s3:
+            # WHEN
+            self.default_asset_sync.start_output_streaming(
+                default_job_attachment_s3_settings,
+                attachments,
+                tmp_path,
+                quiescence_seconds=0,
+                poll_interval_seconds=0.01,
+            )
+            deadline_time = time.monotonic() + 10
+            while mock_upload_file_to_s3.call_count < 2 and time.monotonic() < deadline_time:
+                time.sleep(0.01)
+            self.default_asset_sync.stop_output_streaming()
+
+            # THEN
+            assert uploaded_keys(mock_upload_file_to_s3) == {
+                f"{hash_data(b'frame 1', HashAlgorithm.XXH128)}.xxh128",
+                f"{hash_data(b'frame 2', HashAlgorithm.XXH128)}.xxh128",
+            }
+
+            # WHEN
+            mock_upload_file_to_s3.reset_mock()
+            (output_root / "frame1.exr").write_text("frame 1, rendered again")
+            os.utime(output_root / "frame1.exr", ns=(10**18, 10**18))
+            (output_root / "frame3.exr").write_text("frame 3")
+            summary_statistics = self.default_asset_sync.sync_outputs(
+                s3_settings=default_job_attachment_s3_settings,
+                attachments=attachments,
+                queue_id=default_queue.queueId,
+                job_id=default_job.jobId,
+                step_id="test_step",
+                task_id="test_task",
+                session_action_id=session_action_id,
+                start_time=1234.56,
+                session_dir=tmp_path,
+            )
+
+        # THEN
+        assert uploaded_keys(mock_upload_file_to_s3) == {
+            f"{hash_data(b'frame 1, rendered again', HashAlgorithm.XXH128)}.xxh128",
+            f"{hash_data(b'frame 3', HashAlgorithm.XXH128)}.xxh128",
+        }
+        assert summary_statistics.total_files == 3
+        assert summary_statistics.skipped_files == 1
+
+    @mock_aws
+    def test_stream_output_file_changed_while_read(
+        self, tmp_path: Path, default_job_attachment_s3_settings: JobAttachmentS3Settings
+    ):
+        """
+        An output file that the task writes to while it is being read is not uploaded, so that
+        the CAS never gets content that doesn't match its hash.
+        """
+        output_file = tmp_path / "outputs" / "render.log"
+        output_file.parent.mkdir()
+        output_file.write_text("line 1\n")
+        copyfileobj = shutil.copyfileobj
+
+        def copy_then_append(src, dst):
+            copyfileobj(src, dst)
+            with open(output_file, "a") as fh:
+                fh.write("line 2\n")
+
+        with patch.object(
+            self.default_asset_sync.s3_uploader, "upload_file_to_s3"
+        ) as mock_upload_file_to_s3, patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.shutil.copyfileobj",
+            side_effect=copy_then_append,
+        ), pytest.raises(
+            AssetSyncError, match="changed while it was being read"
+        ):
+            self.default_asset_sync._stream_output_file(
+                output_file, tmp_path, default_job_attachment_s3_settings
+            )
+
+        mock_upload_file_to_s3.assert_not_called()
+        assert self.default_asset_sync._output_hash_cache == {}
+
+    @mock_aws
+    def test_stream_output_file_changed_while_uploaded(
+        self, tmp_path: Path, default_job_attachment_s3_settings: JobAttachmentS3Settings
+    ):
+        """
+        An output file that the task writes to while it is being uploaded is uploaded from the
+        copy that was hashed, and reported as changed so that it is streamed again.
+        """
+        output_file = tmp_path / "outputs" / "render.log"
+        output_file.parent.mkdir()
+        output_file.write_text("line 1\n")
+        upload_file_to_s3 = self.default_asset_sync.s3_uploader.upload_file_to_s3
+
+        def append_then_upload(**kwargs):
+            with open(output_file, "a") as fh:
+                fh.write("line 2\n")
+            upload_file_to_s3(**kwargs)
+
+        with patch.object(
+            self.default_asset_sync.s3_uploader,
+            "upload_file_to_s3",
+            side_effect=append_then_upload,
+        ), pytest.raises(AssetSyncError, match="changed while it was being uploaded"):
+            self.default_asset_sync._stream_output_file(
+                output_file, tmp_path, default_job_attachment_s3_settings
+            )
+
+        file_hash = hash_data(b"line 1\n", HashAlgorithm.XXH128)
+        s3 = boto3.Session(region_name="us-west-2").resource("s3")
+        uploaded = s3.Object(
+            default_job_attachment_s3_settings.s3BucketName,
+            f"{default_job_attachment_s3_settings.full_cas_prefix()}/{file_hash}.xxh128",
+        )
+        assert uploaded.get()["Body"].read() == b"line 1\n"
+
     @pytest.mark.parametrize(
         "file_path, directory_path, expected",
         [
@@ -924,6 +1215,7 @@ class TestAssetSync:
                 session=ANY,
                 on_downloading_files=mock_on_downloading_files,
                 logger=getLogger("deadline.job_attachments"),
+                downloaded_file_mtimes={},
             )
 
     @pytest.mark.parametrize(
@@ -1242,6 +1534,122 @@ class TestAssetSync:
             excinfo
         )
 
+    def test_attachment_sync_inputs_with_input_filter(
+        self,
+        tmp_path: Path,
+        default_queue: Queue,
+        default_job: Job,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+        test_manifest_one: dict,
+    ):
+        """
+        Asserts that the input filter, with its task parameter references expanded, narrows
+        the manifest down to the matching files before downloading.
+        """
+        # GIVEN
+        dest_dir = "assetroot-27bggh78dd2b568ab123"
+        local_root = str(tmp_path / dest_dir)
+        test_manifest = decode_manifest(json.dumps(test_manifest_one))
+        input_filter = GlobConfig(
+            include_glob=["{{Task.Param.Name}}.txt", "{{ Task.RawParam.Other }}.txt"],
+            exclude_glob=["c.*"],
+        )
+        task_parameters = {"Name": {"string": "b"}, "Other": "c"}
+        assert default_job.attachments
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
+            return_value=test_manifest,
+        ), patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
+            side_effect=[DownloadSummaryStatistics()],
+        ) as mock_download_files_from_manifests, patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_unique_dest_dir_name",
+            side_effect=[dest_dir],
+        ), patch.object(
+            Path, "stat", MagicMock(st_mtime_ns=1234512345123451)
+        ):
+            self.default_asset_sync.attachment_sync_inputs(
+                default_job_attachment_s3_settings,
+                default_job.attachments,
+                default_queue.queueId,
+                default_job.jobId,
+                tmp_path,
+                input_filter=input_filter,
+                task_parameters=task_parameters,
+            )
+
+        # THEN
+        manifests_by_root = mock_download_files_from_manifests.call_args.kwargs["manifests_by_root"]
+        assert list(manifests_by_root.keys()) == [local_root]
+        assert [path.path for path in manifests_by_root[local_root].paths] == ["b.txt"]
+        assert manifests_by_root[local_root].totalSize == 4
+        assert list(self.default_asset_sync.synced_assets_mtime.keys()) == [
+            str(Path(local_root) / "b.txt")
+        ]
+
+    def test_attachment_sync_inputs_records_mtimes_from_download(
+        self,
+        tmp_path: Path,
+        default_queue: Queue,
+        default_job: Job,
+        default_job_attachment_s3_settings: JobAttachmentS3Settings,
+        test_manifest_one: dict,
+    ):
+        """
+        Asserts that the modification times reported by the download are recorded as is,
+        and only the files the download did not report on are stat'ed.
+        """
+        # GIVEN
+        dest_dir = "assetroot-27bggh78dd2b568ab123"
+        local_root = str(tmp_path / dest_dir)
+        test_manifest = decode_manifest(json.dumps(test_manifest_one))
+        downloaded_path = str(Path(local_root) / "a.txt")
+        assert default_job.attachments
+
+        def download_files_from_manifests(**kwargs):
+            kwargs["downloaded_file_mtimes"][downloaded_path] = 42
+            return DownloadSummaryStatistics()
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.get_manifest_from_s3",
+            return_value=test_manifest,
+        ), patch(
+            f"{deadline.__package__}.job_attachments.asset_sync.download_files_from_manifests",
+            side_effect=download_files_from_manifests,
+        ), patch(
+            f"{deadline.__package__}.job_attachments.asset_sync._get_unique_dest_dir_name",
+            side_effect=[dest_dir],
+        ), patch.object(
+            Path, "stat", MagicMock(return_value=MagicMock(st_mtime_ns=7))
+        ) as mock_stat:
+            self.default_asset_sync.attachment_sync_inputs(
+                default_job_attachment_s3_settings,
+                default_job.attachments,
+                default_queue.queueId,
+                default_job.jobId,
+                tmp_path,
+            )
+
+        # THEN
+        expected_mtimes = {str(Path(local_root) / path.path): 7 for path in test_manifest.paths}
+        expected_mtimes[downloaded_path] = 42
+        assert self.default_asset_sync.synced_assets_mtime == expected_mtimes
+        assert mock_stat.call_count == len(test_manifest.paths) - 1
+
+    def test_expand_input_filter_with_unknown_task_parameter(self):
+        """
+        Asserts that an input filter referencing a parameter the task does not define is an error.
+        """
+        input_filter = GlobConfig(include_glob=["sim/frame_{{Task.Param.Frame}}.vdb"])
+
+        with pytest.raises(AssetSyncError) as excinfo:
+            AssetSync.expand_input_filter(input_filter, {"Camera": "main"})
+
+        assert "references the task parameter 'Frame'" in str(excinfo.value)
+
     @pytest.mark.parametrize(
         ("s3_settings_fixture_name"),
         [
@@ -1557,6 +1965,7 @@ class TestAssetSync:
                 session=ANY,
                 on_downloading_files=mock_on_downloading_files,
                 logger=getLogger("deadline.job_attachments"),
+                downloaded_file_mtimes={},
             )
 
     @pytest.mark.parametrize(
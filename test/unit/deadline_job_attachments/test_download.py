@@ -38,6 +38,7 @@ from deadline.job_attachments.download import (
     download_file,
     download_files_from_manifests,
     download_files_in_directory,
+    filter_asset_manifest,
     get_job_input_output_paths_by_asset_root,
     get_job_input_paths_by_asset_root,
     get_job_output_paths_by_asset_root,
@@ -54,6 +55,7 @@ from deadline.job_attachments.download import (
     VFS_LOGS_FOLDER_IN_SESSION,
 )
 from deadline.job_attachments.exceptions import (
+    AssetSyncCancelledError,
     AssetSyncError,
     JobAttachmentsError,
     JobAttachmentsS3ClientError,
@@ -197,7 +199,7 @@ def assert_download_task_output(
     Assert that the expected files are downloaded when download_job_output is called with a task id.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -244,7 +246,7 @@ def assert_download_step_output(
     Assert that the expected files are downloaded when download_job_output is called with a step id.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -291,7 +293,7 @@ def assert_download_job_output(
     Assert that the expected files are downloaded when download_job_output is called.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -339,7 +341,7 @@ def assert_download_files_in_directory(
     Assert that the expected files are downloaded when download_files_in_directory is called.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -461,7 +463,6 @@ def assert_get_job_input_paths_by_asset_root(
         f"{deadline.__package__}.job_attachments.download.get_job_output_paths_by_asset_root",
         return_value={
             "/tmp": ManifestPathGroup(
-                total_bytes=100,
                 files_by_hash_alg={
                     HashAlgorithm.XXH128: [
                         ManifestPathv2023_03_03(
@@ -498,7 +499,7 @@ def assert_get_job_output_paths_by_asset_root(
     Assert that get_job_output_paths_by_asset_root returns a list of (hash, path) pairs of all output files.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value="/test",
     ):
         paths_by_root = get_job_output_paths_by_asset_root(
@@ -524,7 +525,7 @@ def assert_get_job_output_paths_by_asset_root_when_no_asset_root_throws_error(
     Assert that get_job_output_paths_by_asset_root raises MissingAssetRootError when fail to get manifest.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=None,
     ), pytest.raises(MissingAssetRootError) as raised_err:
         get_job_output_paths_by_asset_root(s3_settings, farm_id, queue_id, "job-1")
@@ -545,7 +546,7 @@ def assert_get_job_input_output_paths_by_asset_root(
     asset files and output files.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value="/tmp",
     ):
         paths_by_root = get_job_input_output_paths_by_asset_root(
@@ -714,6 +715,122 @@ class TestFullDownload:
             farm_id, queue_id, self.job_attachment_settings
         )
 
+    @mock_aws
+    def test_get_job_output_paths_by_asset_root_from_manifest_metadata(
+        self, farm_id, queue_id, manifest_version: ManifestVersion
+    ):
+        """
+        Tests that the asset root is taken from the metadata returned with the output manifest,
+        without a separate HEAD request.
+        """
+        s3 = boto3.Session(region_name="us-west-2").resource("s3")  # pylint: disable=invalid-name
+        bucket = s3.Bucket(self.job_attachment_settings.s3BucketName)
+        manifest = MANIFEST_VERSION_TO_MANIFESTS[manifest_version][0]
+        bucket.upload_fileobj(
+            BytesIO(manifest.manifests),
+            f"{self.job_attachment_settings.rootPrefix}/Manifests/{farm_id}/{queue_id}/"
+            "job-2/step-1/task-1-1/session-action-1/manifest_output",
+            ExtraArgs={"Metadata": {"asset-root": "/root/from/metadata"}},
+        )
+
+        with patch(
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3"
+        ) as mock_get_asset_root_from_s3:
+            paths_by_root = get_job_output_paths_by_asset_root(
+                s3_settings=self.job_attachment_settings,
+                farm_id=farm_id,
+                queue_id=queue_id,
+                job_id="job-2",
+            )
+
+        mock_get_asset_root_from_s3.assert_not_called()
+        assert list(paths_by_root.keys()) == ["/root/from/metadata"]
+        assert paths_by_root["/root/from/metadata"].get_all_paths() == [
+            "test/test2.txt",
+            "test1.txt",
+        ]
+
+    @mock_aws
+    def test_get_job_output_paths_by_asset_root_reports_discovery_progress(self, farm_id, queue_id):
+        """
+        Tests that the discovery callback is called once per fetched output manifest,
+        ending at 100%.
+        """
+        mock_on_discovering_outputs = MagicMock(return_value=True)
+        with patch(
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
+            return_value="/test",
+        ):
+            get_job_output_paths_by_asset_root(
+                s3_settings=self.job_attachment_settings,
+                farm_id=farm_id,
+                queue_id=queue_id,
+                job_id="job-1",
+                on_discovering_outputs=mock_on_discovering_outputs,
+            )
+
+        assert mock_on_discovering_outputs.call_count == 7
+        last_report = mock_on_discovering_outputs.call_args.args[0]
+        assert last_report.progress == 100.0
+        assert last_report.progressMessage == "Fetched 7 / 7 output manifests"
+
+    @mock_aws
+    def test_get_job_output_paths_by_asset_root_discovery_cancelled(self, farm_id, queue_id):
+        """
+        Tests that output discovery stops when the discovery callback returns False.
+        """
+        with patch(
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
+            return_value="/test",
+        ), pytest.raises(AssetSyncCancelledError):
+            get_job_output_paths_by_asset_root(
+                s3_settings=self.job_attachment_settings,
+                farm_id=farm_id,
+                queue_id=queue_id,
+                job_id="job-1",
+                on_discovering_outputs=MagicMock(return_value=False),
+            )
+
+    @mock_aws
+    def test_get_tasks_manifests_keys_from_s3_lists_tasks_separately(self, farm_id, queue_id):
+        """
+        Tests that a job prefix is split into its steps, and the steps into their tasks, so that
+        each task prefix is listed on its own.
+        """
+        manifests_prefix = (
+            f"{self.job_attachment_settings.rootPrefix}/Manifests/{farm_id}/{queue_id}"
+        )
+        with patch(
+            f"{deadline.__package__}.job_attachments.download._list_s3_objects",
+            wraps=deadline.job_attachments.download._list_s3_objects,
+        ) as mock_list_s3_objects:
+            manifests_keys = _get_tasks_manifests_keys_from_s3(
+                f"{manifests_prefix}/job-1/", self.job_attachment_settings.s3BucketName
+            )
+
+        assert [
+            (c.args[2][len(manifests_prefix) + 1 :], c.kwargs.get("delimiter"))
+            for c in mock_list_s3_objects.call_args_list
+        ] == [
+            ("job-1/", "/"),
+            ("job-1/step-1/", "/"),
+            ("job-1/step-2/", "/"),
+            ("job-1/step-1/task-1-1/", None),
+            ("job-1/step-1/task-1-11/", None),
+            ("job-1/step-1/task-1-2/", None),
+            ("job-1/step-2/task-2-3/", None),
+            ("job-1/step-2/task-2-4/", None),
+        ]
+        assert sorted(key[len(manifests_prefix) + 1 :] for key in manifests_keys) == [
+            "job-1/step-1/task-1-1/session-action-9/manifest1v2023-03-03_output",
+            "job-1/step-1/task-1-1/session-action-9/manifest2v2023-03-03_output",
+            "job-1/step-1/task-1-11/session-action-9/manifest7v2023-03-03_output",
+            "job-1/step-1/task-1-2/session-action-9/manifest3v2023-03-03_output",
+            "job-1/step-2/task-2-3/session-action-9/manifest4v2023-03-03_output",
+            "job-1/step-2/task-2-3/session-action-9/manifest5v2023-03-03_output",
+            "job-1/step-2/task-2-4/session-action-9/manifest6v2023-03-03_output",
+        ]
+
     @mock_aws
     def test_get_job_input_output_paths_by_asset_root(
         self, farm_id, queue_id, manifest_version: ManifestVersion
@@ -764,8 +881,9 @@ class TestFullDownload:
     ):
         """
         Tests whether the files listed in the given manifest are downloaded correctly from the
-        S3 bucket. Also, verifies that the functions for changing file ownership and permissions
-        (i.e., chown & chmod for POSIX) are correctly called with the given permission settings.
+        S3 bucket. Also, verifies that the file ownership and permissions (i.e., fchown & fchmod
+        for POSIX) are applied with the given permission settings while the files and directories
+        are created, rather than in a second pass over the paths.
         """
         manifest_str = MANIFEST_VERSION_TO_INPUT_ASSET_MANIFESTS[manifest_version][
             0
@@ -783,33 +901,40 @@ class TestFullDownload:
         mock_on_downloading_files = MagicMock(return_value=True)
 
         # IF
-        with patch("shutil.chown") as mock_chown, patch("os.chmod") as mock_chmod:
-            _ = download_files_from_manifests(
-                s3_bucket=self.job_attachment_settings.s3BucketName,
-                manifests_by_root=manifests_by_root,
-                cas_prefix=self.job_attachment_settings.full_cas_prefix(),
-                fs_permission_settings=fs_permission_settings,
-                on_downloading_files=mock_on_downloading_files,
-            )
+        # The umask removes the group write permission, so only the settings can add it.
+        original_umask = os.umask(0o22)
+        try:
+            with patch(
+                f"{deadline.__package__}.job_attachments.os_file_permission._get_posix_group_id",
+                return_value=4242,
+            ), patch("os.fchown") as mock_fchown, patch("shutil.chown") as mock_chown, patch(
+                "os.chmod"
+            ) as mock_chmod:
+                _ = download_files_from_manifests(
+                    s3_bucket=self.job_attachment_settings.s3BucketName,
+                    manifests_by_root=manifests_by_root,
+                    cas_prefix=self.job_attachment_settings.full_cas_prefix(),
+                    fs_permission_settings=fs_permission_settings,
+                    on_downloading_files=mock_on_downloading_files,
+                )
+        finally:
+            os.umask(original_umask)
 
         # THEN
-        # Ensure that `chown` and `chmod` are properly called with the given permission settings
-        # for the downloaded files (and directory) paths.
+        # Ensure that the group is set once for each of the downloaded files and directories,
+        # and that no path-based second pass happened.
         expected_changed_paths = [
             tmp_path / rel_path for rel_path in self.TARGET_PERMISSION_CHANGE_PATHS_RELATIVE
         ]
+        assert mock_fchown.call_count == len(expected_changed_paths)
+        for call_args in mock_fchown.call_args_list:
+            assert call_args.args[1:] == (-1, 4242)
+        mock_chown.assert_not_called()
+        mock_chmod.assert_not_called()
 
-        chown_expected_calls = [
-            str(call(path, group="test-group")) for path in expected_changed_paths
-        ]
-        chown_actual_calls = [str(call_args) for call_args in mock_chown.call_args_list]
-        assert Counter(chown_actual_calls) == Counter(chown_expected_calls)
-
-        chmod_expected_calls = [
-            str(call(path, path.stat().st_mode | 0o20)) for path in expected_changed_paths
-        ]
-        chmod_actual_calls = [str(call_args) for call_args in mock_chmod.call_args_list]
-        assert Counter(chmod_actual_calls) == Counter(chmod_expected_calls)
+        # Ensure that the permission mode has been added to the downloaded files and directories.
+        for path in expected_changed_paths:
+            assert path.stat().st_mode & 0o20 == 0o20
 
         # Ensure that only the expected files are there and no extras.
         expected_files = [
@@ -819,6 +944,36 @@ class TestFullDownload:
             [path for path in tmp_path.glob("**/*") if path.is_file()]
         )
 
+    @mock_aws
+    def test_download_files_from_manifests_reports_mtimes(
+        self,
+        tmp_path: Path,
+        manifest_version: ManifestVersion,
+    ):
+        """
+        Tests that the modification time of each downloaded file is reported from the download
+        itself, and matches both the manifest and the file on disk.
+        """
+        manifest_str = MANIFEST_VERSION_TO_INPUT_ASSET_MANIFESTS[manifest_version][
+            0
+        ].manifests.decode("utf-8")
+        manifest = decode_manifest(manifest_str)
+        downloaded_file_mtimes: dict[str, int] = {}
+
+        download_files_from_manifests(
+            s3_bucket=self.job_attachment_settings.s3BucketName,
+            manifests_by_root={str(tmp_path): manifest},
+            cas_prefix=self.job_attachment_settings.full_cas_prefix(),
+            downloaded_file_mtimes=downloaded_file_mtimes,
+        )
+
+        assert downloaded_file_mtimes == {
+            str(tmp_path / path.path): path.mtime * 1000  # type: ignore[attr-defined]
+            for path in manifest.paths
+        }
+        for path_str, mtime_ns in downloaded_file_mtimes.items():
+            assert os.stat(path_str).st_mtime_ns == mtime_ns
+
     @mock_aws
     @pytest.mark.skipif(
         sys.platform != "win32",
@@ -1169,7 +1324,7 @@ class TestFullDownload:
         tmp_path: Path,
     ):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1203,7 +1358,7 @@ class TestFullDownload:
     @mock_aws
     def test_OutputDownloader_set_root_path(self, farm_id, queue_id, tmp_path: Path):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1251,7 +1406,7 @@ class TestFullDownload:
         resolving the symlink target, the absolute path with ".." removed is stored.
         """
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1281,6 +1436,50 @@ class TestFullDownload:
             ]
         }
 
+    @pytest.mark.skipif(
+        sys.platform == "win32",
+        reason="This test is for paths in POSIX path format and will be skipped on Windows.",
+    )
+    @mock_aws
+    def test_OutputDownloader_set_root_path_to_existing_root(self, farm_id, queue_id):
+        """
+        Test that when a root is remapped onto another existing root, the file names of paths
+        that exist in both roots are prefixed with the original root.
+        """
+        with patch(
+            f"{deadline.__package__}.job_attachments.download.get_job_output_paths_by_asset_root",
+            return_value={
+                "/root1": ManifestPathGroup(
+                    files_by_hash_alg={
+                        HashAlgorithm.XXH128: [
+                            ManifestPathv2023_03_03(path="out/a.txt", hash="a", size=1, mtime=1),
+                            ManifestPathv2023_03_03(path="b.txt", hash="b", size=1, mtime=1),
+                        ],
+                    },
+                ),
+                "/root2": ManifestPathGroup(
+                    files_by_hash_alg={
+                        HashAlgorithm.XXH128: [
+                            ManifestPathv2023_03_03(path="out/a.txt", hash="c", size=1, mtime=1),
+                        ],
+                    },
+                ),
+            },
+        ):
+            output_downloader = OutputDownloader(
+                s3_settings=self.job_attachment_settings,
+                farm_id=farm_id,
+                queue_id=queue_id,
+                job_id="job-1",
+            )
+
+        output_downloader.set_root_path(original_root="/root1", new_root="/root2")
+
+        assert output_downloader.get_output_paths_by_root() == {
+            "/root2": ["b.txt", "out/_root1_a.txt", "out/a.txt"]
+        }
+        assert output_downloader.outputs_by_root["/root2"].total_bytes == 3
+
     @mock_aws
     def test_OutputDownloader_set_root_path_wrong_root_throws_exception(
         self, farm_id, queue_id, tmp_path: Path
@@ -1289,7 +1488,7 @@ class TestFullDownload:
         Assert a ValueError is thrown when given a non-existent root path.
         """
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1333,7 +1532,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1396,7 +1595,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1475,7 +1674,7 @@ class TestFullDownload:
         expected_files_after_create_copy.extend(expected_files)
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1505,7 +1704,7 @@ class TestFullDownload:
         self, farm_id, queue_id, tmp_path: Path
     ):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1545,7 +1744,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value="/test_root",
         ):
             output_downloader = OutputDownloader(
@@ -1572,7 +1771,6 @@ class TestFullDownload:
         [
             {
                 "/local/home": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(
@@ -1584,7 +1782,6 @@ class TestFullDownload:
             },
             {
                 "/local/home": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(
@@ -1596,7 +1793,6 @@ class TestFullDownload:
             },
             {
                 "home": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(
@@ -1608,7 +1804,6 @@ class TestFullDownload:
             },
             {
                 "/local/home": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(path="////", hash="a", size=1, mtime=1)
@@ -1647,7 +1842,6 @@ class TestFullDownload:
         [
             {
                 "C:/Users": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(
@@ -1659,7 +1853,6 @@ class TestFullDownload:
             },
             {
                 "C:/Users": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(
@@ -1671,7 +1864,6 @@ class TestFullDownload:
             },
             {
                 "/C:": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(
@@ -1683,7 +1875,6 @@ class TestFullDownload:
             },
             {
                 "C:/Users": ManifestPathGroup(
-                    total_bytes=1,
                     files_by_hash_alg={
                         HashAlgorithm.XXH128: [
                             ManifestPathv2023_03_03(path="////", hash="a", size=1, mtime=1)
@@ -2404,6 +2595,36 @@ def test_merge_asset_manifest_single(test_manifest_one: dict):
     assert actual_merged_manifest == manifest
 
 
+@pytest.mark.parametrize(
+    ("include", "exclude", "expected_paths", "expected_total_size"),
+    [
+        (["b.txt"], None, ["b.txt"], 4),
+        (["*.txt"], ["a.txt"], ["b.txt", "c.txt"], 10),
+        (["**/*"], None, ["a.txt", "b.txt", "c.txt"], 12),
+        (["missing/*"], None, [], 0),
+    ],
+)
+def test_filter_asset_manifest(
+    test_manifest_one: dict,
+    include: List[str],
+    exclude: List[str],
+    expected_paths: List[str],
+    expected_total_size: int,
+):
+    """
+    Test that filtering a manifest keeps only the matching paths and updates the total size
+    """
+    manifest = decode_manifest(json.dumps(test_manifest_one))
+
+    filtered_manifest = filter_asset_manifest(manifest, include, exclude)
+
+    assert [path.path for path in filtered_manifest.paths] == expected_paths
+    assert filtered_manifest.totalSize == expected_total_size  # type: ignore[attr-defined]
+    assert filtered_manifest.hashAlg == manifest.hashAlg
+    # The original manifest is left untouched
+    assert len(manifest.paths) == 3
+
+
 def on_downloading_files(progress: ProgressReportMetadata) -> bool:
     return True
 
@@ -2426,10 +2647,10 @@ def test_download_files_from_manifests(
     def download_file(*args):
         nonlocal downloaded_files
         downloaded_files.append(args[0].path)
-        return (40, Path(args[0].path))
+        return (40, Path(args[0].path), 1234000000000)
 
     with patch(
-        f"{deadline.__package__}.job_attachments.download.download_file", side_effect=download_file
+        f"{deadline.__package__}.job_attachments.download._download_file", side_effect=download_file
     ), patch(f"{deadline.__package__}.job_attachments.download.get_s3_client"):
         download_files_from_manifests(
             s3_bucket="s3_settings.s3BucketName",
@@ -2442,6 +2663,42 @@ def test_download_files_from_manifests(
     assert sorted(downloaded_files) == ["a.txt", "b.txt", "c.txt", "d.txt"]
 
 
+def test_download_files_from_manifests_multiple_roots_share_one_schedule():
+    """
+    Test that the files of all roots are scheduled together: the small files of every root are
+    downloaded before any large file, and the downloaded paths are still reported per root.
+    """
+    manifest_one = decode_manifest(
+        '{"hashAlg":"xxh128","manifestVersion":"2023-03-03",'
+        '"paths":[{"hash":"big","mtime":1,"path":"big.exr","size":100},'
+        '{"hash":"a","mtime":1,"path":"a.txt","size":1}],"totalSize":101}'
+    )
+    manifest_two = decode_manifest(
+        '{"hashAlg":"xxh128","manifestVersion":"2023-03-03",'
+        '"paths":[{"hash":"b","mtime":1,"path":"b.txt","size":1}],"totalSize":1}'
+    )
+    download_order: list[str] = []
+
+    def download_file(file, hash_algorithm, local_download_dir, *args):
+        download_order.append(file.path)
+        return (file.size, Path(local_download_dir, file.path), 1000)
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download._download_file", side_effect=download_file
+    ), patch(f"{deadline.__package__}.job_attachments.download.get_s3_client"), patch(
+        f"{deadline.__package__}.job_attachments.download.RANGED_GET_THRESHOLD_BYTES", 100
+    ):
+        summary = download_files_from_manifests(
+            s3_bucket="s3_settings.s3BucketName",
+            manifests_by_root={"/root1": manifest_one, "/root2": manifest_two},
+            cas_prefix="s3_settings.full_cas_prefix()",
+        )
+
+    assert sorted(download_order[:2]) == ["a.txt", "b.txt"]
+    assert download_order[2] == "big.exr"
+    assert summary.file_counts_by_root_directory == {"/root1": 2, "/root2": 1}
+
+
 def test_handle_existing_vfs_no_mount_returns(test_manifest_one: dict):
     """
     Test that handling an existing manifest for a non existent mount returns the manifest
@@ -2532,8 +2789,8 @@ def test_mount_vfs_from_manifests(
     ) as mock_handle_existing, patch(
         f"{deadline.__package__}.job_attachments.download._write_manifest_to_temp_file",
     ) as mock_write_manifest, patch(
-        f"{deadline.__package__}.job_attachments.download.VFSProcessManager.start",
-    ) as mock_vfs_start:
+        f"{deadline.__package__}.job_attachments.download.VFSProcessManager.start_all",
+    ) as mock_vfs_start_all:
         mount_vfs_from_manifests(
             "test-bucket",
             manifests_by_root,
@@ -2577,6 +2834,11 @@ def test_mount_vfs_from_manifests(
         mock_write_manifest.assert_has_calls(
             [call(merged_decoded, dir=manifest_path), call(merged_decoded, dir=manifest_path)]
         )
-        mock_vfs_start.assert_has_calls(
-            [call(session_dir=temp_dir_path), call(session_dir=temp_dir_path)]
-        )
+        # All of the manifests were written before the VFS processes were started together.
+        mock_vfs_start_all.assert_called_once()
+        vfs_managers = mock_vfs_start_all.call_args.args[0]
+        assert [vfs_manager.get_mount_point() for vfs_manager in vfs_managers] == [
+            "/some/root/one",
+            "/some/root/two",
+        ]
+        assert mock_vfs_start_all.call_args.kwargs == {"session_dir": temp_dir_path}
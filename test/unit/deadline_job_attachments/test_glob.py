@@ -4,7 +4,11 @@ import os
 from deadline.client.exceptions import NonValidInputError
 import pytest
 from typing import List
-from deadline.job_attachments._glob import _glob_paths, _process_glob_inputs
+from deadline.job_attachments._glob import (
+    _filter_relative_paths,
+    _glob_paths,
+    _process_glob_inputs,
+)
 
 
 def test_glob_inputs_string(glob_config_file):
@@ -77,3 +81,26 @@ def test_glob_path_exclude(test_glob_folder: str):
     assert len(globbed_files) == 2
     assert os.path.join(os.sep, test_glob_folder, "include.txt") in globbed_files
     assert os.path.join(os.sep, test_glob_folder, "nested", "nested_include.txt") in globbed_files
+
+
+@pytest.mark.parametrize(
+    ("include", "exclude", "expected"),
+    [
+        (["**/*"], None, ["a.txt", "sim/frame_0101.vdb", "sim/frame_0102.vdb", "sim/cache/x.bin"]),
+        (["*"], None, ["a.txt"]),
+        (["sim/frame_0101.vdb"], None, ["sim/frame_0101.vdb"]),
+        (["sim/*.vdb"], None, ["sim/frame_0101.vdb", "sim/frame_0102.vdb"]),
+        (["sim/**"], ["sim/cache/**"], ["sim/frame_0101.vdb", "sim/frame_0102.vdb"]),
+        (["**/*.bin"], None, ["sim/cache/x.bin"]),
+        (["sim/frame_010?.vdb"], ["*/*2.vdb"], ["sim/frame_0101.vdb"]),
+        (["sim/frame_010[!2].vdb"], None, ["sim/frame_0101.vdb"]),
+        (["./a.txt"], None, ["a.txt"]),
+        ([], None, []),
+    ],
+)
+def test_filter_relative_paths(include: List[str], exclude: List[str], expected: List[str]):
+    """
+    Test case to filter manifest-style relative paths with include and exclude globs.
+    """
+    paths = ["a.txt", "sim/frame_0101.vdb", "sim/frame_0102.vdb", "sim/cache/x.bin"]
+    assert _filter_relative_paths(paths, include=include, exclude=exclude) == expected
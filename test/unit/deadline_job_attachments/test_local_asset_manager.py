@@ -0,0 +1,68 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Tests for the local-only asset handling that doesn't need AWS.
+"""
+import subprocess
+import sys
+
+from deadline.job_attachments._local_asset_manager import LocalAssetManager
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
+from deadline.job_attachments.upload import S3AssetManager
+
+
+def test_local_modules_do_not_import_boto3():
+    """
+    Confirm that the modules for working with local files and manifests don't import boto3.
+    """
+    output = subprocess.check_output(
+        args=[
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "import deadline.client.cli._groups.manifest_group\n"
+            "import deadline.job_attachments._diff\n"
+            "import deadline.job_attachments._glob\n"
+            "import deadline.job_attachments._local_asset_manager\n"
+            "import deadline.job_attachments.api.manifest\n"
+            "import deadline.job_attachments.asset_manifests.decode\n"
+            "import deadline.job_attachments.caches\n"
+            "print(sorted(m for m in ('boto3', 'botocore', 's3transfer') if m in sys.modules))",
+        ],
+        text=True,
+    )
+
+    assert output.strip() == "[]"
+
+
+def test_hash_assets_and_create_manifest(tmp_path):
+    """
+    Confirm that the local asset manager groups and hashes files the same way as the S3 one.
+    """
+    (tmp_path / "subdir").mkdir()
+    (tmp_path / "subdir" / "file1.txt").write_text("contents 1")
+    (tmp_path / "file2.txt").write_text("contents 2")
+    input_paths = [str(tmp_path / "subdir" / "file1.txt"), str(tmp_path / "file2.txt")]
+    cache_dir = tmp_path / "cache"
+
+    manifests = []
+    for asset_manager in [LocalAssetManager(), S3AssetManager()]:
+        upload_group = asset_manager.prepare_paths_for_upload(
+            input_paths=input_paths, output_paths=[], referenced_paths=[]
+        )
+        _, asset_root_manifests = asset_manager.hash_assets_and_create_manifest(
+            asset_groups=upload_group.asset_groups,
+            total_input_files=upload_group.total_input_files,
+            total_input_bytes=upload_group.total_input_bytes,
+            hash_cache_dir=str(cache_dir),
+        )
+        assert len(asset_root_manifests) == 1
+        manifest = asset_root_manifests[0].asset_manifest
+        assert manifest is not None
+        manifests.append(manifest)
+
+    assert {(path.path, path.hash) for path in manifests[0].paths} == {
+        ("subdir/file1.txt", hash_data(b"contents 1", HashAlgorithm.XXH128)),
+        ("file2.txt", hash_data(b"contents 2", HashAlgorithm.XXH128)),
+    }
+    assert manifests[0].encode() == manifests[1].encode()
@@ -1,13 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+import time
+from typing import List
 from unittest.mock import patch
 
 from deadline.job_attachments.models import (
+    ManifestPathGroup,
     PathFormat,
     StorageProfileOperatingSystemFamily,
     PathMappingRule,
     JobAttachmentS3Settings,
 )
+from deadline.job_attachments.asset_manifests.base_manifest import BaseManifestPath
 from deadline.job_attachments.asset_manifests.hash_algorithms import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import ManifestPath
 from deadline.job_attachments.exceptions import MalformedAttachmentSettingError
 
 import pytest
@@ -110,3 +115,89 @@ class TestModels:
         """
         with pytest.raises(MalformedAttachmentSettingError):
             JobAttachmentS3Settings.from_s3_root_uri("s3://s3BucketOnly")
+
+    def test_manifest_path_group_deduplicates_paths(self):
+        """
+        Test that a path added to a ManifestPathGroup more than once is only counted once,
+        with the most recently added entry kept, and that the cached paths follow the changes.
+        """
+        group = ManifestPathGroup(
+            files_by_hash_alg={
+                HashAlgorithm.XXH128: [
+                    ManifestPath(path="b.txt", hash="b", size=2, mtime=1),
+                    ManifestPath(path="a.txt", hash="a1", size=1, mtime=1),
+                ]
+            }
+        )
+        assert group.get_all_paths() == ["a.txt", "b.txt"]
+        other_group = ManifestPathGroup(
+            files_by_hash_alg={
+                HashAlgorithm.XXH128: [ManifestPath(path="a.txt", hash="a2", size=5, mtime=2)]
+            }
+        )
+
+        group.combine_with_group(other_group)
+        group.combine_with_group(other_group)
+        group.add_paths(
+            HashAlgorithm.XXH128, [ManifestPath(path="c.txt", hash="c", size=4, mtime=1)]
+        )
+
+        assert group.total_files == 3
+        assert group.total_bytes == 11
+        assert group.get_all_paths() == ["a.txt", "b.txt", "c.txt"]
+        assert group.contains_path("a.txt")
+        assert not group.contains_path("d.txt")
+        assert group.files_by_hash_alg == {
+            HashAlgorithm.XXH128: [
+                ManifestPath(path="b.txt", hash="b", size=2, mtime=1),
+                ManifestPath(path="a.txt", hash="a2", size=5, mtime=2),
+                ManifestPath(path="c.txt", hash="c", size=4, mtime=1),
+            ]
+        }
+        # The cached paths don't take part in comparisons
+        assert group == ManifestPathGroup(files_by_hash_alg=group.files_by_hash_alg)
+
+    def test_manifest_path_group_combined_with_itself(self):
+        """
+        Test that combining the same one-file group twice counts its file and size once.
+        """
+        group = ManifestPathGroup()
+        one_file_group = ManifestPathGroup(
+            files_by_hash_alg={
+                HashAlgorithm.XXH128: [ManifestPath(path="a", hash="a", size=10, mtime=1)]
+            }
+        )
+
+        group.combine_with_group(one_file_group)
+        group.combine_with_group(one_file_group)
+
+        assert group.total_bytes == 10
+        assert group.total_files == 1
+        assert group.get_all_paths() == ["a"]
+
+    def test_manifest_path_group_path_lookups_scale(self):
+        """
+        Test that looking up and listing the paths of a large ManifestPathGroup costs about as
+        much as one pass over its paths, rather than one pass per lookup. The absolute time for
+        1M paths is measured by scripted_tests/manifest_path_group_benchmark.py.
+        """
+        num_paths = 200_000
+        paths: List[BaseManifestPath] = [
+            ManifestPath(path=f"frames/{i % 1000}/frame_{i}.exr", hash="h", size=1, mtime=1)
+            for i in range(num_paths)
+        ]
+        group = ManifestPathGroup(files_by_hash_alg={HashAlgorithm.XXH128: paths})
+
+        start = time.perf_counter()
+        assert len(sorted({manifest_path.path for manifest_path in paths})) == num_paths
+        one_pass_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for manifest_path in paths[::10]:
+            assert group.contains_path(manifest_path.path)
+        assert not group.contains_path("frames/missing.exr")
+        assert len(group.get_all_paths()) == num_paths
+        lookup_seconds = time.perf_counter() - start
+
+        # Scanning the paths for each of the 20,000 lookups would take thousands of passes.
+        assert lookup_seconds < 10 * one_pass_seconds
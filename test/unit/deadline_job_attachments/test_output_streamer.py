@@ -0,0 +1,93 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for streaming output files while a task is running."""
+import os
+from logging import getLogger
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from deadline.job_attachments._output_streamer import _OutputStreamer
+
+
+class TestOutputStreamer:
+    def _streamer(self, tmp_path: Path, on_quiescent_file: MagicMock) -> _OutputStreamer:
+        return _OutputStreamer(
+            [(tmp_path / "outputs", tmp_path)],
+            on_quiescent_file,
+            logger=getLogger("test"),
+            quiescence_seconds=10,
+        )
+
+    def test_poll_hands_over_quiescent_files_once(self, tmp_path: Path):
+        # GIVEN
+        (tmp_path / "outputs").mkdir()
+        output_file = tmp_path / "outputs" / "frame1.exr"
+        output_file.write_text("frame 1")
+        on_quiescent_file = MagicMock()
+        streamer = self._streamer(tmp_path, on_quiescent_file)
+
+        # WHEN
+        streamer.poll(now=0)
+        streamer.poll(now=5)
+
+        # THEN
+        on_quiescent_file.assert_not_called()
+
+        # WHEN
+        streamer.poll(now=10)
+        streamer.poll(now=20)
+
+        # THEN
+        on_quiescent_file.assert_called_once_with(output_file, tmp_path)
+
+    def test_poll_hands_over_rewritten_files_again(self, tmp_path: Path):
+        # GIVEN
+        (tmp_path / "outputs").mkdir()
+        output_file = tmp_path / "outputs" / "frame1.exr"
+        output_file.write_text("frame 1")
+        on_quiescent_file = MagicMock()
+        streamer = self._streamer(tmp_path, on_quiescent_file)
+        streamer.poll(now=0)
+        streamer.poll(now=10)
+
+        # WHEN
+        output_file.write_text("frame 1, rendered again")
+        os.utime(output_file, ns=(10**18, 10**18))
+        streamer.poll(now=11)
+        streamer.poll(now=15)
+
+        # THEN
+        assert on_quiescent_file.call_count == 1
+
+        # WHEN
+        streamer.poll(now=21)
+
+        # THEN
+        assert on_quiescent_file.call_count == 2
+
+    def test_poll_retries_failed_files(self, tmp_path: Path):
+        # GIVEN
+        (tmp_path / "outputs").mkdir()
+        (tmp_path / "outputs" / "frame1.exr").write_text("frame 1")
+        on_quiescent_file = MagicMock(side_effect=[Exception("upload failed"), None])
+        streamer = self._streamer(tmp_path, on_quiescent_file)
+
+        # WHEN
+        streamer.poll(now=0)
+        streamer.poll(now=10)
+        streamer.poll(now=11)
+        streamer.poll(now=12)
+
+        # THEN
+        assert on_quiescent_file.call_count == 2
+
+    def test_poll_ignores_missing_output_dirs(self, tmp_path: Path):
+        # GIVEN
+        on_quiescent_file = MagicMock()
+        streamer = self._streamer(tmp_path, on_quiescent_file)
+
+        # WHEN
+        streamer.poll(now=0)
+
+        # THEN
+        on_quiescent_file.assert_not_called()
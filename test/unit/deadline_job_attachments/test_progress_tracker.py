@@ -4,11 +4,15 @@
 from deadline.job_attachments.progress_tracker import (
     SummaryStatistics,
     DownloadSummaryStatistics,
+    ProgressReportMetadata,
     ProgressTracker,
     ProgressStatus,
 )
 import pytest
 import concurrent
+import threading
+import time
+from typing import List
 
 
 # += operator doesn't seem to be non-threadsafe in python 3.10 or later, but can be an issue in earlier versions.
@@ -33,6 +37,107 @@ class TestProgressTracker:
 
         assert progress_tracker.processed_files == N * K
 
+    def test_track_progress_counts_bytes_from_all_threads(self):
+        progress_tracker = ProgressTracker(ProgressStatus.UPLOAD_IN_PROGRESS, 64, 64 * 1000)
+
+        def transfer():
+            for _ in range(10):
+                progress_tracker.track_progress_callback(100)
+            progress_tracker.track_progress_callback(0, True)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=64) as executor:
+            for _ in range(64):
+                executor.submit(transfer)
+
+        assert progress_tracker.processed_bytes == 64 * 1000
+        assert progress_tracker.processed_files == 64
+
+    def test_slow_callback_does_not_block_transfers(self):
+        """
+        Tests that the callback is invoked from a separate thread, so that the transfer threads
+        don't wait for it.
+        """
+        # Given
+        callback_started = threading.Event()
+        release_callback = threading.Event()
+        callback_threads = []
+
+        def slow_callback(_) -> bool:
+            callback_threads.append(threading.current_thread())
+            callback_started.set()
+            release_callback.wait(10)
+            return True
+
+        progress_tracker = ProgressTracker(
+            ProgressStatus.DOWNLOAD_IN_PROGRESS,
+            total_files=2,
+            total_bytes=1000,
+            on_progress_callback=slow_callback,
+            callback_interval=0,
+        )
+
+        # When
+        assert progress_tracker.track_progress_callback(100)
+        assert callback_started.wait(10)
+        start = time.perf_counter()
+        for _ in range(100):
+            assert progress_tracker.track_progress_callback(1)
+        elapsed = time.perf_counter() - start
+        release_callback.set()
+
+        # Then
+        assert elapsed < 1
+        assert callback_threads[0] is not threading.current_thread()
+        assert progress_tracker.processed_bytes == 200
+
+    def test_cancel_from_callback(self):
+        """
+        Tests that when the callback returns False, the transfer threads are told to stop.
+        """
+        cancelled = threading.Event()
+
+        def cancel(_) -> bool:
+            cancelled.set()
+            return False
+
+        progress_tracker = ProgressTracker(
+            ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=1,
+            total_bytes=1000,
+            on_progress_callback=cancel,
+            callback_interval=0,
+        )
+
+        progress_tracker.track_progress_callback(100)
+        assert cancelled.wait(10)
+        # The flag is set right after the callback returns.
+        timeout_at = time.perf_counter() + 10
+        while progress_tracker.continue_reporting and time.perf_counter() < timeout_at:
+            time.sleep(0.01)
+
+        assert not progress_tracker.track_progress_callback(100)
+        assert not progress_tracker.report_progress()
+
+    def test_report_progress_reports_final_progress(self):
+        reports: List[ProgressReportMetadata] = []
+
+        def on_progress(report: ProgressReportMetadata) -> bool:
+            reports.append(report)
+            return True
+
+        progress_tracker = ProgressTracker(
+            ProgressStatus.DOWNLOAD_IN_PROGRESS,
+            total_files=2,
+            total_bytes=300,
+            on_progress_callback=on_progress,
+        )
+
+        progress_tracker.increase_processed(1, 100)
+        progress_tracker.increase_skipped(1, 200)
+        assert progress_tracker.report_progress()
+
+        assert reports[-1].progress == 100.0
+
 
 class TestSummaryStatistics:
     """
@@ -0,0 +1,313 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for downloading large files with parallel ranged GETs."""
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import threading
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+import deadline
+from deadline.job_attachments._ranged_download import (
+    RANGED_GET_MAX_PART_SIZE,
+    RANGED_GET_MIN_PART_SIZE,
+    _OrderedHasher,
+    _TransferEstimate,
+    _split_into_ranges,
+    download_file_with_ranged_gets,
+)
+from deadline.job_attachments.asset_manifests import HashAlgorithm
+from deadline.job_attachments.asset_manifests.hash_algorithms import hash_data
+from deadline.job_attachments.asset_manifests.v2023_03_03 import ManifestPath
+from deadline.job_attachments.download import download_file
+from deadline.job_attachments.exceptions import AssetSyncCancelledError, AssetSyncError
+from deadline.job_attachments.progress_tracker import ProgressStatus, ProgressTracker
+
+
+class _FixedPartSize(_TransferEstimate):
+    """An estimate with a fixed small part size, so that tests can use small objects."""
+
+    def __init__(self, part_size: int) -> None:
+        super().__init__()
+        self._part_size = part_size
+
+    def part_size(self) -> int:
+        return self._part_size
+
+
+TEST_BUCKET = "test-bucket"
+TEST_KEY = "Data/large_file"
+# Not a multiple of the part size, so the last range is a partial one.
+TEST_DATA = os.urandom(100_003)
+
+
+@pytest.fixture
+def large_object(s3, create_s3_bucket) -> str:
+    create_s3_bucket(bucket_name=TEST_BUCKET)
+    s3.put_object(Bucket=TEST_BUCKET, Key=TEST_KEY, Body=TEST_DATA)
+    return hash_data(TEST_DATA, HashAlgorithm.XXH128)
+
+
+@pytest.mark.parametrize(
+    ("file_size", "part_size", "expected"),
+    [
+        (0, 4, []),
+        (4, 4, [(0, 4)]),
+        (10, 4, [(0, 4), (4, 4), (8, 2)]),
+    ],
+)
+def test_split_into_ranges(file_size: int, part_size: int, expected: list):
+    assert _split_into_ranges(file_size, part_size) == expected
+
+
+def test_transfer_estimate_part_size():
+    """The part size grows with the bandwidth-delay product and is clamped to the allowed range."""
+    slow_nearby = _TransferEstimate(bytes_per_second=10 * 1000**2, latency_seconds=0.001)
+    fast_far = _TransferEstimate(bytes_per_second=100 * 1000**2, latency_seconds=0.1)
+    very_fast_far = _TransferEstimate(bytes_per_second=10 * 1000**3, latency_seconds=1.0)
+
+    assert slow_nearby.part_size() == RANGED_GET_MIN_PART_SIZE
+    assert RANGED_GET_MIN_PART_SIZE < fast_far.part_size() < RANGED_GET_MAX_PART_SIZE
+    assert fast_far.part_size() % (1024 * 1024) == 0
+    assert very_fast_far.part_size() == RANGED_GET_MAX_PART_SIZE
+
+
+def test_transfer_estimate_record():
+    estimate = _TransferEstimate(bytes_per_second=1000, latency_seconds=1.0)
+
+    estimate.record(num_bytes=2000, latency_seconds=2.0, total_seconds=3.0)
+
+    assert estimate.bytes_per_second > 1000
+    assert estimate.latency_seconds > 1.0
+
+
+@pytest.fixture
+def fd(tmp_path: Path) -> Generator[int, None, None]:
+    fd = os.open(tmp_path / "large_file", os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+    yield fd
+    os.close(fd)
+
+
+@pytest.mark.parametrize("max_connections", [1, 4, 64])
+def test_download_file_with_ranged_gets(
+    tmp_path: Path, s3, large_object: str, fd: int, max_connections
+):
+    """The ranges are reassembled into the file, and progress is reported for every byte."""
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.DOWNLOAD_IN_PROGRESS, total_files=1, total_bytes=len(TEST_DATA)
+    )
+
+    download_file_with_ranged_gets(
+        s3_client=s3,
+        s3_bucket=TEST_BUCKET,
+        s3_key=TEST_KEY,
+        fd=fd,
+        file_size=len(TEST_DATA),
+        expected_hash=large_object,
+        hash_algorithm=HashAlgorithm.XXH128,
+        max_connections=max_connections,
+        progress_tracker=progress_tracker,
+        transfer_estimate=_FixedPartSize(4096),
+    )
+
+    assert (tmp_path / "large_file").read_bytes() == TEST_DATA
+    assert progress_tracker.processed_bytes == len(TEST_DATA)
+
+
+def test_download_file_with_ranged_gets_hash_mismatch(s3, large_object: str, fd: int):
+    """A hash mismatch raises an error."""
+    with pytest.raises(AssetSyncError, match="Hash mismatch"):
+        download_file_with_ranged_gets(
+            s3_client=s3,
+            s3_bucket=TEST_BUCKET,
+            s3_key=TEST_KEY,
+            fd=fd,
+            file_size=len(TEST_DATA),
+            expected_hash="0" * 32,
+            hash_algorithm=HashAlgorithm.XXH128,
+            max_connections=4,
+            transfer_estimate=_FixedPartSize(4096),
+        )
+
+
+def test_download_file_with_ranged_gets_cancelled(s3, large_object: str, fd: int):
+    """Cancelling through the progress tracker stops the download."""
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.DOWNLOAD_IN_PROGRESS,
+        total_files=1,
+        total_bytes=len(TEST_DATA),
+        on_progress_callback=lambda _: False,
+        # Report progress on every callback, so that the cancellation is noticed right away.
+        callback_interval=0,
+    )
+
+    with pytest.raises(concurrent.futures.CancelledError):
+        download_file_with_ranged_gets(
+            s3_client=s3,
+            s3_bucket=TEST_BUCKET,
+            s3_key=TEST_KEY,
+            fd=fd,
+            file_size=len(TEST_DATA),
+            expected_hash=large_object,
+            hash_algorithm=HashAlgorithm.XXH128,
+            max_connections=4,
+            progress_tracker=progress_tracker,
+            transfer_estimate=_FixedPartSize(4096),
+        )
+
+    assert progress_tracker.processed_bytes < len(TEST_DATA)
+
+
+def test_ordered_hasher_memory_limit():
+    """Parts only start when they fit in the memory limit, except the next part to hash."""
+    hasher = _OrderedHasher(HashAlgorithm.XXH128, window=10, memory_limit_bytes=10)
+    assert hasher.wait_for_turn(0, 8)
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(hasher.wait_for_turn(1, 8)))
+    waiter.start()
+    waiter.join(timeout=0.2)
+    assert waiter.is_alive()
+
+    # Hashing part 0 frees its memory for part 1
+    hasher.add(0, [b"x" * 8])
+    waiter.join(timeout=10)
+    assert results == [True]
+
+    # The next part to hash can start even if it's larger than the limit
+    hasher.add(1, [b"x" * 8])
+    assert hasher.wait_for_turn(2, 100)
+    assert hasher.hexdigest() == hash_data(b"x" * 16, HashAlgorithm.XXH128)
+
+
+def test_download_file_with_ranged_gets_memory_limit(
+    tmp_path: Path, s3, large_object: str, fd: int
+):
+    """With a memory limit smaller than the window of parts, the download still completes."""
+    with patch(
+        f"{deadline.__package__}.job_attachments._ranged_download.RANGED_GET_HASH_MEMORY_LIMIT_BYTES",
+        3 * 4096,
+    ):
+        download_file_with_ranged_gets(
+            s3_client=s3,
+            s3_bucket=TEST_BUCKET,
+            s3_key=TEST_KEY,
+            fd=fd,
+            file_size=len(TEST_DATA),
+            expected_hash=large_object,
+            hash_algorithm=HashAlgorithm.XXH128,
+            max_connections=16,
+            transfer_estimate=_FixedPartSize(4096),
+        )
+
+    assert (tmp_path / "large_file").read_bytes() == TEST_DATA
+
+
+class TestDownloadFileWithRangedGets:
+    """Tests that download_file uses ranged GETs for large files."""
+
+    @pytest.fixture(autouse=True)
+    def small_threshold(self):
+        with patch(
+            f"{deadline.__package__}.job_attachments.download.RANGED_GET_THRESHOLD_BYTES", 1000
+        ), patch(
+            f"{deadline.__package__}.job_attachments._ranged_download._transfer_estimate",
+            _FixedPartSize(4096),
+        ):
+            yield
+
+    def _manifest_path(self, file_hash: str) -> ManifestPath:
+        return ManifestPath(path="out/large_file", hash=file_hash, size=len(TEST_DATA), mtime=1)
+
+    def test_download_file(self, tmp_path: Path, s3, create_s3_bucket):
+        create_s3_bucket(bucket_name=TEST_BUCKET)
+        file_hash = hash_data(TEST_DATA, HashAlgorithm.XXH128)
+        s3.put_object(Bucket=TEST_BUCKET, Key=f"Data/{file_hash}.xxh128", Body=TEST_DATA)
+
+        with patch(
+            f"{deadline.__package__}.job_attachments.download.get_s3_transfer_manager"
+        ) as mock_transfer_manager:
+            file_bytes, local_file_name = download_file(
+                self._manifest_path(file_hash),
+                HashAlgorithm.XXH128,
+                str(tmp_path),
+                TEST_BUCKET,
+                "Data",
+                s3,
+            )
+
+        mock_transfer_manager.return_value.download.assert_not_called()
+        assert file_bytes == len(TEST_DATA)
+        assert local_file_name == tmp_path / "out" / "large_file"
+        assert local_file_name.read_bytes() == TEST_DATA
+        assert os.path.getmtime(local_file_name) == pytest.approx(1 / 1000000)
+        # The temporary file was renamed into place.
+        assert os.listdir(tmp_path / "out") == ["large_file"]
+
+    def test_download_file_hash_mismatch(self, tmp_path: Path, s3, create_s3_bucket):
+        """Corrupted data is detected, and the partial download is discarded."""
+        create_s3_bucket(bucket_name=TEST_BUCKET)
+        file_hash = hash_data(TEST_DATA, HashAlgorithm.XXH128)
+        s3.put_object(
+            Bucket=TEST_BUCKET, Key=f"Data/{file_hash}.xxh128", Body=b"x" * len(TEST_DATA)
+        )
+
+        with pytest.raises(AssetSyncError, match="Hash mismatch"):
+            download_file(
+                self._manifest_path(file_hash),
+                HashAlgorithm.XXH128,
+                str(tmp_path),
+                TEST_BUCKET,
+                "Data",
+                s3,
+            )
+
+        assert os.listdir(tmp_path / "out") == []
+
+    def test_download_file_legacy_key(self, tmp_path: Path, s3, create_s3_bucket):
+        """Falls back to the key without the hash algorithm extension."""
+        create_s3_bucket(bucket_name=TEST_BUCKET)
+        file_hash = hash_data(TEST_DATA, HashAlgorithm.XXH128)
+        s3.put_object(Bucket=TEST_BUCKET, Key=f"Data/{file_hash}", Body=TEST_DATA)
+
+        _, local_file_name = download_file(
+            self._manifest_path(file_hash),
+            HashAlgorithm.XXH128,
+            str(tmp_path),
+            TEST_BUCKET,
+            "Data",
+            s3,
+        )
+
+        assert local_file_name is not None
+        assert local_file_name.read_bytes() == TEST_DATA
+
+    def test_download_file_cancelled(self, tmp_path: Path, s3, create_s3_bucket):
+        create_s3_bucket(bucket_name=TEST_BUCKET)
+        file_hash = hash_data(TEST_DATA, HashAlgorithm.XXH128)
+        s3.put_object(Bucket=TEST_BUCKET, Key=f"Data/{file_hash}.xxh128", Body=TEST_DATA)
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.DOWNLOAD_IN_PROGRESS,
+            total_files=1,
+            total_bytes=len(TEST_DATA),
+            on_progress_callback=lambda _: False,
+            callback_interval=0,
+        )
+
+        with pytest.raises(AssetSyncCancelledError):
+            download_file(
+                self._manifest_path(file_hash),
+                HashAlgorithm.XXH128,
+                str(tmp_path),
+                TEST_BUCKET,
+                "Data",
+                s3,
+                progress_tracker=progress_tracker,
+            )
+
+        assert os.listdir(tmp_path / "out") == []
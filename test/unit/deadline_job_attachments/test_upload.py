@@ -4,8 +4,10 @@
 Tests related to the uploading of assets.
 """
 
+import json
 import os
 import sys
+import threading
 from copy import deepcopy
 from datetime import datetime
 from io import BytesIO
@@ -28,9 +30,12 @@ from deadline.job_attachments.asset_manifests import (
     BaseManifestPath,
     HashAlgorithm,
     ManifestVersion,
+    hash_data,
 )
+from deadline.job_attachments.asset_manifests.decode import decode_manifest
 from deadline.job_attachments.caches import HashCacheEntry, S3CheckCacheEntry
 from deadline.job_attachments.exceptions import (
+    AssetSyncCancelledError,
     AssetSyncError,
     JobAttachmentsS3ClientError,
     MisconfiguredInputsError,
@@ -40,6 +45,7 @@ from deadline.job_attachments.exceptions import (
 from deadline.job_attachments.models import (
     AssetRootGroup,
     Attachments,
+    FileStatus,
     FileSystemLocation,
     FileSystemLocationType,
     ManifestProperties,
@@ -50,9 +56,14 @@ from deadline.job_attachments.models import (
 )
 from deadline.job_attachments.progress_tracker import (
     ProgressStatus,
+    ProgressTracker,
     SummaryStatistics,
 )
-from deadline.job_attachments.upload import FileStatus, S3AssetManager, S3AssetUploader
+from deadline.job_attachments.upload import (
+    S3AssetManager,
+    S3AssetUploader,
+    _SmallFileBuffers,
+)
 from deadline.job_attachments._utils import _human_readable_file_size
 from ..conftest import is_windows_non_admin
 
@@ -149,12 +160,12 @@ class TestUpload:
             side_effect=["e", "manifesthash"],
         ), patch(
             f"{deadline.__package__}.job_attachments.upload.hash_file",
-            side_effect={
+            side_effect=lambda file_path, hash_alg, **kwargs: {
                 str(scene_file): "a",
                 str(texture_file): "b",
                 str(normal_file): "c",
                 str(meta_file): "d",
-            }.get,
+            }.get(file_path),
         ), patch(
             f"{deadline.__package__}.job_attachments.models._generate_random_guid",
             return_value="0000",
@@ -344,7 +355,7 @@ class TestUpload:
             side_effect=["b", "manifesthash"],
         ), patch(
             f"{deadline.__package__}.job_attachments.upload.hash_file",
-            side_effect={str(input_c): "a"}.get,
+            side_effect=lambda file_path, hash_alg, **kwargs: {str(input_c): "a"}.get(file_path),
         ), patch(
             f"{deadline.__package__}.job_attachments.models._generate_random_guid",
             return_value="0000",
@@ -768,7 +779,7 @@ class TestUpload:
         expected_total_uploaded_bytes = not_yet_uploaded_file.size()
         expected_total_input_bytes = expected_total_skipped_bytes + expected_total_uploaded_bytes
 
-        def mock_hash_file(file_path: str, hash_alg: HashAlgorithm):
+        def mock_hash_file(file_path: str, hash_alg: HashAlgorithm, **kwargs):
             if file_path == already_uploaded_file:
                 return "existinghash"
             elif file_path == not_yet_uploaded_file:
@@ -877,6 +888,152 @@ class TestUpload:
                 },
             )
 
+    @mock_aws
+    def test_asset_management_uploads_small_files_from_memory(self, tmpdir, farm_id, queue_id):
+        """
+        Test that a new small file is read only once: the contents read while hashing it are
+        uploaded with a single PutObject, and the file isn't read again for the upload.
+        """
+        small_file = tmpdir.mkdir("scene").join("small.ma")
+        small_file.write("contents when hashed")
+        large_file = tmpdir.mkdir("textures").join("large.png")
+        large_file.write("x" * 100)
+
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+        )
+        cache_dir = tmpdir.mkdir("cache")
+
+        # Given
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.SMALL_FILE_BUFFER_THRESHOLD_BYTES", 50
+        ):
+            upload_group = asset_manager.prepare_paths_for_upload(
+                input_paths=[small_file, large_file],
+                output_paths=[],
+                referenced_paths=[],
+            )
+            (_, asset_root_manifests) = asset_manager.hash_assets_and_create_manifest(
+                asset_groups=upload_group.asset_groups,
+                total_input_files=upload_group.total_input_files,
+                total_input_bytes=upload_group.total_input_bytes,
+                hash_cache_dir=cache_dir,
+            )
+
+        # When
+        with patch.object(
+            asset_manager.asset_uploader,
+            "upload_file_to_s3",
+            wraps=asset_manager.asset_uploader.upload_file_to_s3,
+        ) as mock_upload_file_to_s3, patch.object(
+            asset_manager.asset_uploader,
+            "_open_non_symlink_file_binary",
+            wraps=asset_manager.asset_uploader._open_non_symlink_file_binary,
+        ) as mock_open_file:
+            (upload_summary_statistics, _) = asset_manager.upload_assets(
+                manifests=asset_root_manifests,
+                s3_check_cache_dir=cache_dir,
+            )
+
+        # Then
+        mock_upload_file_to_s3.assert_called_once()
+        assert [Path(c.args[0]).name for c in mock_open_file.call_args_list] == ["large.png"]
+        assert mock_upload_file_to_s3.call_args.kwargs["local_path"].name == "large.png"
+        assert upload_summary_statistics.processed_files == 2
+        assert upload_summary_statistics.processed_bytes == small_file.size() + large_file.size()
+
+        small_file_hash = hash_data(b"contents when hashed", HashAlgorithm.XXH128)
+        s3 = boto3.Session(region_name="us-west-2").resource("s3")
+        uploaded = s3.Object(
+            self.job_attachment_s3_settings.s3BucketName,
+            f"{self.job_attachment_s3_settings.full_cas_prefix()}/{small_file_hash}.xxh128",
+        )
+        assert uploaded.get()["Body"].read() == b"contents when hashed"
+        # The memory is released after uploading.
+        assert asset_manager._small_file_buffers is not None
+        assert asset_manager._small_file_buffers.pop(str(Path(small_file)), small_file_hash) is None
+
+    def test_small_file_buffers_memory_limit(self, tmp_path):
+        """
+        Test that the contents of small files are only kept up to the memory limit.
+        """
+        buffers = _SmallFileBuffers(memory_limit_bytes=10)
+        file_a = tmp_path / "a"
+        file_b = tmp_path / "b"
+        for file in (file_a, file_b):
+            file.write_bytes(b"123456")
+
+        assert buffers.put(str(file_a), "hasha", b"123456", file_a.stat().st_mtime_ns)
+        assert not buffers.put(str(file_b), "hashb", b"123456", file_b.stat().st_mtime_ns)
+        assert buffers.pop(file_a, "hasha") == b"123456"
+        assert buffers.put(str(file_b), "hashb", b"123456", file_b.stat().st_mtime_ns)
+        assert buffers.pop(file_a, "hasha") is None
+
+    def test_small_file_buffers_are_keyed_by_resolved_path(self, tmp_path):
+        """
+        Test that contents kept under one path of a file are found under another path of it.
+        """
+        buffers = _SmallFileBuffers()
+        (tmp_path / "dir").mkdir()
+        file = tmp_path / "file"
+        file.write_bytes(b"contents")
+
+        buffers.put(
+            os.path.join(str(tmp_path), "dir", "..", "file"),
+            "hash",
+            b"contents",
+            file.stat().st_mtime_ns,
+        )
+
+        assert buffers.pop(file.resolve(), "hash") == b"contents"
+
+    def test_small_file_buffers_skip_changed_files(self, tmp_path):
+        """
+        Test that the contents aren't given back if the file changed after it was hashed, or was
+        replaced by a symlink, so that the file is read again to upload it.
+        """
+        buffers = _SmallFileBuffers()
+        file = tmp_path / "file"
+        file.write_bytes(b"contents")
+        mtime_ns = file.stat().st_mtime_ns
+
+        # Same size, different modification time
+        buffers.put(str(file), "hash", b"contents", mtime_ns)
+        file.write_bytes(b"CONTENTS")
+        os.utime(file, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+        assert buffers.pop(file, "hash") is None
+
+        # Different size
+        buffers.put(str(file), "hash", b"contents", file.stat().st_mtime_ns)
+        file.write_bytes(b"more contents")
+        assert buffers.pop(file, "hash") is None
+
+        # Deleted
+        buffers.put(str(file), "hash", b"contents", file.stat().st_mtime_ns)
+        file.unlink()
+        assert buffers.pop(file, "hash") is None
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Creating symlinks needs privileges")
+    def test_small_file_buffers_skip_files_replaced_by_symlinks(self, tmp_path):
+        """
+        Test that the contents aren't given back if the file was replaced by a symlink after it
+        was hashed.
+        """
+        buffers = _SmallFileBuffers()
+        file = tmp_path / "file"
+        file.write_bytes(b"contents")
+        buffers.put(str(file), "hash", b"contents", file.stat().st_mtime_ns)
+        real_path = file.resolve()
+
+        other_file = tmp_path / "other"
+        other_file.write_bytes(b"contents")
+        file.unlink()
+        file.symlink_to(other_file)
+
+        assert buffers.pop(real_path, "hash") is None
+
     @mock_aws
     @pytest.mark.parametrize(
         "num_input_files",
@@ -1242,7 +1399,7 @@ class TestUpload:
         Test that the appropriate error is raised when the library doesn't support an asset manifest version.
         """
         with patch(
-            f"{deadline.__package__}.job_attachments.upload.ManifestModelRegistry.get_manifest_model",
+            f"{deadline.__package__}.job_attachments._local_asset_manager.ManifestModelRegistry.get_manifest_model",
             return_value=BaseManifestModel,
         ):
             with pytest.raises(
@@ -2494,6 +2651,127 @@ class TestUpload:
         )
         assert actual_queues == expected_queues
 
+    def test_upload_small_files_then_large_files(self):
+        """
+        Tests that all of the small files are uploaded before any large file, and that the large
+        files are uploaded in order.
+        """
+        a3_asset_uploader = S3AssetUploader()
+        uploaded: List[str] = []
+
+        a3_asset_uploader._upload_small_files_then_large_files(
+            ["small1", "small2", "small3"], ["large1", "large2"], uploaded.append
+        )
+
+        assert sorted(uploaded[:3]) == ["small1", "small2", "small3"]
+        assert uploaded[3:] == ["large1", "large2"]
+
+    def test_upload_small_files_then_large_files_stops_on_error(self):
+        """
+        Tests that an error uploading a small file is raised, and that no large file is uploaded.
+        """
+        a3_asset_uploader = S3AssetUploader()
+        uploaded: List[str] = []
+
+        def upload_file(file: str) -> None:
+            if file == "small2":
+                raise AssetSyncError("upload failed")
+            uploaded.append(file)
+
+        with pytest.raises(AssetSyncError, match="upload failed"):
+            a3_asset_uploader._upload_small_files_then_large_files(
+                ["small1", "small2", "small3"], ["large1"], upload_file
+            )
+
+        assert "large1" not in uploaded
+
+    def test_upload_input_files_from_roots_schedules_roots_together(self, tmpdir):
+        """
+        Tests that the files of all roots are uploaded in one schedule: the small files of every
+        root before any large file, each from its own root.
+        """
+        a3_asset_uploader = S3AssetUploader()
+        a3_asset_uploader.small_file_threshold = 10
+        manifest_one = decode_manifest(
+            '{"hashAlg":"xxh128","manifestVersion":"2023-03-03",'
+            '"paths":[{"hash":"big","mtime":1,"path":"big.exr","size":100},'
+            '{"hash":"a","mtime":1,"path":"a.txt","size":1}],"totalSize":101}'
+        )
+        manifest_two = decode_manifest(
+            '{"hashAlg":"xxh128","manifestVersion":"2023-03-03",'
+            '"paths":[{"hash":"b","mtime":1,"path":"b.txt","size":1}],"totalSize":1}'
+        )
+        uploaded: List[Tuple[str, Path]] = []
+
+        def upload_object_to_cas(file, hash_algorithm, s3_bucket, source_root, *args):
+            uploaded.append((file.path, source_root))
+            return (True, file.size)
+
+        with patch.object(
+            a3_asset_uploader, "upload_object_to_cas", side_effect=upload_object_to_cas
+        ):
+            a3_asset_uploader.upload_input_files_from_roots(
+                manifests_by_source_root=[
+                    (manifest_one, Path("/root1")),
+                    (manifest_two, Path("/root2")),
+                ],
+                s3_bucket="test-bucket",
+                s3_cas_prefix="Data",
+                s3_check_cache_dir=str(tmpdir),
+            )
+
+        assert sorted(uploaded[:2]) == [("a.txt", Path("/root1")), ("b.txt", Path("/root2"))]
+        assert uploaded[2] == ("big.exr", Path("/root1"))
+
+    @pytest.mark.parametrize("num_files", [100, 10_000])
+    def test_upload_input_files_cancel_drops_queued_files(self, tmpdir, num_files: int):
+        """
+        Tests that cancelling an upload stops it after the files that were already in flight,
+        no matter how many files are still queued.
+        """
+        a3_asset_uploader = S3AssetUploader()
+        manifest = decode_manifest(
+            json.dumps(
+                {
+                    "hashAlg": "xxh128",
+                    "manifestVersion": "2023-03-03",
+                    "paths": [
+                        {"hash": f"hash{i}", "mtime": 1, "path": f"file{i}.txt", "size": 1}
+                        for i in range(num_files)
+                    ],
+                    "totalSize": num_files,
+                }
+            )
+        )
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=num_files,
+            total_bytes=num_files,
+        )
+        uploaded = []
+        lock = threading.Lock()
+
+        def upload_object_to_cas(file, *args):
+            with lock:
+                uploaded.append(file.path)
+                if len(uploaded) == 10:
+                    progress_tracker.continue_reporting = False
+            return (True, file.size)
+
+        with patch.object(
+            a3_asset_uploader, "upload_object_to_cas", side_effect=upload_object_to_cas
+        ), pytest.raises(AssetSyncCancelledError):
+            a3_asset_uploader.upload_input_files(
+                manifest=manifest,
+                s3_bucket="test-bucket",
+                source_root=Path("/root"),
+                s3_cas_prefix="Data",
+                progress_tracker=progress_tracker,
+                s3_check_cache_dir=str(tmpdir),
+            )
+
+        assert len(uploaded) <= 10 + 2 * a3_asset_uploader.num_upload_workers
+
     @mock_aws
     @pytest.mark.parametrize(
         "manifest_version",
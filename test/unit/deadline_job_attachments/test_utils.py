@@ -1,13 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
+import os
 from pathlib import Path
 import sys
+import threading
+import tracemalloc
 
 import pytest
 
 from deadline.job_attachments._utils import (
+    _bounded_imap_unordered,
     _is_relative_to,
     _retry,
+    _walk_files,
 )
 
 
@@ -81,3 +86,136 @@ class TestUtils:
 
         # Then
         assert call_count == 2
+
+    def test_walk_files(self, tmp_path: Path):
+        """
+        Tests that every file under the directory is found with its stat result, and that
+        directories themselves are not reported.
+        """
+        # Given
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "empty").mkdir()
+        for file_path in ("top.txt", "a/middle.txt", "a/b/bottom.txt"):
+            (tmp_path / file_path).write_text(file_path)
+        os.utime(tmp_path / "a" / "middle.txt", ns=(1234, 5678))
+
+        # When
+        files = dict(_walk_files(tmp_path))
+
+        # Then
+        assert sorted(path.relative_to(tmp_path).as_posix() for path in files) == [
+            "a/b/bottom.txt",
+            "a/middle.txt",
+            "top.txt",
+        ]
+        assert files[tmp_path / "a" / "middle.txt"].st_mtime_ns == 5678
+
+    def test_bounded_imap_unordered(self):
+        """
+        Tests that every item is processed and yielded with its result, while the items are consumed
+        lazily with no more than `max_in_flight` of them pending at any time.
+        """
+        # Given
+        pulled = 0
+        yielded = 0
+        max_pending = 0
+
+        def items():
+            nonlocal pulled, max_pending
+            for i in range(100):
+                pulled += 1
+                max_pending = max(max_pending, pulled - yielded)
+                yield i
+
+        # When
+        results = {}
+        for item, result in _bounded_imap_unordered(
+            lambda x: x * 2, items(), max_workers=2, max_in_flight=4
+        ):
+            yielded += 1
+            results[item] = result
+
+        # Then
+        assert results == {i: i * 2 for i in range(100)}
+        assert max_pending <= 4
+
+    def test_bounded_imap_unordered_cancels_pending_on_error(self):
+        """
+        Tests that an exception in one call is raised to the caller, and that the items that were
+        not started yet are never processed.
+        """
+        # Given
+        processed = []
+        lock = threading.Lock()
+
+        def process(x: int) -> int:
+            if x == 0:
+                raise ValueError("failed")
+            with lock:
+                processed.append(x)
+            return x
+
+        # When
+        with pytest.raises(ValueError, match="failed"):
+            for _ in _bounded_imap_unordered(
+                process, range(10_000), max_workers=1, max_in_flight=2
+            ):
+                pass
+
+        # Then
+        assert len(processed) < 10
+
+    @pytest.mark.parametrize("num_items", [1_000, 1_000_000])
+    def test_bounded_imap_unordered_cancel_event(self, num_items: int):
+        """
+        Tests that once the cancel event is set, the queued items are dropped, so the number of
+        items processed after cancelling doesn't depend on how many items there are.
+        """
+        # Given
+        cancel_event = threading.Event()
+        processed = []
+        lock = threading.Lock()
+
+        def process(x: int) -> int:
+            with lock:
+                processed.append(x)
+                if len(processed) == 10:
+                    cancel_event.set()
+            return x
+
+        # When
+        results = list(
+            _bounded_imap_unordered(
+                process, range(num_items), max_workers=4, max_in_flight=8, cancel_event=cancel_event
+            )
+        )
+
+        # Then
+        assert len(processed) <= 10 + 8
+        assert len(results) == len(processed)
+
+    def test_bounded_imap_unordered_invalid_window(self):
+        with pytest.raises(ValueError):
+            list(_bounded_imap_unordered(lambda x: x, [1], max_workers=1, max_in_flight=0))
+
+    def test_bounded_imap_unordered_peak_memory(self):
+        """
+        Regression test: the peak memory used while processing a large number of items must not
+        grow with the number of items, as it did when one future was submitted per item up front.
+        """
+        num_items = 20_000
+
+        # When
+        tracemalloc.start()
+        try:
+            count = 0
+            for _ in _bounded_imap_unordered(lambda x: x, range(num_items), max_workers=4):
+                count += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Then
+        assert count == num_items
+        # A future alone takes several hundred bytes, so one per item would be well over 5 MB.
+        assert peak < 1024 * 1024
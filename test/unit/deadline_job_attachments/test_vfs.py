@@ -9,7 +9,8 @@ import sys
 from pathlib import Path
 import subprocess
 import threading
-from typing import Union
+import time
+from typing import List, Union
 from unittest.mock import Mock, patch, call, MagicMock
 
 import pytest
@@ -18,6 +19,7 @@ import deadline
 from deadline.job_attachments.asset_sync import AssetSync
 from deadline.job_attachments.exceptions import (
     VFSExecutableMissingError,
+    VFSFailedToMountError,
     VFSLaunchScriptMissingError,
 )
 from deadline.job_attachments.models import JobAttachmentS3Settings
@@ -696,6 +698,106 @@ class TestVFSProcessmanager:
                 any_order=True,
             )
 
+    def _process_managers(self, tmp_path: Path, count: int) -> List[VFSProcessManager]:
+        return [
+            VFSProcessManager(
+                asset_bucket=self.s3_settings.s3BucketName,
+                region=os.environ["AWS_DEFAULT_REGION"],
+                manifest_path=str(tmp_path / f"manifest{i}.json"),
+                mount_point=str(tmp_path / f"assetroot-{i}"),
+                os_user="test-user",
+                os_env_vars={"AWS_PROFILE": "test-profile"},
+            )
+            for i in range(count)
+        ]
+
+    def test_start_all_launches_before_waiting(self, tmp_path: Path):
+        """
+        Tests that all of the VFS processes are launched before the mounts are awaited together,
+        and that all of the pids are recorded.
+        """
+        process_managers = self._process_managers(tmp_path, 3)
+        events: List[str] = []
+
+        def launch(manager: VFSProcessManager, _) -> None:
+            events.append(f"launch {manager.get_mount_point()}")
+
+        def wait_for_mounts(mount_points: List[str], _) -> bool:
+            events.append("wait")
+            return True
+
+        with patch.object(
+            VFSProcessManager, "launch", autospec=True, side_effect=launch
+        ), patch.object(
+            VFSProcessManager, "wait_for_mounts", side_effect=wait_for_mounts
+        ) as mock_wait_for_mounts, patch.object(
+            VFSProcessManager, "record_pid", autospec=True
+        ) as mock_record_pid:
+            VFSProcessManager.start_all(process_managers, tmp_path)
+
+        assert events == [
+            *(f"launch {manager.get_mount_point()}" for manager in process_managers),
+            "wait",
+        ]
+        mock_wait_for_mounts.assert_called_once_with(
+            [manager.get_mount_point() for manager in process_managers], tmp_path
+        )
+        mock_record_pid.assert_has_calls([call(manager, tmp_path) for manager in process_managers])
+
+    def test_start_all_shuts_down_launched_processes_on_failure(self, tmp_path: Path):
+        """
+        Tests that when a VFS process fails to launch, the processes that were already launched
+        are shut down, and none are recorded.
+        """
+        process_managers = self._process_managers(tmp_path, 3)
+
+        def launch(self, session_dir):
+            if self is process_managers[2]:
+                raise OSError("launch failed")
+
+        with patch.object(
+            VFSProcessManager, "launch", autospec=True, side_effect=launch
+        ), patch.object(VFSProcessManager, "wait_for_mounts") as mock_wait_for_mounts, patch.object(
+            VFSProcessManager, "shut_down", autospec=True
+        ) as mock_shut_down, patch.object(
+            VFSProcessManager, "record_pid", autospec=True
+        ) as mock_record_pid:
+            with pytest.raises(OSError, match="launch failed"):
+                VFSProcessManager.start_all(process_managers, tmp_path)
+
+        mock_wait_for_mounts.assert_not_called()
+        mock_shut_down.assert_has_calls(
+            [call(process_managers[0], tmp_path), call(process_managers[1], tmp_path)]
+        )
+        assert mock_shut_down.call_count == 2
+        mock_record_pid.assert_not_called()
+
+    def test_start_all_shuts_down_all_processes_when_mount_fails(self, tmp_path: Path):
+        process_managers = self._process_managers(tmp_path, 2)
+
+        with patch.object(VFSProcessManager, "launch", autospec=True), patch.object(
+            VFSProcessManager, "wait_for_mounts", return_value=False
+        ), patch.object(VFSProcessManager, "shut_down", autospec=True) as mock_shut_down:
+            with pytest.raises(VFSFailedToMountError):
+                VFSProcessManager.start_all(process_managers, tmp_path)
+
+        assert mock_shut_down.call_count == 2
+
+    def test_shut_down_unmounts_and_terminates(self, tmp_path: Path):
+        (process_manager,) = self._process_managers(tmp_path, 1)
+        process_manager._vfs_proc = MagicMock()
+        process_manager._vfs_proc.poll.return_value = None
+
+        with patch.object(VFSProcessManager, "is_mount", return_value=True), patch.object(
+            VFSProcessManager, "shutdown_libfuse_mount"
+        ) as mock_shutdown_libfuse_mount:
+            process_manager.shut_down(tmp_path)
+
+        mock_shutdown_libfuse_mount.assert_called_once_with(
+            process_manager.get_mount_point(), "test-user", tmp_path
+        )
+        process_manager._vfs_proc.terminate.assert_called_once()
+
     def test_manifest_group_set(
         self,
         tmp_path: Path,
@@ -897,3 +999,87 @@ def test_vfs_has_expected_logs_folder(
         process_manager.start(tmp_path)
 
         assert process_manager.get_logs_folder() == expected_logs_folder
+
+
+def _mountinfo_line(mount_id: int, mount_point: str) -> str:
+    escaped_mount_point = mount_point.replace(" ", "\\040")
+    return (
+        f"{mount_id} 1 0:{mount_id} / {escaped_mount_point} rw,nosuid,nodev - fuse.deadline_vfs"
+        " deadline_vfs rw\n"
+    )
+
+
+@pytest.fixture
+def fake_mountinfo(tmp_path: Path):
+    """A fake mount table, with the root file system mounted."""
+    mountinfo_path = tmp_path / "mountinfo"
+    mountinfo_path.write_text(_mountinfo_line(1, "/"))
+    with patch(f"{deadline.__package__}.job_attachments.vfs.MOUNTINFO_PATH", str(mountinfo_path)):
+        yield mountinfo_path
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="VFS doesn't currently support Windows")
+def test_is_mount_reads_mount_table(tmp_path: Path, fake_mountinfo: Path):
+    mount_point = tmp_path / "asset root"
+    with open(fake_mountinfo, "a") as mountinfo:
+        mountinfo.write(_mountinfo_line(2, str(mount_point)))
+
+    with patch(f"{deadline.__package__}.job_attachments.vfs.subprocess.run") as mock_run:
+        assert VFSProcessManager.is_mount(str(mount_point))
+        assert not VFSProcessManager.is_mount(str(tmp_path / "other"))
+
+    mock_run.assert_not_called()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="VFS doesn't currently support Windows")
+def test_is_mount_falls_back_to_findmnt(tmp_path: Path):
+    with patch(
+        f"{deadline.__package__}.job_attachments.vfs.MOUNTINFO_PATH", str(tmp_path / "missing")
+    ), patch(
+        f"{deadline.__package__}.job_attachments.vfs.subprocess.run",
+        return_value=MagicMock(returncode=0),
+    ) as mock_run:
+        assert VFSProcessManager.is_mount("/some/mount")
+
+    mock_run.assert_called_once_with(["findmnt", "/some/mount"])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="VFS doesn't currently support Windows")
+def test_wait_for_mounts_session_start_latency(tmp_path: Path, fake_mountinfo: Path):
+    """
+    Measures how long after the last of several mounts appears the wait for them returns, with a
+    fake mount table. Checking once per second used to add up to a second to every session start.
+    """
+    mount_points = [tmp_path / f"root{i}" for i in range(3)]
+    mounted_times = []
+
+    def mount_all():
+        for i, mount_point in enumerate(mount_points):
+            time.sleep(0.05)
+            with open(fake_mountinfo, "a") as mountinfo:
+                mountinfo.write(_mountinfo_line(i + 2, str(mount_point)))
+            mounted_times.append(time.monotonic())
+
+    mount_thread = threading.Thread(target=mount_all)
+    mount_thread.start()
+    try:
+        mounted = VFSProcessManager.wait_for_mounts(mount_points, tmp_path, mount_wait_seconds=5)
+        latency = time.monotonic() - mounted_times[-1]
+    finally:
+        mount_thread.join()
+
+    assert mounted
+    assert latency < 0.5
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="VFS doesn't currently support Windows")
+def test_wait_for_mount_times_out(tmp_path: Path, fake_mountinfo: Path):
+    with patch.object(VFSProcessManager, "print_log_end") as mock_print_log_end:
+        assert not VFSProcessManager.wait_for_mount(
+            str(tmp_path / "never_mounted"), tmp_path, mount_wait_seconds=0.2
+        )
+        assert VFSProcessManager.wait_for_mount(
+            str(tmp_path / "never_mounted"), tmp_path, mount_wait_seconds=0.2, expected=False
+        )
+
+    mock_print_log_end.assert_called_once_with(tmp_path)